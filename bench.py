@@ -0,0 +1,297 @@
+"""Headless benchmark suite for the project planner.
+
+Generates synthetic projects of configurable size and times the model, view and CLI hot paths,
+writing the results as JSON. Two result files can be compared to spot regressions.
+
+Usage:
+  python bench.py                                   # 1k/10k/50k rows -> bench_results.json
+  python bench.py --sizes 1000 10000 --repeat 5 --out before.json
+  python bench.py --sizes 1000 --compare before.json --threshold 0.25
+  python bench.py --generate 5000 --out synthetic.db   # only write a synthetic project DB
+
+Options for the synthetic project: --depth, --fanout, --dep-density, --attachments, --no-costs, --seed.
+Exit code is 1 when --compare finds a regression beyond --threshold, otherwise 0.
+"""
+import os
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import argparse, contextlib, datetime as dt, json, platform, random, shutil, statistics, subprocess, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SIZES = (1000, 10000, 50000)
+COST_FIELDS = ("Production Cost", "Installation Cost", "Production Price", "Installation Price",
+               "Material Cost", "Equipment Cost", "Permit/Eng Cost")
+STATUSES = ("Planned", "In Progress", "Blocked", "Done", "Deferred")
+
+
+def generate_rows(columns, parts, depth=4, fanout=6, dep_density=0.3, with_costs=True,
+                  attachments=0.1, seed=42):
+    """Synthetic project rows (dicts over columns).
+
+    Parts form a forest `depth` levels deep with up to `fanout` children per part; new roots are added
+    until `parts` rows exist. A `dep_density` fraction of parts depend on one or two parts created
+    shortly before them (always earlier, so the dependency graph stays acyclic). `attachments` is the
+    fraction of rows carrying an Attachments list."""
+    from collections import deque
+    rnd = random.Random(seed)
+    base = dt.date(2026, 1, 5)
+    rows = []
+    code = {}   # part name -> outline number ("3.1.4")
+    queue = deque()
+    root_no = 0
+    while len(rows) < parts:
+        if not queue:
+            root_no += 1
+            name = f"Project {root_no}"
+            code[name] = str(root_no)
+            queue.append(name)
+            rows.append(_row(columns, rnd, name, "", base, with_costs, attachments))
+            continue
+        parent = queue.popleft()
+        if code[parent].count(".") >= depth - 1:
+            continue
+        for k in range(rnd.randint(max(1, fanout // 2), fanout)):
+            if len(rows) >= parts:
+                break
+            name = f"Part {code[parent]}.{k + 1}"
+            code[name] = f"{code[parent]}.{k + 1}"
+            queue.append(name)
+            rows.append(_row(columns, rnd, name, parent, base, with_costs, attachments))
+    names = [r["Project Part"] for r in rows]
+    for i, r in enumerate(rows):
+        if i and rnd.random() < dep_density:
+            window = names[max(0, i - 50):i]
+            r["Dependencies"] = ", ".join(sorted(set(rnd.sample(window, min(len(window), rnd.randint(1, 2))))))
+    return rows
+
+
+def _row(columns, rnd, name, parent, base, with_costs, attachments):
+    r = {c: "" for c in columns}
+    status = rnd.choice(STATUSES)
+    pc = 100 if status == "Done" else (0 if status == "Planned" else rnd.randint(5, 95))
+    r.update({
+        "Project Part": name,
+        "Parent": parent,
+        "Start Date": (base + dt.timedelta(days=rnd.randint(0, 365))).strftime("%m-%d-%Y"),
+        "Duration (days)": str(rnd.randint(1, 20)),
+        "Internal/External": rnd.choice(("Internal", "External")),
+        "Type": rnd.choice(("Fabrication", "Installation", "Design", "Milestone")),
+        "Responsible": rnd.choice(("Alex", "Sam", "Jordan", "Riley")),
+        "Status": status,
+        "% Complete": str(pc),
+        "Notes": f"Synthetic part {name}",
+    })
+    if with_costs:
+        for f in COST_FIELDS:
+            if f in r:
+                r[f] = f"{rnd.uniform(100, 25000):.2f}"
+    if attachments and rnd.random() < attachments:
+        r["Attachments"] = json.dumps([f"attachments/{name.replace(' ', '_')}_{i}.pdf"
+                                       for i in range(rnd.randint(1, 3))])
+    return r
+
+
+def measure(fn, repeat, setup=None):
+    """Run fn `repeat` times (setup() before each, untimed); returns per-run milliseconds."""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000.0)
+    return times
+
+
+def summarize(times):
+    return {"median_ms": round(statistics.median(times), 2), "min_ms": round(min(times), 2),
+            "max_ms": round(max(times), 2), "runs": len(times)}
+
+
+@contextlib.contextmanager
+def _quiet():
+    # The app prints diagnostics per row on some paths; keep terminal I/O out of the timings
+    with open(os.devnull, "w") as null, contextlib.redirect_stdout(null):
+        yield
+
+
+@contextlib.contextmanager
+def _db_override(path):
+    """PROJECT_DB_PATH=path for models created inside the block; the caller's value comes back after."""
+    old = os.environ.get("PROJECT_DB_PATH")
+    os.environ["PROJECT_DB_PATH"] = path
+    try:
+        yield
+    finally:
+        if old is None:
+            os.environ.pop("PROJECT_DB_PATH", None)
+        else:
+            os.environ["PROJECT_DB_PATH"] = old
+
+
+def bench_size(main, app, n, args):
+    results = {}
+    d = tempfile.mkdtemp(prefix=f"bench_{n}_")
+    log_path = main._LOG_WRITER.path
+    main._LOG_WRITER.path = os.path.join(d, "app.log")  # perf/db records of the run stay out of the repo
+    try:
+        db = os.path.join(d, "project_data.db")
+        with _db_override(db), _quiet():
+            model = main.ProjectDataModel()
+        model.read_only = False
+        rows = generate_rows(model.COLUMNS, n, args.depth, args.fanout, args.dep_density,
+                             not args.no_costs, args.attachments, args.seed)
+        model.rows.extend(rows)
+        model.bump_data_version()
+
+        def timed(key, fn, repeat=args.repeat, setup=None):
+            with _quiet():
+                results[key] = summarize(measure(fn, repeat, setup))
+
+        # Full rewrite, then an incremental save of 1% edited rows
+        timed("save_to_db.full", model.save_to_db, repeat=1)
+        model.ensure_schema()
+        edit_rnd = random.Random(args.seed + 1)
+        def edit_some():
+            for r in edit_rnd.sample(model.rows, max(1, n // 100)):
+                r["Notes"] = f"edited {edit_rnd.random():.6f}"
+        timed("save_to_db.incremental", model.save_to_db, setup=edit_some)
+        timed("load_from_db", model.load_from_db)
+        # Cold derived computations, as after an edit
+        timed("rollup_progress", model.rollup_progress, setup=model.bump_data_version)
+        timed("progress_metrics", model.progress_metrics, setup=model.bump_data_version)
+        timed("update_calculated_end_dates", model.update_calculated_end_dates, setup=model.bump_data_version)
+
+        # Views are built untimed; refreshes are timed after a data change
+        with _quiet():
+            gantt = main.GanttChartView()
+            tree = main.ProjectTreeView(model)
+            table = main.DatabaseView(model)
+            costs = main.CostEstimatesView(model)
+        timed("render_gantt", lambda: (gantt.render_gantt(model), app.processEvents()), setup=model.bump_data_version)
+        timed("ProjectTreeView.refresh", lambda: (tree.refresh(), app.processEvents()), setup=model.bump_data_version)
+        timed("DatabaseView.refresh_table", lambda: (table.refresh_table(), app.processEvents()), setup=model.bump_data_version)
+        timed("CostEstimatesView.refresh", lambda: (costs.refresh(), app.processEvents()), setup=model.bump_data_version)
+        model.flush_pending_writes()
+        for w in (gantt, tree, table, costs):
+            w.deleteLater()
+        app.processEvents()
+
+        # CLI round trips in a fresh interpreter, like a scripted export/import
+        cli = [sys.executable, os.path.join(ROOT, "cli.py")]
+        for fmt in ("json", "csv", "xlsx"):
+            out = os.path.join(d, f"export.{fmt}")
+            results[f"cli.export.{fmt}"] = summarize(measure(
+                lambda: _run(cli + ["export", "--database", db, "--out", out, "--format", fmt]), 1))
+        imp_db = os.path.join(d, "import.db")
+        results["cli.import.json"] = summarize(measure(
+            lambda: _run(cli + ["import", "--database", imp_db, "--in", os.path.join(d, "export.json"),
+                                "--mode", "replace", "--no-backup"]), 1))
+        model.close_connections()
+    finally:
+        main._LOG_WRITER.flush()
+        main._LOG_WRITER.path = log_path
+        shutil.rmtree(d, ignore_errors=True)
+    return results
+
+
+def _run(cmd):
+    subprocess.run(cmd, check=True, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def compare(current, baseline, threshold):
+    """Print per-benchmark ratios against a baseline run; returns the list of regressions."""
+    regressions = []
+    print(f"{'size':>7}  {'benchmark':<30} {'base ms':>10} {'now ms':>10} {'ratio':>7}")
+    for size, benches in sorted(current["results"].items(), key=lambda kv: int(kv[0])):
+        base_benches = baseline.get("results", {}).get(size, {})
+        for name, res in sorted(benches.items()):
+            base = base_benches.get(name)
+            if not base:
+                continue
+            b, c = base["median_ms"], res["median_ms"]
+            ratio = c / b if b else float("inf")
+            flag = ""
+            if ratio > 1 + threshold and c - b > 1.0:  # ignore sub-millisecond noise
+                flag = "  REGRESSION"
+                regressions.append((size, name, b, c))
+            print(f"{size:>7}  {name:<30} {b:>10.1f} {c:>10.1f} {ratio:>7.2f}{flag}")
+    return regressions
+
+
+def parse_args(argv):
+    p = argparse.ArgumentParser(description="Headless benchmarks on synthetic projects")
+    p.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Row counts to benchmark")
+    p.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark (median is reported)")
+    p.add_argument("--depth", type=int, default=4, help="Hierarchy depth")
+    p.add_argument("--fanout", type=int, default=6, help="Maximum children per part")
+    p.add_argument("--dep-density", type=float, default=0.3, help="Fraction of parts with dependencies")
+    p.add_argument("--attachments", type=float, default=0.1, help="Fraction of parts with attachments")
+    p.add_argument("--no-costs", action="store_true", help="Leave cost/price fields empty")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--out", default="bench_results.json", help="Result JSON (or DB path with --generate)")
+    p.add_argument("--compare", help="Baseline result JSON to compare against")
+    p.add_argument("--threshold", type=float, default=0.2, help="Slowdown ratio flagged as a regression")
+    p.add_argument("--generate", type=int, metavar="N", help="Only write a synthetic project DB of N parts to --out")
+    return p.parse_args(argv)
+
+
+def main_cli(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    sys.path.insert(0, ROOT)
+    from PyQt5.QtWidgets import QApplication, QMessageBox
+    app = QApplication.instance() or QApplication([])
+    # Never block on first-run prompts
+    QMessageBox.question = staticmethod(lambda *a, **k: QMessageBox.No)
+    with _quiet():
+        import main
+    if args.generate:
+        # The save's log records follow the override, so they are flushed before it is lifted
+        with _db_override(os.path.abspath(args.out)), _quiet():
+            model = main.ProjectDataModel()
+            model.read_only = False
+            model.rows.extend(generate_rows(model.COLUMNS, args.generate, args.depth, args.fanout, args.dep_density,
+                                            not args.no_costs, args.attachments, args.seed))
+            model.save_to_db()
+            model.ensure_schema()
+            main._LOG_WRITER.flush()
+        model.close_connections()
+        print(f"Wrote {args.generate} synthetic parts to {args.out}")
+        return 0
+    report = {
+        "meta": {
+            "timestamp": dt.datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {k: v for k, v in vars(args).items() if k not in ("out", "compare", "threshold", "generate")},
+        },
+        "results": {},
+    }
+    for n in args.sizes:
+        t0 = time.perf_counter()
+        report["results"][str(n)] = bench_size(main, app, n, args)
+        print(f"{n} rows: {time.perf_counter() - t0:.1f}s")
+        for name, res in sorted(report["results"][str(n)].items()):
+            print(f"  {name:<30} {res['median_ms']:>10.1f} ms")
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
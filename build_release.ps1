@@ -136,7 +136,11 @@ if ($Version) {
 }
 
 if ($IncludeCLI) {
-  if (Test-Path 'cli.py') { Copy-Item 'cli.py' $staging }
+  if (Test-Path 'cli.py') {
+    Copy-Item 'cli.py' $staging
+    # XLSX export imports the shared column list and writer
+    if (Test-Path 'project_io.py') { Copy-Item 'project_io.py' $staging }
+  }
   else { Write-Warning 'cli.py not found; skipping.' }
 }
 if ($IncludeDBTemplate) {
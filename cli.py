@@ -4,6 +4,7 @@ CLI utility for importing/exporting the project_data.db database.
 
 Features:
   - Export to JSON (default) or CSV
+  - Export to XLSX (all application columns, streamed; needs openpyxl and project_io.py)
   - Import from JSON or CSV into a target database
   - Modes: replace (drop & recreate table), append, merge (upsert on Project Part name)
   - Automatic timestamped backup before destructive operations (replace/merge) unless --no-backup
@@ -12,6 +13,7 @@ Features:
 Examples:
   python cli.py export --out data.json
   python cli.py export --format csv --out parts.csv
+  python cli.py export --out parts.xlsx
   python cli.py import --in data.json --mode merge
   python cli.py import --in parts.csv --format csv --mode replace --database other.db
 
@@ -87,6 +89,42 @@ def export_data(db_path, out_path, fmt):
         raise CLIError(f"Failed writing output {out_path}: {e}")
     return len(rows)
 
+def export_xlsx(db_path, out_path):
+    """Full project export: every ProjectDataModel column, rows streamed from the cursor into a
+    write-only workbook so memory stays flat on large databases."""
+    try:
+        import openpyxl  # noqa: F401
+    except Exception:
+        raise CLIError("XLSX export requires openpyxl (pip install -r requirements.txt)")
+    try:
+        from project_io import PROJECT_COLUMNS, write_xlsx_stream, xlsx_column_kind
+    except Exception as e:
+        raise CLIError(f"XLSX export requires project_io.py next to cli.py: {e}")
+    columns = list(PROJECT_COLUMNS)
+    conn = connect(db_path)
+    try:
+        cur = conn.cursor()
+        try:
+            present = {r[1] for r in cur.execute(f"PRAGMA table_info({TABLE_NAME})")}
+            if not present:
+                raise CLIError(f"Table {TABLE_NAME} not found in {db_path}")
+            # Columns an older database lacks are exported blank
+            select = ",".join(f"[{c}]" if c in present else "''" for c in columns)
+            cur.execute(f"SELECT {select} FROM {TABLE_NAME} ORDER BY id")
+        except CLIError:
+            raise
+        except Exception as e:
+            raise CLIError(f"Failed reading data: {e}")
+        try:
+            return write_xlsx_stream(out_path, [(c, xlsx_column_kind(c)) for c in columns], cur,
+                                     sheet_title='Project Parts',
+                                     meta_rows=[["Generated", dt.datetime.now().isoformat(timespec='seconds')],
+                                                ["Database", os.path.abspath(db_path)]])
+        except Exception as e:
+            raise CLIError(f"Failed writing output {out_path}: {e}")
+    finally:
+        conn.close()
+
 def read_input(in_path, fmt):
     if not os.path.exists(in_path):
         raise CLIError(f"Input file not found: {in_path}")
@@ -172,7 +210,7 @@ def parse_args(argv):
     exp = sub.add_parser('export', help='Export database to file')
     exp.add_argument('--database', default=DB_FILE_DEFAULT, help='Path to SQLite DB (default: project_data.db)')
     exp.add_argument('--out', required=True, help='Output file path')
-    exp.add_argument('--format', choices=['json','csv'], default='json', help='Export format (default json)')
+    exp.add_argument('--format', choices=['json','csv','xlsx'], help='Export format (default json; xlsx for .xlsx output)')
 
     imp = sub.add_parser('import', help='Import file into database')
     imp.add_argument('--database', default=DB_FILE_DEFAULT, help='Path to SQLite DB (default: project_data.db)')
@@ -197,7 +235,11 @@ def main(argv=None):
     try:
         args = parse_args(argv)
         if args.command == 'export':
-            count = export_data(args.database, args.out, args.format)
+            fmt = args.format or ('xlsx' if args.out.lower().endswith('.xlsx') else 'json')
+            if fmt == 'xlsx':
+                count = export_xlsx(args.database, args.out)
+            else:
+                count = export_data(args.database, args.out, fmt)
             print(f"Exported {count} rows to {args.out}")
             return 0
         elif args.command == 'import':
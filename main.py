@@ -3,7 +3,6 @@ from PyQt5.QtWidgets import QMessageBox
 from PyQt5.QtCore import QDate
 
 
-# Minimal ImageCellWidget for image upload/preview in DatabaseView
 from PyQt5.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QLabel, QPushButton, QFileDialog, QMainWindow, QApplication, QListWidget, QTreeWidget, QGraphicsScene, QStackedWidget, QDialog
 from PyQt5.QtWidgets import QTreeWidgetItem
 import os
@@ -11,70 +10,297 @@ from PyQt5.QtGui import QPixmap
 
 # --- Central JSON lines logger -------------------------------------------------
 # Lightweight, dependency-free structured logging. Writes JSON objects one per
-# line to app.log (sibling to the active DB file). Rotates when file exceeds
-# ~1MB (simple single-level rotation). Safe for concurrent appenders on local/
-# network FS (best-effort; no hard locking). Use log_event(category, event, **kv)
-def log_event(category: str, event: str, **fields):
-    try:
-        import os, json, datetime, socket, getpass, threading
-        ts = datetime.datetime.utcnow().isoformat(timespec='seconds') + 'Z'
+# line to app.log (sibling to the active DB file). log_event only queues the
+# record; a background thread appends batches (every LOG_FLUSH_RECORDS records
+# or LOG_FLUSH_SECONDS) and rotates app.log -> app.log.1 .. app.log.N once it
+# exceeds ~1MB. Pending records are flushed at exit. Safe for concurrent
+# appenders on local/network FS (best-effort; no hard locking).
+# Use log_event(category, event, **kv)
+LOG_MAX_BYTES = 1_000_000
+LOG_BACKUPS = 3
+LOG_FLUSH_RECORDS = 200
+LOG_FLUSH_SECONDS = 1.0
+
+
+class _JsonLogWriter:
+    """Queue plus writer thread behind log_event. path=None follows the active DB's folder."""
+    def __init__(self, path=None, max_bytes=LOG_MAX_BYTES, backups=LOG_BACKUPS,
+                 flush_records=LOG_FLUSH_RECORDS, flush_seconds=LOG_FLUSH_SECONDS):
+        import queue, threading, socket, getpass
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_records = flush_records
+        self.flush_seconds = flush_seconds
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        # Identity fields do not change during a session
         try:
-            user = getpass.getuser()
+            self.user = getpass.getuser()
         except Exception:
-            user = 'unknown'
+            self.user = 'unknown'
         try:
-            host = socket.gethostname()
+            self.host = socket.gethostname()
         except Exception:
-            host = 'host'
+            self.host = 'host'
+
+    def put(self, category, event, fields):
+        import os, datetime, threading
+        rec = {
+            'ts': datetime.datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+            'pid': os.getpid(),
+            'thread': threading.current_thread().name,
+            'user': self.user,
+            'host': self.host,
+            'category': category,
+            'event': event,
+        }
+        rec.update(fields)
+        self._queue.put(rec)
+        if self._thread is None:
+            self._start()
+
+    def flush(self, timeout=5.0):
+        """Wait until everything queued so far is on disk (False on timeout or when not running)."""
+        import threading
+        if self._thread is None or not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _start(self):
+        import threading, atexit
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def _log_path(self):
+        import os
+        if self.path:
+            return self.path
         base_dir = None
-        # Attempt to colocate with DB if model global exists later; fallback to script dir
+        # Attempt to colocate with DB if model global exists; fallback to script dir
         try:
-            # Lazy import of __main__ to introspect model if already created
             import __main__ as _m
             if hasattr(_m, 'model') and getattr(_m, 'model') and hasattr(getattr(_m, 'model'), 'DB_FILE'):
                 base_dir = os.path.dirname(os.path.abspath(getattr(_m.model, 'DB_FILE')))
         except Exception:
             base_dir = None
+        if not base_dir and (os.environ.get('PROJECT_DB_PATH') or '').strip():
+            # Headless runs (CLI, tests, benchmarks) without a window model: follow the DB override
+            base_dir = os.path.dirname(os.path.abspath(os.path.expanduser(os.path.expandvars(
+                os.environ['PROJECT_DB_PATH'].strip().lstrip('\ufeff')))))
         if not base_dir:
             base_dir = os.path.dirname(os.path.abspath(__file__))
-        log_path = os.path.join(base_dir, 'app.log')
-        # Simple rotation
+        return os.path.join(base_dir, 'app.log')
+
+    def _run(self):
+        import queue, threading, time
+        batch = []
+        waiters = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not None:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_seconds
+            if batch and (item is None or waiters or len(batch) >= self.flush_records):
+                self._write(batch)
+                batch = []
+                deadline = None
+            for w in waiters:
+                w.set()
+            waiters = []
+
+    def _write(self, batch):
+        import os, json
         try:
-            if os.path.exists(log_path) and os.path.getsize(log_path) > 1_000_000:
-                bak = log_path + '.1'
-                try:
-                    if os.path.exists(bak):
-                        os.remove(bak)
-                except Exception:
-                    pass
+            path = self._log_path()
+            # Stringify anything not JSON-serializable
+            data = ''.join(json.dumps(rec, ensure_ascii=False, default=repr) + '\n' for rec in batch)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(data)
+                size = f.tell()
+            if size > self.max_bytes:
+                self._rotate(path)
+        except Exception:
+            # Never raise from logger
+            pass
+
+    def _rotate(self, path):
+        import os
+        # app.log.(N-1) -> app.log.N, ..., app.log -> app.log.1; the oldest generation is dropped
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{path}.{i}"
+            if os.path.exists(src):
                 try:
-                    os.replace(log_path, bak)
+                    os.replace(src, f"{path}.{i + 1}")
                 except Exception:
                     pass
+        try:
+            os.replace(path, path + '.1')
         except Exception:
             pass
-        rec = {
-            'ts': ts,
-            'pid': os.getpid(),
-            'thread': threading.current_thread().name,
-            'user': user,
-            'host': host,
-            'category': category,
-            'event': event,
-        }
-        # Merge user fields (stringify anything not JSON-serializable)
-        for k, v in fields.items():
-            try:
-                json.dumps(v)
-                rec[k] = v
-            except Exception:
-                rec[k] = repr(v)
-        line = json.dumps(rec, ensure_ascii=False)
-        with open(log_path, 'a', encoding='utf-8') as f:
-            f.write(line + '\n')
+
+
+_LOG_WRITER = _JsonLogWriter()
+
+
+def log_event(category: str, event: str, **fields):
+    try:
+        _LOG_WRITER.put(category, event, fields)
     except Exception:
         # Never raise from logger
         pass
+# --- Hot-path timing -----------------------------------------------------------
+# perf_span()/timed() measure entry points (load, save, roll-ups, CPM, renders,
+# exports). Every span lands in PERF, a ring buffer of recent operations shown
+# in Tools -> Performance; spans of at least PERF_LOG_MIN_MS also go to app.log.
+PERF_RING_SIZE = 500
+PERF_LOG_MIN_MS = 10.0
+
+
+class PerfRecorder:
+    """Ring buffer of the most recent timed operations: (wall time, name, ms, fields)."""
+    def __init__(self, size=PERF_RING_SIZE):
+        import collections, threading
+        self._ring = collections.deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self):
+        """How many operations the buffer keeps."""
+        return self._ring.maxlen
+
+    def record(self, name, ms, fields):
+        import time
+        with self._lock:
+            self._ring.append((time.time(), name, ms, fields))
+
+    def recent(self, n=None):
+        with self._lock:
+            items = list(self._ring)
+        return items[-n:] if n else items
+
+    def clear(self):
+        with self._lock:
+            self._ring.clear()
+
+    def stats(self):
+        """{name: {'count', 'last', 'p50', 'p95', 'max'}} in ms over the buffered operations."""
+        by_name = {}
+        for _, name, ms, _ in self.recent():
+            by_name.setdefault(name, []).append(ms)
+        out = {}
+        for name, vals in by_name.items():
+            ordered = sorted(vals)
+            def pct(p):
+                return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))]
+            out[name] = {'count': len(vals), 'last': vals[-1], 'p50': pct(50), 'p95': pct(95), 'max': ordered[-1]}
+        return out
+
+
+PERF = PerfRecorder()
+_perf_local = None
+
+
+def _perf_stack():
+    global _perf_local
+    if _perf_local is None:
+        import threading
+        _perf_local = threading.local()
+    stack = getattr(_perf_local, 'stack', None)
+    if stack is None:
+        stack = _perf_local.stack = []
+    return stack
+
+
+class PerfSpan:
+    """One timed operation; see perf_span()."""
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+        self.ms = None
+
+    def note(self, **fields):
+        self.fields.update(fields)
+
+    def __enter__(self):
+        import time
+        _perf_stack().append(self)
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        import time
+        self.ms = (time.perf_counter() - self._t0) * 1000.0
+        stack = _perf_stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        if exc_type is not None:
+            self.fields['error'] = exc_type.__name__
+        try:
+            PERF.record(self.name, self.ms, self.fields)
+            if self.ms >= PERF_LOG_MIN_MS:
+                log_event('perf', self.name, ms=round(self.ms, 2), **self.fields)
+        except Exception:
+            pass
+        return False
+
+
+def perf_span(name, **fields):
+    """Time a block: `with perf_span('db.save', rows=n) as span: ...`. Counts known only later can be
+    added with span.note(...) or perf_note(...)."""
+    return PerfSpan(name, dict(fields))
+
+
+def perf_note(**fields):
+    """Attach counts (rows, items, ...) to the innermost span running on this thread, if any."""
+    stack = _perf_stack()
+    if stack:
+        stack[-1].note(**fields)
+
+
+def timed(name, note=None):
+    """Decorator form of perf_span(). note(result, *args, **kwargs) may return counts for the span.
+    Surplus positional args are dropped, as PyQt does for a plain slot, so a decorated method can still be
+    connected to a signal that carries values (clicked(bool), currentIndexChanged(int), ...)."""
+    import functools, inspect
+    def decorate(fn):
+        params = inspect.signature(fn).parameters.values()
+        if any(p.kind == p.VAR_POSITIONAL for p in params):
+            max_args = None
+        else:
+            max_args = sum(1 for p in params if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD))
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if max_args is not None and len(args) > max_args:
+                args = args[:max_args]
+            with perf_span(name) as span:
+                result = fn(*args, **kwargs)
+                if note is not None:
+                    try:
+                        span.note(**note(result, *args, **kwargs))
+                    except Exception:
+                        pass
+                return result
+        return wrapper
+    return decorate
+
+
 import shutil
 
 # --- Resource path resolution helper ---
@@ -143,6 +369,210 @@ def save_holiday_dates(dates):
         json.dump(sorted(list(dates)), open(p, "w", encoding="utf-8"), ensure_ascii=False, indent=2)
     except Exception:
         pass
+    global _business_calendar_cache
+    _business_calendar_cache = None
+
+import project_io
+from project_io import PROJECT_COLUMNS, parse_mdy
+
+def parse_money(v):
+    """Parse a cost/price cell ("$1,250.00", 1250, "") to float; blanks and junk count as 0.0."""
+    if v is None:
+        return 0.0
+    if isinstance(v, (int, float)):
+        return float(v)
+    try:
+        s = str(v).strip().replace('$', '').replace(',', '')
+        return float(s) if s else 0.0
+    except Exception:
+        return 0.0
+
+# --- Streaming XLSX export (Qt-free, shared with cli.py) ---
+write_xlsx_stream = timed('export.xlsx', note=lambda n, *a, **k: {'rows': n})(project_io.write_xlsx_stream)
+
+# --- Business calendar (Mon-Fri working days minus holidays.json) ---
+class BusinessCalendar:
+    """Working-day arithmetic in closed form: whole weeks plus a remainder, holidays found by binary search.
+    add_workdays(d, n) returns the n-th working day strictly after d (d itself may be a weekend/holiday)."""
+    def __init__(self, holidays=()):
+        import datetime
+        # Weekend holidays never change the result, so only weekday ones are kept
+        self.holidays = sorted({h for h in holidays if isinstance(h, datetime.date) and h.weekday() < 5})
+        self._holiday_set = set(self.holidays)
+
+    def is_workday(self, d):
+        return d.weekday() < 5 and d not in self._holiday_set
+
+    def _holidays_in(self, after, upto):
+        """Number of (weekday) holidays h with after < h <= upto."""
+        import bisect
+        return bisect.bisect_right(self.holidays, upto) - bisect.bisect_right(self.holidays, after)
+
+    @staticmethod
+    def _add_weekdays(d, n):
+        import datetime
+        if n <= 0:
+            return d
+        wd = d.weekday()
+        if wd >= 5:
+            # The n-th weekday after Sat/Sun equals the n-th weekday after the preceding Friday
+            d = d - datetime.timedelta(days=wd - 4)
+            wd = 4
+        weeks, rem = divmod(n, 5)
+        days = weeks * 7 + rem
+        if wd + rem >= 5:
+            days += 2
+        return d + datetime.timedelta(days=days)
+
+    def add_workdays(self, d, n):
+        end = self._add_weekdays(d, n)
+        extra = self._holidays_in(d, end) if self.holidays and n > 0 else 0
+        while extra:
+            nxt = self._add_weekdays(end, extra)
+            extra = self._holidays_in(end, nxt)
+            end = nxt
+        return end
+
+    def add_workdays_batch(self, starts, counts, as_mdy=False):
+        """Vectorized add_workdays over parallel sequences of start dates (datetime.date or ISO strings) and counts.
+        Returns a list of dates, or MM-dd-YYYY strings when as_mdy is set.
+        Uses numpy.busday_offset when available, else the scalar path."""
+        import datetime
+        try:
+            import numpy as np
+        except Exception:
+            starts = [datetime.date.fromisoformat(d) if isinstance(d, str) else d for d in starts]
+            ends = [self.add_workdays(d, n) for d, n in zip(starts, counts)]
+            return [e.strftime("%m-%d-%Y") for e in ends] if as_mdy else ends
+        if not len(starts):
+            return []
+        d = np.array(starts, dtype='datetime64[D]')
+        n = np.maximum(np.array(counts, dtype=np.int64), 0)
+        hol = np.array(self.holidays, dtype='datetime64[D]')
+        # busday_offset rolls a non-working start forward first, which already counts as one step
+        on_day = np.is_busday(d, holidays=hol)
+        offs = np.where(on_day, n, n - 1)
+        out = np.busday_offset(d, np.maximum(offs, 0), roll='forward', holidays=hol)
+        out = np.where(n > 0, out, d)
+        if as_mdy:
+            return [f"{iso[5:7]}-{iso[8:10]}-{iso[0:4]}" for iso in np.datetime_as_string(out, unit='D').tolist()]
+        return out.astype(object).tolist()
+
+    def weekend_runs(self, start, end):
+        """Yield (run_start, run_end_exclusive) for each Sat/Sun run overlapping [start, end] (dates or datetimes)."""
+        import datetime
+        wd = start.weekday()
+        cur = start if wd == 6 else start + datetime.timedelta(days=(5 - wd) % 7)
+        while cur <= end:
+            run_end = cur + datetime.timedelta(days=7 - cur.weekday())
+            yield cur, min(run_end, end + datetime.timedelta(days=1))
+            cur = run_end + datetime.timedelta(days=5)
+
+    def holidays_between(self, start, end):
+        """Weekday holidays within [start, end] (dates)."""
+        import bisect
+        lo = bisect.bisect_left(self.holidays, start)
+        hi = bisect.bisect_right(self.holidays, end)
+        return self.holidays[lo:hi]
+
+_business_calendar_cache = None
+def get_business_calendar():
+    """Shared BusinessCalendar built from holidays.json; reloaded when the file (or its location) changes."""
+    import os
+    global _business_calendar_cache
+    p = _holidays_path()
+    try:
+        mtime = os.path.getmtime(p) if os.path.exists(p) else None
+    except Exception:
+        mtime = None
+    key = (p, mtime)
+    if _business_calendar_cache is None or _business_calendar_cache[0] != key:
+        _business_calendar_cache = (key, BusinessCalendar(load_holiday_dates()))
+    return _business_calendar_cache[1]
+
+# --- Scheduling engine (critical path method) ---
+class Schedule:
+    """Result of compute_schedule: per-part ES/EF/LS/LF (datetimes), total float (days) and the critical set."""
+    def __init__(self):
+        self.es = {}
+        self.ef = {}
+        self.ls = {}
+        self.lf = {}
+        self.total_float = {}
+        self.critical = set()
+        self.order = []           # topological order (predecessors first); parts on cycles are omitted
+        self.project_finish = None
+
+@timed('schedule.cpm', note=lambda s, rows: {'rows': len(rows)})
+def compute_schedule(rows):
+    """CPM forward/backward pass over the "Dependencies" column in O(V+E).
+    Parts without (known) predecessors start at their Start Date, or the earliest start in the project.
+    Unknown dependency names are ignored; parts on a dependency cycle get their own dates and are never critical."""
+    import datetime
+    from collections import deque
+    sched = Schedule()
+    preds = {}
+    dur = {}
+    start = {}
+    min_start = None
+    for r in rows:
+        n = r.get("Project Part", "")
+        preds[n] = [d.strip() for d in (r.get("Dependencies", "") or "").split(",") if d.strip()]
+        try:
+            dur[n] = int(r.get("Duration (days)") or 0)
+        except Exception:
+            dur[n] = 0
+        try:
+            sd = r.get("Start Date", "")
+            start[n] = datetime.datetime.strptime(sd, "%m-%d-%Y") if sd else None
+        except Exception:
+            start[n] = None
+        if start[n] is not None and (min_start is None or start[n] < min_start):
+            min_start = start[n]
+    base = min_start or datetime.datetime.combine(datetime.date.today(), datetime.time())
+    # Successor adjacency built once (dedupe repeated dependency names)
+    succs = {n: [] for n in preds}
+    indeg = {n: 0 for n in preds}
+    for n, ps in preds.items():
+        known = []
+        for p in ps:
+            if p in succs and p != n and p not in known:
+                known.append(p)
+                succs[p].append(n)
+        preds[n] = known
+        indeg[n] = len(known)
+    # Kahn's algorithm keeps row order for ties
+    queue = deque(n for n in preds if indeg[n] == 0)
+    order = []
+    while queue:
+        n = queue.popleft()
+        order.append(n)
+        for s in succs[n]:
+            indeg[s] -= 1
+            if indeg[s] == 0:
+                queue.append(s)
+    es, ef = sched.es, sched.ef
+    for n in order:
+        ps = preds[n]
+        es[n] = max(ef[p] for p in ps) if ps else (start[n] or base)
+        ef[n] = es[n] + datetime.timedelta(days=dur[n])
+    sched.order = order
+    sched.project_finish = max(ef.values()) if ef else base
+    ls, lf = sched.ls, sched.lf
+    for n in reversed(order):
+        ss = succs[n]
+        lf[n] = min(ls[s] for s in ss) if ss else sched.project_finish
+        ls[n] = lf[n] - datetime.timedelta(days=dur[n])
+        sched.total_float[n] = (ls[n] - es[n]).days
+        if sched.total_float[n] <= 0:
+            sched.critical.add(n)
+    # Cyclic leftovers: report their own dates, zero slack information
+    for n in preds:
+        if n not in es:
+            es[n] = ls[n] = start[n] or base
+            ef[n] = lf[n] = es[n] + datetime.timedelta(days=dur[n])
+            sched.total_float[n] = None
+    return sched
 
 # --- Export Settings Dialog (format/page size/orientation/margins) ---
 class ExportSettingsDialog(QDialog):
@@ -308,114 +738,787 @@ class FirstRunDialog(QDialog):
     def hide_future(self):
         return self.chk_hide.isChecked()
 
-class ImageCellWidget(QWidget):
-    def __init__(self, parent, row, col, model, on_data_changed=None):
-        super().__init__(parent)
-        self.row = row
-        self.col = col
-        self.model = model
-        self.on_data_changed = on_data_changed
-        layout = QHBoxLayout()
-        self.img_label = QLabel()
-        self.img_label.setFixedSize(48, 48)
-        layout.addWidget(self.img_label)
-        self.btn = QPushButton("Upload")
-        self.btn.clicked.connect(self.upload_image)
-        layout.addWidget(self.btn)
-        self.setLayout(layout)
-        self.refresh()
+# --- Row indexes (name, parent -> children, dependency -> dependents, ancestors) ---
+class ModelIndex:
+    """Lookup tables over ProjectDataModel.rows. Built in one O(n) pass; ancestor chains are memoized on demand.
+    Only "Project Part", "Parent" and "Dependencies" feed the index, so edits to other fields keep it valid."""
+    STRUCTURAL_FIELDS = ("Project Part", "Parent", "Dependencies")
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.by_name = {}
+        self.children = {}
+        self.dependents = {}
+        self._ancestors = {}
+        for r in rows:
+            self._add(r)
+
+    def _add(self, r):
+        name = r.get("Project Part", "")
+        # First row wins for duplicate names (matches the old linear scans)
+        self.by_name.setdefault(name, r)
+        p = r.get("Parent") or ""
+        if p:
+            self.children.setdefault(p, []).append(r)
+        for d in (r.get("Dependencies", "") or "").split(","):
+            d = d.strip()
+            if d:
+                self.dependents.setdefault(d, []).append(name)
+
+    def ancestors(self, name):
+        """Parent chain for name, nearest first. Stops at missing parents and on cycles."""
+        cached = self._ancestors.get(name)
+        if cached is not None:
+            return cached
+        chain = []
+        seen = {name}
+        row = self.by_name.get(name)
+        p = (row.get("Parent") or "") if row else ""
+        while p and p not in seen:
+            # Reuse a memoized suffix when available
+            rest = self._ancestors.get(p)
+            if rest is not None:
+                chain.append(p)
+                chain.extend(a for a in rest if a not in seen)
+                break
+            chain.append(p)
+            seen.add(p)
+            prow = self.by_name.get(p)
+            if prow is None:
+                break
+            p = prow.get("Parent") or ""
+        result = tuple(chain)
+        self._ancestors[name] = result
+        return result
+
+# --- Cost roll-up ---
+class CostRollup:
+    """Subtree sums of the four cost/price fields for every part, built in one post-order pass.
+    Each row's fields are parsed once; cycles in the Parent chain contribute nothing past the back edge."""
+    FIELDS = ("Production Cost", "Installation Cost", "Production Price", "Installation Price")
+    ZERO = (0.0, 0.0, 0.0, 0.0)
+
+    def __init__(self, rows, children):
+        own = {id(r): tuple(parse_money(r.get(f)) for f in self.FIELDS) for r in rows}
+        self._own = own
+        # Sum over all descendants of a part name (the part itself excluded)
+        self.descendants = desc = {}
+        visiting = set()
+        for r in rows:
+            root = r.get("Project Part", "")
+            if root in desc:
+                continue
+            stack = [(root, False)]
+            while stack:
+                name, expanded = stack.pop()
+                kids = children.get(name, ())
+                if expanded:
+                    pc = ic = pp = ip = 0.0
+                    for c in kids:
+                        o = own.get(id(c), self.ZERO)
+                        d = desc.get(c.get("Project Part", ""), self.ZERO)
+                        pc += o[0] + d[0]; ic += o[1] + d[1]; pp += o[2] + d[2]; ip += o[3] + d[3]
+                    desc[name] = (pc, ic, pp, ip)
+                    continue
+                if name in desc or name in visiting:
+                    continue
+                visiting.add(name)
+                stack.append((name, True))
+                for c in kids:
+                    cn = c.get("Project Part", "")
+                    if cn not in desc and cn not in visiting:
+                        stack.append((cn, False))
+
+    def own(self, row):
+        """(prod cost, inst cost, prod price, inst price) for the row alone."""
+        o = self._own.get(id(row))
+        return o if o is not None else tuple(parse_money(row.get(f)) for f in self.FIELDS)
+
+    def totals(self, row):
+        """The row's own figures plus everything beneath it."""
+        o = self.own(row)
+        d = self.descendants.get(row.get("Project Part", ""), self.ZERO)
+        return (o[0] + d[0], o[1] + d[1], o[2] + d[2], o[3] + d[3])
+
+# --- Pricing what-if ---
+class PricingEngine:
+    """Project-wide version of the edit dialog's price suggestion, evaluated on NumPy arrays.
+    Per part: cost x (1 + contingency) / (1 - risk-adjusted target margin), where a zero Production /
+    Installation Cost is derived from material + fabrication labor / install labor + equipment + permit,
+    and the effective margin is what remains after the warranty reserve."""
+    RISK_ADJ = {"low": -0.02, "high": 0.03}   # margin points added for the part's Risk Level
+    MIN_MARGIN, MAX_MARGIN = 0.01, 0.95
+
+    def __init__(self, rows):
+        import numpy as np
+        def col(field):
+            return np.fromiter((parse_money(r.get(field)) for r in rows), dtype=float, count=len(rows))
+        self.names = [r.get("Project Part", "") for r in rows]
+        pc = col("Production Cost")
+        ic = col("Installation Cost")
+        derived_pc = col("Material Cost") + col("Fabrication Labor Hours") * col("Labor Rate")
+        derived_ic = (col("Installation Labor Hours") * col("Install Labor Rate")
+                      + col("Equipment Cost") + col("Permit/Eng Cost"))
+        self.prod_cost = np.where(pc == 0, derived_pc, pc)
+        self.inst_cost = np.where(ic == 0, derived_ic, ic)
+        self.contingency = col("Contingency %") / 100.0
+        self.warranty = col("Warranty Reserve %") / 100.0
+        self.risk_adj = np.fromiter((self._risk_adj(r.get("Risk Level")) for r in rows), dtype=float, count=len(rows))
+
+    @classmethod
+    def _risk_adj(cls, level):
+        level = str(level or "").lower()
+        for prefix, pts in cls.RISK_ADJ.items():
+            if level.startswith(prefix):
+                return pts
+        return 0.0
+
+    def adjusted_margin(self, target_margin):
+        """Risk-adjusted margin per part; target_margin may be a scalar or an (M, 1) column for sweeps."""
+        import numpy as np
+        t = np.asarray(target_margin, dtype=float)
+        adj = t + self.risk_adj
+        return np.where(self.risk_adj < 0, np.maximum(self.MIN_MARGIN, adj),
+                        np.where(self.risk_adj > 0, np.minimum(self.MAX_MARGIN, adj), adj))
+
+    def suggest(self, target_margin):
+        """dict of per-part arrays: prod/inst suggested price (NaN where that cost is 0), total price,
+        gross profit and effective margin % after the warranty reserve (NaN where there is no price)."""
+        import numpy as np
+        m = self.adjusted_margin(target_margin)
+        factor = (1.0 + self.contingency) / (1.0 - m)
+        prod = np.where(self.prod_cost > 0, self.prod_cost * factor, np.nan)
+        inst = np.where(self.inst_cost > 0, self.inst_cost * factor, np.nan)
+        total = np.nan_to_num(prod) + np.nan_to_num(inst)
+        loaded_cost = (self.prod_cost + self.inst_cost) * (1.0 + self.contingency)
+        gross = total - loaded_cost
+        eff = gross - total * self.warranty
+        with np.errstate(divide='ignore', invalid='ignore'):
+            eff_margin = np.where(total > 0, eff / total * 100.0, np.nan)
+        return {"prod": prod, "inst": inst, "total": total, "loaded_cost": loaded_cost,
+                "gross": gross, "effective": eff, "effective_margin": eff_margin}
+
+    def sweep(self, margins):
+        """Sensitivity of project totals to the target margin. margins: fractions (e.g. 0.10..0.40).
+        Returns a list of dicts, one per margin, computed in a single (margins x parts) broadcast."""
+        import numpy as np
+        ms = np.asarray(margins, dtype=float).reshape(-1, 1)
+        r = self.suggest(ms)
+        price = r["total"].sum(axis=1)
+        cost = np.where(r["total"] > 0, r["loaded_cost"], 0.0).sum(axis=1)
+        reserve = (r["total"] * self.warranty).sum(axis=1)
+        eff = price - cost - reserve
+        out = []
+        for i, m in enumerate(ms[:, 0]):
+            out.append({
+                "target_margin": float(m) * 100.0,
+                "price": float(price[i]),
+                "cost": float(cost[i]),
+                "gross_profit": float(price[i] - cost[i]),
+                "reserve": float(reserve[i]),
+                "effective_profit": float(eff[i]),
+                "effective_margin": float(eff[i] / price[i] * 100.0) if price[i] > 0 else 0.0,
+            })
+        return out
 
-    def upload_image(self):
-        fname, _ = QFileDialog.getOpenFileName(self, "Select Image", "", "Image Files (*.png *.jpg *.jpeg *.bmp *.gif)")
-        if fname:
-            # Store images next to the executable/script so packaged app can load them
-            base_dir = os.path.dirname(resolve_resource_path("."))
-            images_dir = os.path.join(base_dir, "images")
-            if not os.path.exists(images_dir):
-                os.makedirs(images_dir)
-            base = os.path.basename(fname)
-            dest = os.path.join(images_dir, base)
-            count = 1
-            orig_base, ext = os.path.splitext(base)
-            while os.path.exists(dest):
-                dest = os.path.join(images_dir, f"{orig_base}_{count}{ext}")
-                count += 1
-            shutil.copy2(fname, dest)
-            rel_path = os.path.relpath(dest, base_dir)
-            self.model.rows[self.row][self.model.COLUMNS[self.col]] = rel_path
-            self.model.save_to_db()
-            self.refresh()
+# --- Model change events ---
+class ModelEvent:
+    """Typed change notification delivered to ProjectDataModel.subscribe() listeners.
+    parts: affected part names; changes: {part: {field: (old, new)}} for field edits."""
+    ROWS_INSERTED = "rows_inserted"
+    ROWS_REMOVED = "rows_removed"
+    FIELDS_CHANGED = "fields_changed"
+    HIERARCHY_MOVED = "hierarchy_moved"   # Parent changed (changes holds the old/new parent)
+    RELOADED = "reloaded"                 # bulk replace; listeners should rebuild
+    __slots__ = ("kind", "parts", "changes")
+
+    def __init__(self, kind, parts=(), changes=None):
+        self.kind = kind
+        self.parts = list(parts)
+        self.changes = changes or {}
+
+    @property
+    def structural(self):
+        """True when the hierarchy, names, dependencies or the row set changed."""
+        if self.kind != self.FIELDS_CHANGED:
+            return True
+        return any(f in ModelIndex.STRUCTURAL_FIELDS for fields in self.changes.values() for f in fields)
+
+    def __repr__(self):
+        return f"ModelEvent({self.kind}, {self.parts})"
+
+
+# --- Background database work ---
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QCoreApplication, pyqtSignal
+
+
+class DbCancelled(Exception):
+    """Raised inside a DbWorker job once its DbJob has been cancelled."""
 
-    def refresh(self):
-        img_path = self.model.rows[self.row].get(self.model.COLUMNS[self.col], "")
-        if img_path:
-            img_path_full = resolve_resource_path(img_path)
 
-            pixmap = QPixmap(img_path_full)
-            if not pixmap.isNull():
-                self.img_label.setPixmap(pixmap.scaled(48, 48, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-                self.img_label.setCursor(Qt.PointingHandCursor)
-                self.img_label.mousePressEvent = lambda event: self.show_full_image(img_path_full)
+class DbJob:
+    """Handle for one unit of work queued on a DbWorker."""
+    def __init__(self, fn, on_done=None, on_error=None, label="", cancellable=False):
+        import threading
+        self.fn = fn
+        self.on_done = on_done
+        self.on_error = on_error
+        self.label = label
+        self.cancellable = cancellable
+        self._cancel = threading.Event()
+        self._worker = None
+
+    def cancel(self):
+        if self.cancellable:
+            self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check(self):
+        """Call between batches of work; raises DbCancelled when cancel() was requested."""
+        if self._cancel.is_set():
+            raise DbCancelled(self.label)
+
+    def report(self, done, total):
+        """Progress from inside the job (any thread); delivered through DbWorker.progress."""
+        if self._worker is not None:
+            self._worker.progress.emit(self, int(done), int(total))
+
+
+class _DbRunnable(QRunnable):
+    def __init__(self, worker, job):
+        super().__init__()
+        self._worker = worker
+        self._job = job
+
+    def run(self):
+        self._worker._run(self._job)
+
+
+class DbWorker(QObject):
+    """Runs SQLite work on a single background thread, in submission order, so queued edits reach the
+    database in the order they were made and network-share latency never blocks the GUI.
+    Jobs share the model's DbConnections (one writer serialized by its lock, pooled readers), so a
+    GUI-thread write waits on any job holding the writer; results, errors and progress come back as
+    signals and the on_done/on_error callbacks run on the GUI thread. Without a Qt application jobs
+    run inline."""
+    jobFinished = pyqtSignal(object, object)   # job, result
+    jobFailed = pyqtSignal(object, object)     # job, exception
+    progress = pyqtSignal(object, int, int)    # job, done, total
+    busyChanged = pyqtSignal(bool, str)        # busy, label of the oldest unfinished job
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._jobs = []  # unfinished jobs, oldest first (GUI thread only)
+        self.jobFinished.connect(self._on_finished)
+        self.jobFailed.connect(self._on_failed)
+
+    @property
+    def busy(self):
+        return bool(self._jobs)
+
+    @property
+    def current_job(self):
+        return self._jobs[0] if self._jobs else None
+
+    def submit(self, fn, on_done=None, on_error=None, label="", cancellable=False):
+        """Queue fn(job) and return its DbJob."""
+        job = DbJob(fn, on_done, on_error, label, cancellable)
+        job._worker = self
+        if QCoreApplication.instance() is None:
+            try:
+                result = fn(job)
+            except Exception as e:
+                self._deliver_error(job, e)
             else:
-                self.img_label.setText("[Image not found]")
-                self.img_label.setCursor(Qt.ArrowCursor)
-                self.img_label.mousePressEvent = None
+                if on_done is not None:
+                    on_done(result)
+            return job
+        self._jobs.append(job)
+        if len(self._jobs) == 1:
+            self.busyChanged.emit(True, label)
+        self._pool.start(_DbRunnable(self, job))
+        return job
+
+    def cancel_all(self):
+        for job in list(self._jobs):
+            job.cancel()
+
+    def wait_idle(self, timeout_ms=30000):
+        """Block until queued jobs have run and their callbacks were delivered (shutdown, DB switch, tests)."""
+        import time
+        deadline = time.monotonic() + timeout_ms / 1000.0
+        while True:
+            left = max(0, int((deadline - time.monotonic()) * 1000))
+            done = self._pool.waitForDone(left)
+            QCoreApplication.sendPostedEvents()  # deliver the queued result signals
+            # Result handlers may queue follow-up jobs
+            if not done or not self._jobs or time.monotonic() >= deadline:
+                return done and not self._jobs
+
+    def _run(self, job):
+        # Worker thread
+        try:
+            job.check()
+            result = job.fn(job)
+        except Exception as e:
+            self.jobFailed.emit(job, e)
         else:
-            self.img_label.setText("")
-            self.img_label.setCursor(Qt.ArrowCursor)
-            self.img_label.mousePressEvent = None
+            self.jobFinished.emit(job, result)
 
-    def show_full_image(self, img_path_full):
-        dlg = QDialog(self)
-        dlg.setWindowTitle("Image Preview")
-        vbox = QVBoxLayout(dlg)
-        lbl = QLabel()
-        pixmap = QPixmap(img_path_full)
-        if not pixmap.isNull():
-            lbl.setPixmap(pixmap.scaledToWidth(600, Qt.SmoothTransformation))
+    def _finish(self, job):
+        try:
+            self._jobs.remove(job)
+        except ValueError:
+            pass
+        if self._jobs:
+            self.busyChanged.emit(True, self._jobs[0].label)
         else:
-            lbl.setText("[Image not found]")
-        vbox.addWidget(lbl)
-        dlg.setLayout(vbox)
-        dlg.exec_()
+            self.busyChanged.emit(False, "")
+
+    def _on_finished(self, job, result):
+        self._finish(job)
+        if job.on_done is not None:
+            try:
+                job.on_done(result)
+            except Exception as e:
+                print(f"DB job '{job.label}' result handler failed: {e}")
+
+    def _on_failed(self, job, error):
+        self._finish(job)
+        self._deliver_error(job, error)
+
+    def _deliver_error(self, job, error):
+        if isinstance(error, DbCancelled):
+            try: log_event('db', 'job_cancelled', label=job.label)
+            except Exception: pass
+        else:
+            try: log_event('db', 'job_failed', label=job.label, error=str(error))
+            except Exception: pass
+        if job.on_error is not None:
+            try:
+                job.on_error(error)
+            except Exception as e:
+                print(f"DB job '{job.label}' error handler failed: {e}")
+        elif not isinstance(error, DbCancelled):
+            print(f"DB job '{job.label}' failed: {error}")
+
+
+class DbConnections:
+    """Long-lived SQLite connections for one database file: a single writer (serialized by a lock, so
+    the GUI thread and the DbWorker never interleave transactions) and a small pool of readers.
+    PRAGMAs are applied once per connection, and each connection keeps sqlite3's statement cache warm
+    for the fixed SQL the model issues. Column metadata is cached until the schema is changed."""
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA busy_timeout=5000",
+        "PRAGMA foreign_keys=ON",
+    )
+
+    def __init__(self, path, max_readers=2):
+        import threading
+        self.path = path
+        self.max_readers = max_readers
+        self._writer = None
+        self._write_lock = threading.RLock()
+        self._idle_readers = []
+        self._readers_lock = threading.Lock()
+        self._columns = {}
+        self._closed = False
+
+    def _open(self):
+        import os
+        import sqlite3
+        # Ensure parent exists (defensive guard for scenarios where DB path dir was missing)
+        try:
+            db_dir = os.path.dirname(os.path.abspath(self.path))
+            if db_dir and not os.path.exists(db_dir):
+                os.makedirs(db_dir, exist_ok=True)
+        except Exception:
+            pass
+        # check_same_thread=False: connections are handed between the GUI thread and the DB worker
+        conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, cached_statements=256)
+        try:
+            for pragma in self.PRAGMAS:
+                conn.execute(pragma)
+            conn.commit()
+        except Exception:
+            pass
+        return conn
+
+    @staticmethod
+    def _end(conn, failed):
+        # Leave the connection idle for its next user, as closing a short-lived one used to
+        if conn.in_transaction:
+            if failed:
+                conn.rollback()
+            else:
+                conn.commit()
+
+    def writer(self):
+        """Context manager yielding the writer connection; commits on success, rolls back on error."""
+        import contextlib
+        @contextlib.contextmanager
+        def lease():
+            with self._write_lock:
+                if self._writer is None:
+                    self._writer = self._open()
+                conn = self._writer
+                try:
+                    yield conn
+                except BaseException:
+                    self._end(conn, True)
+                    raise
+                self._end(conn, False)
+        return lease()
+
+    def reader(self):
+        """Context manager yielding a pooled connection for queries."""
+        import contextlib
+        @contextlib.contextmanager
+        def lease():
+            with self._readers_lock:
+                conn = self._idle_readers.pop() if self._idle_readers else None
+            if conn is None:
+                conn = self._open()
+            failed = True
+            try:
+                yield conn
+                failed = False
+            finally:
+                self._end(conn, failed)
+                with self._readers_lock:
+                    keep = not self._closed and len(self._idle_readers) < self.max_readers
+                    if keep:
+                        self._idle_readers.append(conn)
+                if not keep:
+                    conn.close()
+        return lease()
+
+    def columns(self, conn, table="project_parts"):
+        """Column names of table, read with PRAGMA table_info once and then served from the cache."""
+        cols = self._columns.get(table)
+        if cols is None:
+            try:
+                cols = tuple(r[1] for r in conn.execute(f"PRAGMA table_info({table})").fetchall())
+            except Exception:
+                return ()
+            if cols:
+                self._columns[table] = cols
+        return cols
+
+    def invalidate_columns(self):
+        self._columns.clear()
+
+    def close(self):
+        """Close every connection (DB file switched or app exiting). A writer lease in progress is
+        waited for; readers still leased are closed when they are handed back."""
+        with self._readers_lock:
+            self._closed = True
+            idle, self._idle_readers = self._idle_readers, []
+        for conn in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        with self._write_lock:
+            if self._writer is not None:
+                try:
+                    self._writer.close()
+                except Exception:
+                    pass
+                self._writer = None
+
+
+# --- Shared-folder change detection ---
+from PyQt5.QtCore import QThread, pyqtSlot
+
+
+def _file_signature(path):
+    import os
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _is_network_path(path):
+    """Best effort: UNC paths, mapped network drives and network file systems, where change
+    notifications are missing or late."""
+    import os, sys
+    p = os.path.abspath(path)
+    if p.startswith('\\\\') or p.startswith('//'):
+        return True
+    if sys.platform.startswith('win'):
+        try:
+            import ctypes
+            return ctypes.windll.kernel32.GetDriveTypeW(os.path.splitdrive(p)[0] + '\\') == 4  # DRIVE_REMOTE
+        except Exception:
+            return False
+    try:
+        mount, fstype = '', ''
+        with open('/proc/mounts', encoding='utf-8') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 3 and len(parts[1]) >= len(mount) and (p == parts[1] or p.startswith(parts[1].rstrip('/') + '/')):
+                    mount, fstype = parts[1], parts[2]
+        return fstype in ('nfs', 'nfs4', 'cifs', 'smbfs', 'smb3', 'fuse.sshfs', '9p', 'afs')
+    except Exception:
+        return False
+
+
+class _DbFileProbe(QObject):
+    """DbChangeWatcher's worker. Lives on the watcher thread with its QFileSystemWatcher and timers."""
+    changed = pyqtSignal(bool, bool)
+    codeChanged = pyqtSignal(float)
+    modeChanged = pyqtSignal(bool)
+
+    def __init__(self, watcher):
+        super().__init__()
+        self.debounce_ms = watcher.DEBOUNCE_MS
+        self.max_poll_ms = watcher.MAX_POLL_MS
+        self.code_check_ms = watcher.CODE_CHECK_MS
+        self._code_probe = watcher.code_probe
+        self._db_path = ""
+        self._poll_ms = 2000
+        self._interval = 0
+        self._force_poll = False
+        self._missed_events = False
+        self._reliable = False
+        self._db_sig = self._lock_sig = None
+        self._code_mtime = None
+        self._fs = self._debounce = self._poll = self._code_timer = None
+
+    @pyqtSlot()
+    def start(self):
+        from PyQt5.QtCore import QFileSystemWatcher, QTimer
+        self._fs = QFileSystemWatcher(self)
+        self._fs.fileChanged.connect(self._on_fs_event)
+        self._fs.directoryChanged.connect(self._on_fs_event)
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(self.debounce_ms)
+        self._debounce.timeout.connect(lambda: self._scan(True))
+        self._poll = QTimer(self)
+        self._poll.setSingleShot(True)
+        self._poll.timeout.connect(lambda: self._scan(False))
+        self._code_timer = QTimer(self)
+        self._code_timer.setInterval(self.code_check_ms)
+        self._code_timer.timeout.connect(self._check_code)
+        if self._code_probe is not None:
+            self._code_timer.start()
+
+    @pyqtSlot(str, int, bool)
+    def configure(self, db_path, poll_ms, force_poll):
+        self._poll_ms = max(250, int(poll_ms))
+        self._force_poll = bool(force_poll)
+        if db_path != self._db_path:
+            self._db_path = db_path
+            self._missed_events = False
+            self._db_sig, self._lock_sig = self._signatures()
+        self._rewatch()
+        self._schedule_poll(reset=True)
+
+    @pyqtSlot()
+    def shutdown(self):
+        for t in (self._debounce, self._poll, self._code_timer):
+            if t is not None:
+                t.stop()
+        QThread.currentThread().quit()
+
+    def _paths(self):
+        db = self._db_path
+        return [db, db + '-wal', db + '-shm'], db + '.lock.json'
+
+    def _signatures(self):
+        files, lock = self._paths()
+        return tuple(_file_signature(p) for p in files), _file_signature(lock)
+
+    def _rewatch(self):
+        # Sync clients replace files (write temp, rename), which drops their watch, and the lock file and
+        # WAL come and go: watch the folder as well and re-add whichever files exist after every event.
+        import os
+        if self._fs is None or not self._db_path:
+            return
+        files, lock = self._paths()
+        folder = os.path.dirname(self._db_path) or '.'
+        wanted = [folder] + [p for p in files + [lock] if os.path.exists(p)]
+        watched = set(self._fs.files()) | set(self._fs.directories())
+        stale = [p for p in watched if p not in wanted]
+        if stale:
+            self._fs.removePaths(stale)
+        missing = [p for p in wanted if p not in watched]
+        if missing:
+            self._fs.addPaths(missing)
+        reliable = (not self._force_poll and not self._missed_events
+                    and folder in self._fs.directories() and not _is_network_path(folder))
+        self._set_reliable(reliable)
+
+    def _set_reliable(self, reliable):
+        if reliable != self._reliable:
+            self._reliable = reliable
+            self.modeChanged.emit(reliable)
+
+    def _schedule_poll(self, reset=False):
+        # Trusted file events: a slow safety-net poll. Otherwise poll at the configured interval,
+        # doubling after each quiet poll up to max_poll_ms, and back to the interval after a change.
+        if self._poll is None:
+            return
+        if self._reliable:
+            self._interval = self.max_poll_ms
+        elif reset or not self._interval:
+            self._interval = self._poll_ms
+        else:
+            self._interval = min(self.max_poll_ms, self._interval * 2)
+        self._poll.start(self._interval)
+
+    def _on_fs_event(self, path):
+        self._rewatch()
+        self._debounce.start()  # restarts: a burst of writes to the db, -wal, -shm and lock is one scan
+
+    def _scan(self, from_event):
+        if not from_event and self._debounce.isActive():
+            self._schedule_poll()
+            return
+        db_sig, lock_sig = self._signatures()
+        db_changed, lock_changed = db_sig != self._db_sig, lock_sig != self._lock_sig
+        self._db_sig, self._lock_sig = db_sig, lock_sig
+        if db_changed or lock_changed:
+            if not from_event and self._reliable:
+                # A poll saw a change that no file event reported: stop trusting events for this folder
+                self._missed_events = True
+            self._rewatch()
+            self.changed.emit(db_changed, lock_changed)
+        self._schedule_poll(reset=db_changed or lock_changed)
+
+    def _check_code(self):
+        try:
+            m = self._code_probe()
+        except Exception:
+            return
+        if m and m != self._code_mtime:
+            self._code_mtime = m
+            self.codeChanged.emit(m)
+
+
+class DbChangeWatcher(QObject):
+    """Watches a database file, its -wal/-shm sidecars and its .lock.json edit lock from a background
+    thread and emits changed(db_changed, lock_changed) once per burst of writes.
+
+    File system notifications (QFileSystemWatcher: inotify, FSEvents, ReadDirectoryChangesW) are
+    debounced by DEBOUNCE_MS. On network shares, or once a poll catches a change no notification
+    reported, it falls back to polling with backoff (poll_ms doubling up to MAX_POLL_MS while nothing
+    changes). Only stat() calls are made; reading the lock file is left to the receiver.
+    An optional code_probe callable is also run every CODE_CHECK_MS and reported via codeChanged."""
+    DEBOUNCE_MS = 250
+    MAX_POLL_MS = 15000
+    CODE_CHECK_MS = 10000
+    changed = pyqtSignal(bool, bool)   # db_changed, lock_changed
+    codeChanged = pyqtSignal(float)    # newest code_probe() result
+    modeChanged = pyqtSignal(bool)     # True while relying on file events, False while polling
+    _configure = pyqtSignal(str, int, bool)
+    _shutdown = pyqtSignal()
+
+    def __init__(self, db_path, poll_ms=2000, force_poll=False, code_probe=None, parent=None):
+        super().__init__(parent)
+        import os, atexit, weakref
+        self.code_probe = code_probe
+        self.watching = False
+        self._db_path = os.path.abspath(db_path)
+        self._poll_ms = int(poll_ms)
+        self._force_poll = bool(force_poll)
+        self._thread = QThread()
+        self._thread.setObjectName('db-change-watcher')
+        self._probe = _DbFileProbe(self)
+        self._probe.moveToThread(self._thread)
+        self._thread.started.connect(self._probe.start)
+        self._thread.finished.connect(self._probe.deleteLater)
+        self._configure.connect(self._probe.configure)
+        self._shutdown.connect(self._probe.shutdown)
+        self._probe.changed.connect(self.changed)
+        self._probe.codeChanged.connect(self.codeChanged)
+        self._probe.modeChanged.connect(self._on_mode)
+        # A QThread destroyed while running aborts the process
+        ref = weakref.ref(self)
+        def stop_at_exit():
+            try:
+                if ref() is not None:
+                    ref().stop()
+            except Exception:
+                pass
+        atexit.register(stop_at_exit)
+
+    @property
+    def db_path(self):
+        return self._db_path
+
+    def start(self):
+        if self._thread.isRunning() or self._probe is None:
+            return
+        self._thread.start()
+        self._configure.emit(self._db_path, self._poll_ms, self._force_poll)
+
+    def stop(self, timeout_ms=3000):
+        if self._thread.isRunning():
+            self._shutdown.emit()
+            self._thread.wait(timeout_ms)
+            self._probe = None
+
+    def set_db_path(self, db_path):
+        """Follow a switched database; the new files become the baseline (no change is reported)."""
+        import os
+        self._db_path = os.path.abspath(db_path)
+        self._configure.emit(self._db_path, self._poll_ms, self._force_poll)
+
+    def set_poll_interval(self, poll_ms, force_poll=None):
+        self._poll_ms = int(poll_ms)
+        if force_poll is not None:
+            self._force_poll = bool(force_poll)
+        self._configure.emit(self._db_path, self._poll_ms, self._force_poll)
+
+    def _on_mode(self, watching):
+        self.watching = watching
+        try:
+            log_event('sync', 'watch_mode', mode='events' if watching else 'polling', db=self._db_path)
+        except Exception:
+            pass
+
 
 class ProjectDataModel:
-    # NOTE: Append-only pattern; new progress-related columns added at end to avoid breaking older rows
-    COLUMNS = [
-        "Project Part", "Parent", "Children", "Start Date", "Duration (days)", "Internal/External", "Dependencies", "Type", "Calculated End Date", "Resources", "Notes", "Responsible", "Images", "Pace Link", "Attachments",
-        # Progress tracking fields
-        "% Complete",            # Integer 0-100 (leaf editable, parents rolled up)
-        "Status",                 # Planned | In Progress | Blocked | Done | Deferred
-        "Actual Start Date",      # Set when Status transitions to In Progress
-        "Actual Finish Date",     # Set when Status transitions to Done
-        "Baseline Start Date",    # Captured first time valid start/duration appear
-        "Baseline End Date",      # Derived from baseline start + duration (working days not yet applied)
-        # Cost tracking fields
-        "Production Cost",        # Internal estimated production cost (materials + fabrication labor)
-        "Installation Cost",      # Internal estimated install cost (crew labor + equipment)
-        "Production Price",       # Decimal number (price to be charged for production)
-        "Installation Price",     # Decimal number (price to be charged for installation)
-        # Extended cost breakdown (append-only)
-        "Material Cost",          # Materials-only direct cost
-        "Fabrication Labor Hours",# Hours for shop fabrication
-        "Installation Labor Hours",# Hours for field install
-        "Labor Rate",             # Default blended labor rate (can be overridden per row)
-        "Install Labor Rate"      # Field install labor rate
-        ,"Equipment Cost"         # Lift / crane / equipment rental cost
-        ,"Permit/Eng Cost"        # Permitting or engineering fees
-        ,"Contingency %"          # Applied percentage buffer (on cost basis)
-        ,"Warranty Reserve %"     # Percentage of price allocated to warranty reserve
-        ,"Risk Level"             # Low | Medium | High affects margin target (future)
-        ,"Quote Version"          # Current working quote version label
-        ,"Frozen Production Cost" # Snapshot baseline cost
-        ,"Frozen Installation Cost"
-        ,"Frozen Production Price"
-        ,"Frozen Installation Price"
-    ]
+    # Append-only column list, shared with cli.py through project_io
+    COLUMNS = list(PROJECT_COLUMNS)
     DB_FILE = "project_data.db"
 
     def __init__(self):
         self.rows = []  # Each row is a dict with keys as COLUMNS
+        # Last persisted state per part (see _snapshot_saved_state); None forces a full rewrite
+        self._saved_state = None
+        self._saved_order = []
+        self._saved_db = None
+        # Bumped whenever rows change; derived results (schedule, ...) are cached against it
+        self.data_version = 0
+        self._schedule_cache = None
+        self._cost_rollup_cache = None
+        self._pricing_cache = None
+        from collections import OrderedDict
+        self._quote_delta_cache = OrderedDict()  # LRU of quote_version_delta_map results
+        self._index = None  # ModelIndex, tagged with the data_version it was built for
+        self._index_version = -1
+        self._listeners = []        # callables taking a ModelEvent
+        self._batch_depth = 0
+        self._pending_events = []
+        # Background I/O: the DbWorker (created on first use) and the queued save / update bookkeeping
+        self._db_worker = None
+        self._save_queued = False       # a coalesced save_async is waiting for the event loop
+        self._save_held = False         # ... or for queued updates to come back first
+        self._inflight_updates = {}     # part -> queued update_part_values_async calls not yet back
+        self._written_versions = {}     # part -> row_version the worker last wrote (worker thread only)
         # collaborative mode: prevent writes on viewer machines (persisted via QSettings)
         try:
             from PyQt5.QtCore import QSettings
@@ -503,31 +1606,30 @@ class ProjectDataModel:
             traceback.print_exc()
             raise
 
+    def _db(self):
+        """DbConnections for the current DB_FILE; switching DB_FILE closes the old file's connections."""
+        pool = getattr(self, '_db_pool', None)
+        if pool is None or pool.path != self.DB_FILE:
+            if pool is not None:
+                pool.close()
+            pool = self._db_pool = DbConnections(self.DB_FILE)
+        return pool
+
     def _connect(self):
-        """Return an sqlite3 connection with WAL, busy timeout and slightly safer cache settings.
+        """Lease the writer connection (WAL, busy timeout and slightly safer cache settings) for a `with` block.
         For network drives like OneDrive/SharePoint, WAL reduces lock contention but conflicts can still occur.
         """
-        import sqlite3
-        # Ensure parent exists (defensive guard for scenarios where DB path dir was missing)
-        try:
-            import os
-            db_dir = os.path.dirname(os.path.abspath(self.DB_FILE))
-            if db_dir and not os.path.exists(db_dir):
-                os.makedirs(db_dir, exist_ok=True)
-        except Exception:
-            pass
-        # Use check_same_thread=False to allow background UI operations if needed (Qt timers)
-        conn = sqlite3.connect(self.DB_FILE, timeout=5.0, check_same_thread=False)
-        try:
-            cur = conn.cursor()
-            cur.execute("PRAGMA journal_mode=WAL")
-            cur.execute("PRAGMA synchronous=NORMAL")
-            cur.execute("PRAGMA busy_timeout=5000")
-            cur.execute("PRAGMA foreign_keys=ON")
-            conn.commit()
-        except Exception:
-            pass
-        return conn
+        return self._db().writer()
+
+    def _read(self):
+        """Lease a pooled reader connection for a `with` block of queries."""
+        return self._db().reader()
+
+    def close_connections(self):
+        pool = getattr(self, '_db_pool', None)
+        if pool is not None:
+            pool.close()
+            self._db_pool = None
 
     # --- Schema migration to add progress columns if missing ---
     def ensure_schema(self):
@@ -539,18 +1641,16 @@ class ProjectDataModel:
             except Exception:
                 pass
             return
+        db = self._db()
         with self._connect() as conn:
             c = conn.cursor()
-            # Inspect existing columns
+            # Inspect existing columns (fresh, this may be another file or an older app's schema)
+            db.invalidate_columns()
+            existing = list(db.columns(conn))
             try:
-                c.execute("PRAGMA table_info(project_parts)")
-                existing = [row[1] for row in c.fetchall()]  # name in 2nd column
-                try:
-                    log_event('schema','existing_columns', count=len(existing))
-                except Exception:
-                    pass
+                log_event('schema','existing_columns', count=len(existing))
             except Exception:
-                existing = []
+                pass
             to_add = [col for col in self.COLUMNS if col not in existing]
             for col in to_add:
                 # Decide type based on semantic
@@ -611,6 +1711,8 @@ class ProjectDataModel:
                     )
                     """
                 )
+                # The primary key covers per-version scans; this one serves part-keyed joins across versions
+                c.execute("CREATE INDEX IF NOT EXISTS idx_quote_versions_part ON quote_versions(part_name, version_name)")
             except Exception:
                 pass
             # Changes audit log table
@@ -631,6 +1733,7 @@ class ProjectDataModel:
             except Exception:
                 pass
             conn.commit()
+        db.invalidate_columns()  # re-read on first use after the ALTERs
         try:
             log_event('schema','ensure_schema_complete', added=to_add, has_row_version=('row_version' in existing), has_last_modified=('last_modified_utc' in existing))
         except Exception:
@@ -640,39 +1743,118 @@ class ProjectDataModel:
         row = {col: val for col, val in zip(self.COLUMNS, data)}
         row['Parent'] = parent
         self.rows.append(row)
+        idx_current = self._index is not None and self._index_version == self.data_version
+        self.bump_data_version()
+        if idx_current and row.get("Project Part", "") not in self._index.by_name:
+            # Appending a fresh part only adds entries; earlier ancestor chains stay valid
+            self._index._add(row)
+            self._index_version = self.data_version
+        self._emit(ModelEvent(ModelEvent.ROWS_INSERTED, [row.get("Project Part", "")]))
         return len(self.rows) - 1
 
     def update_row(self, idx, data):
         # Legacy in-memory update (used before persistence commit); does not apply concurrency logic.
+        row = self.rows[idx]
+        changes = {col: (row.get(col), data[i]) for i, col in enumerate(self.COLUMNS) if row.get(col) != data[i]}
         for i, col in enumerate(self.COLUMNS):
-            self.rows[idx][col] = data[i]
+            row[col] = data[i]
+        self.bump_data_version()
+        if changes:
+            self._emit_field_changes({row.get("Project Part", ""): changes})
 
     def update_part_values(self, part_name: str, new_values: dict, expected_version: int):
         """Optimistic concurrency update by Project Part name.
         new_values: dict of column->value (must be subset of self.COLUMNS)
         expected_version: caller's last known row_version
         Returns (True, new_version) on success; (False, reason) on conflict/error."""
-        import datetime, os
+        valid = self._valid_part_values(part_name, new_values)
+        if not isinstance(valid, dict):
+            return valid
+        return self._apply_part_values(part_name, valid, self._write_part_values(part_name, valid, expected_version))
+
+    def update_part_values_async(self, part_name: str, new_values: dict, expected_version: int, callback=None):
+        """update_part_values on the DB worker; callback(ok, info) runs on the GUI thread afterwards.
+        The values are shown in the in-memory row right away; if the write fails or conflicts they are
+        put back (unless edited again since) before callback runs. Updates to a part that is still
+        waiting on an earlier queued update expect the version that update writes, so quick successive
+        edits of one row do not conflict with themselves."""
+        valid = self._valid_part_values(part_name, new_values)
+        if not isinstance(valid, dict):
+            if callback is not None:
+                callback(*valid)
+            return None
+        # A rename would move the row's key under the queued write, so it is applied once confirmed
+        shown = {k: v for k, v in valid.items() if k != 'Project Part'}
+        row = self.row_by_name(part_name)
+        previous = {k: row.get(k) for k in shown} if row is not None else {}
+        self.set_part_fields(part_name, shown)
+        inflight = self._inflight_updates
+        written = self._written_versions
+        chained = inflight.get(part_name, 0) > 0
+        inflight[part_name] = inflight.get(part_name, 0) + 1
+        def work(job):
+            expected = written.get(part_name, expected_version) if chained else expected_version
+            res = self._write_part_values(part_name, valid, expected)
+            if res[0]:
+                written[part_name] = res[1]
+            return res
+        def settle():
+            left = inflight.get(part_name, 1) - 1
+            if left > 0:
+                inflight[part_name] = left
+            else:
+                inflight.pop(part_name, None)
+        def rollback():
+            r = self.row_by_name(part_name)
+            if r is not None:
+                self.set_part_fields(part_name, {k: previous[k] for k in previous if r.get(k) == shown[k]})
+        def done(res):
+            settle()
+            # The write and whatever the caller re-derives from it go out as one notification
+            with self.batch():
+                if not res[0]:
+                    rollback()
+                ok, info = self._apply_part_values(part_name, valid, res, applied=shown)
+                if callback is not None:
+                    callback(ok, info)
+            self._release_held_save()
+        def failed(e):
+            settle()
+            with self.batch():
+                rollback()
+                if callback is not None:
+                    callback(False, str(e))
+            self._release_held_save()
+        return self.db_worker().submit(work, on_done=done, on_error=failed, label=f"Updating {part_name}")
+
+    def _valid_part_values(self, part_name, new_values):
+        """Columns of new_values that may be written, or a (False, reason) tuple."""
         if not part_name or not new_values:
             try: log_event('concurrency','update_invalid_params', part=part_name)
             except Exception: pass
             return False, "Invalid parameters"
-        if not os.path.exists(self.DB_FILE):
-            try: log_event('concurrency','update_db_missing', part=part_name)
-            except Exception: pass
-            return False, "DB missing"
         # Sanitize keys
         valid = {k: v for k, v in new_values.items() if k in self.COLUMNS}
         if not valid:
             try: log_event('concurrency','update_no_valid_fields', part=part_name)
             except Exception: pass
             return False, "No valid fields"
+        return valid
+
+    def _write_part_values(self, part_name, valid, expected_version):
+        """SQL half of update_part_values (safe on the DB worker).
+        Returns (True, new_version, modified_utc) or (False, reason, None)."""
+        import datetime, os
+        if not os.path.exists(self.DB_FILE):
+            try: log_event('concurrency','update_db_missing', part=part_name)
+            except Exception: pass
+            return False, "DB missing", None
         # Build SQL
         set_fragments = []
         params = []
-        for k, v in valid.items():
+        for k in sorted(valid):  # stable statement text per field set, so the statement cache hits
             set_fragments.append(f'"{k}"=?')
-            params.append(v)
+            params.append(valid[k])
         set_fragments.append('last_modified_utc=?')
         now_iso = datetime.datetime.utcnow().isoformat(timespec='seconds')
         params.append(now_iso)
@@ -687,32 +1869,57 @@ class ProjectDataModel:
                 if cur.rowcount == 0:
                     try: log_event('concurrency','conflict', part=part_name, expected=expected_version)
                     except Exception: pass
-                    return False, "Conflict"
-                # Fetch new version
-                cur.execute('SELECT row_version FROM project_parts WHERE "Project Part"=?', (part_name,))
-                new_ver = cur.fetchone()[0]
+                    return False, "Conflict", None
+                # Only rows at expected_version matched, and each was bumped by one
+                new_ver = int(expected_version) + 1
                 conn.commit()
-            # Update in-memory copy
-            for r in self.rows:
-                if r.get('Project Part') == part_name:
-                    r.update(valid)
-                    r['row_version'] = new_ver
-                    r['last_modified_utc'] = now_iso
-                    break
             try: log_event('concurrency','update_success', part=part_name, new_version=new_ver, fields=list(valid.keys()))
             except Exception: pass
-            return True, new_ver
+            return True, new_ver, now_iso
         except Exception as e:
             try: log_event('concurrency','update_exception', part=part_name, error=str(e))
             except Exception: pass
-            return False, str(e)
+            return False, str(e), None
+
+    def _apply_part_values(self, part_name, valid, result, applied=()):
+        """GUI-thread half of update_part_values: mirror a successful write into the in-memory row.
+        Fields in applied were already shown optimistically and are not copied again, so a newer
+        local edit of them survives the confirmation of an older write."""
+        ok, info, now_iso = result
+        if not ok:
+            return False, info
+        new_ver = info
+        r = self.row_by_name(part_name)
+        changes = {}
+        if r is not None:
+            pending = {k: v for k, v in valid.items() if k not in applied}
+            changes = {k: (r.get(k), v) for k, v in pending.items() if r.get(k) != v}
+            r.update(pending)
+            r['row_version'] = new_ver
+            r['last_modified_utc'] = now_iso
+            # The DB row now has these fields and version; other unsaved edits of the row stay pending
+            if self._saved_state is not None and part_name in self._saved_state:
+                st = list(self._saved_state[part_name])
+                for k, v in valid.items():
+                    st[self.COLUMNS.index(k)] = v
+                st[-2:] = [new_ver, now_iso]
+                self._saved_state[part_name] = tuple(st)
+        idx_current = self._index is not None and self._index_version == self.data_version
+        self.bump_data_version()
+        if idx_current and not any(k in ModelIndex.STRUCTURAL_FIELDS for k in valid):
+            self._index_version = self.data_version
+        if changes:
+            self._emit_field_changes({part_name: changes})
+        return True, new_ver
 
     def delete_row(self, idx):
         # Remove children recursively
         children = [i for i, r in enumerate(self.rows) if r.get('Parent') == idx]
         for c in sorted(children, reverse=True):
             self.delete_row(c)
-        del self.rows[idx]
+        removed = self.rows.pop(idx)
+        self.bump_data_version()
+        self._emit(ModelEvent(ModelEvent.ROWS_REMOVED, [removed.get("Project Part", "")]))
         # Update parent indices
         for r in self.rows:
             if r.get('Parent') is not None and isinstance(r.get('Parent'), int) and r.get('Parent') > idx:
@@ -732,59 +1939,93 @@ class ProjectDataModel:
         return self.rows
 
     def load_from_db(self):
+        self._apply_db_rows(self._read_db_rows())
+
+    def load_async(self, on_done=None):
+        """Reload rows on the DB worker; the model is only touched (and RELOADED emitted) once the read
+        has finished. Returns the cancellable DbJob."""
+        self._flush_async_save()  # a coalesced save must hit the disk before the read
+        def done(result):
+            self._apply_db_rows(result)
+            if on_done is not None:
+                on_done()
+        return self.db_worker().submit(self._read_db_rows, on_done=done,
+                                       label="Loading project data", cancellable=True)
+
+    @timed('db.load', note=lambda res, *a, **k: {'rows': len(res[0]) if res else 0})
+    def _read_db_rows(self, job=None):
+        """Read project_parts into fresh, normalized row dicts without touching self.rows (safe on the
+        DB worker). Returns (rows, on-disk states), or None when the DB file does not exist yet."""
         import os
         import sqlite3
-        self.rows.clear()
         if not os.path.exists(self.DB_FILE):
             self.create_table()
-            return
-        with self._connect() as conn:
+            return None
+        rows = []
+        loaded_states = []
+        import json as _json_att
+        with self._read() as conn:
             c = conn.cursor()
             # Build quoted column list without nested f-strings/backslashes (macOS Python parser-safe)
             cols_quoted = ", ".join(['"{}"'.format(col) for col in self.COLUMNS])
             # Also pull concurrency columns if they exist
-            try:
-                c.execute('PRAGMA table_info(project_parts)')
-                existing_cols = [r[1] for r in c.fetchall()]
-            except Exception:
-                existing_cols = []
-            concurrency_select = []
-            if 'row_version' in existing_cols:
-                concurrency_select.append('row_version')
-            if 'last_modified_utc' in existing_cols:
-                concurrency_select.append('last_modified_utc')
+            concurrency_select = self._persisted_columns(c)[len(self.COLUMNS):]
             extra_sql = (', ' + ', '.join(concurrency_select)) if concurrency_select else ''
-            c.execute(f"SELECT {cols_quoted}{extra_sql} FROM project_parts")
-            for row in c.fetchall():
-                base_part = row[:len(self.COLUMNS)]
-                row_dict = {col: val for col, val in zip(self.COLUMNS, base_part)}
-                if concurrency_select:
-                    # Append concurrency fields by order appended
-                    tail = row[len(self.COLUMNS):]
-                    for name, val in zip(concurrency_select, tail):
-                        row_dict[name] = val
-                # Default missing progress fields (older rows) if any are absent or None
-                if row_dict.get("% Complete") in (None, ""):
-                    row_dict["% Complete"] = 0
-                if not row_dict.get("Status"):
-                    row_dict["Status"] = "Planned"
-                # Normalize attachments field to JSON list string
-                import json as _json_att
-                att_val = row_dict.get("Attachments")
-                if att_val in (None, ""):
-                    row_dict["Attachments"] = "[]"
-                else:
-                    try:
-                        parsed = _json_att.loads(att_val)
-                        if not isinstance(parsed, list):
+            total = 0
+            if job is not None:
+                total = c.execute("SELECT COUNT(*) FROM project_parts").fetchone()[0]
+            c.execute(f"SELECT {cols_quoted}{extra_sql} FROM project_parts ORDER BY rowid")
+            while True:
+                batch = c.fetchmany(500)
+                if not batch:
+                    break
+                if job is not None:
+                    job.check()
+                for row in batch:
+                    base_part = row[:len(self.COLUMNS)]
+                    row_dict = {col: val for col, val in zip(self.COLUMNS, base_part)}
+                    if concurrency_select:
+                        # Append concurrency fields by order appended
+                        tail = row[len(self.COLUMNS):]
+                        for name, val in zip(concurrency_select, tail):
+                            row_dict[name] = val
+                    # Record what is on disk before normalization so the next save persists the fix-ups
+                    loaded_states.append(self._row_state(row_dict))
+                    # Default missing progress fields (older rows) if any are absent or None
+                    if row_dict.get("% Complete") in (None, ""):
+                        row_dict["% Complete"] = 0
+                    if not row_dict.get("Status"):
+                        row_dict["Status"] = "Planned"
+                    # Normalize attachments field to JSON list string
+                    att_val = row_dict.get("Attachments")
+                    if att_val in (None, ""):
+                        row_dict["Attachments"] = "[]"
+                    else:
+                        try:
+                            parsed = _json_att.loads(att_val)
+                            if not isinstance(parsed, list):
+                                row_dict["Attachments"] = _json_att.dumps([att_val])
+                        except Exception:
                             row_dict["Attachments"] = _json_att.dumps([att_val])
-                    except Exception:
-                        row_dict["Attachments"] = _json_att.dumps([att_val])
-                print(f"Loaded from DB: {row_dict}")
-                self.rows.append(row_dict)
+                    rows.append(row_dict)
+                if job is not None:
+                    job.report(len(rows), total)
+        return rows, loaded_states
+
+    def _apply_db_rows(self, result):
+        """GUI-thread half of a load: swap in rows read by _read_db_rows and notify listeners."""
+        self.rows.clear()
+        self._saved_state = None
+        self.bump_data_version()
+        if result is None:
+            return
+        rows, loaded_states = result
+        self.rows.extend(rows)
+        self._snapshot_saved_state(loaded_states)
         self.update_calculated_end_dates()
         # After loading & computing end dates, establish baseline if missing
         self.capture_missing_baselines()
+        self._emit(ModelEvent(ModelEvent.RELOADED))
 
     def get_row_snapshot(self, part_name: str):
         """Return a fresh DB snapshot dict for the given part including row_version/last_modified if present, or None."""
@@ -793,18 +2034,9 @@ class ProjectDataModel:
         import os, sqlite3
         if not os.path.exists(self.DB_FILE):
             return None
-        with self._connect() as conn:
+        with self._read() as conn:
             cur = conn.cursor()
-            try:
-                cur.execute('PRAGMA table_info(project_parts)')
-                cols = [r[1] for r in cur.fetchall()]
-            except Exception:
-                cols = []
-            select_cols = list(self.COLUMNS)
-            if 'row_version' in cols:
-                select_cols.append('row_version')
-            if 'last_modified_utc' in cols:
-                select_cols.append('last_modified_utc')
+            select_cols = self._persisted_columns(cur)
             quoted = ', '.join(['"{}"'.format(c) for c in select_cols])
             try:
                 cur.execute(f'SELECT {quoted} FROM project_parts WHERE "Project Part"=? LIMIT 1', (part_name,))
@@ -834,12 +2066,24 @@ class ProjectDataModel:
                     pass
 
     def save_to_db(self):
-        import sqlite3, os, socket, getpass, json
+        if not self._save_allowed():
+            return
+        plan = self._plan_save()
+        try:
+            self._write_save_plan(plan)
+        except Exception:
+            # What is on disk is unknown now; the next save rewrites the table
+            self._saved_state = None
+            raise
+
+    def _save_allowed(self):
+        """False (and logged) in read-only mode or while another user holds the edit lock."""
+        import os, socket, getpass, json
         if getattr(self, 'read_only', False):
             # Skip save in read-only mode (collaborative viewer)
             try: log_event('db','save_skipped_read_only')
             except Exception: pass
-            return
+            return False
         # Enforce single-editor lock: if a lock file exists and we are not the owner, prevent writes
         try:
             dbp = getattr(self, 'DB_FILE', None) or ''
@@ -861,48 +2105,362 @@ class ProjectDataModel:
                         print(f"Save blocked: edit lock held by {owner}")
                         try: log_event('db','save_blocked_lock', owner=owner)
                         except Exception: pass
-                        return
+                        return False
         except Exception:
             pass
+        return True
+
+    def save_async(self):
+        """Queue a save on the DB worker. Calls made before the queued save runs are coalesced into it;
+        the rows are snapshotted on the GUI thread, so later edits never race the write."""
+        if QCoreApplication.instance() is None:
+            self.save_to_db()
+            return
+        if self._save_queued:
+            return
+        self._save_queued = True
+        from PyQt5.QtCore import QTimer
+        QTimer.singleShot(0, self._flush_async_save)
+
+    def _flush_async_save(self):
+        if not self._save_queued:
+            return
+        self._save_queued = False
+        if self._inflight_updates:
+            # A plan taken now would carry the old values and row_version of parts whose queued update
+            # has not come back, and its write would run after that update and undo it: wait for them
+            self._save_held = True
+            return
+        if not self._save_allowed():
+            return
+        plan = self._plan_save()
+        if plan[0] == 'noop':
+            self._write_save_plan(plan)
+            return
+        def failed(e):
+            self._saved_state = None
+            print(f"Save failed: {e}")
+        self.db_worker().submit(lambda job: self._write_save_plan(plan), on_error=failed, label="Saving changes")
+
+    def _release_held_save(self):
+        # Runs on the GUI thread after an optimistic update has been applied
+        if self._save_held and not self._inflight_updates:
+            self._save_held = False
+            self._save_queued = True
+            self._flush_async_save()
+
+    def flush_pending_writes(self, timeout_ms=30000):
+        """Run any coalesced save now and wait for queued DB work to finish (shutdown, DB switch)."""
+        self._flush_async_save()
+        return self._db_worker.wait_idle(timeout_ms) if self._db_worker is not None else True
+
+    def db_worker(self):
+        """DbWorker that runs this model's background SQLite I/O."""
+        if self._db_worker is None:
+            self._db_worker = DbWorker()
+        return self._db_worker
+
+    @timed('db.save.plan', note=lambda plan, self: {'mode': plan[0], 'rows': len(plan[2])})
+    def _plan_save(self):
+        """GUI-thread half of a save: roll-ups, then a snapshot of exactly what has to be written.
+        The saved-state bookkeeping advances immediately so the next plan only carries newer edits."""
+        # Callers mutate rows in place before saving
+        self.bump_data_version()
         self.update_calculated_end_dates()
         # Roll-ups before save to persist auto-calculated parent progress
         self.rollup_progress()
+        pending = self.pending_changes()
+        if pending is None:
+            # Full rewrite (first save, DB switched or keys not unique)
+            rows = [dict(r) for r in self.rows]
+            self._snapshot_saved_state()
+            return ('full', self.DB_FILE, rows, None)
+        inserted, changed, deleted = pending
+        if not (inserted or changed or deleted):
+            return ('noop', self.DB_FILE, [], None)
+        by_name = {r.get("Project Part", ""): r for r in self.rows}
+        upserts = [dict(by_name[n]) for n in changed + inserted]
+        for n in deleted:
+            self._saved_state.pop(n, None)
+        for r in upserts:
+            self._saved_state[r.get("Project Part", "")] = self._row_state(r)
+        self._saved_order = [r.get("Project Part", "") for r in self.rows]
+        return ('incremental', self.DB_FILE, upserts, (inserted, changed, deleted))
+
+    @timed('db.save', note=lambda res, self, plan: {'mode': plan[0], 'rows': len(plan[2])})
+    def _write_save_plan(self, plan):
+        """SQL half of a save (safe on the DB worker): executes a plan from _plan_save."""
+        mode, db_file, rows, counts = plan
+        if mode == 'noop':
+            try: log_event('db','save_complete', rows=0, mode='noop')
+            except Exception: pass
+            return
+        if db_file != self.DB_FILE:
+            raise RuntimeError(f"Database switched before save to {db_file} ran")
         self.create_table()
-        # Full rewrite (legacy). Preserve row_version/last_modified_utc if present in table.
         with self._connect() as conn:
             c = conn.cursor()
             try:
                 c.execute("BEGIN IMMEDIATE")
             except Exception:
                 pass
-            # Determine if concurrency columns exist
-            try:
-                c.execute('PRAGMA table_info(project_parts)')
-                cols_exist = [r[1] for r in c.fetchall()]
-            except Exception:
-                cols_exist = []
-            has_rv = 'row_version' in cols_exist
-            has_lm = 'last_modified_utc' in cols_exist
-            c.execute("DELETE FROM project_parts")
-            base_cols = [col for col in self.COLUMNS]
-            extra_cols = []
-            if has_rv:
-                extra_cols.append('row_version')
-            if has_lm:
-                extra_cols.append('last_modified_utc')
-            all_cols = base_cols + extra_cols
+            all_cols = self._persisted_columns(c)
             columns_sql = ", ".join(['"{}"'.format(col) for col in all_cols])
             placeholders = ", ".join(["?" for _ in all_cols])
-            for row in self.rows:
-                vals = [row.get(c, "") for c in base_cols]
-                if has_rv:
-                    vals.append(row.get('row_version', 0))
-                if has_lm:
-                    vals.append(row.get('last_modified_utc', ''))
-                c.execute(f"INSERT INTO project_parts ({columns_sql}) VALUES ({placeholders})", vals)
+            if mode == 'full':
+                # Preserve row_version/last_modified_utc if present in table
+                c.execute("DELETE FROM project_parts")
+                c.executemany(f"INSERT INTO project_parts ({columns_sql}) VALUES ({placeholders})",
+                              [self._row_values(row, all_cols) for row in rows])
+            else:
+                deleted = counts[2]
+                if deleted:
+                    c.executemany('DELETE FROM project_parts WHERE "Project Part"=?', [(n,) for n in deleted])
+                if rows:
+                    # "Project Part" has no UNIQUE constraint on older DBs, so UPSERT as UPDATE + INSERT-if-missing
+                    set_sql = ", ".join(['"{}"=?'.format(col) for col in all_cols])
+                    c.executemany(f'UPDATE project_parts SET {set_sql} WHERE "Project Part"=?',
+                                  [self._row_values(r, all_cols) + [r.get("Project Part", "")] for r in rows])
+                    c.executemany(
+                        f'INSERT INTO project_parts ({columns_sql}) SELECT {placeholders} '
+                        f'WHERE NOT EXISTS (SELECT 1 FROM project_parts WHERE "Project Part"=?)',
+                        [self._row_values(r, all_cols) + [r.get("Project Part", "")] for r in rows])
             conn.commit()
-        try: log_event('db','save_complete', rows=len(self.rows))
-        except Exception: pass
+        if mode == 'full':
+            try: log_event('db','save_complete', rows=len(rows), mode='full')
+            except Exception: pass
+        else:
+            inserted, changed, deleted = counts
+            try: log_event('db','save_complete', rows=len(rows) + len(deleted), mode='incremental',
+                           inserted=len(inserted), changed=len(changed), deleted=len(deleted))
+            except Exception: pass
+
+    # --- Incremental persistence ---
+    def _row_state(self, row):
+        """Tuple of everything save_to_db writes for a row; compared against the last saved state."""
+        return tuple(row.get(c, "") for c in self.COLUMNS) + (row.get('row_version', 0), row.get('last_modified_utc', ''))
+
+    def _row_values(self, row, cols):
+        vals = []
+        for c in cols:
+            if c == 'row_version':
+                vals.append(row.get('row_version', 0))
+            elif c == 'last_modified_utc':
+                vals.append(row.get('last_modified_utc', ''))
+            else:
+                vals.append(row.get(c, ""))
+        return vals
+
+    def _persisted_columns(self, cur):
+        """COLUMNS plus whichever concurrency columns exist in project_parts."""
+        cols_exist = self._db().columns(cur.connection)
+        extra = [c for c in ('row_version', 'last_modified_utc') if c in cols_exist]
+        return list(self.COLUMNS) + extra
+
+    def _snapshot_saved_state(self, states=None):
+        """Remember the persisted state of every row (defaults to the current rows).
+        Duplicate part names cannot be keyed, so they leave the snapshot unset and force a full rewrite."""
+        import os
+        if states is None:
+            states = [self._row_state(r) for r in self.rows]
+        name_idx = self.COLUMNS.index("Project Part")
+        order = [st[name_idx] for st in states]
+        state = dict(zip(order, states))
+        if len(state) != len(states):
+            self._saved_state = None
+            return
+        self._saved_state = state
+        self._saved_order = order
+        self._saved_db = os.path.abspath(self.DB_FILE)
+
+    def pending_changes(self):
+        """Return (inserted, changed, deleted) part names relative to the last save/load,
+        or None when the next save has to rewrite the whole table."""
+        import os
+        saved = self._saved_state
+        if saved is None or self._saved_db != os.path.abspath(self.DB_FILE) or not os.path.exists(self.DB_FILE):
+            return None
+        current = {}
+        for r in self.rows:
+            name = r.get("Project Part", "")
+            if name in current:
+                return None
+            current[name] = r
+        inserted, changed = [], []
+        for name, r in current.items():
+            old = saved.get(name)
+            if old is None:
+                inserted.append(name)
+            elif old != self._row_state(r):
+                changed.append(name)
+        deleted = [n for n in self._saved_order if n not in current]
+        # Rows kept in place must keep their relative order; otherwise fall back to a rewrite
+        kept_saved = [n for n in self._saved_order if n in current]
+        kept_now = [n for n in current if n in saved]
+        if kept_saved != kept_now:
+            return None
+        # Inserts land at the end of the table (rowid order is load order), so a rename or a row added
+        # mid-list would move on reload: rewrite unless every new row is already after all kept rows
+        if inserted:
+            names = list(current)
+            if any(n in saved for n in names[names.index(inserted[0]):]):
+                return None
+        return inserted, changed, deleted
+
+    # --- Data version & derived caches ---
+    def bump_data_version(self):
+        """Invalidate caches derived from rows. Call after mutating rows outside the model's own methods."""
+        self.data_version += 1
+        return self.data_version
+
+    # --- Change events ---
+    def subscribe(self, listener):
+        """Register listener(ModelEvent); called synchronously after each change (or once per batch())."""
+        if not hasattr(self, '_listeners'):
+            self._listeners = []
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        try:
+            self._listeners.remove(listener)
+        except (AttributeError, ValueError):
+            pass
+
+    def batch(self):
+        """Context manager that holds events until the outermost batch exits, then delivers them merged:
+        one RELOADED if any reload happened, otherwise structural events in order plus a single
+        FIELDS_CHANGED carrying every field edit (first old value, last new value)."""
+        import contextlib
+        @contextlib.contextmanager
+        def _batch():
+            self._batch_depth = getattr(self, '_batch_depth', 0) + 1
+            if not hasattr(self, '_pending_events'):
+                self._pending_events = []
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    pending, self._pending_events = getattr(self, '_pending_events', []), []
+                    for ev in self._merge_events(pending):
+                        self._deliver(ev)
+        return _batch()
+
+    @staticmethod
+    def _merge_events(events):
+        if any(ev.kind == ModelEvent.RELOADED for ev in events):
+            return [ModelEvent(ModelEvent.RELOADED)]
+        merged = []
+        fields = {}
+        for ev in events:
+            if ev.kind == ModelEvent.FIELDS_CHANGED:
+                for part, ch in ev.changes.items():
+                    slot = fields.setdefault(part, {})
+                    for f, (old, new) in ch.items():
+                        slot[f] = (slot[f][0] if f in slot else old, new)
+            else:
+                merged.append(ev)
+        if fields:
+            merged.append(ModelEvent(ModelEvent.FIELDS_CHANGED, list(fields), fields))
+        return merged
+
+    def _emit(self, event):
+        if getattr(self, '_batch_depth', 0):
+            self._pending_events.append(event)
+        else:
+            self._deliver(event)
+
+    def _emit_field_changes(self, changes):
+        """changes: {part: {field: (old, new)}}. Parent edits are reported as HIERARCHY_MOVED."""
+        moved = [p for p, ch in changes.items() if "Parent" in ch]
+        kind = ModelEvent.HIERARCHY_MOVED if moved else ModelEvent.FIELDS_CHANGED
+        self._emit(ModelEvent(kind, list(changes), changes))
+
+    def _deliver(self, event):
+        for listener in list(getattr(self, '_listeners', [])):
+            try:
+                listener(event)
+            except Exception as e:
+                print(f"Model listener failed for {event}: {e}")
+
+    def set_part_fields(self, part_name, values):
+        """In-memory edit of one part that notifies listeners (use instead of mutating rows directly).
+        Returns {field: (old, new)} for the values that actually changed."""
+        row = self.row_by_name(part_name)
+        if row is None:
+            return {}
+        changes = {k: (row.get(k), v) for k, v in values.items() if row.get(k) != v}
+        if not changes:
+            return {}
+        row.update(values)
+        idx_current = self._index is not None and self._index_version == self.data_version
+        self.bump_data_version()
+        if idx_current and not any(k in ModelIndex.STRUCTURAL_FIELDS for k in changes):
+            self._index_version = self.data_version
+        self._emit_field_changes({part_name: changes})
+        return changes
+
+    def replace_rows(self, rows):
+        """Swap in a whole new row list (imports) and notify listeners with RELOADED."""
+        self.rows = rows
+        self.bump_data_version()
+        self._emit(ModelEvent(ModelEvent.RELOADED))
+
+    def index(self):
+        """ModelIndex for the current rows, rebuilt lazily when data_version moves."""
+        # Identity check covers wholesale `model.rows = ...` assignments that skip bump_data_version
+        if self._index is None or self._index_version != self.data_version or self._index.rows is not self.rows:
+            self._index = ModelIndex(self.rows)
+            self._index_version = self.data_version
+        return self._index
+
+    def row_by_name(self, name):
+        return self.index().by_name.get(name)
+
+    def children_of(self, name):
+        """Rows whose Parent is name (row order)."""
+        return self.index().children.get(name, [])
+
+    def has_children(self, name):
+        return bool(name) and name in self.index().children
+
+    def dependents_of(self, name):
+        """Names of parts listing name in their Dependencies."""
+        return self.index().dependents.get(name, [])
+
+    def ancestors_of(self, name):
+        """Ancestor part names, nearest parent first."""
+        return self.index().ancestors(name)
+
+    def schedule(self):
+        """CPM schedule for the current rows (see compute_schedule), cached per data_version."""
+        cached = self._schedule_cache
+        if cached is not None and cached[0] == self.data_version:
+            return cached[1]
+        sched = compute_schedule(self.rows)
+        self._schedule_cache = (self.data_version, sched)
+        return sched
+
+    def cost_rollup(self):
+        """CostRollup (subtree cost/price sums) for the current rows, cached per data_version."""
+        cached = getattr(self, '_cost_rollup_cache', None)
+        # Also keyed on the list object: callers sometimes assign model.rows wholesale
+        if cached is not None and cached[0] == self.data_version and cached[2] is self.rows:
+            return cached[1]
+        with perf_span('rollup.cost', rows=len(self.rows)):
+            rollup = CostRollup(self.rows, self.index().children)
+        self._cost_rollup_cache = (self.data_version, rollup, self.rows)
+        return rollup
+
+    def pricing_engine(self):
+        """PricingEngine over the current rows, cached per data_version like cost_rollup()."""
+        cached = getattr(self, '_pricing_cache', None)
+        if cached is not None and cached[0] == self.data_version and cached[2] is self.rows:
+            return cached[1]
+        engine = PricingEngine(self.rows)
+        self._pricing_cache = (self.data_version, engine, self.rows)
+        return engine
 
     def create_table(self):
         import sqlite3
@@ -915,6 +2473,11 @@ class ProjectDataModel:
                     {fields}
                 )
             """)
+            # Keyed lookups for incremental saves and optimistic updates
+            try:
+                c.execute('CREATE INDEX IF NOT EXISTS idx_project_parts_part ON project_parts("Project Part")')
+            except Exception:
+                pass
             c.execute(
                 """
                 CREATE TABLE IF NOT EXISTS baselines (
@@ -933,7 +2496,7 @@ class ProjectDataModel:
         import sqlite3, os
         if not os.path.exists(self.DB_FILE):
             return []
-        with self._connect() as conn:
+        with self._read() as conn:
             c = conn.cursor()
             try:
                 c.execute("SELECT DISTINCT baseline_name FROM baselines ORDER BY baseline_name")
@@ -942,22 +2505,39 @@ class ProjectDataModel:
                 return []
 
     def save_baseline(self, name: str):
-        import sqlite3, datetime
         if not name:
             return
+        self._write_baseline(name, self._baseline_snapshot())
+
+    def save_baseline_async(self, name: str, on_done=None, on_error=None):
+        """save_baseline on the DB worker; the dates are snapshotted here, on the GUI thread."""
+        if not name:
+            return None
+        snapshot = self._baseline_snapshot()
+        return self.db_worker().submit(lambda job: self._write_baseline(name, snapshot), on_done=on_done,
+                                       on_error=on_error, label=f"Saving baseline '{name}'")
+
+    def _baseline_snapshot(self):
+        """[(part, start, end)] for the current rows; end falls back to start + duration."""
+        import datetime
+        out = []
+        for r in self.rows:
+            s = r.get("Start Date", "")
+            e = r.get("Calculated End Date", "")
+            if not e and s and r.get("Duration (days)"):
+                try:
+                    sd = datetime.datetime.strptime(s, "%m-%d-%Y")
+                    d = int(r.get("Duration (days)") or 0)
+                    e = (sd + datetime.timedelta(days=d)).strftime("%m-%d-%Y")
+                except Exception:
+                    e = ""
+            out.append((r.get("Project Part", ""), s, e))
+        return out
+
+    def _write_baseline(self, name, snapshot):
         with self._connect() as conn:
             c = conn.cursor()
-            for r in self.rows:
-                part = r.get("Project Part", "")
-                s = r.get("Start Date", "")
-                e = r.get("Calculated End Date", "")
-                if not e and s and r.get("Duration (days)"):
-                    try:
-                        sd = datetime.datetime.strptime(s, "%m-%d-%Y")
-                        d = int(r.get("Duration (days)") or 0)
-                        e = (sd + datetime.timedelta(days=d)).strftime("%m-%d-%Y")
-                    except Exception:
-                        e = ""
+            for part, s, e in snapshot:
                 try:
                     c.execute(
                         """
@@ -973,15 +2553,56 @@ class ProjectDataModel:
             conn.commit()
 
     # --- Quote Versioning API ---
+    # Pseudo version name for the saved project_parts prices in delta / compare queries
+    CURRENT_QUOTE = "\x00current"
+    QUOTE_CACHE_SIZE = 8
+
+    def _invalidate_quote_cache(self, *version_names):
+        cache = self._quote_delta_cache
+        for key in [k for k in cache if k[1] in version_names]:
+            del cache[key]
+
     def save_quote_version(self, version_name: str):
         if not version_name:
             return
+        self._invalidate_quote_cache(version_name)
         import os
         if not os.path.exists(self.DB_FILE):
             return
+        self._write_quote_version(version_name, self._quote_version_snapshot())
+
+    def save_quote_version_async(self, version_name: str, replace=False, on_done=None, on_error=None):
+        """save_quote_version on the DB worker; the prices are snapshotted here, on the GUI thread.
+        replace=True drops an existing version of that name in the same transaction."""
+        import os
+        if not version_name or not os.path.exists(self.DB_FILE):
+            return None
+        snapshot = self._quote_version_snapshot()
+        return self._submit_quote_write(lambda: self._write_quote_version(version_name, snapshot, replace),
+                                        (version_name,), on_done, on_error, f"Saving quote version '{version_name}'")
+
+    def _submit_quote_write(self, write, version_names, on_done, on_error, label):
+        """Run a quote_versions write on the DB worker; cached delta maps of the affected versions are
+        dropped when it is queued and again once it is back (a map read in between holds old data)."""
+        self._invalidate_quote_cache(*version_names)
+        def done(res):
+            self._invalidate_quote_cache(*version_names)
+            if on_done is not None:
+                on_done(res)
+        return self.db_worker().submit(lambda job: write(), on_done=done, on_error=on_error, label=label)
+
+    def _quote_version_snapshot(self):
+        """[(part, prod cost, inst cost, prod price, inst price)] for the current rows."""
+        return [(r.get('Project Part',''), parse_money(r.get('Production Cost')), parse_money(r.get('Installation Cost')),
+                 parse_money(r.get('Production Price')), parse_money(r.get('Installation Price')))
+                for r in self.rows]
+
+    def _write_quote_version(self, version_name, snapshot, replace=False):
         with self._connect() as conn:
             cur = conn.cursor()
-            for r in self.rows:
+            if replace:
+                cur.execute("DELETE FROM quote_versions WHERE version_name=?", (version_name,))
+            for values in snapshot:
                 try:
                     cur.execute(
                         """
@@ -993,14 +2614,7 @@ class ProjectDataModel:
                           production_price=excluded.production_price,
                           installation_price=excluded.installation_price
                         """,
-                        (
-                            version_name,
-                            r.get('Project Part',''),
-                            float(r.get('Production Cost') or 0),
-                            float(r.get('Installation Cost') or 0),
-                            float(r.get('Production Price') or 0),
-                            float(r.get('Installation Price') or 0)
-                        )
+                        (version_name,) + values
                     )
                 except Exception:
                     pass
@@ -1010,7 +2624,7 @@ class ProjectDataModel:
         import os
         if not os.path.exists(self.DB_FILE):
             return []
-        with self._connect() as conn:
+        with self._read() as conn:
             cur = conn.cursor()
             try:
                 cur.execute("SELECT DISTINCT version_name FROM quote_versions ORDER BY version_name")
@@ -1022,6 +2636,20 @@ class ProjectDataModel:
         import os
         if not version_name or not os.path.exists(self.DB_FILE):
             return False
+        self._invalidate_quote_cache(version_name)
+        return self._write_delete_quote_version(version_name)
+
+    def delete_quote_version_async(self, version_name: str, on_done=None, on_error=None):
+        """delete_quote_version on the DB worker; on_done(ok) runs on the GUI thread."""
+        import os
+        if not version_name or not os.path.exists(self.DB_FILE):
+            if on_done is not None:
+                on_done(False)
+            return None
+        return self._submit_quote_write(lambda: self._write_delete_quote_version(version_name), (version_name,),
+                                        on_done, on_error, f"Deleting quote version '{version_name}'")
+
+    def _write_delete_quote_version(self, version_name):
         with self._connect() as conn:
             cur = conn.cursor()
             try:
@@ -1031,31 +2659,57 @@ class ProjectDataModel:
             except Exception:
                 return False
 
-    def rename_quote_version(self, old_name: str, new_name: str):
+    def rename_quote_version(self, old_name: str, new_name: str, replace=False):
         """Rename a quote version label. Returns True on success.
-        Fails (returns False) if destination already exists or source missing."""
+        Fails (returns False) if the source is missing, or if the destination already exists unless
+        replace=True, which drops the destination in the same transaction."""
         import os
         if (not old_name or not new_name or old_name == new_name or
                 not os.path.exists(self.DB_FILE)):
             return False
+        self._invalidate_quote_cache(old_name, new_name)
+        return self._write_rename_quote_version(old_name, new_name, replace)
+
+    def rename_quote_version_async(self, old_name: str, new_name: str, replace=False, on_done=None, on_error=None):
+        """rename_quote_version on the DB worker; on_done(ok) runs on the GUI thread."""
+        import os
+        if (not old_name or not new_name or old_name == new_name or
+                not os.path.exists(self.DB_FILE)):
+            if on_done is not None:
+                on_done(False)
+            return None
+        return self._submit_quote_write(lambda: self._write_rename_quote_version(old_name, new_name, replace),
+                                        (old_name, new_name), on_done, on_error,
+                                        f"Renaming quote version '{old_name}'")
+
+    def _write_rename_quote_version(self, old_name, new_name, replace=False):
         with self._connect() as conn:
             cur = conn.cursor()
             try:
-                # Abort if destination exists
-                cur.execute("SELECT 1 FROM quote_versions WHERE version_name=? LIMIT 1", (new_name,))
-                if cur.fetchone():
-                    return False
+                if replace:
+                    cur.execute("DELETE FROM quote_versions WHERE version_name=?", (new_name,))
+                else:
+                    # Abort if destination exists
+                    cur.execute("SELECT 1 FROM quote_versions WHERE version_name=? LIMIT 1", (new_name,))
+                    if cur.fetchone():
+                        return False
                 cur.execute("UPDATE quote_versions SET version_name=? WHERE version_name=?", (new_name, old_name))
+                if cur.rowcount <= 0:
+                    # Missing source: keep the destination a replace would have dropped
+                    conn.rollback()
+                    return False
                 conn.commit()
-                return cur.rowcount > 0
+                return True
             except Exception:
+                conn.rollback()
                 return False
 
     def load_quote_version_map(self, version_name: str):
+        """{part: (prod cost, inst cost, prod price, inst price)} for a version."""
         import os
         if not version_name or not os.path.exists(self.DB_FILE):
             return {}
-        with self._connect() as conn:
+        with self._read() as conn:
             cur = conn.cursor()
             try:
                 cur.execute("SELECT part_name, production_cost, installation_cost, production_price, installation_price FROM quote_versions WHERE version_name=?", (version_name,))
@@ -1066,13 +2720,128 @@ class ProjectDataModel:
             except Exception:
                 return {}
 
+    @staticmethod
+    def _sql_money(col):
+        """SQL expression parsing a TEXT money column of project_parts ("$1,250.00", "") to REAL."""
+        return f"""COALESCE(CAST(NULLIF(REPLACE(REPLACE(TRIM(p."{col}"), '$', ''), ',', ''), '') AS REAL), 0.0)"""
+
+    def _quote_source_sql(self, version_name, alias):
+        """(FROM-clause, params) yielding part_name / cost / price columns under alias for a version,
+        or for the saved project_parts prices when version_name is CURRENT_QUOTE."""
+        if version_name == self.CURRENT_QUOTE:
+            m = self._sql_money
+            sub = (f'SELECT p."Project Part" AS part_name, {m("Production Cost")} + {m("Installation Cost")} AS cost, '
+                   f'{m("Production Price")} + {m("Installation Price")} AS price FROM project_parts p')
+            return f"({sub}) {alias}", []
+        sub = ("SELECT part_name, COALESCE(production_cost,0) + COALESCE(installation_cost,0) AS cost, "
+               "COALESCE(production_price,0) + COALESCE(installation_price,0) AS price "
+               "FROM quote_versions WHERE version_name=?")
+        return f"({sub}) {alias}", [version_name]
+
+    def quote_version_deltas(self, version_name, against=None):
+        """Per-part deltas of `against` (default: current saved prices) relative to version_name, computed in SQLite.
+        Returns [(part, base_price, price, price_delta_pct, base_margin_pct, margin_pct, margin_delta_pts)]
+        for parts present on both sides, ordered by part name."""
+        import os
+        against = self.CURRENT_QUOTE if against is None else against
+        if not version_name or not os.path.exists(self.DB_FILE):
+            return []
+        # Single-version subqueries are flattened into the join, so snapshot sides use the primary key
+        # and the current side the "Project Part" index
+        b_src, b_params = self._quote_source_sql(version_name, "b")
+        c_src, c_params = self._quote_source_sql(against, "c")
+        sql = f"""
+            SELECT b.part_name, b.price, c.price,
+                   CASE WHEN b.price > 0 THEN (c.price - b.price) / b.price * 100.0 ELSE 0.0 END,
+                   CASE WHEN b.price > 0 THEN (b.price - b.cost) / b.price * 100.0 ELSE 0.0 END,
+                   CASE WHEN c.price > 0 THEN (c.price - c.cost) / c.price * 100.0 ELSE 0.0 END
+            FROM {b_src} JOIN {c_src} ON c.part_name = b.part_name
+            ORDER BY b.part_name
+        """
+        params = b_params + c_params
+        try:
+            with self._read() as conn:
+                rows = conn.execute(sql, params).fetchall()
+        except Exception as e:
+            try: log_event('db', 'quote_deltas_failed', version=version_name, error=str(e))
+            except Exception: pass
+            return []
+        return [r + (r[5] - r[4],) for r in rows]
+
+    def quote_version_delta_map(self, version_name):
+        """{part: quote_version_deltas row} against the current saved prices, LRU cached per
+        (db file, version, data_version) so repeated view refreshes skip the join; treat as read-only."""
+        cache = self._quote_delta_cache
+        key = (self.DB_FILE, version_name, self.data_version)
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        out = {r[0]: r for r in self.quote_version_deltas(version_name)}
+        # Entries for older data_versions of this version can never be hit again
+        for k in [k for k in cache if k[:2] == key[:2]]:
+            del cache[k]
+        cache[key] = out
+        while len(cache) > self.QUOTE_CACHE_SIZE:
+            cache.popitem(last=False)
+        return out
+
+    def compare_quote_versions(self, version_names, metric="price"):
+        """Matrix of one metric ("price" = total price, "margin" = margin %) per part across N versions,
+        pivoted inside SQLite. Returns rows [(part, v1, ..., vN, delta)] ordered by part; a value is None
+        where the part is missing from that version, delta is last vs first (% for price, pts for margin)."""
+        import os
+        names = [n for n in version_names if n]
+        if not names or not os.path.exists(self.DB_FILE):
+            return []
+        value = "price" if metric == "price" else "CASE WHEN price > 0 THEN (price - cost) / price * 100.0 END"
+        # Params follow the SQL text: pivot columns first, then the UNION ALL sources
+        pivots = []
+        params = []
+        for n in names:
+            pivots.append(f"MAX(CASE WHEN version_name=? THEN {value} END)")
+            params.append(n)
+        sources = []
+        for n in names:
+            if n == self.CURRENT_QUOTE:
+                m = self._sql_money
+                sources.append(f'SELECT p."Project Part" AS part_name, ? AS version_name, '
+                               f'{m("Production Cost")} + {m("Installation Cost")} AS cost, '
+                               f'{m("Production Price")} + {m("Installation Price")} AS price FROM project_parts p')
+                params.append(n)
+        snapshots = [n for n in names if n != self.CURRENT_QUOTE]
+        if snapshots:
+            sources.append("SELECT part_name, version_name, COALESCE(production_cost,0) + COALESCE(installation_cost,0) AS cost, "
+                           "COALESCE(production_price,0) + COALESCE(installation_price,0) AS price FROM quote_versions "
+                           f"WHERE version_name IN ({','.join('?' * len(snapshots))})")
+            params.extend(snapshots)
+        sql = (f"SELECT part_name, {', '.join(pivots)} FROM ({' UNION ALL '.join(sources)}) "
+               "GROUP BY part_name ORDER BY part_name")
+        try:
+            with self._read() as conn:
+                rows = conn.execute(sql, params).fetchall()
+        except Exception as e:
+            try: log_event('db', 'quote_compare_failed', versions=names, metric=metric, error=str(e))
+            except Exception: pass
+            return []
+        out = []
+        for r in rows:
+            first, last = r[1], r[-1]
+            if first is None or last is None:
+                delta = None
+            elif metric == "price":
+                delta = (last - first) / first * 100.0 if first > 0 else 0.0
+            else:
+                delta = last - first
+            out.append(r + (delta,))
+        return out
+
     def load_baseline_map(self, name: str):
         import sqlite3, os
         if not name:
             return {}
         if not os.path.exists(self.DB_FILE):
             return {}
-        with self._connect() as conn:
+        with self._read() as conn:
             c = conn.cursor()
             try:
                 c.execute("SELECT part_name, start_date, end_date FROM baselines WHERE baseline_name=?", (name,))
@@ -1084,36 +2853,57 @@ class ProjectDataModel:
                 return {}
 
     def update_calculated_end_dates(self):
-        import datetime
-        for row in self.rows:
+        """Set "Calculated End Date" = Start Date + Duration working days (Mon-Fri, minus holidays.json),
+        computed for all rows in one vectorized batch."""
+        try:
+            cal = get_business_calendar()
+        except Exception:
+            cal = BusinessCalendar()
+        idx = []
+        starts = []
+        counts = []
+        for i, row in enumerate(self.rows):
             start = row.get("Start Date", "")
             duration = row.get("Duration (days)", "")
-            try:
-                if start and duration:
-                    start_date = datetime.datetime.strptime(start, "%m-%d-%Y")
-                    days = int(duration)
-                    current_date = start_date
-                    added_days = 0
-                    while added_days < days:
-                        current_date += datetime.timedelta(days=1)
-                        # Skip Saturday (5) and Sunday (6)
-                        if current_date.weekday() < 5:
-                            added_days += 1
-                    row["Calculated End Date"] = current_date.strftime("%m-%d-%Y")
+            iso = None
+            if start and duration:
+                s = str(start)
+                if len(s) == 10 and s[2] == '-' and s[5] == '-':
+                    iso = s[6:10] + '-' + s[0:2] + '-' + s[3:5]  # validated by the batch conversion below
                 else:
-                    row["Calculated End Date"] = ""
+                    d = parse_mdy(s)
+                    iso = d.isoformat() if d else None
+            try:
+                n = int(duration) if iso else None
             except Exception:
+                n = None
+            if n is None:
                 row["Calculated End Date"] = ""
+                continue
+            idx.append(i)
+            starts.append(iso)
+            counts.append(n)
+        try:
+            ends = cal.add_workdays_batch(starts, counts, as_mdy=True)
+        except Exception:
+            # Some start date did not validate; redo row by row so only bad rows are blanked
+            import datetime
+            ends = []
+            for iso, n in zip(starts, counts):
+                try:
+                    ends.append(cal.add_workdays(datetime.date.fromisoformat(iso), n).strftime("%m-%d-%Y"))
+                except Exception:
+                    ends.append("")
+        for i, end in zip(idx, ends):
+            self.rows[i]["Calculated End Date"] = end
 
     # --- Progress Roll-up Logic ---
+    @timed('rollup.progress', note=lambda res, self: {'rows': len(self.rows)})
     def rollup_progress(self):
-        # Build children mapping by parent part name (string)
-        name_to_row = {r.get("Project Part", ""): r for r in self.rows}
-        children = {}
-        for r in self.rows:
-            p = r.get("Parent") or ""
-            if p:
-                children.setdefault(p, []).append(r)
+        # Children mapping by parent part name (string)
+        idx = self.index()
+        name_to_row = idx.by_name
+        children = idx.children
 
         # Depth-first post-order to compute parent % Complete
         visited = set()
@@ -1135,61 +2925,100 @@ class ProjectDataModel:
                     row["% Complete"] = 100
                 return
             # Recurse children first
-            total_weight = 0
-            weighted = 0
-            all_done = True
-            any_in_progress = False
-            any_blocked = False
             for child in children[name]:
-                cname = child.get("Project Part", "")
-                dfs(cname)
-                try:
-                    dur = int(child.get("Duration (days)") or 0)
-                except Exception:
-                    dur = 0
-                try:
-                    cpc = int(child.get("% Complete") or 0)
-                except Exception:
-                    cpc = 0
-                weighted += cpc * dur
-                total_weight += dur
-                st = child.get("Status") or "Planned"
-                if st != "Done":
-                    all_done = False
-                if st == "In Progress":
-                    any_in_progress = True
-                if st == "Blocked":
-                    any_blocked = True
-            if total_weight > 0:
-                row["% Complete"] = int(round(weighted / total_weight))
-            else:
-                # No duration children: average raw
-                vals = []
-                for child in children[name]:
-                    try:
-                        vals.append(int(child.get("% Complete") or 0))
-                    except Exception:
-                        pass
-                row["% Complete"] = int(round(sum(vals)/len(vals))) if vals else 0
-            # Derive parent status
-            if all_done and children[name]:
-                row["Status"] = "Done"
-                row["% Complete"] = 100
-            else:
-                # Preserve explicit Blocked if all children blocked
-                if any_blocked and not any_in_progress:
-                    row["Status"] = "Blocked"
-                elif any_in_progress:
-                    row["Status"] = "In Progress"
-                else:
-                    # Keep existing or default
-                    row["Status"] = row.get("Status") or "Planned"
+                dfs(child.get("Project Part", ""))
+            self._rollup_row(row, children[name])
 
         # Start DFS from top-level rows (no Parent or blank)
         for r in self.rows:
             if not (r.get("Parent") or ""):
                 dfs(r.get("Project Part", ""))
 
+    def _rollup_row(self, row, kids):
+        """Derive a parent's % Complete (duration weighted) and Status from its direct children."""
+        total_weight = 0
+        weighted = 0
+        all_done = True
+        any_in_progress = False
+        any_blocked = False
+        for child in kids:
+            try:
+                dur = int(child.get("Duration (days)") or 0)
+            except Exception:
+                dur = 0
+            try:
+                cpc = int(child.get("% Complete") or 0)
+            except Exception:
+                cpc = 0
+            weighted += cpc * dur
+            total_weight += dur
+            st = child.get("Status") or "Planned"
+            if st != "Done":
+                all_done = False
+            if st == "In Progress":
+                any_in_progress = True
+            if st == "Blocked":
+                any_blocked = True
+        if total_weight > 0:
+            row["% Complete"] = int(round(weighted / total_weight))
+        else:
+            # No duration children: average raw
+            vals = []
+            for child in kids:
+                try:
+                    vals.append(int(child.get("% Complete") or 0))
+                except Exception:
+                    pass
+            row["% Complete"] = int(round(sum(vals)/len(vals))) if vals else 0
+        # Derive parent status
+        if all_done and kids:
+            row["Status"] = "Done"
+            row["% Complete"] = 100
+        else:
+            # Preserve explicit Blocked if all children blocked
+            if any_blocked and not any_in_progress:
+                row["Status"] = "Blocked"
+            elif any_in_progress:
+                row["Status"] = "In Progress"
+            else:
+                # Keep existing or default
+                row["Status"] = row.get("Status") or "Planned"
+
+    def rollup_ancestors(self, part_name):
+        """Re-derive roll-ups for the ancestors of one edited part (nearest first).
+        Returns the names of ancestors whose % Complete or Status changed."""
+        changed = {}
+        for anc in self.ancestors_of(part_name):
+            row = self.row_by_name(anc)
+            if row is None:
+                continue
+            before = {"% Complete": row.get("% Complete"), "Status": row.get("Status")}
+            self._rollup_row(row, self.children_of(anc))
+            diff = {f: (old, row.get(f)) for f, old in before.items() if row.get(f) != old}
+            if diff:
+                changed[anc] = diff
+        if changed:
+            self._emit_field_changes(changed)
+        return list(changed)
+
+    def update_calculated_end_date(self, row):
+        """Single-row variant of update_calculated_end_dates (used after an in-place edit)."""
+        old = row.get("Calculated End Date", "")
+        start = parse_mdy(row.get("Start Date", ""))
+        try:
+            n = int(row.get("Duration (days)", "")) if start else None
+        except Exception:
+            n = None
+        end = ""
+        if n is not None:
+            try:
+                end = get_business_calendar().add_workdays(start, max(n, 0)).strftime("%m-%d-%Y")
+            except Exception:
+                end = ""
+        row["Calculated End Date"] = end
+        if end != old:
+            self._emit_field_changes({row.get("Project Part", ""): {"Calculated End Date": (old, end)}})
+
     # --- Aggregate metrics helper for dashboard ---
     def load_sample_data(self):
         """Populate model & DB with a small sample hierarchy.
@@ -1231,6 +3060,7 @@ class ProjectDataModel:
                 row["Baseline Start Date"] = row["Start Date"]
                 row["Baseline End Date"] = row["Calculated End Date"]
                 self.rows.append(row)
+            self.bump_data_version()
             # Recalculate roll-ups & derived fields
             self.rollup_progress()
             self.update_calculated_end_dates()
@@ -1238,6 +3068,7 @@ class ProjectDataModel:
                 self.save_to_db()
             except Exception:
                 pass
+            self._emit(ModelEvent(ModelEvent.ROWS_INSERTED, [t[0] for t in spec]))
         except Exception as e:
             print(f"load_sample_data failed: {e}")
 
@@ -1253,63 +3084,15 @@ class ProjectDataModel:
         today = datetime.datetime.today().date()
         overdue = 0
         at_risk = 0
-        # Identify critical path quickly (reuse minimal logic)
-        try:
-            name_to_row = {r.get("Project Part", ""): r for r in self.rows}
-            graph = {}
-            duration_map = {}
-            min_date = None
-            for r in self.rows:
-                n = r.get("Project Part", "")
-                deps = [d.strip() for d in (r.get("Dependencies", "") or '').split(',') if d.strip()]
-                graph[n] = deps
-                try:
-                    duration_map[n] = int(r.get("Duration (days)") or 0)
-                except Exception:
-                    duration_map[n] = 0
-                try:
-                    sd = r.get("Start Date", "")
-                    if sd:
-                        dt = datetime.datetime.strptime(sd, "%m-%d-%Y")
-                        if min_date is None or dt < min_date:
-                            min_date = dt
-                except Exception:
-                    pass
-            visited = set(); order = []
-            def dfs(n):
-                if n in visited: return
-                for d in graph.get(n, []): dfs(d)
-                visited.add(n); order.append(n)
-            for n in graph: dfs(n)
-            earliest_finish = {}; earliest_start = {}
-            base_min = min_date or datetime.datetime.today()
-            for n in order:
-                deps = graph.get(n, [])
-                if not deps:
-                    row = name_to_row.get(n, {})
-                    try:
-                        earliest_start[n] = datetime.datetime.strptime(row.get("Start Date", ""), "%m-%d-%Y")
-                    except Exception:
-                        earliest_start[n] = base_min
-                else:
-                    earliest_start[n] = max([earliest_finish.get(d, base_min) for d in deps])
-                earliest_finish[n] = earliest_start[n] + datetime.timedelta(days=duration_map.get(n,0))
-            project_finish = max(earliest_finish.values()) if earliest_finish else base_min
-            latest_start = {}; latest_finish = {}
-            for n in reversed(order):
-                succs = [k for k,v in graph.items() if n in v]
-                if not succs:
-                    latest_finish[n] = project_finish
-                else:
-                    latest_finish[n] = min([latest_start[s] for s in succs]) if succs else project_finish
-                latest_start[n] = latest_finish[n] - datetime.timedelta(days=duration_map.get(n,0))
-            critical_set = {n for n in order if abs((earliest_start[n]-latest_start[n]).days) <= 0}
+        # Critical path from the shared (cached) schedule
+        try:
+            critical_set = self.schedule().critical
         except Exception:
             critical_set = set()
         for r in self.rows:
             # Skip parent aggregator tasks for EV style metrics: treat non-leaf if it has children with durations
             name = r.get("Project Part", "")
-            has_child = any(ch.get("Parent", "") == name for ch in self.rows if ch is not r)
+            has_child = any(ch is not r for ch in self.children_of(name))
             try:
                 dur = int(r.get("Duration (days)") or 0)
             except Exception:
@@ -1380,6 +3163,246 @@ class ProgressDashboard(QWidget):
         )
         self.summary_label.setText(text)
 
+# --- UI stall watchdog ---
+class UiStallWatchdog(QObject):
+    """Opt-in detector for a blocked GUI thread. A QTimer on the GUI thread stamps a heartbeat; a
+    background thread watches it, and once the heartbeat is late by threshold_ms it snapshots the GUI
+    thread's Python stack (sys._current_frames). When the event loop comes back, the stall is logged
+    (log_event 'ui'/'stall' and PERF 'ui.stall') with its duration, stack and the active view.
+    The GUI thread keeps `context` (e.g. the current page) current; the watcher only reads it."""
+    BEAT_MS = 50
+    MAX_STALLS = 200
+
+    def __init__(self, threshold_ms=250, parent=None):
+        super().__init__(parent)
+        import threading
+        from PyQt5.QtCore import QTimer
+        self.threshold_ms = threshold_ms
+        self.context = ""
+        self._gui_ident = threading.get_ident()
+        self._last_beat = None
+        self._stalls = []  # dicts, oldest first (guarded by _lock)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.BEAT_MS)
+        self._timer.timeout.connect(self._beat)
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self):
+        import threading, time
+        if self._thread is not None:
+            return
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._timer.start()
+        self._thread = threading.Thread(target=self._watch, name='ui-watchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._timer.stop()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+
+    def _beat(self):
+        import time
+        self._last_beat = time.monotonic()
+
+    def stalls(self):
+        with self._lock:
+            return list(self._stalls)
+
+    def clear(self):
+        with self._lock:
+            self._stalls.clear()
+
+    def worst_offenders(self):
+        """Stalls grouped by location, worst first: [{'where', 'count', 'worst_ms', 'total_ms', 'view', 'stack'}].
+        view/stack are those of the longest stall at that location."""
+        groups = {}
+        for st in self.stalls():
+            g = groups.get(st['where'])
+            if g is None:
+                g = groups[st['where']] = {'where': st['where'], 'count': 0, 'worst_ms': 0.0, 'total_ms': 0.0,
+                                           'view': st['view'], 'stack': st['stack']}
+            g['count'] += 1
+            g['total_ms'] += st['ms']
+            if st['ms'] >= g['worst_ms']:
+                g.update(worst_ms=st['ms'], view=st['view'], stack=st['stack'])
+        return sorted(groups.values(), key=lambda g: -g['worst_ms'])
+
+    def _watch(self):
+        import time
+        poll = self.BEAT_MS / 1000.0
+        pending = None  # (heartbeat the stall started after, captured stack, location, view)
+        while not self._stop.wait(poll):
+            last = self._last_beat
+            if pending is None:
+                if (time.monotonic() - last) * 1000.0 - self.BEAT_MS >= self.threshold_ms:
+                    captured = self._capture()
+                    if captured is not None:
+                        pending = (last,) + captured
+            elif last != pending[0]:
+                # Event loop is back: the late heartbeat bounds the stall
+                ms = max(0.0, (last - pending[0]) * 1000.0 - self.BEAT_MS)
+                self._record(ms, *pending[1:])
+                pending = None
+
+    def _capture(self):
+        import sys, os, traceback
+        frame = sys._current_frames().get(self._gui_ident)
+        if frame is None:
+            return None
+        if frame.f_back is None and frame.f_code.co_name == '<module>':
+            return None  # idle in app.exec_() (e.g. the machine was asleep)
+        summary = traceback.extract_stack(frame)
+        here = os.path.abspath(__file__)
+        own = [fs for fs in summary if os.path.abspath(fs.filename) == here]
+        top = (own or summary)[-1]
+        where = f"{top.name} ({os.path.basename(top.filename)}:{top.lineno})"
+        stack = ''.join(traceback.format_list(summary[-25:]))
+        return stack, where, self.context
+
+    def _record(self, ms, stack, where, view):
+        import datetime
+        st = {'when': datetime.datetime.now().strftime('%H:%M:%S'), 'ms': ms, 'where': where, 'view': view, 'stack': stack}
+        with self._lock:
+            self._stalls.append(st)
+            del self._stalls[:-self.MAX_STALLS]
+        try:
+            PERF.record('ui.stall', ms, {'where': where, 'view': view})
+            log_event('ui', 'stall', ms=round(ms, 1), where=where, view=view, stack=stack)
+        except Exception:
+            pass
+
+
+# --- Performance panel (Tools -> Performance) ---
+class PerformanceDialog(QDialog):
+    """Tools -> Performance: latency percentiles per timed operation and the most recent operations,
+    read from PERF, plus the worst UI stalls when a UiStallWatchdog is given. Refreshes itself while open."""
+    RECENT_ROWS = 100
+
+    def __init__(self, recorder=None, parent=None, watchdog=None):
+        super().__init__(parent)
+        self.setWindowTitle("Performance")
+        self.resize(760, 560)
+        self.recorder = recorder or PERF
+        self.watchdog = watchdog
+        from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget, QHeaderView,
+                                     QAbstractItemView, QPlainTextEdit)
+        from PyQt5.QtCore import QTimer
+        layout = QVBoxLayout(self)
+        info = QLabel(f"Timings of the last {self.recorder.capacity} operations (ms). "
+                      f"Operations of {PERF_LOG_MIN_MS:g} ms or more are also written to app.log.")
+        info.setWordWrap(True)
+        layout.addWidget(info)
+        def make_table(headers):
+            t = QTableWidget(0, len(headers))
+            t.setHorizontalHeaderLabels(headers)
+            t.verticalHeader().setVisible(False)
+            t.setEditTriggers(QAbstractItemView.NoEditTriggers)
+            t.setSelectionBehavior(QAbstractItemView.SelectRows)
+            t.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+            t.horizontalHeader().setStretchLastSection(True)
+            return t
+        self.summary = make_table(["Operation", "Count", "Last", "p50", "p95", "Max"])
+        self.summary.setSortingEnabled(True)
+        layout.addWidget(self.summary, 1)
+        layout.addWidget(QLabel("Recent operations (newest first)"))
+        self.recent = make_table(["Time", "Operation", "ms", "Details"])
+        layout.addWidget(self.recent, 2)
+        self.stalls = self.stall_stack = None
+        if watchdog is not None:
+            self.resize(760, 760)
+            layout.addWidget(QLabel(f"UI stalls of {watchdog.threshold_ms} ms or more (worst first)"))
+            self.stalls = make_table(["Where", "Count", "Worst ms", "Total ms", "View"])
+            layout.addWidget(self.stalls, 1)
+            self.stall_stack = QPlainTextEdit()
+            self.stall_stack.setReadOnly(True)
+            self.stall_stack.setPlaceholderText("Select a stall to see the GUI thread's stack")
+            layout.addWidget(self.stall_stack, 1)
+            self.stalls.itemSelectionChanged.connect(self._show_stall_stack)
+        btns = QHBoxLayout()
+        refresh_btn = QPushButton("Refresh"); clear_btn = QPushButton("Clear"); close_btn = QPushButton("Close")
+        btns.addWidget(refresh_btn); btns.addWidget(clear_btn); btns.addStretch(1); btns.addWidget(close_btn)
+        layout.addLayout(btns)
+        refresh_btn.clicked.connect(self.refresh)
+        clear_btn.clicked.connect(self._clear)
+        close_btn.clicked.connect(self.close)
+        self._timer = QTimer(self)
+        self._timer.setInterval(2000)
+        self._timer.timeout.connect(self.refresh)
+        self.refresh()
+
+    def showEvent(self, event):
+        self.refresh()
+        self._timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super().hideEvent(event)
+
+    def _clear(self):
+        self.recorder.clear()
+        if self.watchdog is not None:
+            self.watchdog.clear()
+        self.refresh()
+
+    def _show_stall_stack(self):
+        from PyQt5.QtCore import Qt
+        rows = self.stalls.selectionModel().selectedRows()
+        item = self.stalls.item(rows[0].row(), 0) if rows else None
+        self.stall_stack.setPlainText(item.data(Qt.UserRole) if item is not None else "")
+
+    def refresh(self):
+        import datetime
+        from PyQt5.QtWidgets import QTableWidgetItem
+        from PyQt5.QtCore import Qt
+        def num_item(v):
+            it = QTableWidgetItem()
+            it.setData(Qt.DisplayRole, round(v, 1) if isinstance(v, float) else v)  # numeric, so columns sort by value
+            it.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            return it
+        stats = self.recorder.stats()
+        self.summary.setSortingEnabled(False)
+        self.summary.setRowCount(len(stats))
+        for r, name in enumerate(sorted(stats, key=lambda n: -stats[n]['p95'])):
+            st = stats[name]
+            self.summary.setItem(r, 0, QTableWidgetItem(name))
+            self.summary.setItem(r, 1, num_item(st['count']))
+            for c, key in enumerate(('last', 'p50', 'p95', 'max'), start=2):
+                self.summary.setItem(r, c, num_item(st[key]))
+        self.summary.setSortingEnabled(True)
+        recent = self.recorder.recent(self.RECENT_ROWS)[::-1]
+        self.recent.setRowCount(len(recent))
+        for r, (when, name, ms, fields) in enumerate(recent):
+            self.recent.setItem(r, 0, QTableWidgetItem(datetime.datetime.fromtimestamp(when).strftime("%H:%M:%S")))
+            self.recent.setItem(r, 1, QTableWidgetItem(name))
+            self.recent.setItem(r, 2, num_item(ms))
+            self.recent.setItem(r, 3, QTableWidgetItem(", ".join(f"{k}={v}" for k, v in fields.items())))
+        if self.stalls is not None:
+            offenders = self.watchdog.worst_offenders()
+            selected = self.stalls.currentRow()
+            self.stalls.setRowCount(len(offenders))
+            for r, g in enumerate(offenders):
+                where = QTableWidgetItem(g['where'])
+                where.setData(Qt.UserRole, g['stack'])
+                self.stalls.setItem(r, 0, where)
+                self.stalls.setItem(r, 1, num_item(g['count']))
+                self.stalls.setItem(r, 2, num_item(g['worst_ms']))
+                self.stalls.setItem(r, 3, num_item(g['total_ms']))
+                self.stalls.setItem(r, 4, QTableWidgetItem(g['view']))
+            if 0 <= selected < len(offenders):
+                self.stalls.selectRow(selected)
+
+
 # --- Conflict Resolution Dialog -------------------------------------------------
 class ConflictResolutionDialog(QDialog):
     """Dialog shown when an optimistic concurrency update detects a conflict.
@@ -1480,6 +3503,197 @@ class ConflictResolutionDialog(QDialog):
         self.choice = 'merge'
         self.accept()
 
+# --- Cost estimates table model ---
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from PyQt5.QtWidgets import QTableView
+
+class CostTableModel(QAbstractTableModel):
+    """Typed records for CostEstimatesView; numbers are only formatted in data().
+    Qt.UserRole returns the raw value (sorting and exports read it)."""
+    HEADERS = ["Project Part","Parent","Prod Cost","Inst Cost","Total Cost","Prod Price","Inst Price","Total Price",
+               "Profit $","Margin %","Δ Price %","Δ Margin pts","% of Total Price","Internal/External"]
+    # Column kinds drive formatting: money "1,234.00", pct "12.5%", pts "1.5"
+    KINDS = ["text","text","money","money","money","money","money","money","money","pct","pct","pts","pct","text"]
+    COL_TOTAL_PRICE, COL_PROFIT, COL_MARGIN, COL_DPRICE, COL_DMARGIN, COL_SHARE = 7, 8, 9, 10, 11, 12
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # (name, parent, pcost, icost, tcost, pprice, iprice, tprice, profit, margin_pct, dprice_pct, dmargin_pts, ie)
+        self.records = []
+        self.share_base = 1.0   # total price of the rows currently shown
+        self.top_cut = None     # total price at or above which a row is highlighted
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.records)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            return self.HEADERS[section] if orientation == Qt.Horizontal else section + 1
+        return None
+
+    def set_records(self, records):
+        self.beginResetModel()
+        self.records = records
+        self.endResetModel()
+
+    def set_highlights(self, share_base, top_cut):
+        """Totals-dependent columns (% of total, top-N shading) follow the filtered set."""
+        self.share_base = share_base if share_base > 0 else 1.0
+        self.top_cut = top_cut
+        if self.records:
+            self.dataChanged.emit(self.index(0, self.COL_TOTAL_PRICE), self.index(len(self.records) - 1, self.COL_SHARE))
+
+    def raw(self, row, col):
+        rec = self.records[row]
+        if col == self.COL_SHARE:
+            return rec[7] / self.share_base * 100.0
+        if col == 13:
+            return rec[12]
+        return rec[col]
+
+    def display(self, row, col):
+        v = self.raw(row, col)
+        kind = self.KINDS[col]
+        if kind == "money":
+            return f"{v:,.2f}"
+        if kind == "pct":
+            return f"{v:,.1f}%"
+        if kind == "pts":
+            return f"{v:,.1f}"
+        return v
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if role == Qt.DisplayRole:
+            return self.display(row, col)
+        if role == Qt.UserRole:
+            return self.raw(row, col)
+        if role == Qt.TextAlignmentRole:
+            # margin & delta margin are textual with % / pts
+            if col >= 2 and col not in (9, 11):
+                return int(Qt.AlignRight | Qt.AlignVCenter)
+            return None
+        if role in (Qt.BackgroundRole, Qt.ForegroundRole):
+            colors = self._colors(row, col)
+            if colors:
+                from PyQt5.QtGui import QColor
+                c = colors[0] if role == Qt.BackgroundRole else colors[1]
+                return QColor(*c) if isinstance(c, tuple) else (QColor(c) if c else None)
+        return None
+
+    def _colors(self, row, col):
+        """(background, foreground) for conditional formatting, or None."""
+        rec = self.records[row]
+        if col == self.COL_PROFIT:
+            if rec[8] < 0:
+                return ((120,0,0), 'white')
+            if rec[8] == 0:
+                return ((80,80,80), 'white')
+        elif col == self.COL_MARGIN:
+            if rec[9] < 5:
+                return ((130,0,0), 'white')
+            if rec[9] < 15:
+                return ((110,70,0), 'white')
+        elif col in (self.COL_DPRICE, self.COL_DMARGIN):
+            if rec[col] > 0:
+                return (None, '#3CB371')
+            if rec[col] < 0:
+                return (None, '#FF6347')
+        elif col == self.COL_TOTAL_PRICE and self.top_cut is not None and rec[7] >= self.top_cut:
+            return ((60,60,0), '#FFE066')
+        return None
+
+
+class CostFilterProxy(QSortFilterProxyModel):
+    """Name / Internal-External / minimum-price filtering over CostTableModel without rebuilding it."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.name_filter = ""
+        self.int_ext = "All"
+        self.min_price = 0.0
+        self.setSortRole(Qt.UserRole)
+
+    def set_filters(self, name_filter, int_ext, min_price):
+        self.name_filter = (name_filter or "").strip().lower()
+        self.int_ext = int_ext
+        self.min_price = float(min_price)
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        rec = self.sourceModel().records[source_row]
+        if self.name_filter and self.name_filter not in rec[0].lower():
+            return False
+        if self.int_ext != 'All' and rec[12] != self.int_ext:
+            return False
+        return rec[7] >= self.min_price
+
+
+class QuoteCompareModel(QAbstractTableModel):
+    """Read-only view over ProjectDataModel.compare_quote_versions() rows: (part, v1..vN, delta)."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.headers = []
+        self.rows = []
+        self.metric = "price"
+
+    def set_matrix(self, version_labels, rows, metric):
+        self.beginResetModel()
+        delta = "Δ Last vs First %" if metric == "price" else "Δ Last vs First pts"
+        self.headers = ["Project Part"] + list(version_labels) + [delta]
+        self.rows = rows
+        self.metric = metric
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            return self.headers[section] if orientation == Qt.Horizontal else section + 1
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        v = self.rows[index.row()][index.column()]
+        col = index.column()
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return v
+            if v is None:
+                return "—"
+            last = col == len(self.headers) - 1
+            if self.metric == "price":
+                return f"{v:,.1f}%" if last else f"{v:,.2f}"
+            return f"{v:,.1f}" if last else f"{v:,.1f}%"
+        if role == Qt.UserRole:
+            return v
+        if role == Qt.TextAlignmentRole and col > 0:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        if role == Qt.ForegroundRole and col == len(self.headers) - 1 and v:
+            from PyQt5.QtGui import QColor
+            return QColor('#3CB371') if v > 0 else QColor('#FF6347')
+        return None
+
+
+class CostTableView(QTableView):
+    """QTableView with the rowCount()/columnCount() conveniences the cost view code and tests use."""
+    def rowCount(self):
+        m = self.model()
+        return m.rowCount() if m is not None else 0
+
+    def columnCount(self):
+        m = self.model()
+        return m.columnCount() if m is not None else 0
+
 class CostEstimatesView(QWidget):
     """Enhanced cost & margin estimation view.
     Columns:
@@ -1502,13 +3716,13 @@ class CostEstimatesView(QWidget):
         header.addWidget(title)
         header.addStretch(1)
         self.le_filter = QLineEdit(); self.le_filter.setPlaceholderText("Filter name…")
-        self.le_filter.textChanged.connect(self.refresh)
+        self.le_filter.textChanged.connect(self._apply_filters)
         header.addWidget(self.le_filter)
-        self.combo_int_ext = QComboBox(); self.combo_int_ext.addItems(["All","Internal","External"]); self.combo_int_ext.currentIndexChanged.connect(self.refresh)
+        self.combo_int_ext = QComboBox(); self.combo_int_ext.addItems(["All","Internal","External"]); self.combo_int_ext.currentIndexChanged.connect(self._apply_filters)
         header.addWidget(self.combo_int_ext)
         self.min_price_spin = QSpinBox(); self.min_price_spin.setRange(0, 10_000_000); self.min_price_spin.setPrefix(">$ "); self.min_price_spin.setSingleStep(500)
         self.min_price_spin.setToolTip("Minimum total price filter")
-        self.min_price_spin.valueChanged.connect(self.refresh)
+        self.min_price_spin.valueChanged.connect(self._apply_filters)
         header.addWidget(self.min_price_spin)
         self.chk_leaf_only = QCheckBox("Leaf Only")
         self.chk_leaf_only.setToolTip("Show leaf rows only (exclude parent aggregators)")
@@ -1528,6 +3742,10 @@ class CostEstimatesView(QWidget):
         self.chk_selected_only = QCheckBox("Selected Only")
         self.chk_selected_only.setToolTip("When checked, only selected table rows are exported (CSV/XLSX/PDF/PNG). If none selected, falls back to all.")
         header.addWidget(self.chk_selected_only)
+        sweep_btn = QPushButton("Margin Sweep…")
+        sweep_btn.setToolTip("Project totals for suggested prices across a range of target margins")
+        sweep_btn.clicked.connect(self._open_margin_sweep_dialog)
+        header.addWidget(sweep_btn)
     # (Legacy individual export buttons removed in favor of unified dialog)
         # Column visibility / layouts button
         self.columns_btn = QPushButton("Columns…")
@@ -1557,17 +3775,15 @@ class CostEstimatesView(QWidget):
                         resp = QMessageBox.question(self, "Overwrite Version?", f"A version named '{ver_name}' already exists. Overwrite it?", QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
                         if resp != QMessageBox.Yes:
                             return
-                        # Delete existing first so save acts like replace
-                        try:
-                            self.model.delete_quote_version(ver_name)
-                        except Exception:
-                            pass
-                    self.model.save_quote_version(ver_name)
-                    self._reload_versions()
-                    self.version_combo.setCurrentText(ver_name)
-                    if self.parent() and self.parent().window().statusBar():
-                        action = "overwritten" if ver_name in existing else "saved"
-                        self.parent().window().statusBar().showMessage(f"Quote version '{ver_name}' {action}", 3000)
+                    def saved(_res):
+                        self._reload_versions()
+                        self.version_combo.setCurrentText(ver_name)
+                        if self.parent() and self.parent().window().statusBar():
+                            action = "overwritten" if ver_name in existing else "saved"
+                            self.parent().window().statusBar().showMessage(f"Quote version '{ver_name}' {action}", 3000)
+                    # Overwrite replaces the old snapshot in the same transaction
+                    self.model.save_quote_version_async(ver_name, replace=ver_name in existing, on_done=saved,
+                                                        on_error=lambda e: QMessageBox.critical(self, "Freeze Failed", str(e)))
                 except Exception as e:
                     QMessageBox.critical(self, "Freeze Failed", str(e))
         self.freeze_btn.clicked.connect(do_freeze)
@@ -1578,12 +3794,15 @@ class CostEstimatesView(QWidget):
                 return
             resp = QMessageBox.question(self, "Delete Quote Version", f"Delete version '{ver}'? This cannot be undone.", QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
             if resp == QMessageBox.Yes:
-                if self.model.delete_quote_version(ver):
-                    if self.parent() and self.parent().window().statusBar():
-                        self.parent().window().statusBar().showMessage(f"Deleted quote version '{ver}'",3000)
-                    self._reload_versions()
-                else:
-                    QMessageBox.critical(self, "Delete Failed", f"Could not delete version '{ver}'.")
+                def deleted(ok):
+                    if ok:
+                        if self.parent() and self.parent().window().statusBar():
+                            self.parent().window().statusBar().showMessage(f"Deleted quote version '{ver}'",3000)
+                        self._reload_versions()
+                    else:
+                        QMessageBox.critical(self, "Delete Failed", f"Could not delete version '{ver}'.")
+                self.model.delete_quote_version_async(ver, on_done=deleted,
+                                                      on_error=lambda e: QMessageBox.critical(self, "Delete Failed", str(e)))
         self.delete_version_btn.clicked.connect(do_delete_version)
         def do_rename_version():
             from PyQt5.QtWidgets import QInputDialog, QMessageBox
@@ -1600,33 +3819,40 @@ class CostEstimatesView(QWidget):
                 resp = QMessageBox.question(self, "Overwrite Existing?", f"A version named '{new_name}' exists. Overwrite it with '{cur}'?", QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
                 if resp != QMessageBox.Yes:
                     return
-                # Delete new_name then rename
-                try:
-                    self.model.delete_quote_version(new_name)
-                except Exception:
-                    pass
-            if self.model.rename_quote_version(cur, new_name):
-                self._reload_versions()
-                self.version_combo.setCurrentText(new_name)
-                if self.parent() and self.parent().window().statusBar():
-                    self.parent().window().statusBar().showMessage(f"Renamed version '{cur}' → '{new_name}'", 4000)
-            else:
-                QMessageBox.critical(self, "Rename Failed", f"Could not rename '{cur}' to '{new_name}'.")
+            def renamed(ok):
+                if ok:
+                    self._reload_versions()
+                    self.version_combo.setCurrentText(new_name)
+                    if self.parent() and self.parent().window().statusBar():
+                        self.parent().window().statusBar().showMessage(f"Renamed version '{cur}' → '{new_name}'", 4000)
+                else:
+                    QMessageBox.critical(self, "Rename Failed", f"Could not rename '{cur}' to '{new_name}'.")
+            # Overwrite drops the existing destination in the same transaction
+            self.model.rename_quote_version_async(cur, new_name, replace=new_name in existing, on_done=renamed,
+                                                  on_error=lambda e: QMessageBox.critical(self, "Rename Failed", str(e)))
         self.rename_version_btn.clicked.connect(do_rename_version)
+        self.compare_btn = QPushButton("Compare Versions…")
+        self.compare_btn.setToolTip("Side-by-side matrix of several quote versions (and current prices)")
+        self.compare_btn.clicked.connect(self._open_compare_versions_dialog)
         header.addWidget(self.version_combo)
+        header.addWidget(self.compare_btn)
         header.addWidget(self.freeze_btn)
         header.addWidget(self.delete_version_btn)
         header.addWidget(self.rename_version_btn)
-        self.table = QTableWidget(0, 14)
-        self.table.setHorizontalHeaderLabels([
-            "Project Part","Parent","Prod Cost","Inst Cost","Total Cost","Prod Price","Inst Price","Total Price","Profit $","Margin %","Δ Price %","Δ Margin pts","% of Total Price","Internal/External"
-        ])
+        self.cost_model = CostTableModel(self)
+        self.proxy = CostFilterProxy(self)
+        self.proxy.setSourceModel(self.cost_model)
+        self.table = CostTableView()
+        self.table.setModel(self.proxy)
         self.table.setEditTriggers(self.table.NoEditTriggers)
         self.table.setSelectionBehavior(self.table.SelectRows)
         self.table.setAlternatingRowColors(True)
         try:
             self.table.horizontalHeader().setSectionsMovable(True)
             self.table.horizontalHeader().setSectionsClickable(True)
+            # Click-to-sort on raw values; no indicator keeps model (row) order until the user picks a column
+            self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+            self.table.setSortingEnabled(True)
         except Exception:
             pass
         self.vbox.addWidget(self.table, 1)
@@ -1639,23 +3865,39 @@ class CostEstimatesView(QWidget):
         self.refresh()
 
     def _num(self, v):
-        try:
-            if v is None: return 0.0
-            if isinstance(v,(int,float)): return float(v)
-            s=str(v).strip().replace('$','').replace(',','')
-            return float(s) if s else 0.0
-        except Exception:
-            return 0.0
+        return parse_money(v)
 
     def _is_leaf(self, row):
-        name = row.get("Project Part","")
-        return not any(r.get("Parent") == name for r in self.model.rows if r is not row)
+        return not self.model.has_children(row.get("Project Part",""))
+
+    def _header_text(self, col):
+        return CostTableModel.HEADERS[col]
+
+    def _cell_text(self, row, col):
+        """Display text of a (proxy/view) row."""
+        return self.cost_model.display(self.proxy.mapToSource(self.proxy.index(row, 0)).row(), col)
+
+    def _cell_value(self, row, col):
+        """Raw typed value of a (proxy/view) row."""
+        return self.cost_model.raw(self.proxy.mapToSource(self.proxy.index(row, 0)).row(), col)
+
+    def _export_row_indices(self):
+        """View rows to export: the selection when Selected Only is on (falls back to all rows)."""
+        selected_rows = set()
+        if hasattr(self, 'chk_selected_only') and self.chk_selected_only.isChecked():
+            try:
+                selected_rows = {idx.row() for idx in self.table.selectionModel().selectedRows()}
+            except Exception:
+                selected_rows = set()
+        if selected_rows:
+            return sorted(selected_rows), True
+        return list(range(self.proxy.rowCount())), False
 
     def _apply_compact_mode(self):
         try:
             if self.chk_compact.isChecked():
                 self.table.verticalHeader().setDefaultSectionSize(18)
-                self.table.setStyleSheet("QTableWidget { font-size:11px; }")
+                self.table.setStyleSheet("QTableView { font-size:11px; }")
             else:
                 self.table.verticalHeader().setDefaultSectionSize(24)
                 self.table.setStyleSheet("")
@@ -1669,20 +3911,16 @@ class CostEstimatesView(QWidget):
             return
         import csv
         try:
-            with open(path, 'w', newline='', encoding='utf-8') as f:
+            with perf_span('export.csv') as span, open(path, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
-                headers = [self.table.horizontalHeaderItem(i).text() for i in range(self.table.columnCount())]
+                headers = [self._header_text(i) for i in range(self.table.columnCount())]
                 writer.writerow(headers)
-                selected_rows = set()
-                if hasattr(self, 'chk_selected_only') and self.chk_selected_only.isChecked():
-                    selected_rows = {idx.row() for idx in self.table.selectionModel().selectedRows()}
-                # Fallback to all rows if none selected
-                if selected_rows:
-                    row_iter = sorted(selected_rows)
-                else:
-                    row_iter = range(self.table.rowCount())
+                row_iter, _ = self._export_row_indices()
+                n = 0
                 for r in row_iter:
-                    writer.writerow([self.table.item(r,c).text() if self.table.item(r,c) else '' for c in range(self.table.columnCount())])
+                    writer.writerow([self._cell_text(r, c) for c in range(self.table.columnCount())])
+                    n += 1
+                span.note(rows=n)
             print(f"Exported CSV -> {path}")
         except Exception as e:
             print(f"CSV export failed: {e}")
@@ -1755,16 +3993,7 @@ class CostEstimatesView(QWidget):
         h_header = self.table.horizontalHeader(); v_header = self.table.verticalHeader()
         width = sum(self.table.columnWidth(c) for c in range(self.table.columnCount())) + v_header.width()
         # Determine row set (Selected Only logic)
-        selected_rows = set()
-        if hasattr(self, 'chk_selected_only') and self.chk_selected_only.isChecked():
-            try:
-                selected_rows = {idx.row() for idx in self.table.selectionModel().selectedRows()}
-            except Exception:
-                selected_rows = set()
-        if selected_rows:
-            row_iter = sorted(selected_rows)
-        else:
-            row_iter = range(self.table.rowCount())
+        row_iter, _ = self._export_row_indices()
         height = h_header.height() + sum(self.table.rowHeight(r) for r in row_iter)
         if width <=0 or height <=0:
             print('Empty table; abort export.')
@@ -1824,7 +4053,7 @@ class CostEstimatesView(QWidget):
                 x=0
                 for c in range(self.table.columnCount()):
                     w = self.table.columnWidth(c)
-                    txt = self.table.horizontalHeaderItem(c).text()
+                    txt = self._header_text(c)
                     painter.drawText(x+2, y+fm.ascent()+2, txt)
                     x += w
                 painter.restore()
@@ -1832,8 +4061,7 @@ class CostEstimatesView(QWidget):
                 painter.save(); x=0
                 for c in range(self.table.columnCount()):
                     w = self.table.columnWidth(c)
-                    it = self.table.item(r,c)
-                    txt = it.text() if it else ''
+                    txt = self._cell_text(r, c)
                     align_right = (c>=2 and c not in (9,11))
                     if align_right:
                         tw = fm.width(txt); painter.drawText(x+w-tw-2, y+fm.ascent()+2, txt)
@@ -1879,14 +4107,14 @@ class CostEstimatesView(QWidget):
         x=0
         for c in range(self.table.columnCount()):
             w=self.table.columnWidth(c)
-            txt=self.table.horizontalHeaderItem(c).text()
+            txt=self._header_text(c)
             painter.drawText(x+2,fm.ascent()+2,txt)
             x+=w
         y=row_h
         for r in row_iter:
             x=0
             for c in range(self.table.columnCount()):
-                w=self.table.columnWidth(c); it=self.table.item(r,c); txt=it.text() if it else ''
+                w=self.table.columnWidth(c); txt=self._cell_text(r, c)
                 align_right = (c>=2 and c not in (9,11))
                 if align_right:
                     tw=fm.width(txt); painter.drawText(x+w-tw-2, y+fm.ascent()+2, txt)
@@ -1938,10 +4166,7 @@ class CostEstimatesView(QWidget):
 
     def _export_xlsx(self):
         try:
-            from openpyxl import Workbook
-            from openpyxl.styles import Font, Alignment, PatternFill
-            from openpyxl.utils import get_column_letter
-            from openpyxl.styles import numbers
+            import openpyxl  # noqa: F401
         except Exception as e:
             from PyQt5.QtWidgets import QMessageBox
             QMessageBox.critical(self, "Missing Dependency", "openpyxl not installed. Please install requirements.")
@@ -1952,87 +4177,117 @@ class CostEstimatesView(QWidget):
             return
         if not path.lower().endswith('.xlsx'):
             path += '.xlsx'
-        wb = Workbook(); ws = wb.active; ws.title = 'Costs'
-        # Gather headers & data (only visible columns)
+        # Only visible columns, typed from the model (percent columns are points, written as fractions)
         visible_cols = [c for c in range(self.table.columnCount()) if not self.table.isColumnHidden(c)]
-        headers = [self.table.horizontalHeaderItem(c).text() for c in visible_cols]
-        ws.append(headers)
-        bold = Font(bold=True)
-        for cell in ws[1]:
-            cell.font = bold
-            cell.alignment = Alignment(horizontal='center')
-            cell.fill = PatternFill(start_color='FFD9D9D9', end_color='FFD9D9D9', fill_type='solid')
-        # Rows
-        currency_cols = set()
-        percent_cols = set()
-        selected_rows = set()
-        if hasattr(self,'chk_selected_only') and self.chk_selected_only.isChecked():
-            selected_rows = {idx.row() for idx in self.table.selectionModel().selectedRows()}
-        if selected_rows:
-            row_range = sorted(selected_rows)
-        else:
-            row_range = range(self.table.rowCount())
-        for r in row_range:
-            row_vals = []
-            for c in visible_cols:
-                it = self.table.item(r,c)
-                txt = it.text() if it else ''
-                # Numeric detection (strip %,$, commas)
-                raw = txt.replace(',','').replace('$','').strip()
-                if raw.endswith('%'):
-                    try:
-                        val = float(raw[:-1]) / 100.0
-                        row_vals.append(val)
-                        percent_cols.add(len(row_vals))  # 1-based within written row
-                        continue
-                    except Exception:
-                        pass
-                try:
-                    if raw:
-                        val = float(raw)
-                        row_vals.append(val)
-                        # Heuristic: treat price/cost/profit columns as currency if header matches
-                        hdr = headers[len(row_vals)-1].lower()
-                        if any(k in hdr for k in ["cost","price","profit"]):
-                            currency_cols.add(len(row_vals))
-                        continue
-                except Exception:
-                    pass
-                row_vals.append(txt)
-            ws.append(row_vals)
-        # Apply number formats (skip header row which is row 1)
-        for row in ws.iter_rows(min_row=2):
-            for idx, cell in enumerate(row, start=1):
-                if idx in currency_cols and isinstance(cell.value,(int,float)):
-                    cell.number_format = numbers.FORMAT_CURRENCY_USD_SIMPLE
-                elif idx in percent_cols and isinstance(cell.value,(int,float)):
-                    cell.number_format = '0.0%'
-        # Autosize columns (simple heuristic)
-        for col_idx in range(1, ws.max_column + 1):
-            letter = get_column_letter(col_idx)
-            max_len = 0
-            for cell in ws[letter]:
-                v = cell.value
-                if v is None:
-                    continue
-                l = len(str(v))
-                if l > max_len:
-                    max_len = l
-            ws.column_dimensions[letter].width = min(60, max_len + 2)
-        # Add metadata sheet
-        meta = wb.create_sheet('_Meta')
+        kind_map = {"money": "money", "pct": "pct100", "pts": "number", "text": "text"}
+        columns = [(self._header_text(c), kind_map[CostTableModel.KINDS[c]]) for c in visible_cols]
+        row_range, subset_selected = self._export_row_indices()
+        rows = ([self._cell_value(r, c) for c in visible_cols] for r in row_range)
         from datetime import datetime
-        meta.append(["Generated", datetime.now().isoformat(timespec='seconds')])
-        meta.append(["Version Selected", self.version_combo.currentText() if hasattr(self,'version_combo') else ''])
-        subset = "Selected" if selected_rows else "All"
-        meta.append(["Filters", f"Name='{self.le_filter.text()}', Int/Ext='{self.combo_int_ext.currentText()}', MinPrice>{self.min_price_spin.value()}"])
-        meta.append(["Subset", subset])
+        meta = [
+            ["Generated", datetime.now().isoformat(timespec='seconds')],
+            ["Version Selected", self.version_combo.currentText() if hasattr(self,'version_combo') else ''],
+            ["Filters", f"Name='{self.le_filter.text()}', Int/Ext='{self.combo_int_ext.currentText()}', MinPrice>{self.min_price_spin.value()}"],
+            ["Subset", "Selected" if subset_selected else "All"],
+        ]
         try:
-            wb.save(path)
+            write_xlsx_stream(path, columns, rows, sheet_title='Costs', meta_rows=meta)
             print(f"Exported XLSX -> {path}")
         except Exception as e:
             QMessageBox.critical(self, "Export Failed", str(e))
 
+    def _open_compare_versions_dialog(self):
+        """Compare N quote versions (optionally with current saved prices) in one matrix built by SQLite."""
+        from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QListWidgetItem, QComboBox, QPushButton
+        dlg = QDialog(self); dlg.setWindowTitle("Compare Quote Versions")
+        dlg.resize(900, 560)
+        v = QVBoxLayout(dlg)
+        top = QHBoxLayout(); v.addLayout(top)
+        versions = QListWidget(); versions.setMaximumWidth(220)
+        current_label = "Current (saved)"
+        for name in self.model.list_quote_versions() + [current_label]:
+            it = QListWidgetItem(name)
+            it.setFlags(it.flags() | Qt.ItemIsUserCheckable)
+            it.setCheckState(Qt.Checked if name in (self.version_combo.currentText(), current_label) else Qt.Unchecked)
+            it.setData(Qt.UserRole, self.model.CURRENT_QUOTE if name == current_label else name)
+            versions.addItem(it)
+        side = QVBoxLayout()
+        side.addWidget(QLabel("Versions (in column order):")); side.addWidget(versions, 1)
+        metric_combo = QComboBox(); metric_combo.addItems(["Total Price", "Margin %"])
+        side.addWidget(metric_combo)
+        top.addLayout(side)
+        cmp_model = QuoteCompareModel(dlg)
+        table = QTableView(); table.setModel(cmp_model)
+        table.setEditTriggers(table.NoEditTriggers); table.setAlternatingRowColors(True)
+        top.addWidget(table, 1)
+        status = QLabel(""); v.addWidget(status)
+        def run():
+            picked = [(versions.item(i).text(), versions.item(i).data(Qt.UserRole)) for i in range(versions.count())
+                      if versions.item(i).checkState() == Qt.Checked]
+            metric = "price" if metric_combo.currentIndex() == 0 else "margin"
+            rows = self.model.compare_quote_versions([key for _, key in picked], metric) if picked else []
+            cmp_model.set_matrix([label for label, _ in picked], rows, metric)
+            table.resizeColumnsToContents()
+            status.setText(f"{len(rows)} parts × {len(picked)} versions")
+        versions.itemChanged.connect(lambda *_: run())
+        metric_combo.currentIndexChanged.connect(lambda *_: run())
+        run()
+        close_btn = QPushButton("Close"); close_btn.clicked.connect(dlg.accept)
+        row = QHBoxLayout(); row.addStretch(1); row.addWidget(close_btn); v.addLayout(row)
+        dlg.exec_()
+
+    def _open_margin_sweep_dialog(self):
+        """Sensitivity table: suggested project price / profit / effective margin per target margin."""
+        from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QSpinBox, QTableWidget, QTableWidgetItem, QPushButton, QMessageBox
+        from PyQt5.QtCore import QSettings
+        from PyQt5.QtGui import QColor
+        try:
+            engine = self.model.pricing_engine()
+        except Exception as e:
+            QMessageBox.critical(self, "Margin Sweep", f"Pricing engine unavailable: {e}")
+            return
+        try:
+            current = round(float(QSettings('LSI','ProjectPlanner').value('Pricing/target_margin', 35.0)))
+        except Exception:
+            current = 35
+        dlg = QDialog(self); dlg.setWindowTitle("Target Margin Sweep")
+        dlg.resize(760, 520)
+        v = QVBoxLayout(dlg)
+        priced = int(((engine.prod_cost > 0) | (engine.inst_cost > 0)).sum())
+        v.addWidget(QLabel(f"Suggested prices for {priced} costed parts (contingency, risk level and warranty reserve applied). Current target: {current}%"))
+        ctl = QHBoxLayout(); v.addLayout(ctl)
+        spins = []
+        for label, val in (("From %", 10), ("To %", 40), ("Step", 1)):
+            sb = QSpinBox(); sb.setRange(1, 95); sb.setValue(val)
+            ctl.addWidget(QLabel(label)); ctl.addWidget(sb); spins.append(sb)
+        ctl.addStretch(1)
+        headers = ["Target Margin %", "Suggested Price", "Loaded Cost", "Gross Profit", "Warranty Reserve", "Effective Profit", "Effective Margin %"]
+        keys = ["target_margin", "price", "cost", "gross_profit", "reserve", "effective_profit", "effective_margin"]
+        table = QTableWidget(0, len(headers)); table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(table.NoEditTriggers); table.setAlternatingRowColors(True)
+        v.addWidget(table, 1)
+        def run():
+            lo, hi, step = (sb.value() for sb in spins)
+            margins = [m / 100.0 for m in range(lo, max(lo, hi) + 1, max(1, step))]
+            results = engine.sweep(margins)
+            table.setRowCount(len(results))
+            for i, res in enumerate(results):
+                for c, k in enumerate(keys):
+                    val = res[k]
+                    txt = f"{val:,.1f}%" if k in ("target_margin", "effective_margin") else f"{val:,.2f}"
+                    it = QTableWidgetItem(txt)
+                    it.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                    if round(res["target_margin"]) == current:
+                        it.setBackground(QColor(60,60,0)); it.setForeground(QColor('#FFE066'))
+                    table.setItem(i, c, it)
+            table.resizeColumnsToContents()
+        for sb in spins:
+            sb.valueChanged.connect(run)
+        run()
+        close_btn = QPushButton("Close"); close_btn.clicked.connect(dlg.accept)
+        row = QHBoxLayout(); row.addStretch(1); row.addWidget(close_btn); v.addLayout(row)
+        dlg.exec_()
+
     # --------------- Column Visibility & Layout Management ---------------
     def _open_columns_dialog(self):
         from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem, QPushButton, QCheckBox, QLineEdit, QLabel, QMessageBox
@@ -2051,7 +4306,7 @@ class CostEstimatesView(QWidget):
         container = QWidget(); grid = QGridLayout(container)
         self._col_checkboxes = []
         for c in range(self.table.columnCount()):
-            name = self.table.horizontalHeaderItem(c).text()
+            name = self._header_text(c)
             cb = QCheckBox(name)
             cb.setChecked(not self.table.isColumnHidden(c))
             grid.addWidget(cb, c // 2, c % 2)  # two columns layout
@@ -2118,7 +4373,7 @@ class CostEstimatesView(QWidget):
             vis = [1 if cb.isChecked() else 0 for cb in self._col_checkboxes]
             order = _current_order()
             # Store current column header names to allow graceful re-mapping later
-            col_names = [self.table.horizontalHeaderItem(i).text() for i in range(self.table.columnCount())]
+            col_names = [self._header_text(i) for i in range(self.table.columnCount())]
             layouts[name] = {"visibility": vis, "order": order, "columns": col_names, "v": 2}
             s.setValue("Columns/layouts", json.dumps(layouts))
             refresh_layout_list()
@@ -2137,7 +4392,7 @@ class CostEstimatesView(QWidget):
             vis = cfg.get("visibility") if isinstance(cfg, dict) else None
             order = cfg.get("order") if isinstance(cfg, dict) else None
             saved_cols = cfg.get("columns") if isinstance(cfg, dict) else None
-            current_cols = [self.table.horizontalHeaderItem(i).text() for i in range(self.table.columnCount())]
+            current_cols = [self._header_text(i) for i in range(self.table.columnCount())]
             reindex_map = None
             if saved_cols and len(saved_cols) != len(current_cols):
                 # Attempt name-based mapping
@@ -2238,7 +4493,7 @@ class CostEstimatesView(QWidget):
             vis = [0 if self.table.isColumnHidden(i) else 1 for i in range(self.table.columnCount())]
             header = self.table.horizontalHeader()
             order = [header.logicalIndex(i) for i in range(header.count())]
-            col_names = [self.table.horizontalHeaderItem(i).text() for i in range(self.table.columnCount())]
+            col_names = [self._header_text(i) for i in range(self.table.columnCount())]
             layouts[name] = {"visibility": vis, "order": order, "columns": col_names, "v": 2}
             s.setValue("Columns/layouts", json.dumps(layouts))
             s.setValue("Columns/last_layout", name)
@@ -2260,7 +4515,7 @@ class CostEstimatesView(QWidget):
             vis = cfg.get("visibility")
             order = cfg.get("order")
             saved_cols = cfg.get("columns")
-            current_cols = [self.table.horizontalHeaderItem(i).text() for i in range(self.table.columnCount())]
+            current_cols = [self._header_text(i) for i in range(self.table.columnCount())]
             if saved_cols and len(saved_cols) != len(current_cols):
                 # Attempt name-based remap
                 name_to_cur = {n: i for i, n in enumerate(current_cols)}
@@ -2285,144 +4540,75 @@ class CostEstimatesView(QWidget):
         except Exception as e:
             return False, str(e)
 
+    @timed('render.costs', note=lambda res, self: {'rows': self.table.rowCount()})
     def refresh(self):
         rows = getattr(self.model,'rows', [])
         # Version map
         selected_version = self.version_combo.currentText() if hasattr(self, 'version_combo') else '<None>'
-        version_map = {}
+        deltas = {}
         if selected_version and selected_version not in ("<None>", ""):
             try:
-                version_map = self.model.load_quote_version_map(selected_version)
+                deltas = self.model.quote_version_delta_map(selected_version)
             except Exception:
-                version_map = {}
-        name_filter = (self.le_filter.text() or '').strip().lower()
-        int_ext_filter = self.combo_int_ext.currentText()
-        min_price = float(self.min_price_spin.value())
+                deltas = {}
         leaf_only = self.chk_leaf_only.isChecked()
         rollup = self.chk_rollup.isChecked()
-        data = []
-        total_cost = total_price = total_profit = 0.0
-        # Pre-build child mapping for rollups
-        children_map = {}
-        if rollup:
-            for r in rows:
-                p = (r.get('Parent') or '').strip()
-                if p:
-                    children_map.setdefault(p, []).append(r)
-        # Helper to accumulate descendants
-        def accumulate(row):
-            stack = [row]
-            cost_prod = cost_inst = price_prod = price_inst = 0.0
-            while stack:
-                cur = stack.pop()
-                pcost = self._num(cur.get('Production Cost', 0))
-                icost = self._num(cur.get('Installation Cost', 0))
-                pprice = self._num(cur.get('Production Price', 0))
-                iprice = self._num(cur.get('Installation Price', 0))
-                cost_prod += pcost; cost_inst += icost; price_prod += pprice; price_inst += iprice
-                for ch in children_map.get(cur.get('Project Part', ''), []):
-                    stack.append(ch)
-            return cost_prod, cost_inst, price_prod, price_inst
-        # Build data
+        records = []
+        # Pre-aggregated subtree sums (one pass, cached per data_version)
+        costs = self.model.cost_rollup()
         for r in rows:
             if leaf_only and not self._is_leaf(r):
                 # If rollup enabled and parent row: still include using aggregated numbers
                 if not rollup:
                     continue
             name = r.get('Project Part','')
-            if name_filter and name_filter not in name.lower():
-                continue
             ie = r.get('Internal/External','') or ''
-            if int_ext_filter != 'All' and ie != int_ext_filter:
-                continue
-            if rollup:
-                pcost, icost, pprice, iprice = accumulate(r)
-            else:
-                pcost = self._num(r.get('Production Cost',0))
-                icost = self._num(r.get('Installation Cost',0))
-                pprice = self._num(r.get('Production Price',0))
-                iprice = self._num(r.get('Installation Price',0))
+            pcost, icost, pprice, iprice = costs.totals(r) if rollup else costs.own(r)
             tcost = pcost + icost
             tprice = pprice + iprice
-            if tprice < min_price:
-                continue
             profit = tprice - tcost
             margin_pct = (profit / tprice * 100.0) if tprice > 0 else 0.0
-            data.append((name, r.get('Parent','') or '', pcost, icost, tcost, pprice, iprice, tprice, profit, margin_pct, ie))
-            total_cost += tcost
-            total_price += tprice
-            total_profit += profit
-        pct_base = total_price if total_price>0 else 1.0
-        self.table.setRowCount(len(data))
-        # Determine thresholds for highlighting top-N (top 10% by total price)
-        import math
-        sorted_prices = sorted([d[7] for d in data], reverse=True)
-        top_n = max(1, math.ceil(len(sorted_prices)*0.10)) if sorted_prices else 0
-        top_cut = sorted_prices[top_n-1] if sorted_prices and top_n<=len(sorted_prices) else None
-        for row_idx, (name,parent,pcost,icost,tcost,pprice,iprice,tprice,profit,margin_pct,ie) in enumerate(data):
-            base = version_map.get(name)
-            if base:
-                b_pc, b_ic, b_pp, b_ip = base
-                base_total_price = (b_pp or 0)+(b_ip or 0)
-                cur_total_price = tprice
-                price_delta_pct = ((cur_total_price - base_total_price)/base_total_price*100.0) if base_total_price>0 else 0.0
-                # margin delta
-                base_profit = base_total_price - ((b_pc or 0)+(b_ic or 0))
-                base_margin_pct = (base_profit/base_total_price*100.0) if base_total_price>0 else 0.0
-                margin_delta_pts = margin_pct - base_margin_pct
-            else:
+            d = deltas.get(name)
+            if d is None:
                 price_delta_pct = 0.0; margin_delta_pts = 0.0
-            values = [
-                name, parent,
-                f"{pcost:,.2f}", f"{icost:,.2f}", f"{tcost:,.2f}",
-                f"{pprice:,.2f}", f"{iprice:,.2f}", f"{tprice:,.2f}",
-                f"{profit:,.2f}", f"{margin_pct:,.1f}%", f"{price_delta_pct:,.1f}%", f"{margin_delta_pts:,.1f}", f"{(tprice/pct_base)*100:,.1f}%", ie
-            ]
-            for col_idx, val in enumerate(values):
-                item = QTableWidgetItem(val)
-                if col_idx >=2 and col_idx not in (9,11):  # margin & delta margin are textual with % / pts
-                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                # Conditional formatting
-                from PyQt5.QtGui import QColor
-                if col_idx == 8:  # profit
-                    if profit < 0:
-                        item.setBackground(QColor(120,0,0))
-                        item.setForeground(QColor('white'))
-                    elif profit == 0:
-                        item.setBackground(QColor(80,80,80))
-                        item.setForeground(QColor('white'))
-                if col_idx == 9:  # margin %
-                    if margin_pct < 5:
-                        item.setBackground(QColor(130,0,0))
-                        item.setForeground(QColor('white'))
-                    elif margin_pct < 15:
-                        item.setBackground(QColor(110,70,0))
-                        item.setForeground(QColor('white'))
-                if col_idx == 10:  # Δ Price % highlight
-                    if price_delta_pct > 0:
-                        item.setForeground(QColor('#3CB371'))
-                    elif price_delta_pct < 0:
-                        item.setForeground(QColor('#FF6347'))
-                if col_idx == 11:  # Δ Margin pts
-                    if margin_delta_pts > 0:
-                        item.setForeground(QColor('#3CB371'))
-                    elif margin_delta_pts < 0:
-                        item.setForeground(QColor('#FF6347'))
-                if top_cut is not None and tprice >= top_cut and col_idx == 7:
-                    item.setBackground(QColor(60,60,0))
-                    item.setForeground(QColor('#FFE066'))
-                self.table.setItem(row_idx, col_idx, item)
+            elif not rollup and abs(tprice - d[2]) < 0.005 and abs(margin_pct - d[5]) < 1e-6:
+                # Row matches its saved prices: the SQL deltas apply as-is
+                price_delta_pct, margin_delta_pts = d[3], d[6]
+            else:
+                # Roll-ups and unsaved edits are rebased on the version's price / margin
+                base_total_price, base_margin_pct = d[1], d[4]
+                price_delta_pct = ((tprice - base_total_price)/base_total_price*100.0) if base_total_price>0 else 0.0
+                margin_delta_pts = margin_pct - base_margin_pct
+            records.append((name, r.get('Parent','') or '', pcost, icost, tcost, pprice, iprice, tprice, profit, margin_pct, price_delta_pct, margin_delta_pts, ie))
+        self.cost_model.set_records(records)
+        # Name / Int-Ext / min price are proxy filters; this also refreshes totals & highlights
+        self._apply_filters()
         try:
             self.table.resizeColumnsToContents()
         except Exception:
             pass
+        self._apply_compact_mode()
+        self._reload_versions()
+
+    def _apply_filters(self, *_):
+        """Re-filter the existing records (no rebuild) and recompute the totals footer."""
+        self.proxy.set_filters(self.le_filter.text(), self.combo_int_ext.currentText(), self.min_price_spin.value())
+        records = self.cost_model.records
+        shown = [records[self.proxy.mapToSource(self.proxy.index(i, 0)).row()] for i in range(self.proxy.rowCount())]
+        total_cost = sum(d[4] for d in shown)
+        total_price = sum(d[7] for d in shown)
+        total_profit = sum(d[8] for d in shown)
+        # Determine thresholds for highlighting top-N (top 10% by total price)
+        import math
+        sorted_prices = sorted((d[7] for d in shown), reverse=True)
+        top_n = max(1, math.ceil(len(sorted_prices)*0.10)) if sorted_prices else 0
+        top_cut = sorted_prices[top_n-1] if sorted_prices and top_n<=len(sorted_prices) else None
+        self.cost_model.set_highlights(total_price, top_cut)
         blended_margin = (total_profit/total_price*100.0) if total_price>0 else 0.0
-        avg_margin = (sum(d[9] for d in data)/len(data)) if data else 0.0
+        avg_margin = (sum(d[9] for d in shown)/len(shown)) if shown else 0.0
         self.totals_label.setText(
-            f"Cost: ${total_cost:,.2f}  Price: ${total_price:,.2f}  Profit: ${total_profit:,.2f}  Blended Margin: {blended_margin:,.1f}%  Avg Margin: {avg_margin:,.1f}%  Rows: {len(data)}"
+            f"Cost: ${total_cost:,.2f}  Price: ${total_price:,.2f}  Profit: ${total_profit:,.2f}  Blended Margin: {blended_margin:,.1f}%  Avg Margin: {avg_margin:,.1f}%  Rows: {len(shown)}"
         )
-        self._apply_compact_mode()
-        self._reload_versions()
 
     def _reload_versions(self):
         try:
@@ -2443,6 +4629,223 @@ class CostEstimatesView(QWidget):
         except Exception:
             pass
 
+class TreeLayout:
+    """Left-to-right tidy tree layout for ProjectTreeView.
+    Every visible leaf gets its own row and a parent is centred on its children, so subtrees never
+    overlap. Each subtree's extent (visible leaf count and the centre offset of its root within its
+    block) is cached; set_collapsed() recomputes only the toggled nodes and their ancestors, and
+    positions() resolves absolute coordinates in one top-down pass. All passes are iterative and O(n).
+    """
+    NODE_W, NODE_H = 180, 46
+    H_GAP, V_GAP = 80, 24
+
+    def __init__(self, roots, children, collapsed=()):
+        key = lambda s: s.lower()
+        self.roots = sorted(roots, key=key)
+        self.children = {p: sorted(ch, key=key) for p, ch in children.items()}
+        self.collapsed = set(collapsed)
+        self.parent = {}
+        self.depth = {}
+        self.leaves = {}   # name -> visible leaves in subtree
+        self.center = {}   # name -> centre of the node, measured from the top of its subtree block
+        self._positions = None
+        # Pre-order walk assigns parent/depth once per node (duplicate names and cycles are skipped)
+        order = []
+        stack = [(r, None, 0) for r in reversed(self.roots)]
+        while stack:
+            name, parent, depth = stack.pop()
+            if name in self.depth:
+                continue
+            self.depth[name] = depth
+            self.parent[name] = parent
+            order.append(name)
+            for c in reversed(self.children.get(name, ())):
+                stack.append((c, name, depth + 1))
+        for name in reversed(order):
+            self._measure(name)
+
+    def _tree_children(self, name):
+        return [c for c in self.children.get(name, ()) if self.parent.get(c) == name]
+
+    def _measure(self, name):
+        spacing = self.NODE_H + self.V_GAP
+        ch = [] if name in self.collapsed else self._tree_children(name)
+        if not ch:
+            self.leaves[name] = 1
+            self.center[name] = self.NODE_H / 2
+            return
+        offset = 0
+        total = 0.0
+        for c in ch:
+            total += offset * spacing + self.center[c]
+            offset += self.leaves[c]
+        self.leaves[name] = offset
+        self.center[name] = total / len(ch)
+
+    def is_collapsed(self, name):
+        return name in self.collapsed
+
+    def visible_children(self, name):
+        return [] if name in self.collapsed else self._tree_children(name)
+
+    def set_collapsed(self, names):
+        """Adopt a new collapsed set; re-measures only changed nodes and their ancestors."""
+        names = set(names)
+        changed = (names ^ self.collapsed) & self.depth.keys()
+        self.collapsed = names
+        if not changed:
+            return False
+        import heapq
+        # Deepest first; climb only while a subtree's extent actually changes
+        heap = [(-self.depth[n], n) for n in changed]
+        heapq.heapify(heap)
+        queued = set(changed)
+        while heap:
+            _d, n = heapq.heappop(heap)
+            before = (self.leaves[n], self.center[n])
+            self._measure(n)
+            p = self.parent[n]
+            if p is not None and p not in queued and (n in changed or before != (self.leaves[n], self.center[n])):
+                queued.add(p)
+                heapq.heappush(heap, (-self.depth[p], p))
+        self._positions = None
+        return True
+
+    def positions(self):
+        """{name: (x, y)} top-left corners of the visible nodes."""
+        if self._positions is not None:
+            return self._positions
+        spacing = self.NODE_H + self.V_GAP
+        col = self.NODE_W + self.H_GAP
+        out = {}
+        stack = []
+        top = 0
+        for r in self.roots:
+            if self.parent.get(r, 0) is None and r not in out:
+                out[r] = None  # placeholder: a duplicated root name is laid out once
+                stack.append((r, top))
+                top += self.leaves[r] * spacing
+        # Pop in reverse so siblings are emitted top to bottom (matches the old recursive order)
+        stack.reverse()
+        while stack:
+            name, block_top = stack.pop()
+            out[name] = (self.depth[name] * col, block_top + self.center[name] - self.NODE_H / 2)
+            placed = []
+            for c in self.visible_children(name):
+                placed.append((c, block_top))
+                block_top += self.leaves[c] * spacing
+            stack.extend(reversed(placed))
+        self._positions = out
+        return out
+
+
+from PyQt5.QtWidgets import QGraphicsItem, QGraphicsPathItem, QStyle, QStyleOptionGraphicsItem
+from PyQt5.QtGui import QStaticText, QFontMetricsF
+
+
+class TreeNodeItem(QGraphicsItem):
+    """One project-tree node painted in a single item: box, progress strip, collapse triangle,
+    title and status line. Text uses QStaticText laid out on first paint; below LOD_TEXT zoom
+    only the box and progress strip are drawn."""
+    LOD_TEXT = 0.4
+    TOGGLE_W = 12
+
+    def __init__(self, name, w, h, status, pc, has_children, collapsed, fonts):
+        super().__init__()
+        from PyQt5.QtGui import QColor
+        self.name = name
+        self._w, self._h = w, h
+        self.pc = pc
+        self.has_children = has_children
+        self.collapsed = collapsed
+        self._fonts = fonts  # (title QFont, meta QFont), shared by every node of one refresh
+        s = status.lower()
+        if s == 'done':
+            self._color = QColor('#235f23')
+        elif s in ('blocked', 'deferred'):
+            self._color = QColor('#5f2323')
+        elif s in ('in progress', 'at risk'):
+            self._color = QColor('#5f4a23')
+        else:
+            self._color = QColor('#2f2f2f')
+        self._title = name if len(name) <= 40 else name[:37] + '…'
+        self._meta = f"{status or ''}  {pc}%".strip()
+        self._static = None  # (title QStaticText, x, meta QStaticText or None, x, y) once laid out
+        from PyQt5.QtCore import QRectF
+        self._rect = QRectF(0, 0, w, h)
+        self.setData(0, name)
+        self.setFlag(QGraphicsItem.ItemIsSelectable, True)
+
+    def boundingRect(self):
+        return self._rect
+
+    def set_collapsed(self, collapsed):
+        if collapsed != self.collapsed:
+            self.collapsed = collapsed
+            self.update()
+
+    def toggle_hit(self, scene_pos):
+        """True when scene_pos falls on the collapse/expand triangle."""
+        if not self.has_children:
+            return False
+        p = self.mapFromScene(scene_pos)
+        cy = self._h / 2
+        return 2 <= p.x() <= 10 + self.TOGGLE_W and cy - self.TOGGLE_W <= p.y() <= cy + self.TOGGLE_W
+
+    def _layout_text(self):
+        title_font, meta_font = self._fonts
+        title = QStaticText(self._title)
+        title.setTextFormat(Qt.PlainText)
+        title.prepare(font=title_font)
+        tx = (self._w - QFontMetricsF(title_font).horizontalAdvance(self._title)) / 2
+        meta = mx = my = None
+        if self._meta:
+            meta = QStaticText(self._meta)
+            meta.setTextFormat(Qt.PlainText)
+            meta.prepare(font=meta_font)
+            fm = QFontMetricsF(meta_font)
+            mx = (self._w - fm.horizontalAdvance(self._meta)) / 2
+            my = self._h - fm.height() - 16
+        self._static = (title, tx, meta, mx, my)
+
+    def paint(self, painter, option, widget=None):
+        from PyQt5.QtGui import QColor, QPen, QPolygonF
+        from PyQt5.QtCore import QPointF
+        w, h = self._w, self._h
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        detailed = lod >= self.LOD_TEXT
+        painter.setPen(QPen(QColor('#888')) if detailed else Qt.NoPen)
+        painter.setBrush(self._color)
+        painter.drawRect(self.boundingRect())
+        if self.pc > 0:
+            painter.fillRect(0, int(h - 8), int((self.pc / 100) * w), 8, QColor('#FF8200'))
+        if not detailed:
+            return
+        if option.state & QStyle.State_Selected:
+            pen = QPen(QColor('#FF8200')); pen.setStyle(Qt.DashLine)
+            painter.setPen(pen); painter.setBrush(Qt.NoBrush)
+            painter.drawRect(self.boundingRect().adjusted(1, 1, -1, -1))
+        if self.has_children:
+            t = self.TOGGLE_W; cy = h / 2
+            if self.collapsed:
+                pts = [QPointF(6, cy - t/2), QPointF(6, cy + t/2), QPointF(6 + t, cy)]
+            else:
+                pts = [QPointF(6, cy - t/2), QPointF(6 + t, cy - t/2), QPointF(6 + t/2, cy + t/2)]
+            painter.setPen(QColor('#ddd')); painter.setBrush(QColor('#ddd'))
+            painter.drawPolygon(QPolygonF(pts))
+        if self._static is None:
+            self._layout_text()
+        title, tx, meta, mx, my = self._static
+        title_font, meta_font = self._fonts
+        painter.setFont(title_font)
+        painter.setPen(QColor('white'))
+        painter.drawStaticText(QPointF(tx, 10), title)
+        if meta is not None:
+            painter.setFont(meta_font)
+            painter.setPen(QColor('#dddddd'))
+            painter.drawStaticText(QPointF(mx, my), meta)
+
+
 class ProjectTreeView(QWidget):
     """Horizontal left-to-right branching tree visualization (graphics based).
     Replaces prior multi-column QTreeWidget with a schematic layout closer to the web app's
@@ -2669,7 +5072,7 @@ class ProjectTreeView(QWidget):
             from PyQt5.QtCore import QTimer
             self._minimap_timer = QTimer(self)
             self._minimap_timer.setSingleShot(True)
-            self._minimap_timer.timeout.connect(self._update_minimap)
+            self._minimap_timer.timeout.connect(self._update_minimap_viewport)
             def schedule_minimap():
                 try:
                     self._minimap_timer.start(120)
@@ -2685,8 +5088,7 @@ class ProjectTreeView(QWidget):
             def mini_click(ev):
                 if ev.button() == Qt.LeftButton:
                     scene_pt = self._mini_view.mapToScene(ev.pos())
-                    # scale factor used in _update_minimap
-                    scale_factor = 0.12
+                    scale_factor = self.MINIMAP_SCALE
                     from PyQt5.QtCore import QRectF
                     # Center main view around corresponding point
                     center_target = QPointF(scene_pt.x()/scale_factor, scene_pt.y()/scale_factor)
@@ -2699,7 +5101,7 @@ class ProjectTreeView(QWidget):
                             self.view.fitInView(new_rect, Qt.KeepAspectRatio)
                     except Exception:
                         self.view.fitInView(new_rect, Qt.KeepAspectRatio)
-                    self._update_minimap()
+                    self._update_minimap_viewport()
                 orig_press(ev)
             from PyQt5.QtCore import QPointF
             self._mini_view.mousePressEvent = mini_click
@@ -2721,161 +5123,127 @@ class ProjectTreeView(QWidget):
                 roots.append(name)
         return roots, children
 
-    def _compute_layout(self, roots, children):
-        # Tidy-ish layout: allocate vertical space proportional to leaf count
-        node_w, node_h = 180, 46
-        h_gap, v_gap = 80, 24
-        leaf_spacing = node_h + v_gap
-        positions = {}
-        def count_leaves(name, visited=None):
-            if visited is None: visited = set()
-            if name in visited: return 1
-            visited.add(name)
-            ch = children.get(name, [])
-            if not ch: return 1
-            return sum(count_leaves(c, visited.copy()) for c in ch)
-        y_cursor = 0
-        def place(name, depth, y_start):
-            ch = children.get(name, [])
-            if name in self._collapsed:
-                ch = []  # treat as leaf visually
-            if not ch:
-                y_center = y_start + node_h/2
-                positions[name] = (depth*(node_w+h_gap), y_center - node_h/2)
-                return y_center, y_start + leaf_spacing
-            # place children first
-            child_centers = []
-            cur_y = y_start
-            for c in sorted(ch, key=lambda s: s.lower()):
-                cc, cur_y = place(c, depth+1, cur_y)
-                child_centers.append(cc)
-            y_center = sum(child_centers)/len(child_centers)
-            positions[name] = (depth*(node_w+h_gap), y_center - node_h/2)
-            return y_center, cur_y
-        for r in sorted(roots, key=lambda s: s.lower()):
-            _c, y_cursor = place(r, 0, y_cursor)
-        return positions, (node_w, node_h)
+    def _compute_layout(self):
+        """TreeLayout for the current rows, reused while the model's data version is unchanged;
+        collapse/expand only re-measures the toggled branches."""
+        key = (getattr(self.model, 'data_version', None), id(getattr(self.model, 'rows', None)))
+        layout = getattr(self, '_tree_layout', None)
+        if layout is None or self._tree_layout_key != key or key[0] is None:
+            roots, children = self._build_hierarchy()
+            layout = TreeLayout(roots, children, self._collapsed)
+            self._tree_layout = layout
+            self._tree_layout_key = key
+        else:
+            layout.set_collapsed(self._collapsed)
+        return layout
 
     # -------- Rendering --------
+    @timed('render.tree', note=lambda res, self: {'nodes': len(self._name_to_item),
+                                                  'items': len(self._name_to_item) + len(self._connector_items)})
     def refresh(self):
+        layout = self._compute_layout()
+        # Same layout object as the scene shows: only collapse state moved, so keep the node items
+        if layout is getattr(self, '_drawn_layout', None) and self._name_to_item:
+            self._sync_scene(layout)
+            self._update_scene_rect()
+            self._update_minimap(self._mini_dirty)
+            return
         self.scene.clear()
         self._name_to_item.clear()
-        roots, children = self._build_hierarchy()
-        if not roots:
+        self._connector_items = {}  # parent -> (endpoints, QGraphicsPathItem)
+        self._drawn_layout = None
+        if not layout.roots:
             self.scene.addText("(No data)")
+            self._update_minimap()
             return
-        positions, (node_w, node_h) = self._compute_layout(roots, children)
-        from PyQt5.QtGui import QPen, QColor, QBrush, QFont
-        # Draw connectors first
-        pen_conn = QPen(QColor(150,150,150))
-        pen_conn.setWidth(2)
-        for parent, chs in children.items():
-            if parent not in positions: continue
-            px, py = positions[parent]
-            for c in chs:
-                if c not in positions: continue
-                if parent in self._collapsed:
-                    continue
-                cx, cy = positions[c]
-                # Parent right middle to child left middle via elbow
-                p_mid = (px+node_w, py + node_h/2)
-                c_mid = (cx, cy + node_h/2)
-                mid_x = (p_mid[0] + c_mid[0]) / 2
-                self.scene.addLine(p_mid[0], p_mid[1], mid_x, p_mid[1], pen_conn)
-                self.scene.addLine(mid_x, p_mid[1], mid_x, c_mid[1], pen_conn)
-                self.scene.addLine(mid_x, c_mid[1], c_mid[0], c_mid[1], pen_conn)
-        # Draw nodes
-        font = self.font()
-        for name, (x, y) in positions.items():
-            row = self._name_to_row.get(name, {})
-            pc = 0
-            try:
-                pc = int(row.get('% Complete') or 0)
-            except Exception:
-                pc = 0
-            status = (row.get('Status') or '').strip()
-            base_color = QColor('#2f2f2f')
-            if status.lower() == 'done':
-                base_color = QColor('#235f23')
-            elif status.lower() in ('blocked','deferred'):
-                base_color = QColor('#5f2323')
-            elif status.lower() in ('in progress', 'at risk'):
-                base_color = QColor('#5f4a23')
-            rect_item = self.scene.addRect(x, y, node_w, node_h, QPen(QColor('#888')), QBrush(base_color))
-            rect_item.setData(0, name)
-            rect_item.setFlag(rect_item.ItemIsSelectable, True)
-            try:
-                # Ensure hover events fire at scene level
-                rect_item.setAcceptHoverEvents(True)
-            except Exception:
-                pass
-            # Collapse/expand indicator if has children
-            if name in children and children[name]:
-                tri_w = 12; tri_h = 12
-                from PyQt5.QtGui import QPolygonF
-                from PyQt5.QtCore import QPointF
-                if name in self._collapsed:
-                    pts = [QPointF(x+6, y+node_h/2 - tri_h/2), QPointF(x+6, y+node_h/2 + tri_h/2), QPointF(x+6+tri_w, y+node_h/2)]
-                else:
-                    pts = [QPointF(x+6, y+node_h/2 - tri_h/2), QPointF(x+6+tri_w, y+node_h/2 - tri_h/2), QPointF(x+6+tri_w/2, y+node_h/2 + tri_h/2)]
-                poly = self.scene.addPolygon(QPolygonF(pts), QPen(QColor('#ddd')), QBrush(QColor('#ddd')))
-                poly.setData(0, f"__toggle__::{name}")
-                poly.setZValue(rect_item.zValue()+3)
-                try:
-                    poly.setAcceptHoverEvents(True)
-                except Exception:
-                    pass
-            # Progress overlay
-            if pc > 0:
-                prog_w = int((pc/100)*node_w)
-                prog = self.scene.addRect(x, y+node_h-8, prog_w, 8, QPen(Qt.NoPen), QBrush(QColor('#FF8200')))
-                prog.setZValue(rect_item.zValue()+1)
-                try:
-                    prog.setData(0, name)
-                    prog.setAcceptHoverEvents(True)
-                except Exception:
-                    pass
-            # Text (wrap / elide simple)
-            txt = name
-            if len(txt) > 40:
-                txt = txt[:37] + '…'
-            text_item = self.scene.addText(txt)
-            f = QFont(font)
-            f.setPointSize(f.pointSize()-1)
-            f.setBold(True)
-            text_item.setFont(f)
-            text_item.setDefaultTextColor(QColor('white'))
-            br = text_item.boundingRect()
-            text_item.setPos(x + (node_w - br.width())/2, y + 6)
-            text_item.setZValue(rect_item.zValue()+2)
-            try:
-                # Carry the name so hover/click on text resolves the part
-                text_item.setData(0, name)
-                text_item.setAcceptHoverEvents(True)
-            except Exception:
-                pass
-            # Status / percent line
-            meta_line = f"{status or ''}  {pc}%".strip()
-            if meta_line:
-                meta_item = self.scene.addText(meta_line)
-                f2 = QFont(font); f2.setPointSize(f2.pointSize()-2)
-                meta_item.setFont(f2)
-                meta_item.setDefaultTextColor(QColor('#dddddd'))
-                mbr = meta_item.boundingRect()
-                meta_item.setPos(x + (node_w - mbr.width())/2, y + node_h - mbr.height() - 12)
-                meta_item.setZValue(rect_item.zValue()+2)
-                try:
-                    meta_item.setData(0, name)
-                    meta_item.setAcceptHoverEvents(True)
-                except Exception:
-                    pass
-            self._name_to_item[name] = rect_item
-        # Interaction
-        self.scene.installEventFilter(self)
-        # Autosize scene rect
+        from PyQt5.QtGui import QFont
+        title_font = QFont(self.font())
+        title_font.setPointSize(title_font.pointSize()-1)
+        title_font.setBold(True)
+        meta_font = QFont(self.font())
+        meta_font.setPointSize(meta_font.pointSize()-2)
+        self._node_fonts = (title_font, meta_font)
+        self._drawn_layout = layout
+        self._sync_scene(layout)
+        self._finish_refresh()
+
+    def _sync_scene(self, layout):
+        """Bring node items and connector paths in line with layout.positions(): visible nodes are
+        created or moved, hidden ones removed, and each parent's elbows are one QGraphicsPathItem."""
+        from PyQt5.QtGui import QPen, QColor, QPainterPath
+        positions = layout.positions()
+        node_w, node_h = layout.NODE_W, layout.NODE_H
+        dirty = self._mini_dirty = []  # scene rects whose minimap pixels are stale
+        for name in [n for n in self._name_to_item if n not in positions]:
+            item = self._name_to_item.pop(name)
+            dirty.append(item.sceneBoundingRect())
+            self.scene.removeItem(item)
+        for name, (x, y) in positions.items():
+            item = self._name_to_item.get(name)
+            if item is None:
+                row = self._name_to_row.get(name, {})
+                try:
+                    pc = int(row.get('% Complete') or 0)
+                except Exception:
+                    pc = 0
+                item = TreeNodeItem(name, node_w, node_h, (row.get('Status') or '').strip(), pc,
+                                    bool(layout.children.get(name)), layout.is_collapsed(name), self._node_fonts)
+                item.setPos(x, y)
+                self.scene.addItem(item)
+                self._name_to_item[name] = item
+                dirty.append(item.sceneBoundingRect())
+            else:
+                if item.x() != x or item.y() != y:
+                    dirty.append(item.sceneBoundingRect())
+                    item.setPos(x, y)
+                    dirty.append(item.sceneBoundingRect())
+                item.set_collapsed(layout.is_collapsed(name))
+        # Connector paths are keyed by parent and rebuilt only when their endpoints moved
+        pen_conn = QPen(QColor(150,150,150))
+        pen_conn.setWidth(2)
+        old = self._connector_items
+        self._connector_items = {}
+        for parent, (px, py) in positions.items():
+            kids = layout.visible_children(parent)
+            if not kids:
+                continue
+            ends = (px, py, tuple(positions[c] for c in kids))
+            prev = old.pop(parent, None)
+            if prev is not None and prev[0] == ends:
+                self._connector_items[parent] = prev
+                continue
+            # Parent right middle to each child's left middle via an elbow
+            path = QPainterPath()
+            p_mid = (px+node_w, py + node_h/2)
+            for cx, cy in ends[2]:
+                mid_x = (p_mid[0] + cx) / 2
+                path.moveTo(p_mid[0], p_mid[1])
+                path.lineTo(mid_x, p_mid[1])
+                path.lineTo(mid_x, cy + node_h/2)
+                path.lineTo(cx, cy + node_h/2)
+            if prev is not None:
+                path_item = prev[1]
+                path_item.setPath(path)
+            else:
+                path_item = QGraphicsPathItem(path)
+                path_item.setPen(pen_conn)
+                path_item.setZValue(-1)
+                self.scene.addItem(path_item)
+            self._connector_items[parent] = (ends, path_item)
+        for _ends, path_item in old.values():
+            self.scene.removeItem(path_item)
+
+    def _update_scene_rect(self):
         r = self.scene.itemsBoundingRect()
         padded = r.adjusted(-40, -40, 40, 40)
         self.scene.setSceneRect(padded)
+        return padded
+
+    def _finish_refresh(self):
+        # Interaction
+        self.scene.installEventFilter(self)
+        # Autosize scene rect
+        padded = self._update_scene_rect()
         # Capture deterministic initial view rectangle once
         try:
             if getattr(self, '_initial_view_rect', None) is None or getattr(self._initial_view_rect, 'isNull', lambda: False)():
@@ -2902,7 +5270,7 @@ class ProjectTreeView(QWidget):
                 if hasattr(self, '_minimap_timer'):
                     self._minimap_timer.start(120)
                 else:
-                    self._update_minimap()
+                    self._update_minimap_viewport()
             except Exception:
                 pass
         if event.type() == QEvent.GraphicsSceneMousePress:
@@ -2910,8 +5278,8 @@ class ProjectTreeView(QWidget):
             if item:
                 name = item.data(0)
                 if isinstance(name, str) and name:
-                    if name.startswith("__toggle__::"):
-                        target = name.split("::",1)[1]
+                    if isinstance(item, TreeNodeItem) and item.toggle_hit(event.scenePos()):
+                        target = name
                         if target in self._collapsed:
                             self._collapsed.remove(target)
                         else:
@@ -2963,7 +5331,7 @@ class ProjectTreeView(QWidget):
             target_name = None
             if item:
                 d = item.data(0)
-                if isinstance(d, str) and d and not d.startswith("__toggle__::"):
+                if isinstance(d, str) and d:
                     target_name = d
             self._show_context_menu(event.screenPos(), target_name)
         elif event.type() == QEvent.GraphicsSceneHoverMove:
@@ -2997,7 +5365,14 @@ class ProjectTreeView(QWidget):
         return super().eventFilter(obj, event)
 
     # -------- Minimap --------
-    def _update_minimap(self):
+    # The node overview is rasterized once into a low-resolution pixmap when the scene content
+    # changes (only dirty regions on collapse/expand); panning and zooming just move the viewport box.
+    MINIMAP_SCALE = 0.12     # minimap scene units per main scene unit
+    MINIMAP_MAX_PX = 2048    # longest side of the cached pixmap
+
+    def _update_minimap(self, dirty=None):
+        """Re-render the cached minimap pixmap (whole scene, or only the dirty scene rects when the
+        cached area still covers the scene) and then the viewport box."""
         if not hasattr(self, '_mini_scene'):
             return
         try:
@@ -3006,32 +5381,96 @@ class ProjectTreeView(QWidget):
         except Exception:
             return
         try:
-            self._mini_scene.clear()
-        except Exception:
+            src = self.scene.sceneRect()
+            cache = getattr(self, '_mini_cache', None)  # (pixmap item, source rect, pixels per scene unit)
+            if dirty is None or cache is None or not cache[1].contains(src):
+                self._render_minimap(src)
+            elif dirty:
+                from PyQt5.QtCore import QRectF
+                if len(dirty) > 64:
+                    u = QRectF(dirty[0])
+                    for r in dirty[1:]:
+                        u = u.united(r)
+                    dirty = [u]
+                item, csrc, px = cache
+                pm = item.pixmap()
+                pad = 2 / px  # two pixels, so antialiased edges of the old boxes are cleared too
+                for r in dirty:
+                    self._paint_minimap_nodes(pm, csrc, px, r.adjusted(-pad, -pad, pad, pad).intersected(csrc))
+                item.setPixmap(pm)
+        except Exception as e:
+            print(f"Minimap render failed: {e}")
+        self._update_minimap_viewport(fit=True)
+
+    def _render_minimap(self, src):
+        from PyQt5.QtGui import QPixmap
+        from PyQt5.QtWidgets import QGraphicsPixmapItem
+        if src.isEmpty():
             return
-        # Render simplified rectangles from main scene
-        scale_factor = 0.12
-        for it in self.scene.items():
-            try:
-                if it.data(0):
-                    from PyQt5.QtGui import QBrush, QColor
-                    r = it.sceneBoundingRect()
-                    rect = self._mini_scene.addRect(r.x()*scale_factor, r.y()*scale_factor, r.width()*scale_factor, r.height()*scale_factor,
-                                                    pen=Qt.NoPen, brush=QBrush(QColor(255,130,0,90)))
-            except Exception:
-                pass
-        # Viewport box
+        px = min(self.MINIMAP_SCALE, self.MINIMAP_MAX_PX / max(src.width(), src.height()))
+        pm = QPixmap(max(1, int(src.width() * px) + 1), max(1, int(src.height() * px) + 1))
+        self._paint_minimap_nodes(pm, src, px, src)
+        cache = getattr(self, '_mini_cache', None)
+        item = cache[0] if cache is not None else None
+        if item is None or item.scene() is not self._mini_scene:
+            item = QGraphicsPixmapItem()
+            item.setTransformationMode(Qt.SmoothTransformation)
+            self._mini_scene.addItem(item)
+        item.setPixmap(pm)
+        item.setPos(src.x() * self.MINIMAP_SCALE, src.y() * self.MINIMAP_SCALE)
+        item.setScale(self.MINIMAP_SCALE / px)
+        self._mini_cache = (item, src, px)
+
+    def _paint_minimap_nodes(self, pm, src, px, region):
+        """Clear region (scene coords) of the cached pixmap and redraw the node boxes inside it."""
+        from PyQt5.QtGui import QPainter, QColor
+        if region.isEmpty():
+            return
+        if region == src:
+            pm.fill(Qt.transparent)
+            items = self._name_to_item.values()
+        else:
+            items = [it for it in self.scene.items(region) if isinstance(it, TreeNodeItem)]
+        p = QPainter(pm)
         try:
-            from PyQt5.QtGui import QPen, QColor, QBrush
-            vr = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
-            vp = self._mini_scene.addRect(vr.x()*scale_factor, vr.y()*scale_factor, vr.width()*scale_factor, vr.height()*scale_factor,
-                                          pen=QPen(QColor('#ffffff')), brush=QBrush(Qt.NoBrush))
-            vp.setZValue(999)
-        except Exception:
-            pass
-        # Fit minimap view
+            p.setRenderHint(QPainter.Antialiasing, True)
+            p.scale(px, px)
+            p.translate(-src.x(), -src.y())
+            if region != src:
+                p.setCompositionMode(QPainter.CompositionMode_Clear)
+                p.fillRect(region, Qt.transparent)
+                p.setCompositionMode(QPainter.CompositionMode_SourceOver)
+            p.setClipRect(region)
+            color = QColor(255,130,0,90)
+            for it in items:
+                p.fillRect(it.sceneBoundingRect(), color)
+        finally:
+            p.end()
+
+    def _update_minimap_viewport(self, fit=False):
+        """Move the viewport box over the cached minimap; no re-rendering."""
+        if not hasattr(self, '_mini_scene'):
+            return
         try:
-            self._mini_view.fitInView(self._mini_scene.itemsBoundingRect().adjusted(-4,-4,4,4), Qt.KeepAspectRatio)
+            from PyQt5.QtGui import QPen, QColor
+            from PyQt5.QtWidgets import QGraphicsRectItem
+            k = self.MINIMAP_SCALE
+            vr = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+            box = getattr(self, '_mini_viewport_item', None)
+            if box is None or box.scene() is not self._mini_scene:
+                box = QGraphicsRectItem()
+                box.setPen(QPen(QColor('#ffffff')))
+                box.setBrush(Qt.NoBrush)
+                box.setZValue(999)
+                self._mini_scene.addItem(box)
+                self._mini_viewport_item = box
+            box.setRect(vr.x()*k, vr.y()*k, vr.width()*k, vr.height()*k)
+            if fit:
+                cache = getattr(self, '_mini_cache', None)
+                if cache is not None:
+                    target = cache[0].sceneBoundingRect()
+                    self._mini_scene.setSceneRect(target.united(box.rect()).adjusted(-4,-4,4,4))
+                    self._mini_view.fitInView(target.adjusted(-4,-4,4,4), Qt.KeepAspectRatio)
         except Exception:
             pass
 
@@ -3066,16 +5505,19 @@ class ProjectTreeView(QWidget):
         elif chosen == act_collapse:
             self._collapse_subtree(name)
 
-    def _expand_subtree(self, name):
-        queue = [name]
+    def _subtree_names(self, name):
+        children = self._compute_layout().children
+        out = []; seen = set(); queue = [name]
         while queue:
             n = queue.pop()
-            if n in self._collapsed:
-                self._collapsed.remove(n)
-            # add children
-            for r in self.model.rows:
-                if r.get('Parent') == n:
-                    queue.append(r.get('Project Part',''))
+            if n in seen:
+                continue
+            seen.add(n); out.append(n)
+            queue.extend(children.get(n, ()))
+        return out
+
+    def _expand_subtree(self, name):
+        self._collapsed.difference_update(self._subtree_names(name))
         # Persist
         try:
             from PyQt5.QtCore import QSettings
@@ -3086,13 +5528,7 @@ class ProjectTreeView(QWidget):
         self.refresh()
 
     def _collapse_subtree(self, name):
-        queue = [name]
-        while queue:
-            n = queue.pop()
-            self._collapsed.add(n)
-            for r in self.model.rows:
-                if r.get('Parent') == n:
-                    queue.append(r.get('Project Part',''))
+        self._collapsed.update(self._subtree_names(name))
         try:
             from PyQt5.QtCore import QSettings
             _ts = QSettings('LSI','ProjectApp')
@@ -3134,13 +5570,10 @@ class ProjectTreeView(QWidget):
             new_parent = combo.currentText()
             if new_parent == "<None>":
                 new_parent = None
-            for r in self.model.rows:
-                if r.get('Project Part') == target_name:
-                    r['Parent'] = new_parent
-                    break
+            self.model.set_part_fields(target_name, {'Parent': new_parent or ''})
             try:
-                if hasattr(self.model, 'save_to_db'):
-                    self.model.save_to_db()
+                if hasattr(self.model, 'save_async'):
+                    self.model.save_async()
             except Exception as e:
                 print(f"Reparent save failed: {e}")
             self.refresh()
@@ -3153,11 +5586,10 @@ class ProjectTreeView(QWidget):
         out = set(); queue = [name]
         while queue:
             n = queue.pop()
-            for r in self.model.rows:
-                if r.get('Parent') == n:
-                    child = r.get('Project Part','')
-                    if child and child not in out:
-                        out.add(child); queue.append(child)
+            for r in self.model.children_of(n):
+                child = r.get('Project Part','')
+                if child and child not in out:
+                    out.add(child); queue.append(child)
         return out
 
     def _show_image_for_row(self, row):
@@ -3357,6 +5789,9 @@ from PyQt5.QtWidgets import QGraphicsView
 from PyQt5.QtCore import Qt
 
 class ZoomableGraphicsView(QGraphicsView):
+    from PyQt5.QtCore import pyqtSignal
+    viewportChanged = pyqtSignal()  # scroll, resize or zoom changed the visible scene area
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._zoom = 0
@@ -3380,20 +5815,35 @@ class ZoomableGraphicsView(QGraphicsView):
         else:
             super().keyPressEvent(event)
 
+    def scrollContentsBy(self, dx, dy):
+        super().scrollContentsBy(dx, dy)
+        self.viewportChanged.emit()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.viewportChanged.emit()
+
+    def fitInView(self, *args, **kwargs):
+        super().fitInView(*args, **kwargs)
+        self.viewportChanged.emit()
+
     def zoomIn(self):
         self._zoom += 1
         self.scale(1.2, 1.2)
         self._persist_zoom()
+        self.viewportChanged.emit()
 
     def zoomOut(self):
         self._zoom -= 1
         self.scale(1/1.2, 1/1.2)
         self._persist_zoom()
+        self.viewportChanged.emit()
 
     def resetZoom(self):
         self.resetTransform()
         self._zoom = 0
         self._persist_zoom()
+        self.viewportChanged.emit()
 
     def setSettingsKey(self, key: str):
         self._settings_key = key
@@ -3423,13 +5873,352 @@ class ZoomableGraphicsView(QGraphicsView):
                     self.resetTransform()
                     # apply uniform scale on both axes
                     self.scale(scale_factor, scale_factor)
+                    self.viewportChanged.emit()
                 except Exception:
                     pass
         except Exception:
             pass
 
 
+# --- Gantt virtualization ---
+# render_gantt computes a _GanttLayout (plain geometry, no Qt objects); GanttChartView then
+# materializes scene items only for the part of the layout that intersects the viewport.
+class _GanttBarSpec:
+    __slots__ = ("name", "x", "y", "w", "row", "pc", "outline", "critical", "display_name", "baseline")
+
+    def __init__(self, name, x, y, w, row, pc, outline, critical, display_name):
+        self.name = name
+        self.x = x
+        self.y = y
+        self.w = w
+        self.row = row
+        self.pc = pc
+        self.outline = outline          # None, 'overdue' or 'risk'
+        self.critical = critical
+        self.display_name = display_name
+        self.baseline = None            # (x0, x1) when a baseline overlay applies
+
+    def state(self):
+        return (self.name, self.x, self.y, self.w, self.pc, self.outline, self.critical,
+                self.display_name, self.baseline)
+
+
+class _GanttSlot:
+    """Reusable bundle of scene items that renders one bar (bar, progress, label, label bg, baseline)."""
+    __slots__ = ("bar", "prog", "text", "bg", "baseline", "labels")
+
+
+class _GanttLayout:
+    def __init__(self):
+        self.bars = []          # _GanttBarSpec, ordered by y
+        self.by_name = {}
+        self.segments = []      # (kind, x1, y1, x2, y2, parts)
+        self.backdrops = []     # (kind, x0, width), ordered by x0
+        self.ticks = []         # (x, label), ordered by x
+        self.bar_height = 24
+        self.pitch = 34
+        self.shade_height = 0
+        self.axis_x0 = self.axis_x1 = self.axis_y = 0
+        self.scene_rect = (0, 0, 800, 300)
+        self.virtual = False
+        self._bar_ys = []
+        self._backdrop_xs = []
+        self._tick_xs = []
+        self._seg_boxes = None
+
+    def same_frame(self, other):
+        """True when other has the same rows, date axis and shading, so items can be updated in place."""
+        return (self.virtual == other.virtual and self.scene_rect == other.scene_rect
+                and (self.axis_x0, self.axis_x1, self.axis_y) == (other.axis_x0, other.axis_x1, other.axis_y)
+                and self.ticks == other.ticks and self.backdrops == other.backdrops
+                and len(self.bars) == len(other.bars)
+                and all(a.name == b.name and a.y == b.y for a, b in zip(self.bars, other.bars)))
+
+    def add_segment(self, kind, x1, y1, x2, y2, parts):
+        self.segments.append((kind, x1, y1, x2, y2, parts))
+
+    def finalize(self):
+        self._bar_ys = [b.y for b in self.bars]
+        self._backdrop_xs = [b[1] for b in self.backdrops]
+        self._tick_xs = [t[0] for t in self.ticks]
+        boxes = [(min(s[1], s[3]), min(s[2], s[4]), max(s[1], s[3]), max(s[2], s[4])) for s in self.segments]
+        try:
+            import numpy as np
+            self._seg_boxes = np.array(boxes, dtype=float).reshape(-1, 4)
+        except Exception:
+            self._seg_boxes = boxes
+
+    def bar_range(self, top, bottom):
+        import bisect
+        lo = bisect.bisect_left(self._bar_ys, top - self.bar_height)
+        hi = bisect.bisect_right(self._bar_ys, bottom)
+        return range(lo, hi)
+
+    def backdrop_range(self, left, right):
+        import bisect
+        # Weekend runs are at most a few days wide
+        return range(bisect.bisect_left(self._backdrop_xs, left - 40), bisect.bisect_right(self._backdrop_xs, right))
+
+    def tick_range(self, left, right):
+        import bisect
+        # Tick labels extend ~30px left and ~60px right of the tick
+        return range(bisect.bisect_left(self._tick_xs, left - 80), bisect.bisect_right(self._tick_xs, right + 40))
+
+    def segments_in(self, left, top, right, bottom):
+        boxes = self._seg_boxes
+        if boxes is None or len(boxes) == 0:
+            return []
+        if isinstance(boxes, list):
+            return [i for i, (x0, y0, x1, y1) in enumerate(boxes)
+                    if x0 <= right and x1 >= left and y0 <= bottom and y1 >= top]
+        import numpy as np
+        mask = (boxes[:, 0] <= right) & (boxes[:, 2] >= left) & (boxes[:, 1] <= bottom) & (boxes[:, 3] >= top)
+        return np.nonzero(mask)[0].tolist()
+
+
+from PyQt5.QtWidgets import QGraphicsRectItem, QGraphicsLineItem, QGraphicsItem
+from PyQt5.QtGui import QPen as _QPen
+from PyQt5.QtCore import QPropertyAnimation, pyqtProperty
+
+
+class ClickableBar(QGraphicsRectItem):
+    def __init__(self, x, y, w, h, row_dict, preview_label, gantt_view):
+        super().__init__(x, y, w, h)
+        self.row = row_dict
+        self.preview_label = preview_label
+        self.gantt_view = gantt_view
+        self.setAcceptHoverEvents(True)
+        self.setFlag(QGraphicsItem.ItemIsSelectable, True)
+
+    # --- Attachment utilities ---
+    def _attachments_list(self):
+        import json
+        raw = self.row.get("Attachments") or "[]"
+        try:
+            lst = json.loads(raw)
+            if isinstance(lst, list):
+                return [p for p in lst if isinstance(p, str)]
+        except Exception:
+            pass
+        return []
+    def _save_attachments_list(self, lst):
+        import json
+        value = json.dumps(lst)
+        # Persist via model if parent widget exposes one; set_part_fields notifies the other views
+        pw = self.preview_label.parentWidget()
+        if pw and hasattr(pw, 'model'):
+            try:
+                pw.model.set_part_fields(self.row.get("Project Part", ""), {"Attachments": value})
+                pw.model.save_async()
+            except Exception as e:
+                print(f"Attachment save failed: {e}")
+        else:
+            self.row["Attachments"] = value
+    def contextMenuEvent(self, event):
+        from PyQt5.QtWidgets import QMenu
+        menu = QMenu()
+        open_action = menu.addAction("Open Attachments…")
+        add_action = menu.addAction("Add Attachment…")
+        open_folder_action = menu.addAction("Open Attachments Folder")
+        chosen = menu.exec_(event.screenPos())
+        if chosen == open_action:
+            self.show_attachments_dialog()
+        elif chosen == add_action:
+            self.add_attachment_files()
+        elif chosen == open_folder_action:
+            self.open_attachments_folder()
+    def add_attachment_files(self):
+        from PyQt5.QtWidgets import QFileDialog
+        import os, shutil
+        files, _ = QFileDialog.getOpenFileNames(None, "Select Attachment(s)")
+        if not files:
+            return
+        import sys
+        base_dir = os.path.dirname(resolve_resource_path("."))
+        attach_dir = os.path.join(base_dir, 'attachments')
+        if not os.path.exists(attach_dir):
+            os.makedirs(attach_dir)
+        current = self._attachments_list()
+        for f in files:
+            name = os.path.basename(f)
+            dest = os.path.join(attach_dir, name)
+            root, ext = os.path.splitext(name)
+            counter = 1
+            while os.path.exists(dest):
+                dest = os.path.join(attach_dir, f"{root}_{counter}{ext}")
+                counter += 1
+            try:
+                shutil.copy2(f, dest)
+                rel = os.path.relpath(dest, base_dir)
+                current.append(rel)
+            except Exception as e:
+                print(f"Attachment copy failed: {e}")
+        self._save_attachments_list(current)
+    def open_attachments_folder(self):
+        import os, sys, subprocess
+        base_dir = os.path.dirname(resolve_resource_path("."))
+        attach_dir = os.path.join(base_dir, 'attachments')
+        if not os.path.exists(attach_dir):
+            os.makedirs(attach_dir)
+        if sys.platform.startswith('win'):
+            os.startfile(attach_dir)
+        elif sys.platform == 'darwin':
+            subprocess.Popen(['open', attach_dir])
+        else:
+            subprocess.Popen(['xdg-open', attach_dir])
+    def show_attachments_dialog(self):
+        from PyQt5.QtWidgets import QDialog, QVBoxLayout, QListWidget, QPushButton, QHBoxLayout, QLabel
+        import os, webbrowser
+        dlg = QDialog()
+        dlg.setWindowTitle(f"Attachments - {self.row.get('Project Part','')}")
+        vbox = QVBoxLayout(dlg)
+        info = QLabel("Double-click or Open to launch. Remove only deletes reference.")
+        vbox.addWidget(info)
+        lst = QListWidget(); vbox.addWidget(lst)
+        thumb = QLabel(); thumb.setFixedHeight(110); vbox.addWidget(thumb)
+        btn_row = QHBoxLayout()
+        add_btn = QPushButton("Add…"); rem_btn = QPushButton("Remove"); open_btn = QPushButton("Open")
+        btn_row.addWidget(add_btn); btn_row.addWidget(rem_btn); btn_row.addWidget(open_btn)
+        vbox.addLayout(btn_row)
+        for p in self._attachments_list():
+            lst.addItem(p)
+        def refresh_thumb():
+            from PyQt5.QtGui import QPixmap
+            item = lst.currentItem()
+            if not item:
+                thumb.clear(); return
+            rel = item.text()
+            base_dir = os.path.dirname(resolve_resource_path("."))
+            full = os.path.join(base_dir, rel)
+            if os.path.exists(full) and os.path.splitext(full)[1].lower() in ('.png','.jpg','.jpeg','.bmp','.gif'):
+                pm = QPixmap(full)
+                if not pm.isNull():
+                    thumb.setPixmap(pm.scaledToHeight(100, Qt.SmoothTransformation)); return
+            thumb.setText(os.path.basename(full))
+        def do_add():
+            self.add_attachment_files(); lst.clear(); [lst.addItem(p) for p in self._attachments_list()]; refresh_thumb()
+        def do_remove():
+            item = lst.currentItem();
+            if not item: return
+            rel = item.text()
+            remain = [p for p in self._attachments_list() if p != rel]
+            self._save_attachments_list(remain)
+            lst.takeItem(lst.currentRow()); refresh_thumb()
+        def do_open():
+            item = lst.currentItem();
+            if not item: return
+            rel = item.text()
+            base_dir = os.path.dirname(resolve_resource_path("."))
+            full = os.path.join(base_dir, rel)
+            if os.path.exists(full):
+                webbrowser.open(full)
+        lst.currentItemChanged.connect(lambda *_: refresh_thumb())
+        lst.itemDoubleClicked.connect(lambda *_: do_open())
+        add_btn.clicked.connect(do_add)
+        rem_btn.clicked.connect(do_remove)
+        open_btn.clicked.connect(do_open)
+        refresh_thumb()
+        dlg.exec_()
+    def _set_preview(self):
+        img_path = self.row.get("Images", "")
+        if img_path and str(img_path).strip():
+            from PyQt5.QtGui import QPixmap
+            img_path_full = resolve_resource_path(img_path)
+            pm = QPixmap(img_path_full)
+            if not pm.isNull():
+                self.preview_label.setPixmap(pm.scaledToHeight(90, Qt.SmoothTransformation))
+                self.preview_label.setText("")
+                return
+        # Ensure QPixmap is imported when clearing
+        from PyQt5.QtGui import QPixmap
+        self.preview_label.setText("")
+        self.preview_label.setPixmap(QPixmap())
+    def mousePressEvent(self, event):
+        try:
+            self._set_preview()
+            parent_widget = self.preview_label.parentWidget()
+            if parent_widget and hasattr(parent_widget, 'show_edit_dialog'):
+                parent_widget.show_edit_dialog(self.row)
+        except Exception as e:
+            print(f"ERROR in ClickableBar.mousePressEvent: {e}")
+    def hoverEnterEvent(self, event):
+        self._set_preview()
+        part = self.row.get("Project Part", "")
+        if part:
+            self.gantt_view._highlight_connectors(part, True)
+        parent = self.row.get("Parent", "")
+        if parent:
+            self.gantt_view._highlight_connectors(parent, True)
+    def hoverLeaveEvent(self, event):
+        self.preview_label.clear()
+        part = self.row.get("Project Part", "")
+        if part:
+            self.gantt_view._highlight_connectors(part, False)
+        parent = self.row.get("Parent", "")
+        if parent:
+            self.gantt_view._highlight_connectors(parent, False)
+        # Fallback to first image attachment preview if no explicit image assigned
+        if not self.row.get("Images"):
+            atts = self._attachments_list()
+            if atts:
+                from PyQt5.QtGui import QPixmap
+                full = resolve_resource_path(atts[0])
+                if os.path.exists(full):
+                    pm = QPixmap(full)
+                    if not pm.isNull():
+                        self.preview_label.setPixmap(pm.scaledToHeight(90, Qt.SmoothTransformation))
+                        self.preview_label.setText("")
+
+
+class _AnimatedConnector(QGraphicsLineItem):
+    def __init__(self, x1, y1, x2, y2, base_pen, highlight_pen, style):
+        super().__init__(x1, y1, x2, y2)
+        self._base_pen = _QPen(base_pen)
+        self._highlight_pen = _QPen(highlight_pen)
+        if style == 'trunk':
+            self._base_pen.setStyle(Qt.DashLine)
+            self._base_pen.setWidth(2)
+            self._highlight_pen.setWidth(3)
+        else:
+            self._base_pen.setWidth(1)
+            self._highlight_pen.setWidth(2)
+        self.setPen(self._base_pen)
+        self._opacity = 0.55
+        self._anim = None
+        self._apply_opacity()
+    def _apply_opacity(self):
+        p = self.pen()
+        c = p.color()
+        c.setAlphaF(self._opacity)
+        p.setColor(c)
+        self.setPen(p)
+    def getOpacity(self):
+        return self._opacity
+    def setOpacity(self, val):
+        self._opacity = val
+        self._apply_opacity()
+    opacity = pyqtProperty(float, fget=getOpacity, fset=setOpacity)
+    def fade(self, target, duration):
+        if self._anim:
+            self._anim.stop()
+        self._anim = QPropertyAnimation(self, b"opacity")
+        self._anim.setDuration(duration)
+        self._anim.setStartValue(self._opacity)
+        self._anim.setEndValue(target)
+        self._anim.start()
+    def set_highlight(self, on):
+        if on:
+            self.setPen(self._highlight_pen)
+            self.fade(1.0, 180)
+        else:
+            self.setPen(self._base_pen)
+            self.fade(0.55, 260)
+
+
 class GanttChartView(QWidget):
+    # Charts with more bars than this only materialize scene items near the viewport
+    VIRTUALIZE_MIN_ROWS = 300
+
     # --- Filtering Support (extensible for future filter panel) ---
     def _init_filters(self):
         # Stored criteria; None / empty means no filtering
@@ -3519,6 +6308,14 @@ class GanttChartView(QWidget):
                     item.setPen(item.data(99) or QPen(item.pen()))
         except Exception:
             pass
+        self._highlighted_bar = part_name
+        # In a virtualized chart the bar may not exist yet: scroll to its layout position first
+        layout = getattr(self, '_gantt_layout', None)
+        spec = layout.by_name.get(part_name) if layout is not None else None
+        if spec is not None and part_name not in self._name_to_rect and hasattr(self, 'view') and self.view:
+            from PyQt5.QtCore import QPointF
+            self.view.centerOn(QPointF(spec.x + spec.w / 2, spec.y + layout.bar_height / 2))
+            self._sync_gantt_items()
         rect_item = getattr(self, '_name_to_rect', {}).get(part_name)
         if rect_item:
             from PyQt5.QtGui import QPen, QColor
@@ -3818,7 +6615,6 @@ class GanttChartView(QWidget):
                     suggest_label.setText(" | ".join(txt) if txt else "")
             except Exception:
                 pass
-        from PyQt5.QtWidgets import QLabel, QHBoxLayout
         suggest_label = QLabel("")
         suggest_label.setStyleSheet("color:#bbb; font-size:11px")
         apply_box = QHBoxLayout()
@@ -3838,86 +6634,88 @@ class GanttChartView(QWidget):
         apply_box.addWidget(apply_inst_btn)
         def save():
             try:
+                # Edit a copy; the model applies it (and notifies the other views) once validated
+                new = dict(row)
                 for col in self.model.COLUMNS:
                     widget = edits[col]
                     if isinstance(widget, QLineEdit):
-                        row[col] = widget.text()
+                        new[col] = widget.text()
                     elif isinstance(widget, QComboBox):
-                        row[col] = widget.currentText()
-                        if col == "Status" and row[col] == "Done" and str(row.get("% Complete")) != "100":
-                            row["% Complete"] = 100
+                        new[col] = widget.currentText()
+                        if col == "Status" and new[col] == "Done" and str(new.get("% Complete")) != "100":
+                            new["% Complete"] = 100
                             import datetime as _dt
-                            if not row.get("Actual Start Date"):
-                                row["Actual Start Date"] = _dt.datetime.today().strftime("%m-%d-%Y")
-                            if not row.get("Actual Finish Date"):
-                                row["Actual Finish Date"] = _dt.datetime.today().strftime("%m-%d-%Y")
-                        if col == "Status" and row[col] == "In Progress" and not row.get("Actual Start Date"):
+                            if not new.get("Actual Start Date"):
+                                new["Actual Start Date"] = _dt.datetime.today().strftime("%m-%d-%Y")
+                            if not new.get("Actual Finish Date"):
+                                new["Actual Finish Date"] = _dt.datetime.today().strftime("%m-%d-%Y")
+                        if col == "Status" and new[col] == "In Progress" and not new.get("Actual Start Date"):
                             import datetime as _dt
-                            row["Actual Start Date"] = _dt.datetime.today().strftime("%m-%d-%Y")
+                            new["Actual Start Date"] = _dt.datetime.today().strftime("%m-%d-%Y")
                     elif isinstance(widget, QDateEdit):
                         d = widget.date()
                         min_blank = QDate(1753, 1, 1)
                         if not d.isValid() or d == min_blank:
-                            row[col] = ""
+                            new[col] = ""
                         else:
-                            row[col] = d.toString("MM-dd-yyyy")
+                            new[col] = d.toString("MM-dd-yyyy")
                     elif hasattr(widget, 'value') and col == "% Complete":
                         try:
-                            row[col] = int(widget.value())
-                            if int(row[col]) >= 100:
-                                row[col] = 100
-                                if row.get("Status") != "Done":
-                                    row["Status"] = "Done"
+                            new[col] = int(widget.value())
+                            if int(new[col]) >= 100:
+                                new[col] = 100
+                                if new.get("Status") != "Done":
+                                    new["Status"] = "Done"
                                     import datetime as _dt
-                                    if not row.get("Actual Start Date"):
-                                        row["Actual Start Date"] = _dt.datetime.today().strftime("%m-%d-%Y")
-                                    if not row.get("Actual Finish Date"):
-                                        row["Actual Finish Date"] = _dt.datetime.today().strftime("%m-%d-%Y")
+                                    if not new.get("Actual Start Date"):
+                                        new["Actual Start Date"] = _dt.datetime.today().strftime("%m-%d-%Y")
+                                    if not new.get("Actual Finish Date"):
+                                        new["Actual Finish Date"] = _dt.datetime.today().strftime("%m-%d-%Y")
                         except Exception:
-                            row[col] = 0
+                            new[col] = 0
                     elif isinstance(widget, QTextEdit):
-                        row[col] = widget.toPlainText()
+                        new[col] = widget.toPlainText()
                     elif hasattr(widget, 'value') and col in ("Fabrication Labor Hours", "Installation Labor Hours"):
                         try:
-                            row[col] = f"{float(widget.value()):.1f}"
+                            new[col] = f"{float(widget.value()):.1f}"
                         except Exception:
-                            row[col] = "0.0"
+                            new[col] = "0.0"
                     elif hasattr(widget, 'value') and col in ("Production Price", "Installation Price", "Production Cost", "Installation Cost", "Material Cost", "Labor Rate", "Install Labor Rate", "Equipment Cost", "Permit/Eng Cost"):
                         try:
-                            row[col] = f"{float(widget.value()):.2f}"
+                            new[col] = f"{float(widget.value()):.2f}"
                         except Exception:
-                            row[col] = "0.00"
+                            new[col] = "0.00"
                     elif hasattr(widget,'value') and col in ("Contingency %","Warranty Reserve %"):
                         try:
-                            row[col] = f"{float(widget.value()):.1f}"
+                            new[col] = f"{float(widget.value()):.1f}"
                         except Exception:
-                            row[col] = "0.0"
+                            new[col] = "0.0"
                 # Derive production / installation cost if material & labor hour info present
                 try:
                     from math import isnan
-                    mat = float(row.get('Material Cost') or 0)
-                    fab_h = float(row.get('Fabrication Labor Hours') or 0)
-                    inst_h = float(row.get('Installation Labor Hours') or 0)
-                    rate = float(row.get('Labor Rate') or 0)
-                    inst_rate = float(row.get('Install Labor Rate') or rate)
-                    equip = float(row.get('Equipment Cost') or 0)
-                    permit = float(row.get('Permit/Eng Cost') or 0)
-                    if (mat or fab_h or inst_h) and (not row.get('Production Cost') or not row.get('Installation Cost')):
+                    mat = float(new.get('Material Cost') or 0)
+                    fab_h = float(new.get('Fabrication Labor Hours') or 0)
+                    inst_h = float(new.get('Installation Labor Hours') or 0)
+                    rate = float(new.get('Labor Rate') or 0)
+                    inst_rate = float(new.get('Install Labor Rate') or rate)
+                    equip = float(new.get('Equipment Cost') or 0)
+                    permit = float(new.get('Permit/Eng Cost') or 0)
+                    if (mat or fab_h or inst_h) and (not new.get('Production Cost') or not new.get('Installation Cost')):
                         prod_cost_calc = mat + fab_h * rate
                         inst_cost_calc = inst_h * inst_rate + equip + permit
-                        if not row.get('Production Cost'):
-                            row['Production Cost'] = f"{prod_cost_calc:.2f}"
-                        if not row.get('Installation Cost'):
-                            row['Installation Cost'] = f"{inst_cost_calc:.2f}"
+                        if not new.get('Production Cost'):
+                            new['Production Cost'] = f"{prod_cost_calc:.2f}"
+                        if not new.get('Installation Cost'):
+                            new['Installation Cost'] = f"{inst_cost_calc:.2f}"
                 except Exception:
                     pass
                 # Validation: price below cost warning
                 try:
                     from PyQt5.QtWidgets import QMessageBox as _QB
-                    pcost = float(row.get('Production Cost') or 0)
-                    icost = float(row.get('Installation Cost') or 0)
-                    pprice = float(row.get('Production Price') or 0)
-                    iprice = float(row.get('Installation Price') or 0)
+                    pcost = float(new.get('Production Cost') or 0)
+                    icost = float(new.get('Installation Cost') or 0)
+                    pprice = float(new.get('Production Price') or 0)
+                    iprice = float(new.get('Installation Price') or 0)
                     warn_msgs = []
                     if pprice and pcost and pprice < pcost:
                         warn_msgs.append(f"Production price ${pprice:,.2f} < cost ${pcost:,.2f}")
@@ -3929,7 +6727,19 @@ class GanttChartView(QWidget):
                             return
                 except Exception:
                     pass
-                self.model.save_to_db()
+                old_name, old_parent = row.get("Project Part", ""), row.get("Parent", "")
+                values = {c: new.get(c, "") for c in self.model.COLUMNS if new.get(c, "") != row.get(c, "")}
+                # End dates and roll-ups are re-derived now rather than in the deferred save, so the
+                # chart rendered below already shows the edit
+                with self.model.batch():
+                    self.model.set_part_fields(old_name, values)
+                    target = self.model.row_by_name(new.get("Project Part", "")) or row
+                    self.model.update_calculated_end_date(target)
+                    if old_name != new.get("Project Part", "") or old_parent != new.get("Parent", ""):
+                        self.model.rollup_progress()  # hierarchy changed: every view rebuilds anyway
+                    else:
+                        self.model.rollup_ancestors(old_name)
+                self.model.save_async()
                 self.render_gantt(self.model)
                 dialog.accept()
             except Exception as e:
@@ -3983,7 +6793,14 @@ class GanttChartView(QWidget):
                     item.setDefaultTextColor(QColor("black"))
 
     def export_gantt_chart(self):
-        self._export_scene_with_header(self.scene, title="Gantt Chart")
+        # Exports cover the whole scene, so materialize every bar for the duration of the export
+        self._gantt_export_all = True
+        try:
+            self._sync_gantt_items(full=True)
+            self._export_scene_with_header(self.scene, title="Gantt Chart")
+        finally:
+            self._gantt_export_all = False
+            self._sync_gantt_items()
 
     def _export_scene_with_header(self, scene, title="Export"):
         from PyQt5.QtGui import QPainter
@@ -4200,6 +7017,8 @@ class GanttChartView(QWidget):
         self.scene = QGraphicsScene()
         self.view.setScene(self.scene)
         self.view.setSettingsKey("GanttZoom")
+        self._reset_gantt_items()
+        self.view.viewportChanged.connect(self._schedule_gantt_sync)
         layout.addWidget(self.view)
 
         self._init_filters()
@@ -4256,11 +7075,13 @@ class GanttChartView(QWidget):
             if ok and name:
                 try:
                     if hasattr(self, 'model') and self.model:
-                        self.model.save_baseline(name)
-                        self._populate_baselines()
-                        idx = self.baseline_combo.findText(name)
-                        if idx >= 0:
-                            self.baseline_combo.setCurrentIndex(idx)
+                        def saved(_res):
+                            self._populate_baselines()
+                            idx = self.baseline_combo.findText(name)
+                            if idx >= 0:
+                                self.baseline_combo.setCurrentIndex(idx)
+                        self.model.save_baseline_async(name, on_done=saved,
+                                                       on_error=lambda e: print(f"Save baseline failed: {e}"))
                 except Exception as e:
                     print(f"Save baseline failed: {e}")
         save_baseline_btn = QPushButton("Save Baseline…")
@@ -4282,7 +7103,7 @@ class GanttChartView(QWidget):
         fit_all_btn = QPushButton("Fit All")
         fit_sel_btn = QPushButton("Fit Sel")
         def _fit_all():
-            r = self.scene.itemsBoundingRect()
+            r = self._gantt_fit_rect()
             if not r.isNull():
                 self.view.fitInView(r, Qt.KeepAspectRatio)
         fit_all_btn.clicked.connect(_fit_all)
@@ -4330,10 +7151,14 @@ class GanttChartView(QWidget):
             return
         try:
             scale_x = self.view.transform().m11()
-            if abs(scale_x - 1.0) < 0.001:
+            layout = getattr(self, '_gantt_layout', None)
+            if layout is not None and layout.virtual:
+                # Fitting thousands of rows leaves nothing readable; start at 1:1 from the top
+                self.view.ensureVisible(0, 0, 1, 1)
+            elif abs(scale_x - 1.0) < 0.001:
                 from PyQt5.QtCore import QTimer
                 def do_fit():
-                    r = self.scene.itemsBoundingRect()
+                    r = self._gantt_fit_rect()
                     if not r.isNull():
                         self.view.fitInView(r, Qt.KeepAspectRatio)
                 QTimer.singleShot(0, do_fit)
@@ -4418,61 +7243,21 @@ class GanttChartView(QWidget):
                             bg.setBrush(orig_brush)
                         else:
                             bg.setBrush(QBrush(QColor("#FF8200")))
+    @timed('render.gantt', note=lambda res, self, model: {'rows': len(getattr(model, 'rows', ())),
+                                                          'items': len(self.scene.items())})
     def render_gantt(self, model):
+        """Lay out the chart and bring the scene up to date.
+        When only bar contents changed (same rows, same date range) existing items are updated in
+        place, which keeps zoom, scroll position and highlights; otherwise the scene is rebuilt."""
         self.model = model
-        self.scene.clear()
         self.preview_label.clear()
         if not hasattr(model, 'rows'):
+            self._clear_gantt_scene()
             return
         raw_rows = model.rows
-        # Precompute critical path set for filtering/highlighting
-        self._current_critical_set = set()
+        # Critical path set for filtering/highlighting (cached on the model between renders)
         try:
-            import datetime as _dt
-            name_to_row_cp = {r.get("Project Part", ""): r for r in raw_rows}
-            graph = {}
-            for r in raw_rows:
-                nm = r.get("Project Part", "")
-                preds_raw = (r.get("Predecessors") or "").strip()
-                preds = [p.strip() for p in preds_raw.split(',') if p.strip()] if preds_raw else []
-                graph[nm] = preds
-            visited = set(); order = []
-            def dfs(n):
-                if n in visited: return
-                visited.add(n)
-                for p in graph.get(n, []):
-                    if p in name_to_row_cp:
-                        dfs(p)
-                order.append(n)
-            for n in graph:
-                dfs(n)
-            es = {}; ef = {}
-            for n in order:
-                r = name_to_row_cp.get(n) or {}
-                s_str = r.get("Start Date", "")
-                try:
-                    s_dt = _dt.datetime.strptime(s_str, "%m-%d-%Y") if s_str else None
-                    dur = int(r.get("Duration (days)") or 0)
-                except Exception:
-                    s_dt = None; dur = 0
-                pred_finishes = [ef[p] for p in graph.get(n, []) if p in ef]
-                base = max(pred_finishes) if pred_finishes else s_dt
-                if base is None:
-                    base = _dt.datetime.today()
-                es[n] = base
-                ef[n] = base + _dt.timedelta(days=dur)
-            if order:
-                proj_finish = max(ef.values())
-                ls = {}; lf = {}
-                for n in reversed(order):
-                    succs = [s for s, preds in graph.items() if n in preds]
-                    if not succs:
-                        lf[n] = proj_finish
-                    else:
-                        lf[n] = min(ls[s] for s in succs)
-                    dur = (ef[n] - es[n]).days
-                    ls[n] = lf[n] - _dt.timedelta(days=dur)
-                self._current_critical_set = {n for n in order if abs((es[n]-ls[n]).days) <= 0}
+            self._current_critical_set = model.schedule().critical if hasattr(model, 'schedule') else set()
         except Exception:
             self._current_critical_set = set()
 
@@ -4486,17 +7271,16 @@ class GanttChartView(QWidget):
                 self._filter_critical_only, self._filter_risk_only]):
             parent_names_needed = set()
             for r in matched:
-                parent_name = r.get("Parent") or ""
-                while parent_name:
-                    if parent_name in parent_names_needed:
-                        break
-                    parent_names_needed.add(parent_name)
-                    parent_row = next((x for x in raw_rows if x.get("Project Part") == parent_name), None)
-                    if parent_row:
-                        parent_name = parent_row.get("Parent") or ""
-                    else:
-                        break
-            rows = [r for r in raw_rows if r in matched or r.get("Project Part") in parent_names_needed]
+                if hasattr(model, 'ancestors_of'):
+                    parent_names_needed.update(model.ancestors_of(r.get("Project Part", "")))
+                else:
+                    parent_name = r.get("Parent") or ""
+                    while parent_name and parent_name not in parent_names_needed:
+                        parent_names_needed.add(parent_name)
+                        parent_row = name_to_row.get(parent_name)
+                        parent_name = (parent_row.get("Parent") or "") if parent_row else ""
+            matched_ids = {id(r) for r in matched}
+            rows = [r for r in raw_rows if id(r) in matched_ids or r.get("Project Part") in parent_names_needed]
         else:
             rows = raw_rows
 
@@ -4525,22 +7309,33 @@ class GanttChartView(QWidget):
                 p = r.get("Parent", "")
                 if p:
                     children.setdefault(p, []).append(r)
+            spans = {}  # id(row) -> (start, end); each subtree is evaluated once
             def update_span(r, visited=None):
                 if visited is None:
                     visited = set()
                 name = r.get("Project Part", "")
                 if name in visited:
                     return None, None
+                if id(r) in spans:
+                    return spans[id(r)]
                 visited.add(name)
+                spans[id(r)] = _span(r, name, visited)
+                visited.discard(name)
+                return spans[id(r)]
+            def _span(r, name, visited):
+                # Drop spans left over from an earlier render (the part may have lost its children)
+                r.pop("_auto_start", None)
+                r.pop("_auto_end", None)
                 if name not in children:
                     try:
-                        s = _dt.datetime.strptime(r.get("Start Date", ""), "%m-%d-%Y")
+                        sd = parse_mdy(r.get("Start Date", ""))
+                        s = _dt.datetime(sd.year, sd.month, sd.day)
                         d = int(r.get("Duration (days)", 0))
                         e = s + _dt.timedelta(days=d)
                         return s, e
                     except Exception:
                         return None, None
-                child_spans = [update_span(c, visited.copy()) for c in children[name]]
+                child_spans = [update_span(c, visited) for c in children[name]]
                 starts = [s for s, e in child_spans if s]
                 ends = [e for s, e in child_spans if e]
                 if starts and ends:
@@ -4554,6 +7349,7 @@ class GanttChartView(QWidget):
         compute_parent_spans(rows)
         rows = topo_sort(rows)
         if not rows:
+            self._clear_gantt_scene()
             return
 
         # ---------- Build bar data ----------
@@ -4588,317 +7384,31 @@ class GanttChartView(QWidget):
             bars.append((r.get("Project Part", ""), start, duration, idx, r))
 
         if not bars:
+            self._clear_gantt_scene()
             return
 
         chart_min_date = min_date  # earliest start
 
-    # ---------- Draw bars ----------
-        from PyQt5.QtGui import QColor
-        from PyQt5.QtWidgets import QGraphicsRectItem, QGraphicsItem
-        gantt_color = QColor("#FF8200")
-
         # Optional critical path calculation
         critical_set = set()
         if hasattr(self, 'critical_path_checkbox') and self.critical_path_checkbox.isChecked():
-            try:
-                # Build dependency graph and durations
-                name_to_row = {r.get("Project Part", ""): r for r in rows}
-                graph = {}
-                duration_map = {}
-                import datetime as _dt_cp
-                for r in rows:
-                    name = r.get("Project Part", "")
-                    deps = [d.strip() for d in (r.get("Dependencies", "") or "").split(',') if d.strip()]
-                    graph[name] = deps
-                    try:
-                        if "_auto_start" in r and "_auto_end" in r:
-                            duration_map[name] = (r["_auto_end"] - r["_auto_start"]).days
-                        else:
-                            duration_map[name] = int(r.get("Duration (days)", 0) or 0)
-                    except Exception:
-                        duration_map[name] = 0
-                # Topological order (simple DFS; assumes no complex cycles)
-                visited = set(); order = []
-                def dfs(n):
-                    if n in visited: return
-                    for d in graph.get(n, []): dfs(d)
-                    visited.add(n); order.append(n)
-                for n in graph: dfs(n)
-                # Forward pass: earliest finish
-                earliest_finish = {}
-                earliest_start = {}
-                for n in order:
-                    deps = graph.get(n, [])
-                    if not deps:
-                        # Use explicit start date if available for alignment; else zero
-                        row = name_to_row.get(n, {})
-                        try:
-                            if "_auto_start" in row:
-                                est = row["_auto_start"]
-                            else:
-                                est = datetime.datetime.strptime(row.get("Start Date", ""), "%m-%d-%Y")
-                        except Exception:
-                            est = min_date
-                        earliest_start[n] = est
-                    else:
-                        # earliest start is max earliest finish of deps
-                        ef_candidates = []
-                        for d in deps:
-                            if d in earliest_finish:
-                                ef_candidates.append(earliest_finish[d])
-                        base = max(ef_candidates) if ef_candidates else min_date
-                        earliest_start[n] = base
-                    earliest_finish[n] = earliest_start[n] + datetime.timedelta(days=duration_map.get(n,0))
-                project_finish = max(earliest_finish.values()) if earliest_finish else None
-                # Backward pass: latest start
-                latest_start = {}; latest_finish = {}
-                for n in reversed(order):
-                    # Successors: tasks that depend on n
-                    succs = [k for k,v in graph.items() if n in v]
-                    if not succs:
-                        latest_finish[n] = project_finish
-                    else:
-                        latest_finish[n] = min([latest_start[s] for s in succs]) if succs else project_finish
-                    latest_start[n] = latest_finish[n] - datetime.timedelta(days=duration_map.get(n,0))
-                # Critical tasks: zero total float (allow <= 0 days tolerance)
-                for n in order:
-                    if abs((earliest_start[n] - latest_start[n]).days) <= 0:
-                        critical_set.add(n)
-            except Exception as e:
-                print(f"WARNING: Critical path calculation failed: {e}")
-
-        class ClickableBar(QGraphicsRectItem):
-            def __init__(self, x, y, w, h, row_dict, preview_label, gantt_view):
-                super().__init__(x, y, w, h)
-                self.row = row_dict
-                self.preview_label = preview_label
-                self.gantt_view = gantt_view
-                self.setAcceptHoverEvents(True)
-                self.setFlag(QGraphicsItem.ItemIsSelectable, True)
-
-            # --- Attachment utilities ---
-            def _attachments_list(self):
-                import json
-                raw = self.row.get("Attachments") or "[]"
-                try:
-                    lst = json.loads(raw)
-                    if isinstance(lst, list):
-                        return [p for p in lst if isinstance(p, str)]
-                except Exception:
-                    pass
-                return []
-            def _save_attachments_list(self, lst):
-                import json
-                self.row["Attachments"] = json.dumps(lst)
-                # Persist via model if parent widget exposes save_model()
-                pw = self.preview_label.parentWidget()
-                if pw and hasattr(pw, 'model'):
-                    try:
-                        pw.model.save_to_db()
-                    except Exception as e:
-                        print(f"Attachment save failed: {e}")
-            def contextMenuEvent(self, event):
-                from PyQt5.QtWidgets import QMenu
-                menu = QMenu()
-                open_action = menu.addAction("Open Attachments…")
-                add_action = menu.addAction("Add Attachment…")
-                open_folder_action = menu.addAction("Open Attachments Folder")
-                chosen = menu.exec_(event.screenPos())
-                if chosen == open_action:
-                    self.show_attachments_dialog()
-                elif chosen == add_action:
-                    self.add_attachment_files()
-                elif chosen == open_folder_action:
-                    self.open_attachments_folder()
-            def add_attachment_files(self):
-                from PyQt5.QtWidgets import QFileDialog
-                import os, shutil
-                files, _ = QFileDialog.getOpenFileNames(None, "Select Attachment(s)")
-                if not files:
-                    return
-                import sys
-                base_dir = os.path.dirname(resolve_resource_path("."))
-                attach_dir = os.path.join(base_dir, 'attachments')
-                if not os.path.exists(attach_dir):
-                    os.makedirs(attach_dir)
-                current = self._attachments_list()
-                for f in files:
-                    name = os.path.basename(f)
-                    dest = os.path.join(attach_dir, name)
-                    root, ext = os.path.splitext(name)
-                    counter = 1
-                    while os.path.exists(dest):
-                        dest = os.path.join(attach_dir, f"{root}_{counter}{ext}")
-                        counter += 1
-                    try:
-                        shutil.copy2(f, dest)
-                        rel = os.path.relpath(dest, base_dir)
-                        current.append(rel)
-                    except Exception as e:
-                        print(f"Attachment copy failed: {e}")
-                self._save_attachments_list(current)
-            def open_attachments_folder(self):
-                import os, sys, subprocess
-                base_dir = os.path.dirname(resolve_resource_path("."))
-                attach_dir = os.path.join(base_dir, 'attachments')
-                if not os.path.exists(attach_dir):
-                    os.makedirs(attach_dir)
-                if sys.platform.startswith('win'):
-                    os.startfile(attach_dir)
-                elif sys.platform == 'darwin':
-                    subprocess.Popen(['open', attach_dir])
-                else:
-                    subprocess.Popen(['xdg-open', attach_dir])
-            def show_attachments_dialog(self):
-                from PyQt5.QtWidgets import QDialog, QVBoxLayout, QListWidget, QPushButton, QHBoxLayout, QLabel
-                import os, webbrowser
-                dlg = QDialog()
-                dlg.setWindowTitle(f"Attachments - {self.row.get('Project Part','')}")
-                vbox = QVBoxLayout(dlg)
-                info = QLabel("Double-click or Open to launch. Remove only deletes reference.")
-                vbox.addWidget(info)
-                lst = QListWidget(); vbox.addWidget(lst)
-                thumb = QLabel(); thumb.setFixedHeight(110); vbox.addWidget(thumb)
-                btn_row = QHBoxLayout()
-                add_btn = QPushButton("Add…"); rem_btn = QPushButton("Remove"); open_btn = QPushButton("Open")
-                btn_row.addWidget(add_btn); btn_row.addWidget(rem_btn); btn_row.addWidget(open_btn)
-                vbox.addLayout(btn_row)
-                for p in self._attachments_list():
-                    lst.addItem(p)
-                def refresh_thumb():
-                    from PyQt5.QtGui import QPixmap
-                    item = lst.currentItem()
-                    if not item:
-                        thumb.clear(); return
-                    rel = item.text()
-                    base_dir = os.path.dirname(resolve_resource_path("."))
-                    full = os.path.join(base_dir, rel)
-                    if os.path.exists(full) and os.path.splitext(full)[1].lower() in ('.png','.jpg','.jpeg','.bmp','.gif'):
-                        pm = QPixmap(full)
-                        if not pm.isNull():
-                            thumb.setPixmap(pm.scaledToHeight(100, Qt.SmoothTransformation)); return
-                    thumb.setText(os.path.basename(full))
-                def do_add():
-                    self.add_attachment_files(); lst.clear(); [lst.addItem(p) for p in self._attachments_list()]; refresh_thumb()
-                def do_remove():
-                    item = lst.currentItem();
-                    if not item: return
-                    rel = item.text()
-                    remain = [p for p in self._attachments_list() if p != rel]
-                    self._save_attachments_list(remain)
-                    lst.takeItem(lst.currentRow()); refresh_thumb()
-                def do_open():
-                    item = lst.currentItem();
-                    if not item: return
-                    rel = item.text()
-                    base_dir = os.path.dirname(resolve_resource_path("."))
-                    full = os.path.join(base_dir, rel)
-                    if os.path.exists(full):
-                        webbrowser.open(full)
-                lst.currentItemChanged.connect(lambda *_: refresh_thumb())
-                lst.itemDoubleClicked.connect(lambda *_: do_open())
-                add_btn.clicked.connect(do_add)
-                rem_btn.clicked.connect(do_remove)
-                open_btn.clicked.connect(do_open)
-                refresh_thumb()
-                dlg.exec_()
-            def _set_preview(self):
-                img_path = self.row.get("Images", "")
-                if img_path and str(img_path).strip():
-                    from PyQt5.QtGui import QPixmap
-                    img_path_full = resolve_resource_path(img_path)
-                    pm = QPixmap(img_path_full)
-                    if not pm.isNull():
-                        self.preview_label.setPixmap(pm.scaledToHeight(90, Qt.SmoothTransformation))
-                        self.preview_label.setText("")
-                        return
-                # Ensure QPixmap is imported when clearing
-                from PyQt5.QtGui import QPixmap
-                self.preview_label.setText("")
-                self.preview_label.setPixmap(QPixmap())
-            def mousePressEvent(self, event):
-                try:
-                    self._set_preview()
-                    parent_widget = self.preview_label.parentWidget()
-                    if parent_widget and hasattr(parent_widget, 'show_edit_dialog'):
-                        parent_widget.show_edit_dialog(self.row)
-                except Exception as e:
-                    print(f"ERROR in ClickableBar.mousePressEvent: {e}")
-            def hoverEnterEvent(self, event):
-                self._set_preview()
-                part = self.row.get("Project Part", "")
-                if part:
-                    self.gantt_view._highlight_connectors(part, True)
-                parent = self.row.get("Parent", "")
-                if parent:
-                    self.gantt_view._highlight_connectors(parent, True)
-            def hoverLeaveEvent(self, event):
-                self.preview_label.clear()
-                part = self.row.get("Project Part", "")
-                if part:
-                    self.gantt_view._highlight_connectors(part, False)
-                parent = self.row.get("Parent", "")
-                if parent:
-                    self.gantt_view._highlight_connectors(parent, False)
-                # Fallback to first image attachment preview if no explicit image assigned
-                if not self.row.get("Images"):
-                    atts = self._attachments_list()
-                    if atts:
-                        from PyQt5.QtGui import QPixmap
-                        full = resolve_resource_path(atts[0])
-                        if os.path.exists(full):
-                            pm = QPixmap(full)
-                            if not pm.isNull():
-                                self.preview_label.setPixmap(pm.scaledToHeight(90, Qt.SmoothTransformation))
-                                self.preview_label.setText("")
+            critical_set = set(self._current_critical_set)
 
-        name_to_bar = {}
-        self._name_to_rect = {}
-        bar_items = []
-        # (Reverted) Previously labels were placed in a dedicated left column and bars were offset.
-        # We now restore inline style with external labels to the right of bars.
-        from PyQt5.QtGui import QFontMetrics, QFont
-        font = self.font() if hasattr(self, 'font') else None
-        fm = QFontMetrics(font) if font else None
+        # ---------- Layout (geometry only; scene items are materialized per viewport) ----------
+        import json as _json_attlabel
+        px_day = 10
+        bar_offset_x = 60
         max_chars_fixed = 32  # keep truncation behavior
-        left_margin = 60
-        bar_offset_x = left_margin
-        self._name_to_text_item = {}
-        # Weekend/holiday background shading for full chart span
-        try:
-            from PyQt5.QtGui import QBrush
-            from datetime import timedelta
-            shade_wknd = QBrush(QColor(220,220,220,120))
-            holidays = load_holiday_dates()
-            shade_hol = QBrush(QColor(255,215,0,60))
-            cur = chart_min_date
-            while cur <= max_date:
-                # weekend
-                if cur.weekday() >= 5:
-                    run_start = cur
-                    while cur <= max_date and cur.weekday() >= 5:
-                        cur += timedelta(days=1)
-                    run_end = cur
-                    x0 = (run_start - chart_min_date).days * 10 + bar_offset_x
-                    x1 = (run_end - chart_min_date).days * 10 + bar_offset_x
-                    self.scene.addRect(x0, 0, max(1, x1-x0), len(bars)*(bar_height+bar_gap)+80, pen=Qt.NoPen, brush=shade_wknd)
-                else:
-                    # holidays (single days)
-                    if cur.date() in holidays:
-                        x0 = (cur - chart_min_date).days * 10 + bar_offset_x
-                        self.scene.addRect(x0, 0, 10, len(bars)*(bar_height+bar_gap)+80, pen=Qt.NoPen, brush=shade_hol)
-                    cur += timedelta(days=1)
-        except Exception:
-            pass
-
+        pitch = bar_height + bar_gap
+        today = datetime.datetime.today()
+        L = _GanttLayout()
+        L.bar_height = bar_height
+        L.pitch = pitch
+        name_to_bar = {}
         for name, start, duration, i, r in bars:
-            x = (start - chart_min_date).days * 10 + bar_offset_x
-            y = i * (bar_height + bar_gap) + 40
-            width = max(duration * 10, 10)
-            rect = ClickableBar(x, y, width, bar_height, r, self.preview_label, self)
-            rect.setBrush(QColor("#333333"))
-            from PyQt5.QtGui import QPen as _QPen4
-            import datetime as _dt_ov
+            x = (start - chart_min_date).days * px_day + bar_offset_x
+            y = i * pitch + 40
+            width = max(duration * px_day, 10)
             overdue = False; at_risk = False
             try:
                 if "_auto_end" in r:
@@ -4906,10 +7416,9 @@ class GanttChartView(QWidget):
                 else:
                     end_calc = r.get("Calculated End Date", "")
                     if end_calc:
-                        scheduled_end = _dt_ov.datetime.strptime(end_calc, "%m-%d-%Y")
+                        scheduled_end = datetime.datetime.strptime(end_calc, "%m-%d-%Y")
                     else:
-                        scheduled_end = start + _dt_ov.timedelta(days=duration)
-                today = _dt_ov.datetime.today()
+                        scheduled_end = start + datetime.timedelta(days=duration)
                 pc_val = int(r.get("% Complete") or 0)
                 status_val = (r.get("Status") or "").strip()
                 if pc_val < 100 and today.date() > scheduled_end.date():
@@ -4918,30 +7427,13 @@ class GanttChartView(QWidget):
                     at_risk = True
             except Exception:
                 pass
-            outline_pen = _QPen4(Qt.NoPen)
-            if overdue:
-                outline_pen = _QPen4(QColor("red")); outline_pen.setWidth(2)
-            elif at_risk:
-                outline_pen = _QPen4(QColor("#FFA500")); outline_pen.setWidth(2)
-            rect.setPen(outline_pen)
-            self.scene.addItem(rect)
-            self._name_to_rect[name] = rect
             try:
                 pc = int(r.get("% Complete") or 0)
             except Exception:
                 pc = 0
-            if pc > 0:
-                prog_w = max(2, int(width * pc / 100))
-                prog_color = QColor("#DAA520") if name in critical_set else gantt_color
-                from PyQt5.QtGui import QPen as _QPen3
-                prog_rect = self.scene.addRect(x, y, prog_w, bar_height, _QPen3(Qt.NoPen), prog_color)
-                prog_rect.setAcceptedMouseButtons(Qt.NoButton)
-                prog_rect.setZValue(rect.zValue() + 1)
-            full_name = name
-            display_name = full_name
+            display_name = name
             # Paperclip if attachments present
             try:
-                import json as _json_attlabel
                 att_raw = r.get("Attachments") or "[]"
                 att_list = _json_attlabel.loads(att_raw) if att_raw else []
                 if isinstance(att_list, list) and len(att_list) > 0:
@@ -4950,206 +7442,99 @@ class GanttChartView(QWidget):
                 pass
             if len(display_name) > max_chars_fixed:
                 display_name = display_name[:max_chars_fixed-1] + "…"
-            text_item = self.scene.addText(display_name)
-            from PyQt5.QtGui import QColor as _QColor, QFont, QBrush, QPen
-            text_item.setDefaultTextColor(_QColor("black"))
-            orig_font = text_item.font()
-            text_item.setData(1, orig_font)
-            text_item.setData(2, full_name)  # store full for tooltip
-            text_item.setToolTip(full_name)
-            ty = y + (bar_height - text_item.boundingRect().height())/2
-            # Place label just to the right of the bar with small gap
-            gap = 6
-            text_item.setPos(x + width + gap, ty)
-            # Always-visible subtle contrasting background for readability
-            br = text_item.boundingRect().translated(text_item.pos())
-            from PyQt5.QtGui import QPen as _LblPen, QBrush as _LblBrush, QColor as _LblColor, QPainterPath as _LblPath
-            bg_color = _LblColor("#FF8200")  # orange background
-            padded = br.adjusted(-3,-1,3,1)
-            path = _LblPath()
-            radius = 6
-            path.addRoundedRect(padded, radius, radius)
-            bg_brush = _LblBrush(bg_color)
-            bg_rect = self.scene.addPath(path, _LblPen(Qt.NoPen), bg_brush)
-            bg_rect.setZValue(text_item.zValue()-1)
-            text_item.setData(3, bg_rect)  # store bg rect
-            text_item.setData(4, bg_brush)  # store original brush
-            self._name_to_text_item[name] = text_item
+            spec = _GanttBarSpec(name, x, y, width, r, pc, 'overdue' if overdue else ('risk' if at_risk else None),
+                                 name in critical_set, display_name)
+            L.bars.append(spec)
+            L.by_name.setdefault(name, spec)
             name_to_bar[name] = (x, y, width, bar_height)
-            bar_items.append((rect, r))
 
         # Baseline overlay (thin background lines)
         try:
             baseline_name = getattr(self, '_selected_baseline_name', None)
             if baseline_name:
                 bmap = self.model.load_baseline_map(baseline_name)
-                from PyQt5.QtGui import QPen
-                pen = QPen(QColor(150,150,150))
-                pen.setStyle(Qt.DashLine); pen.setWidth(1)
-                for name, pos in name_to_bar.items():
-                    if name in bmap:
-                        bs, be = bmap[name]
-                        import datetime as _dtb
+                for spec in L.bars:
+                    if spec.name in bmap:
+                        bs, be = bmap[spec.name]
                         try:
-                            if bs:
-                                s = _dtb.datetime.strptime(bs, "%m-%d-%Y")
-                            else:
-                                continue
-                            if be:
-                                e = _dtb.datetime.strptime(be, "%m-%d-%Y")
-                            else:
+                            if not bs or not be:
                                 continue
-                            x0 = (s - chart_min_date).days * 10 + bar_offset_x
-                            x1 = (e - chart_min_date).days * 10 + bar_offset_x
-                            y = pos[1] + pos[3]//2
-                            self.scene.addLine(x0, y, x1, y, pen)
+                            s_dt = datetime.datetime.strptime(bs, "%m-%d-%Y")
+                            e_dt = datetime.datetime.strptime(be, "%m-%d-%Y")
+                            spec.baseline = ((s_dt - chart_min_date).days * px_day + bar_offset_x,
+                                             (e_dt - chart_min_date).days * px_day + bar_offset_x)
                         except Exception:
                             pass
         except Exception as e:
             print(f"Baseline overlay failed: {e}")
 
-        # ---------- Selection handling ----------
-        self._bar_rect_to_row = {}
-        for rect, r in bar_items:
-            rect.setFlag(QGraphicsItem.ItemIsSelectable, True)
-            self._bar_rect_to_row[rect] = r
-        def on_selection_changed():
-            selected = [it for it in self.scene.selectedItems() if it in self._bar_rect_to_row]
-            if selected:
-                bar = selected[0]
-                try:
-                    if bar.scene() is not None:
-                        r = self._bar_rect_to_row[bar]
-                        self.show_edit_dialog(r)
-                        bar.setSelected(False)
-                except RuntimeError:
-                    pass
+        # Weekend/holiday background shading for full chart span
+        L.shade_height = len(bars)*pitch+80
         try:
-            self.scene.selectionChanged.disconnect()
-        except TypeError:
+            cal = get_business_calendar()
+            for run_start, run_end in cal.weekend_runs(chart_min_date, max_date):
+                x0 = (run_start - chart_min_date).days * px_day + bar_offset_x
+                x1 = (run_end - chart_min_date).days * px_day + bar_offset_x
+                L.backdrops.append(('weekend', x0, max(1, x1-x0)))
+            # holidays (single weekdays)
+            for hd in cal.holidays_between(chart_min_date.date(), max_date.date()):
+                x0 = (hd - chart_min_date.date()).days * px_day + bar_offset_x
+                L.backdrops.append(('holiday', x0, px_day))
+            L.backdrops.sort(key=lambda t: t[1])
+        except Exception:
             pass
-        self.scene.selectionChanged.connect(on_selection_changed)
 
-        # ---------- Axis ----------
-        if min_date and max_date:
-            axis_y = 30
-            axis_x0 = bar_offset_x
-            axis_x1 = (max_date - chart_min_date).days * 10 + bar_offset_x + 40
-            self.scene.addLine(axis_x0, axis_y, axis_x1, axis_y)
-            tick_interval = 7
-            total_days = (max_date - chart_min_date).days
-            import datetime as _dt2
-            for d in range(0, total_days + 1, tick_interval):
-                tick_x = axis_x0 + d * 10
-                self.scene.addLine(tick_x, axis_y - 5, tick_x, axis_y + 5)
-                tick_date = chart_min_date + _dt2.timedelta(days=d)
-                tick_label = self.scene.addText(tick_date.strftime("%m-%d-%Y"))
-                from PyQt5.QtGui import QColor as _QColor
-                tick_label.setDefaultTextColor(_QColor("white"))
-                tick_label.setPos(tick_x - 30, axis_y - 25)
-
-        # ---------- Dependency arrows (simple) ----------
-        from PyQt5.QtGui import QPen, QColor as _QColor2
-        import datetime as _dt3
+        # Axis ticks every 7 days
+        L.axis_y = 30
+        L.axis_x0 = bar_offset_x
+        L.axis_x1 = (max_date - chart_min_date).days * px_day + bar_offset_x + 40
+        total_days = (max_date - chart_min_date).days
+        for d in range(0, total_days + 1, 7):
+            tick_date = chart_min_date + datetime.timedelta(days=d)
+            L.ticks.append((L.axis_x0 + d * px_day, tick_date.strftime("%m-%d-%Y")))
+
+        # Dependency arrows (L-shaped routing)
         name_to_dates = {}
         for name, start, duration, i, r in bars:
-            end = start + _dt3.timedelta(days=duration)
-            name_to_dates[name] = (start, end)
+            name_to_dates[name] = (start, start + datetime.timedelta(days=duration))
         for name, start, duration, i, r in bars:
             deps = r.get("Dependencies", "")
-            if not deps:
+            if not deps or name not in name_to_bar:
                 continue
-            dep_list = [d.strip() for d in deps.split(',') if d.strip()]
-            for dep_name in dep_list:
+            this_x, this_y, this_w, this_h = name_to_bar[name]
+            for dep_name in [d.strip() for d in deps.split(',') if d.strip()]:
                 if dep_name not in name_to_bar:
                     continue
                 dep_x, dep_y, dep_w, dep_h = name_to_bar[dep_name]
-                this_x, this_y, this_w, this_h = name_to_bar.get(name, (None, None, None, None))
-                if this_x is None:
-                    continue
                 dep_end = name_to_dates.get(dep_name, (None, None))[1]
                 this_start = name_to_dates.get(name, (None, None))[0]
-                conflict = dep_end and this_start and dep_end >= this_start
-                if conflict:
-                    pen = QPen(_QColor2("red"), 2)
-                else:
+                if dep_end and this_start and dep_end >= this_start:
+                    kind = 'dep_conflict'
+                elif dep_name in critical_set and name in critical_set:
                     # Critical path dependency (both tasks critical and not conflict) use gold
-                    if dep_name in critical_set and name in critical_set:
-                        pen = QPen(_QColor2("#DAA520"), 2)
-                    else:
-                        pen = QPen(_QColor2("#FF8200"), 2)
+                    kind = 'dep_critical'
+                else:
+                    kind = 'dep'
                 start_x = dep_x + dep_w
                 start_y = dep_y + dep_h/2
                 end_x = this_x
                 end_y = this_y + this_h/2
-                # L-shaped routing (feature 6)
-                self.scene.addLine(start_x, start_y, end_x, start_y, pen)
-                self.scene.addLine(end_x, start_y, end_x, end_y, pen)
-        # ---------- Parent-child connectors (hierarchical fan-out, animated) ----------
-        from PyQt5.QtGui import QPen as _QPen, QColor as _QColor3
-        from PyQt5.QtWidgets import QGraphicsLineItem
-        from PyQt5.QtCore import QPropertyAnimation, pyqtProperty
+                L.add_segment(kind, start_x, start_y, end_x, start_y, ())
+                L.add_segment(kind, end_x, start_y, end_x, end_y, ())
+
+        # Parent-child connectors (hierarchical fan-out)
         draw_hierarchy = True
         if hasattr(self, 'hierarchy_checkbox'):
             try:
                 draw_hierarchy = self.hierarchy_checkbox.isChecked()
             except Exception:
                 draw_hierarchy = True
-        class _AnimatedConnector(QGraphicsLineItem):
-            def __init__(self, x1, y1, x2, y2, base_pen, highlight_pen, style):
-                super().__init__(x1, y1, x2, y2)
-                self._base_pen = _QPen(base_pen)
-                self._highlight_pen = _QPen(highlight_pen)
-                if style == 'trunk':
-                    self._base_pen.setStyle(Qt.DashLine)
-                    self._base_pen.setWidth(2)
-                    self._highlight_pen.setWidth(3)
-                else:
-                    self._base_pen.setWidth(1)
-                    self._highlight_pen.setWidth(2)
-                self.setPen(self._base_pen)
-                self._opacity = 0.55
-                self._anim = None
-                self._apply_opacity()
-            def _apply_opacity(self):
-                p = self.pen()
-                c = p.color()
-                c.setAlphaF(self._opacity)
-                p.setColor(c)
-                self.setPen(p)
-            def getOpacity(self):
-                return self._opacity
-            def setOpacity(self, val):
-                self._opacity = val
-                self._apply_opacity()
-            opacity = pyqtProperty(float, fget=getOpacity, fset=setOpacity)
-            def fade(self, target, duration):
-                if self._anim:
-                    self._anim.stop()
-                self._anim = QPropertyAnimation(self, b"opacity")
-                self._anim.setDuration(duration)
-                self._anim.setStartValue(self._opacity)
-                self._anim.setEndValue(target)
-                self._anim.start()
-            def set_highlight(self, on):
-                if on:
-                    self.setPen(self._highlight_pen)
-                    self.fade(1.0, 180)
-                else:
-                    self.setPen(self._base_pen)
-                    self.fade(0.55, 260)
-        self._connector_lines_map = {}
         if draw_hierarchy:
-            base_color = _QColor3(180,180,180)
-            trunk_color = _QColor3(160,160,160)
-            highlight_color = _QColor3('#00BFFF')
             parent_children = {}
             for name, start, duration, i, r in bars:
                 parent_name = r.get("Parent", "") or ""
                 if parent_name and parent_name in name_to_bar and name in name_to_bar:
                     parent_children.setdefault(parent_name, []).append(name)
-            def _register(part, item):
-                self._connector_lines_map.setdefault(part, []).append(item)
             for parent, children in parent_children.items():
                 if not children:
                     continue
@@ -5161,36 +7546,308 @@ class GanttChartView(QWidget):
                     cx, cy, cw, ch = name_to_bar[child]
                     child_positions.append((child, cx + cw/2, cy))
                 child_positions.sort(key=lambda t: t[2])
-                trunk_top = parent_bottom_y
-                trunk_bottom = child_positions[-1][2]
-                trunk = _AnimatedConnector(parent_mid_x, trunk_top, parent_mid_x, trunk_bottom,
-                                            base_pen=_QPen(trunk_color), highlight_pen=_QPen(highlight_color), style='trunk')
-                trunk.setZValue(-1)
-                self.scene.addItem(trunk)
-                _register(parent, trunk)
+                L.add_segment('trunk', parent_mid_x, parent_bottom_y, parent_mid_x, child_positions[-1][2], (parent,))
                 for child, cmx, cty in child_positions:
-                    h_line = _AnimatedConnector(min(parent_mid_x, cmx), cty, max(parent_mid_x, cmx), cty,
-                                                base_pen=_QPen(base_color), highlight_pen=_QPen(highlight_color), style='child')
-                    h_line.setZValue(-1)
-                    self.scene.addItem(h_line)
-                    v_line = _AnimatedConnector(cmx, cty, cmx, cty,
-                                                base_pen=_QPen(base_color), highlight_pen=_QPen(highlight_color), style='child')
-                    v_line.setZValue(-1)
-                    self.scene.addItem(v_line)
-                    _register(parent, h_line); _register(child, h_line)
-                    _register(child, v_line); _register(parent, v_line)
+                    L.add_segment('child', min(parent_mid_x, cmx), cty, max(parent_mid_x, cmx), cty, (parent, child))
+                    L.add_segment('child', cmx, cty, cmx, cty, (child, parent))
+
+        # ---------- Scene rect ----------
+        scene_w = 800
+        scene_h = max(300, len(bars)*pitch+60)
+        if scene_w < L.axis_x1 + 100:
+            scene_w = L.axis_x1 + 100
+        L.scene_rect = (0, 0, scene_w, scene_h)
+        L.virtual = len(L.bars) > self.VIRTUALIZE_MIN_ROWS
+        L.finalize()
+        old = self._gantt_layout
+        if old is not None and old.same_frame(L):
+            self._apply_gantt_layout(L)
+            return
+        self._clear_gantt_scene()
+        self._gantt_layout = L
+        self.view.setSceneRect(*L.scene_rect)
+        # Axis line is a single item; everything else comes and goes with the viewport
+        self.scene.addLine(L.axis_x0, L.axis_y, L.axis_x1, L.axis_y)
+
+        # ---------- Selection handling ----------
+        def on_selection_changed():
+            selected = [it for it in self.scene.selectedItems() if it in self._bar_rect_to_row]
+            if selected:
+                bar = selected[0]
+                try:
+                    if bar.scene() is not None:
+                        r = getattr(bar, 'row', None) or self._bar_rect_to_row[bar]
+                        self.show_edit_dialog(r)
+                        bar.setSelected(False)
+                except RuntimeError:
+                    pass
+        try:
+            self.scene.selectionChanged.disconnect()
+        except TypeError:
+            pass
+        self.scene.selectionChanged.connect(on_selection_changed)
+
+        self._sync_gantt_items()
+        # One-time initial auto-fit (Option B) if user has not previously zoomed
+        try:
+            self._maybe_initial_fit()
+        except Exception:
+            pass
+
+    # ---------- Virtualized item management ----------
+    def _clear_gantt_scene(self):
+        self.scene.clear()
+        self._reset_gantt_items()
+
+    def _apply_gantt_layout(self, L):
+        """Swap in a layout with the same rows/frame, touching only live items whose geometry or style changed."""
+        old = self._gantt_layout
+        self._gantt_layout = L
+        for k in list(self._gantt_slots):
+            spec = L.bars[k]
+            if spec.state() != old.bars[k].state():
+                self._release_gantt_slot(k)
+            else:
+                bar = self._gantt_slots[k].bar
+                bar.row = spec.row
+                self._bar_rect_to_row[bar] = spec.row
+        if old.segments != L.segments:
+            for sid in list(self._gantt_live_segments):
+                if sid >= len(L.segments) or L.segments[sid] != old.segments[sid]:
+                    self._release_gantt_segment(sid, old)
+        self._sync_gantt_items()
+
+    def _reset_gantt_items(self):
+        """Forget all live/pooled items (call right after scene.clear())."""
+        self._gantt_layout = None
+        self._highlighted_bar = None
+        self._gantt_slots = {}        # bar index -> _GanttSlot currently showing it
+        self._gantt_free_slots = []   # hidden slots ready for reuse
+        self._gantt_live_segments = {}
+        self._gantt_live_backdrops = {}
+        self._gantt_live_ticks = {}
+        self._name_to_rect = {}
+        self._name_to_text_item = {}
+        self._connector_lines_map = {}
+        self._bar_rect_to_row = {}
+
+    def _gantt_visible_rect(self, full=False):
+        from PyQt5.QtCore import QRectF
+        L = self._gantt_layout
+        if full or not L.virtual:
+            return QRectF(*L.scene_rect)
+        vis = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+        mx = vis.width() * 0.5 + 200
+        my = vis.height() * 0.5 + 200
+        return vis.adjusted(-mx, -my, mx, my)
+
+    def _schedule_gantt_sync(self):
+        """Coalesce scroll/zoom/resize notifications into one sync per event-loop turn."""
+        layout = getattr(self, '_gantt_layout', None)
+        if layout is None or not layout.virtual or getattr(self, '_gantt_sync_pending', False):
+            return
+        self._gantt_sync_pending = True
+        from PyQt5.QtCore import QTimer
+        def run():
+            self._gantt_sync_pending = False
+            try:
+                self._sync_gantt_items()
+            except RuntimeError:
+                pass
+        QTimer.singleShot(0, run)
 
-        # ---------- Scene rect ----------
-        self.view.setSceneRect(0, 0, 800, max(300, len(bars)*(bar_height+bar_gap)+60))
-        # Adjust scene width to fit axis_x1 if larger
-        current_rect = self.view.sceneRect()
-        if current_rect.width() < axis_x1 + 100:
-            self.view.setSceneRect(0, 0, axis_x1 + 100, current_rect.height())
-        # One-time initial auto-fit (Option B) if user has not previously zoomed
-        try:
-            self._maybe_initial_fit()
-        except Exception:
-            pass
+    def _sync_gantt_items(self, full=False):
+        """Create/recycle scene items so exactly the layout entries intersecting the viewport (plus margin) exist."""
+        L = getattr(self, '_gantt_layout', None)
+        if L is None:
+            return
+        full = full or getattr(self, '_gantt_export_all', False)
+        vis = self._gantt_visible_rect(full)
+        left, right, top, bottom = vis.left(), vis.right(), vis.top(), vis.bottom()
+        # Level of detail: drop labels when rows are only a few pixels tall (virtual mode only)
+        show_labels = full or not L.virtual or self.view.transform().m22() * L.pitch >= 8
+        # Bars: rows are sorted by y, labels extend up to ~260px right of the bar
+        wanted = set(k for k in L.bar_range(top, bottom)
+                     if L.bars[k].x <= right and L.bars[k].x + L.bars[k].w + 260 >= left)
+        for k in list(self._gantt_slots):
+            slot = self._gantt_slots[k]
+            if k not in wanted or slot.labels != show_labels:
+                self._release_gantt_slot(k)
+        for k in wanted:
+            if k not in self._gantt_slots:
+                self._fill_gantt_slot(k, show_labels)
+        # Connectors
+        seg_ids = set(L.segments_in(left, top, right, bottom))
+        for sid in list(self._gantt_live_segments):
+            if sid not in seg_ids:
+                self._release_gantt_segment(sid)
+        for sid in seg_ids:
+            if sid not in self._gantt_live_segments:
+                self._add_gantt_segment(sid)
+        # Weekend/holiday shading and axis ticks (x-sorted)
+        self._sync_keyed_items(self._gantt_live_backdrops, L.backdrop_range(left, right), self._add_gantt_backdrop)
+        self._sync_keyed_items(self._gantt_live_ticks, L.tick_range(left, right), self._add_gantt_tick)
+        # Don't hoard hidden items after a full materialization (export)
+        excess = len(self._gantt_free_slots) - max(64, len(self._gantt_slots))
+        for _ in range(max(0, excess)):
+            slot = self._gantt_free_slots.pop()
+            for it in (slot.bar, slot.prog, slot.text, slot.bg, slot.baseline):
+                self.scene.removeItem(it)
+        # Re-apply persistent highlights to freshly materialized items
+        locked = getattr(self, '_locked_label', None)
+        if locked and locked in self._name_to_rect:
+            self._highlight_connectors(locked, True)
+
+    def _sync_keyed_items(self, live, keys, factory):
+        keys = set(keys)
+        for k in list(live):
+            if k not in keys:
+                for it in live.pop(k):
+                    self.scene.removeItem(it)
+        for k in keys:
+            if k not in live:
+                live[k] = factory(k)
+
+    def _add_gantt_backdrop(self, k):
+        from PyQt5.QtGui import QBrush, QColor, QPen
+        kind, x0, w = self._gantt_layout.backdrops[k]
+        brush = QBrush(QColor(220,220,220,120)) if kind == 'weekend' else QBrush(QColor(255,215,0,60))
+        rect = self.scene.addRect(x0, 0, w, self._gantt_layout.shade_height, QPen(Qt.NoPen), brush)
+        rect.setZValue(-2)
+        return [rect]
+
+    def _add_gantt_tick(self, k):
+        from PyQt5.QtGui import QColor
+        L = self._gantt_layout
+        tick_x, label = L.ticks[k]
+        line = self.scene.addLine(tick_x, L.axis_y - 5, tick_x, L.axis_y + 5)
+        tick_label = self.scene.addText(label)
+        tick_label.setDefaultTextColor(QColor("white"))
+        tick_label.setPos(tick_x - 30, L.axis_y - 25)
+        return [line, tick_label]
+
+    def _add_gantt_segment(self, sid):
+        from PyQt5.QtGui import QPen, QColor
+        L = self._gantt_layout
+        kind, x1, y1, x2, y2, parts = L.segments[sid]
+        if kind in ('trunk', 'child'):
+            highlight = QColor('#00BFFF')
+            base = QColor(160,160,160) if kind == 'trunk' else QColor(180,180,180)
+            item = _AnimatedConnector(x1, y1, x2, y2, base_pen=QPen(base), highlight_pen=QPen(highlight), style=kind)
+            item.setZValue(-1)
+            self.scene.addItem(item)
+            for part in parts:
+                self._connector_lines_map.setdefault(part, []).append(item)
+        else:
+            color = {'dep_conflict': "red", 'dep_critical': "#DAA520"}.get(kind, "#FF8200")
+            item = self.scene.addLine(x1, y1, x2, y2, QPen(QColor(color), 2))
+        self._gantt_live_segments[sid] = item
+
+    def _release_gantt_segment(self, sid, layout=None):
+        item = self._gantt_live_segments.pop(sid)
+        for part in (layout or self._gantt_layout).segments[sid][5]:
+            lst = self._connector_lines_map.get(part)
+            if lst and item in lst:
+                lst.remove(item)
+        self.scene.removeItem(item)
+
+    def _new_gantt_slot(self):
+        from PyQt5.QtGui import QPen, QColor, QBrush, QPainterPath
+        slot = _GanttSlot()
+        slot.bar = ClickableBar(0, 0, 0, 0, {}, self.preview_label, self)
+        slot.bar.setBrush(QColor("#333333"))
+        self.scene.addItem(slot.bar)
+        slot.prog = self.scene.addRect(0, 0, 0, 0, QPen(Qt.NoPen), QColor("#FF8200"))
+        slot.prog.setAcceptedMouseButtons(Qt.NoButton)
+        slot.prog.setZValue(slot.bar.zValue() + 1)
+        slot.text = self.scene.addText("")
+        slot.text.setDefaultTextColor(QColor("black"))
+        slot.text.setData(1, slot.text.font())
+        slot.bg = self.scene.addPath(QPainterPath(), QPen(Qt.NoPen), QBrush(QColor("#FF8200")))
+        slot.bg.setZValue(slot.text.zValue()-1)
+        slot.text.setData(3, slot.bg)  # store bg rect
+        slot.text.setData(4, QBrush(QColor("#FF8200")))  # store original brush
+        base_pen = QPen(QColor(150,150,150))
+        base_pen.setStyle(Qt.DashLine); base_pen.setWidth(1)
+        slot.baseline = self.scene.addLine(0, 0, 0, 0, base_pen)
+        return slot
+
+    def _fill_gantt_slot(self, k, show_labels):
+        from PyQt5.QtGui import QPen, QColor, QFont, QPainterPath
+        L = self._gantt_layout
+        spec = L.bars[k]
+        slot = self._gantt_free_slots.pop() if self._gantt_free_slots else self._new_gantt_slot()
+        slot.labels = show_labels
+        bar = slot.bar
+        bar.row = spec.row
+        bar.setRect(spec.x, spec.y, spec.w, L.bar_height)
+        if spec.outline == 'overdue':
+            outline_pen = QPen(QColor("red")); outline_pen.setWidth(2)
+        elif spec.outline == 'risk':
+            outline_pen = QPen(QColor("#FFA500")); outline_pen.setWidth(2)
+        else:
+            outline_pen = QPen(Qt.NoPen)
+        bar.setData(99, None)
+        bar.setPen(outline_pen)
+        if spec.name == getattr(self, '_highlighted_bar', None):
+            bar.setData(99, outline_pen)
+            pen = QPen(QColor('#00BFFF')); pen.setWidth(3)
+            bar.setPen(pen)
+        if spec.pc > 0:
+            slot.prog.setRect(spec.x, spec.y, max(2, int(spec.w * spec.pc / 100)), L.bar_height)
+            slot.prog.setBrush(QColor("#DAA520") if spec.critical else QColor("#FF8200"))
+        slot.prog.setVisible(spec.pc > 0)
+        if spec.baseline:
+            ly = spec.y + L.bar_height//2
+            slot.baseline.setLine(spec.baseline[0], ly, spec.baseline[1], ly)
+        slot.baseline.setVisible(bool(spec.baseline))
+        ti = slot.text
+        if show_labels:
+            orig_font = ti.data(1)
+            if isinstance(orig_font, QFont):
+                ti.setFont(orig_font)
+            ti.setPlainText(spec.display_name)
+            ti.setData(2, spec.name)  # store full for tooltip
+            ti.setToolTip(spec.name)
+            ty = spec.y + (L.bar_height - ti.boundingRect().height())/2
+            # Place label just to the right of the bar with small gap
+            ti.setPos(spec.x + spec.w + 6, ty)
+            # Always-visible subtle contrasting background for readability
+            br = ti.boundingRect().translated(ti.pos())
+            path = QPainterPath()
+            path.addRoundedRect(br.adjusted(-3,-1,3,1), 6, 6)
+            slot.bg.setPath(path)
+            slot.bg.setBrush(ti.data(4))
+            self._name_to_text_item[spec.name] = ti
+        ti.setVisible(show_labels)
+        slot.bg.setVisible(show_labels)
+        bar.setVisible(True)
+        self._gantt_slots[k] = slot
+        self._name_to_rect[spec.name] = bar
+        self._bar_rect_to_row[bar] = spec.row
+
+    def _release_gantt_slot(self, k):
+        slot = self._gantt_slots.pop(k)
+        name = self._gantt_layout.bars[k].name
+        if self._name_to_rect.get(name) is slot.bar:
+            del self._name_to_rect[name]
+        if self._name_to_text_item.get(name) is slot.text:
+            del self._name_to_text_item[name]
+        self._bar_rect_to_row.pop(slot.bar, None)
+        slot.bar.setSelected(False)
+        slot.bar.row = {}
+        slot.bar.setRect(0, 0, 0, 0)
+        for it in (slot.bar, slot.prog, slot.text, slot.bg, slot.baseline):
+            it.setVisible(False)
+        self._gantt_free_slots.append(slot)
+
+    def _gantt_fit_rect(self):
+        """Bounding rect used by Fit All / the initial fit (covers unmaterialized rows in virtual mode)."""
+        L = getattr(self, '_gantt_layout', None)
+        if L is not None and L.virtual:
+            from PyQt5.QtCore import QRectF
+            return QRectF(0, 0, L.axis_x1 + 300, L.shade_height)
+        return self.scene.itemsBoundingRect()
 
     # Click-to-lock highlight support
     def mousePressEvent(self, event):
@@ -5429,62 +8086,6 @@ class TimelineView(QWidget):
         self.render_timeline()
 
     def render_timeline(self):
-        # --- Critical Path Calculation ---
-        def find_critical_path(rows):
-            import datetime
-            # Build graph: node = part name, edges = dependencies
-            name_to_row = {row.get("Project Part", ""): row for row in rows}
-            graph = {}
-            for row in rows:
-                name = row.get("Project Part", "")
-                deps = row.get("Dependencies", "")
-                dep_list = [d.strip() for d in deps.split(",") if d.strip()]
-                graph[name] = dep_list
-            # Topo sort
-            visited = set()
-            order = []
-            def visit(n):
-                if n in visited:
-                    return
-                for dep in graph.get(n, []):
-                    visit(dep)
-                visited.add(n)
-                order.append(n)
-            for n in graph:
-                visit(n)
-            # Calculate earliest start/finish
-            est = {}
-            eft = {}
-            for n in order:
-                row = name_to_row.get(n, {})
-                duration = int(row.get("Duration (days)", 0) or 0)
-                if not duration:
-                    continue
-                deps = graph.get(n, [])
-                if not deps:
-                    start = row.get("Start Date", "")
-                    if start:
-                        est[n] = datetime.datetime.strptime(start, "%m-%d-%Y")
-                    else:
-                        est[n] = datetime.datetime.min
-                else:
-                    est[n] = max([eft.get(dep, datetime.datetime.min) for dep in deps])
-                eft[n] = est[n] + datetime.timedelta(days=duration)
-            # Calculate latest finish/start
-            lft = {n: max(eft.values()) for n in order}
-            lst = {}
-            for n in reversed(order):
-                row = name_to_row.get(n, {})
-                duration = int(row.get("Duration (days)", 0) or 0)
-                deps = graph.get(n, [])
-                if not deps:
-                    lft[n] = lft[n]
-                else:
-                    lft[n] = min([lst.get(dep, lft[n]) for dep in deps])
-                lst[n] = lft[n] - datetime.timedelta(days=duration)
-            # Critical path: nodes where est==lst
-            critical = set(n for n in order if est.get(n) == lst.get(n))
-            return critical
         import datetime
         from PyQt5.QtGui import QBrush, QColor
         from PyQt5.QtCore import QDate
@@ -5576,7 +8177,7 @@ class TimelineView(QWidget):
         total_days = (max_date - min_date).days
         # Compute critical path set for highlighting
         try:
-            critical_path = find_critical_path(rows)
+            critical_path = self.model.schedule().critical
         except Exception:
             critical_path = set()
         # Draw bars and record their positions for connectors
@@ -5697,18 +8298,10 @@ class TimelineView(QWidget):
             from PyQt5.QtGui import QBrush, QColor
             from datetime import timedelta
             shade = QBrush(QColor(220, 220, 220, 120))
-            cur = min_date
-            while cur <= max_date:
-                if cur.weekday() >= 5:
-                    run_start = cur
-                    while cur <= max_date and cur.weekday() >= 5:
-                        cur += timedelta(days=1)
-                    run_end = cur
-                    x0 = bar_offset_x + (run_start - min_date).days * 8
-                    x1 = bar_offset_x + (run_end - min_date).days * 8
-                    self.scene.addRect(x0, 0, max(1, x1 - x0), y + 30, pen=Qt.NoPen, brush=shade)
-                else:
-                    cur += timedelta(days=1)
+            for run_start, run_end in get_business_calendar().weekend_runs(min_date, max_date):
+                x0 = bar_offset_x + (run_start - min_date).days * 8
+                x1 = bar_offset_x + (run_end - min_date).days * 8
+                self.scene.addRect(x0, 0, max(1, x1 - x0), y + 30, pen=Qt.NoPen, brush=shade)
         except Exception:
             pass
         # Draw x-axis with date marks every 7 days
@@ -5806,6 +8399,233 @@ from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem
 from PyQt5.QtWidgets import QDateEdit
 from PyQt5.QtCore import QDate
 
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex
+from PyQt5.QtWidgets import QStyledItemDelegate
+
+class ProjectTableModel(QAbstractTableModel):
+    """Table model over ProjectDataModel.rows for DatabaseView.
+    Cells are read straight from the row dicts; edits are handed to DatabaseView so the
+    optimistic-concurrency/conflict handling stays in one place."""
+    READ_ONLY_FIELDS = {"Calculated End Date", "Children"}
+    ROLLUP_FIELDS = {"% Complete", "Status"}  # derived from children on parent rows
+    BLANK_DATE = "01-01-1753"
+    THUMB_SIZE = 32
+
+    def __init__(self, project_model, view):
+        super().__init__(view)
+        self.project_model = project_model
+        self.view = view
+        self._thumbs = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.project_model.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(ProjectDataModel.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal:
+            if role == Qt.DisplayRole:
+                return ProjectDataModel.COLUMNS[section]
+            if role == Qt.ToolTipRole and ProjectDataModel.COLUMNS[section] == "Duration (days)":
+                return "Duration is in days"
+        elif role == Qt.DisplayRole:
+            return section + 1
+        return None
+
+    def column_name(self, index):
+        return ProjectDataModel.COLUMNS[index.column()]
+
+    def row_dict(self, index):
+        return self.project_model.rows[index.row()]
+
+    def _has_children(self, rowdata):
+        name = rowdata.get("Project Part", "")
+        return any(r is not rowdata for r in self.project_model.children_of(name))
+
+    def _thumbnail(self, rel_path):
+        pm = self._thumbs.get(rel_path)
+        if pm is None:
+            pm = QPixmap(resolve_resource_path(rel_path))
+            if not pm.isNull():
+                pm = pm.scaled(self.THUMB_SIZE, self.THUMB_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            self._thumbs[rel_path] = pm
+        return pm
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        rowdata = self.row_dict(index)
+        colname = self.column_name(index)
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if colname == "Children":
+                return ", ".join(r.get("Project Part", "") for r in self.project_model.children_of(rowdata.get("Project Part", "")))
+            val = rowdata.get(colname, "")
+            val = "" if val is None else str(val)
+            if colname in DatabaseView.DATE_FIELDS and val == self.BLANK_DATE:
+                return ""
+            if colname == "Images" and role == Qt.DisplayRole and val:
+                return val.replace("\\", "/").split("/")[-1]
+            if colname == "% Complete" and not val:
+                return "0"
+            return val
+        if role == Qt.DecorationRole and colname == "Images":
+            img = rowdata.get(colname, "")
+            if img:
+                pm = self._thumbnail(img)
+                return pm if not pm.isNull() else None
+        if role == Qt.ToolTipRole:
+            if colname in self.ROLLUP_FIELDS and self._has_children(rowdata):
+                if colname == "Status":
+                    return "Parent status is derived from child statuses."
+                return "Parent progress is rolled up automatically from children."
+            if colname == "Images":
+                return "Double-click to upload an image; right-click to preview."
+            if colname == "Pace Link" and self._is_link(rowdata.get(colname, "")):
+                return "Click to open link"
+        if role == Qt.ForegroundRole and colname == "Pace Link" and self._is_link(rowdata.get(colname, "")):
+            from PyQt5.QtGui import QColor
+            return QColor("#3399FF")
+        return None
+
+    @staticmethod
+    def _is_link(val):
+        return bool(val) and (val.startswith("http://") or val.startswith("https://"))
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        base = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if getattr(self.view, '_read_only', False):
+            return base
+        colname = self.column_name(index)
+        rowdata = self.row_dict(index)
+        if colname in self.READ_ONLY_FIELDS or colname == "Images":
+            return base
+        if colname == "Pace Link" and self._is_link(rowdata.get(colname, "")):
+            return base
+        if colname in self.ROLLUP_FIELDS and self._has_children(rowdata):
+            return base
+        return base | Qt.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        # Defer: the commit may open a conflict dialog or refresh the table, neither of
+        # which should happen while the delegate is still closing its editor.
+        from PyQt5.QtCore import QTimer
+        row, col = index.row(), index.column()
+        QTimer.singleShot(0, lambda: self.view.commit_edit(row, col, value))
+        return True
+
+    def refresh_all(self):
+        self.beginResetModel()
+        self._thumbs.clear()
+        self.endResetModel()
+
+
+class DatabaseItemDelegate(QStyledItemDelegate):
+    """Creates an editor only while a cell is being edited (date, spin, dropdown, Parent completer)."""
+
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+        from PyQt5.QtCore import QStringListModel
+        self._parent_names = QStringListModel(self)  # shared by every Parent editor
+        self._parent_names_version = None
+
+    def _parent_name_model(self):
+        model = self.view.model
+        version = getattr(model, 'data_version', None)
+        if version is None or version != self._parent_names_version:
+            self._parent_names.setStringList([r.get("Project Part", "") for r in model.rows])
+            self._parent_names_version = version
+        return self._parent_names
+
+    def createEditor(self, parent, option, index):
+        colname = ProjectDataModel.COLUMNS[index.column()]
+        if colname in DatabaseView.DATE_FIELDS:
+            editor = QDateEdit(parent)
+            editor.setCalendarPopup(True)
+            editor.setMinimumDate(QDate(1753, 1, 1))
+            editor.setSpecialValueText("")
+            return editor
+        if colname == "% Complete":
+            from PyQt5.QtWidgets import QSpinBox
+            editor = QSpinBox(parent)
+            editor.setRange(0, 100)
+            return editor
+        if colname in DatabaseView.DROPDOWN_FIELDS:
+            editor = QComboBox(parent)
+            editor.addItems(DatabaseView.DROPDOWN_FIELDS[colname])
+            return editor
+        if colname == "Parent":
+            from PyQt5.QtWidgets import QCompleter
+            editor = QLineEdit(parent)
+            completer = QCompleter(self._parent_name_model(), editor)
+            completer.setCaseSensitivity(Qt.CaseInsensitive)
+            completer.setFilterMode(Qt.MatchContains)
+            editor.setCompleter(completer)
+            editor.setPlaceholderText("(no parent)")
+            return editor
+        return super().createEditor(parent, option, index)
+
+    def setEditorData(self, editor, index):
+        colname = ProjectDataModel.COLUMNS[index.column()]
+        val = index.data(Qt.EditRole) or ""
+        if isinstance(editor, QDateEdit):
+            date = QDate.fromString(val, "MM-dd-yyyy") if val else QDate()
+            if date.isValid() and date != QDate(1752, 9, 14):
+                editor.setDate(date)
+            elif colname == "Start Date":
+                editor.setDate(QDate.currentDate())
+            else:
+                editor.setDate(editor.minimumDate())
+            # Opening and closing the editor without a change must not write the placeholder date
+            editor.setProperty("initial_date", editor.date())
+        elif colname == "% Complete":
+            try:
+                editor.setValue(int(float(val or 0)))
+            except Exception:
+                editor.setValue(0)
+        elif isinstance(editor, QComboBox):
+            if val in DatabaseView.DROPDOWN_FIELDS.get(colname, []):
+                editor.setCurrentText(val)
+        elif colname == "Parent":
+            editor.setText(val)
+        else:
+            super().setEditorData(editor, index)
+
+    def setModelData(self, editor, model, index):
+        colname = ProjectDataModel.COLUMNS[index.column()]
+        old = index.data(Qt.EditRole) or ""
+        if isinstance(editor, QDateEdit):
+            value = editor.date()
+            if value == editor.property("initial_date"):
+                return
+        elif colname == "% Complete":
+            value = editor.value()
+            if str(value) == old:
+                return
+        elif isinstance(editor, QComboBox):
+            value = editor.currentText()
+            if value == old:
+                return
+        elif colname == "Parent":
+            value = editor.text().strip()
+            own = self.view.model.rows[index.row()].get("Project Part", "")
+            # Only blank or another existing part is a valid parent
+            if value == old or value == own or (value and self.view.model.row_by_name(value) is None):
+                return
+        else:
+            value = editor.text() if isinstance(editor, QLineEdit) else None
+            if value is None:
+                return super().setModelData(editor, model, index)
+            if value == old:
+                return
+        model.setData(index, value, Qt.EditRole)
+
+
 class DatabaseView(QWidget):
     DATE_FIELDS = {"Start Date", "Calculated End Date"}
     DROPDOWN_FIELDS = {
@@ -5833,12 +8653,20 @@ class DatabaseView(QWidget):
         top_row.addStretch(1)
         top_row.addWidget(self.ro_banner)
         layout.addLayout(top_row)
-        self.table = QTableWidget()
-        self.table.setColumnCount(len(ProjectDataModel.COLUMNS))
-        self.table.setHorizontalHeaderLabels(ProjectDataModel.COLUMNS)
-        # Set tooltip for Duration column
-        duration_col = ProjectDataModel.COLUMNS.index("Duration (days)")
-        self.table.horizontalHeaderItem(duration_col).setToolTip("Duration is in days")
+        from PyQt5.QtWidgets import QTableView, QAbstractItemView
+        from PyQt5.QtCore import QSize
+        self.table = QTableView()
+        self.table_model = ProjectTableModel(self.model, self)
+        self.table.setModel(self.table_model)
+        self.table.setItemDelegate(DatabaseItemDelegate(self))
+        self.table.setIconSize(QSize(ProjectTableModel.THUMB_SIZE, ProjectTableModel.THUMB_SIZE))
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.SelectedClicked
+                                   | QAbstractItemView.EditKeyPressed | QAbstractItemView.AnyKeyPressed)
+        self.table.clicked.connect(self._on_cell_clicked)
+        self.table.doubleClicked.connect(self._on_cell_double_clicked)
+        self.table.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.table.customContextMenuRequested.connect(self._on_context_menu)
         layout.addWidget(self.table)
 
         btn_layout = QHBoxLayout()
@@ -5858,7 +8686,14 @@ class DatabaseView(QWidget):
 
         self.setLayout(layout)
         self.refresh_table()
-        self.table.cellChanged.connect(self.cell_edited)
+        # Row repaints / rebuilds are driven by model change events
+        self.model.subscribe(self._on_model_event)
+
+    def _on_model_event(self, event):
+        if event.structural:
+            self.refresh_table()
+        else:
+            self.refresh_rows(event.parts)
 
     def set_read_only(self, read_only: bool):
         """Enable/disable editing and mutating operations in the Database view."""
@@ -5868,14 +8703,6 @@ class DatabaseView(QWidget):
                 self.ro_banner.setVisible(self._read_only)
         except Exception:
             pass
-        try:
-            from PyQt5.QtWidgets import QAbstractItemView
-            if self._read_only:
-                self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
-            else:
-                self.table.setEditTriggers(QAbstractItemView.AllEditTriggers)
-        except Exception:
-            pass
         # Buttons: disable mutating actions in read-only; export stays enabled
         try:
             self.add_btn.setEnabled(not self._read_only)
@@ -5883,7 +8710,7 @@ class DatabaseView(QWidget):
             self.import_btn.setEnabled(not self._read_only)
         except Exception:
             pass
-        # Rebuild widgets to reflect enabled/disabled state
+        # Editability comes from ProjectTableModel.flags(); repaint to reflect it
         try:
             self.refresh_table()
         except Exception:
@@ -5907,9 +8734,8 @@ class DatabaseView(QWidget):
                     imported_row = {col: row.get(col, "") for col in ProjectDataModel.COLUMNS}
                     imported_rows.append(imported_row)
             # Replace current data with imported data
-            self.model.rows = imported_rows
-            self.model.save_to_db()
-            self.refresh_table()
+            self.model.replace_rows(imported_rows)
+            self.model.save_async()
             QMessageBox.information(self, "Import Successful", f"Imported {len(imported_rows)} rows from {path}")
         except Exception as e:
             QMessageBox.critical(self, "Import Failed", f"Error importing data: {e}")
@@ -5920,7 +8746,7 @@ class DatabaseView(QWidget):
         if not path:
             return
         try:
-            with open(path, "w", newline='', encoding='utf-8') as f:
+            with perf_span('export.csv', rows=len(self.model.rows)), open(path, "w", newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
                 writer.writerow(ProjectDataModel.COLUMNS)
                 for row in self.model.rows:
@@ -5929,182 +8755,115 @@ class DatabaseView(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "Export Failed", f"Error exporting database: {e}")
 
+    @timed('render.table', note=lambda res, self: {'rows': len(self.model.rows)})
     def refresh_table(self):
-        self.table.blockSignals(True)
-        self.table.setRowCount(len(self.model.rows))
-        for row, rowdata in enumerate(self.model.rows):
-            # Determine if this row is a parent (has at least one child referencing its Project Part)
-            part_name = rowdata.get("Project Part", "")
-            has_children = any(r.get("Parent", "") == part_name for r in self.model.rows if r is not rowdata)
-            for col, colname in enumerate(ProjectDataModel.COLUMNS):
-                # Only use QDateEdit for editable date fields, not Calculated End Date
-                if colname in self.DATE_FIELDS and colname != "Calculated End Date":
-                    date_val = rowdata.get(colname, "")
-                    date_edit = QDateEdit()
-                    date_edit.setCalendarPopup(True)
-                    min_blank = QDate(1753, 1, 1)
-                    date_edit.setMinimumDate(min_blank)
-                    date_edit.setSpecialValueText("")
-                    # Prevent wheel events unless focused (clicked)
-                    def block_wheel(event):
-                        if not date_edit.hasFocus():
-                            event.ignore()
-                        else:
-                            QDateEdit.wheelEvent(date_edit, event)
-                    date_edit.wheelEvent = block_wheel
-                    if date_val:
-                        try:
-                            date = QDate.fromString(date_val, "MM-dd-yyyy")
-                            if date.isValid() and date != QDate(1752, 9, 14) and date != min_blank:
-                                date_edit.setDate(date)
-                            else:
-                                if colname == "Start Date":
-                                    date_edit.setDate(QDate.currentDate())
-                                else:
-                                    date_edit.clear()
-                        except Exception:
-                            if colname == "Start Date":
-                                date_edit.setDate(QDate.currentDate())
-                            else:
-                                date_edit.clear()
-                    else:
-                        if colname == "Start Date":
-                            date_edit.setDate(QDate.currentDate())
-                        else:
-                            date_edit.clear()
-                    date_edit.dateChanged.connect(lambda d, r=row, c=col: self.date_changed(r, c, d))
-                    if getattr(self, '_read_only', False):
-                        date_edit.setEnabled(False)
-                    self.table.setCellWidget(row, col, date_edit)
-                    # Show blank in the table cell if value is empty or minimum blank
-                    if not date_val or date_val == min_blank.toString("MM-dd-yyyy"):
-                        self.table.setItem(row, col, QTableWidgetItem(""))
-                    else:
-                        self.table.setItem(row, col, QTableWidgetItem(date_val))
-                elif colname == "Calculated End Date":
-                    # Show as read-only text
-                    val = rowdata.get(colname, "")
-                    self.table.setItem(row, col, QTableWidgetItem(val))
-                elif colname == "% Complete":
-                    from PyQt5.QtWidgets import QSpinBox
-                    spin = QSpinBox()
-                    spin.setRange(0, 100)
-                    try:
-                        spin.setValue(int(rowdata.get(colname) or 0))
-                    except Exception:
-                        spin.setValue(0)
-                    # Prevent wheel without focus
-                    def block_wheel_spin(event, sb=spin):
-                        if not sb.hasFocus():
-                            event.ignore()
-                        else:
-                            QSpinBox.wheelEvent(sb, event)
-                    spin.wheelEvent = block_wheel_spin
-                    if has_children:
-                        spin.setEnabled(False)
-                        spin.setToolTip("Parent progress is rolled up automatically from children.")
-                    else:
-                        spin.valueChanged.connect(lambda val, r=row, c=col: self.percent_changed(r, c, val))
-                    if getattr(self, '_read_only', False):
-                        spin.setEnabled(False)
-                    self.table.setCellWidget(row, col, spin)
-                    self.table.setItem(row, col, QTableWidgetItem(str(spin.value())))
-                elif colname in self.DROPDOWN_FIELDS or colname == "Parent":
-                    from PyQt5.QtWidgets import QComboBox
-                    combo = QComboBox()
-                    # Prevent wheel events unless focused (clicked)
-                    def block_wheel_combo(event):
-                        if not combo.hasFocus():
-                            event.ignore()
-                        else:
-                            QComboBox.wheelEvent(combo, event)
-                    combo.wheelEvent = block_wheel_combo
-                    if colname == "Parent":
-                        # List all other project part names except this row
-                        part_names = [self.model.rows[i]["Project Part"] for i in range(len(self.model.rows)) if i != row]
-                        combo.addItem("")  # Allow no parent
-                        combo.addItems(part_names)
-                        current_val = rowdata.get("Parent", "")
-                        if current_val in part_names:
-                            combo.setCurrentText(current_val)
-                        combo.currentTextChanged.connect(lambda val, r=row, c=col: self.dropdown_changed(r, c, val))
-                        if getattr(self, '_read_only', False):
-                            combo.setEnabled(False)
-                        self.table.setCellWidget(row, col, combo)
-                        self.table.setItem(row, col, QTableWidgetItem(combo.currentText()))
-                    else:
-                        combo.addItems(self.DROPDOWN_FIELDS[colname])
-                        current_val = rowdata.get(colname, "")
-                        if current_val in self.DROPDOWN_FIELDS[colname]:
-                            combo.setCurrentText(current_val)
-                        if colname == "Status":
-                            if has_children:
-                                combo.setEnabled(False)
-                                combo.setToolTip("Parent status is derived from child statuses.")
-                            else:
-                                combo.currentTextChanged.connect(lambda val, r=row, c=col: self.status_changed(r, c, val))
-                        else:
-                            combo.currentTextChanged.connect(lambda val, r=row, c=col: self.dropdown_changed(r, c, val))
-                            if getattr(self, '_read_only', False):
-                                combo.setEnabled(False)
-                        self.table.setCellWidget(row, col, combo)
-                        self.table.setItem(row, col, QTableWidgetItem(combo.currentText()))
-                elif colname == "Images":
-                    img_widget = ImageCellWidget(self, row, col, self.model, self.on_data_changed)
-                    if getattr(self, '_read_only', False) and hasattr(img_widget, 'btn'):
-                        try:
-                            img_widget.btn.setEnabled(False)
-                        except Exception:
-                            pass
-                    self.table.setCellWidget(row, col, img_widget)
-                    img_widget.refresh()  # Ensure preview is updated after loading
-                    img_val = rowdata.get(colname, "")
-                    if img_val:
-                        self.table.setItem(row, col, QTableWidgetItem(img_val.split("/")[-1] or img_val.split("\\")[-1]))
-                    else:
-                        self.table.setItem(row, col, QTableWidgetItem(""))
-                elif colname == "Children":
-                    # Read-only: list all project parts whose parent is this part
-                    this_part = rowdata.get("Project Part", "")
-                    children = [r["Project Part"] for r in self.model.rows if r.get("Parent", "") == this_part]
-                    self.table.setItem(row, col, QTableWidgetItem(", ".join(children)))
-                elif colname == "Pace Link":
-                    link = rowdata.get(colname, "")
-                    if link and (link.startswith("http://") or link.startswith("https://")):
-                        label = QLabel(f'<a href="{link}">{link}</a>')
-                        label.setOpenExternalLinks(True)
-                        self.table.setCellWidget(row, col, label)
-                        self.table.setItem(row, col, QTableWidgetItem(link))
-                    else:
-                        line_edit = QLineEdit(link)
-                        def on_edit_finished(row=row, col=col, edit=line_edit):
-                            val = edit.text()
-                            self.model.rows[row][colname] = val
-                            self.model.save_to_db()
-                            self.refresh_table()
-                            if self.on_data_changed:
-                                self.on_data_changed()
-                        line_edit.editingFinished.connect(on_edit_finished)
-                        if getattr(self, '_read_only', False):
-                            line_edit.setEnabled(False)
-                        self.table.setCellWidget(row, col, line_edit)
-                        self.table.setItem(row, col, QTableWidgetItem(link))
-                else:
-                    self.table.setItem(row, col, QTableWidgetItem(rowdata.get(colname, "")))
-        self.table.blockSignals(False)
-        # Ensure all image widgets are refreshed after table is populated
-        for row in range(self.table.rowCount()):
-            for col in range(self.table.columnCount()):
-                colname = ProjectDataModel.COLUMNS[col]
-                if colname == "Images":
-                    widget = self.table.cellWidget(row, col)
-                    if widget and hasattr(widget, "refresh"):
-                        widget.refresh()
-
+        self.table_model.project_model = self.model
+        self.table_model.refresh_all()
         # Automatically resize Project Part column to fit contents
         part_col = ProjectDataModel.COLUMNS.index("Project Part")
         self.table.resizeColumnToContents(part_col)
 
+    def refresh_rows(self, part_names):
+        """Repaint only the rows of the given parts (no model reset)."""
+        wanted = {id(r) for r in (self.model.row_by_name(n) for n in part_names) if r is not None}
+        last_col = len(ProjectDataModel.COLUMNS) - 1
+        for i, r in enumerate(self.model.rows):
+            if id(r) in wanted:
+                self.table_model.dataChanged.emit(self.table_model.index(i, 0), self.table_model.index(i, last_col))
+
+    def _after_row_edit(self, row):
+        """Re-derive what depends on the edited row (its end date, ancestor roll-ups).
+        The resulting model events scope the repaint to the rows that actually changed."""
+        if row >= len(self.model.rows):
+            return
+        rowdata = self.model.rows[row]
+        self.model.update_calculated_end_date(rowdata)
+        self.model.rollup_ancestors(rowdata.get("Project Part", ""))
+
+    # --- Cell interaction (links, images) ---
+    def _on_cell_clicked(self, index):
+        if ProjectDataModel.COLUMNS[index.column()] != "Pace Link":
+            return
+        link = self.model.rows[index.row()].get("Pace Link", "") or ""
+        if ProjectTableModel._is_link(link):
+            from PyQt5.QtGui import QDesktopServices
+            from PyQt5.QtCore import QUrl
+            QDesktopServices.openUrl(QUrl(link))
+
+    def _on_cell_double_clicked(self, index):
+        if ProjectDataModel.COLUMNS[index.column()] == "Images" and not self._read_only:
+            self.upload_image(index.row())
+
+    def _on_context_menu(self, pos):
+        index = self.table.indexAt(pos)
+        if not index.isValid() or ProjectDataModel.COLUMNS[index.column()] != "Images":
+            return
+        from PyQt5.QtWidgets import QMenu
+        menu = QMenu(self)
+        img = self.model.rows[index.row()].get("Images", "")
+        view_action = menu.addAction("View Image")
+        view_action.setEnabled(bool(img))
+        upload_action = menu.addAction("Upload Image…")
+        upload_action.setEnabled(not self._read_only)
+        chosen = menu.exec_(self.table.viewport().mapToGlobal(pos))
+        if chosen == view_action:
+            self.show_full_image(resolve_resource_path(img))
+        elif chosen == upload_action:
+            self.upload_image(index.row())
+
+    def upload_image(self, row):
+        fname, _ = QFileDialog.getOpenFileName(self, "Select Image", "", "Image Files (*.png *.jpg *.jpeg *.bmp *.gif)")
+        if fname:
+            import shutil
+            # Store images next to the executable/script so packaged app can load them
+            base_dir = os.path.dirname(resolve_resource_path("."))
+            images_dir = os.path.join(base_dir, "images")
+            if not os.path.exists(images_dir):
+                os.makedirs(images_dir)
+            base = os.path.basename(fname)
+            dest = os.path.join(images_dir, base)
+            count = 1
+            orig_base, ext = os.path.splitext(base)
+            while os.path.exists(dest):
+                dest = os.path.join(images_dir, f"{orig_base}_{count}{ext}")
+                count += 1
+            shutil.copy2(fname, dest)
+            rel_path = os.path.relpath(dest, base_dir)
+            self.model.set_part_fields(self.model.rows[row].get("Project Part", ""), {"Images": rel_path})
+            self.model.save_async()
+
+    def show_full_image(self, img_path_full):
+        dlg = QDialog(self)
+        dlg.setWindowTitle("Image Preview")
+        vbox = QVBoxLayout(dlg)
+        lbl = QLabel()
+        pixmap = QPixmap(img_path_full)
+        if not pixmap.isNull():
+            lbl.setPixmap(pixmap.scaledToWidth(600, Qt.SmoothTransformation))
+        else:
+            lbl.setText("[Image not found]")
+        vbox.addWidget(lbl)
+        dlg.setLayout(vbox)
+        dlg.exec_()
+
+    def commit_edit(self, row, col, value):
+        """Route a value committed by DatabaseItemDelegate to the matching field handler."""
+        if row >= len(self.model.rows):
+            return
+        colname = ProjectDataModel.COLUMNS[col]
+        # One merged notification per edit, however many fields the handler touches
+        with self.model.batch():
+            if colname in self.DATE_FIELDS:
+                self.date_changed(row, col, value)
+            elif colname == "% Complete":
+                self.percent_changed(row, col, value)
+            elif colname == "Status":
+                self.status_changed(row, col, value)
+            elif colname in self.DROPDOWN_FIELDS or colname == "Parent":
+                self.dropdown_changed(row, col, value)
+            else:
+                self.cell_edited(row, col, value)
+
     def add_row(self):
         if getattr(self, '_read_only', False):
             from PyQt5.QtWidgets import QMessageBox
@@ -6124,66 +8883,93 @@ class DatabaseView(QWidget):
             else:
                 data.append("")
         idx = self.model.add_row(data)
-        self.model.save_to_db()
-        self.refresh_table()
-        if self.on_data_changed:
-            self.on_data_changed()
+        self.model.save_async()
 
     def delete_row(self):
         if getattr(self, '_read_only', False):
             from PyQt5.QtWidgets import QMessageBox
             QMessageBox.information(self, "Read-Only", "Delete Row is disabled in read-only mode.")
             return
-        row = self.table.currentRow()
+        row = self.table.currentIndex().row()
         if row >= 0:
             self.model.delete_row(row)
-            self.model.save_to_db()
-            self.refresh_table()
-            if self.on_data_changed:
-                self.on_data_changed()
+            self.model.save_async()
 
 
-    def cell_edited(self, row, col):
+    def cell_edited(self, row, col, value):
         colname = ProjectDataModel.COLUMNS[col]
-        if colname in self.DATE_FIELDS:
-            widget = self.table.cellWidget(row, col)
-            if widget:
-                date_val = widget.date().toString("MM-dd-yyyy")
-                self.model.rows[row][colname] = date_val
-        elif colname in self.DROPDOWN_FIELDS or colname == "Parent":
-            widget = self.table.cellWidget(row, col)
-            if widget:
-                self.model.rows[row][colname] = widget.currentText()
-        elif colname == "Pace Link":
-            widget = self.table.cellWidget(row, col)
-            if isinstance(widget, QLineEdit):
-                val = widget.text()
-                self.model.rows[row][colname] = val
-
-        else:
-            val = self.table.item(row, col).text()
-            self.model.rows[row][colname] = val
-            self.model.update_calculated_end_dates()
-            self.model.save_to_db()
-            self.refresh_table()
-        if self.on_data_changed:
-            self.on_data_changed()
+        self.model.set_part_fields(self.model.rows[row].get("Project Part", ""), {colname: value})
+        self._after_row_edit(row)
+        self.model.save_async()
+
+    def _submit_part_update(self, row, updates, field, resolve):
+        """Apply an edit of one row at once and queue its write on the DB worker. If the write fails the
+        model has already put the old values back: a version conflict runs resolve(remote, expected_version)
+        (the handler's dialog), any other failure is reported. Rows may have been added or deleted by
+        then, so resolve looks its row up by part name, not index."""
+        row_dict = self.model.rows[row]
+        part_name = row_dict.get('Project Part','')
+        expected_version = row_dict.get('row_version', 0)
+        def recalc():
+            idx = next((i for i, r in enumerate(self.model.rows) if r is row_dict), None)
+            if idx is not None:
+                self._after_row_edit(idx)
+        def resolve_with(remote):
+            try:
+                resolve(remote or {}, expected_version)
+                recalc()
+            except Exception as e:
+                print(f"ERROR resolving {field} conflict of {part_name}: {e}")
+        def done(ok, info):
+            try:
+                if not ok and info == 'Conflict':
+                    try: log_event('conflict','detected', part=part_name, field=field)
+                    except Exception: pass
+                    # The remote row is read on the DB worker too; the dialog opens once it is back
+                    self.model.db_worker().submit(lambda job: self.model.get_row_snapshot(part_name),
+                                                  on_done=resolve_with, label=f"Reading {part_name}")
+                    return
+                elif not ok:
+                    try: log_event('conflict','other_update_failure', part=part_name, reason=info)
+                    except Exception: pass
+                    recalc()
+                    QMessageBox.warning(self, "Update Failed",
+                                        f"Could not save {field} for '{part_name}': {info}\nThe change was undone.")
+                    return
+                recalc()
+            except Exception as e:
+                print(f"ERROR updating {field} of {part_name}: {e}")
+        self.model.update_part_values_async(part_name, updates, expected_version, done)
+        recalc()
+
+    def _retry_part_update(self, part_name, values, version, action, fallback=None, **log_fields):
+        """Conflict-dialog follow-up: write values at the remote version on the DB worker. If that races
+        again the row is reset to fallback, or to a fresh DB snapshot when fallback is None."""
+        def done(ok, info):
+            try: log_event('conflict', f'{action}_attempt', part=part_name, success=ok, **log_fields)
+            except Exception: pass
+            if not ok:
+                self._reset_part(part_name, fallback)
+        self.model.update_part_values_async(part_name, values, version, done)
+
+    def _reset_part(self, part_name, remote=None):
+        """Replace the in-memory row with remote, or with a DB snapshot read on the worker when None."""
+        if remote is None:
+            def apply(fresh):
+                if fresh:
+                    self.model.set_part_fields(part_name, fresh)
+            self.model.db_worker().submit(lambda job: self.model.get_row_snapshot(part_name),
+                                          on_done=apply, label=f"Reading {part_name}")
+        elif remote:
+            self.model.set_part_fields(part_name, remote)
 
     def dropdown_changed(self, row, col, value):
         colname = ProjectDataModel.COLUMNS[col]
         try:
             part_name = self.model.rows[row].get('Project Part','')
-            # Prepare optimistic update
-            expected_version = self.model.rows[row].get('row_version', 0)
             new_values = {colname: value}
-            ok, info = self.model.update_part_values(part_name, new_values, expected_version)
-            if not ok and info == 'Conflict':
-                try:
-                    log_event('conflict','detected', part=part_name, field=colname)
-                except Exception:
-                    pass
-                remote = self.model.get_row_snapshot(part_name) or {}
-                original = dict(self.model.rows[row])
+            def resolve(remote, expected_version):
+                original = dict(self.model.row_by_name(part_name) or {})
                 dlg = ConflictResolutionDialog(part_name, original=original, pending=new_values, remote=remote, parent=self)
                 if dlg.exec_():
                     if dlg.choice == 'keep':
@@ -6191,46 +8977,21 @@ class DatabaseView(QWidget):
                         except Exception: pass
                         # Reload remote into memory row
                         if remote:
-                            self.model.rows[row].update(remote)
+                            self.model.set_part_fields(part_name, remote)
                     elif dlg.choice == 'overwrite':
-                        # Overwrite: use latest remote version as expected
+                        # Overwrite: use latest remote version as expected; if it still races, refresh the row
                         latest_ver = remote.get('row_version', expected_version)
-                        force_values = dict(new_values)
-                        # Attempt forced update with new version
-                        ok2, info2 = self.model.update_part_values(part_name, force_values, latest_ver)
-                        try: log_event('conflict','overwrite_attempt', part=part_name, success=ok2)
-                        except Exception: pass
-                        if not ok2:
-                            # Could still race; just refresh row
-                            fresh = self.model.get_row_snapshot(part_name)
-                            if fresh:
-                                self.model.rows[row].update(fresh)
+                        self._retry_part_update(part_name, dict(new_values), latest_ver, 'overwrite')
                     elif dlg.choice == 'merge':
                         merged = dlg.merged
                         latest_ver = remote.get('row_version', expected_version)
                         # Remove concurrency keys
                         merged_clean = {k:v for k,v in merged.items() if k in self.model.COLUMNS and k != 'Project Part'}
-                        ok2, info2 = self.model.update_part_values(part_name, merged_clean, latest_ver)
-                        try: log_event('conflict','merge_attempt', part=part_name, success=ok2, fields=list(merged_clean.keys()))
-                        except Exception: pass
-                        if not ok2:
-                            fresh = self.model.get_row_snapshot(part_name)
-                            if fresh:
-                                self.model.rows[row].update(fresh)
+                        self._retry_part_update(part_name, merged_clean, latest_ver, 'merge', fields=list(merged_clean.keys()))
                 else:
                     # Cancel: discard local change and refresh
-                    fresh = self.model.get_row_snapshot(part_name)
-                    if fresh:
-                        self.model.rows[row].update(fresh)
-            elif not ok:
-                try: log_event('conflict','other_update_failure', part=part_name, reason=info)
-                except Exception: pass
-            else:
-                # Successful optimistic update; update in-memory version already done by method
-                pass
-            self.refresh_table()
-            if self.on_data_changed:
-                self.on_data_changed()
+                    self._reset_part(part_name)
+            self._submit_part_update(row, new_values, colname, resolve)
         except Exception as e:
             print(f"ERROR in dropdown_changed: {e}")
     def date_changed(self, row, col, qdate):
@@ -6239,45 +9000,27 @@ class DatabaseView(QWidget):
         try:
             part_name = self.model.rows[row].get('Project Part','')
             date_val = "" if qdate == min_blank else qdate.toString("MM-dd-yyyy")
-            expected_version = self.model.rows[row].get('row_version', 0)
-            ok, info = self.model.update_part_values(part_name, {colname: date_val}, expected_version)
-            if not ok and info == 'Conflict':
-                try: log_event('conflict','detected', part=part_name, field=colname)
-                except Exception: pass
-                remote = self.model.get_row_snapshot(part_name) or {}
-                original = dict(self.model.rows[row])
+            def resolve(remote, expected_version):
+                original = dict(self.model.row_by_name(part_name) or {})
                 dlg = ConflictResolutionDialog(part_name, original=original, pending={colname: date_val}, remote=remote, parent=self)
                 if dlg.exec_():
                     if dlg.choice == 'keep':
                         if remote:
-                            self.model.rows[row].update(remote)
+                            self.model.set_part_fields(part_name, remote)
                             try: log_event('conflict','keep_remote', part=part_name)
                             except Exception: pass
                     elif dlg.choice == 'overwrite':
                         latest_ver = remote.get('row_version', expected_version)
-                        ok2, info2 = self.model.update_part_values(part_name, {colname: date_val}, latest_ver)
-                        try: log_event('conflict','overwrite_attempt', part=part_name, success=ok2)
-                        except Exception: pass
-                        if not ok2 and remote:
-                            self.model.rows[row].update(remote)
+                        self._retry_part_update(part_name, {colname: date_val}, latest_ver, 'overwrite', fallback=remote)
                     elif dlg.choice == 'merge':
                         # For date single-field merge same as overwrite local selection outcome
                         latest_ver = remote.get('row_version', expected_version)
-                        ok2, info2 = self.model.update_part_values(part_name, {colname: date_val}, latest_ver)
-                        try: log_event('conflict','merge_attempt', part=part_name, success=ok2, fields=[colname])
-                        except Exception: pass
-                        if not ok2 and remote:
-                            self.model.rows[row].update(remote)
+                        self._retry_part_update(part_name, {colname: date_val}, latest_ver, 'merge', fallback=remote, fields=[colname])
                 else:
                     # Cancel -> leave remote
                     if remote:
-                        self.model.rows[row].update(remote)
-            elif not ok:
-                try: log_event('conflict','other_update_failure', part=part_name, reason=info)
-                except Exception: pass
-            self.refresh_table()
-            if self.on_data_changed:
-                self.on_data_changed()
+                        self.model.set_part_fields(part_name, remote)
+            self._submit_part_update(row, {colname: date_val}, colname, resolve)
         except Exception as e:
             print(f"ERROR in date_changed: {e}")
 
@@ -6293,46 +9036,28 @@ class DatabaseView(QWidget):
                     updates["Actual Finish Date"] = datetime.datetime.today().strftime("%m-%d-%Y")
                 if not self.model.rows[row].get("Actual Start Date"):
                     updates["Actual Start Date"] = datetime.datetime.today().strftime("%m-%d-%Y")
-            expected_version = self.model.rows[row].get('row_version', 0)
-            ok, info = self.model.update_part_values(part_name, updates, expected_version)
-            if not ok and info == 'Conflict':
-                try: log_event('conflict','detected', part=part_name, field='% Complete')
-                except Exception: pass
-                remote = self.model.get_row_snapshot(part_name) or {}
-                original = dict(self.model.rows[row])
+            def resolve(remote, expected_version):
+                original = dict(self.model.row_by_name(part_name) or {})
                 dlg = ConflictResolutionDialog(part_name, original=original, pending=updates, remote=remote, parent=self)
                 if dlg.exec_():
                     choice_fields = updates.keys()
                     if dlg.choice == 'keep':
                         if remote:
-                            self.model.rows[row].update(remote)
+                            self.model.set_part_fields(part_name, remote)
                             try: log_event('conflict','keep_remote', part=part_name)
                             except Exception: pass
                     elif dlg.choice == 'overwrite':
                         latest_ver = remote.get('row_version', expected_version)
-                        ok2, info2 = self.model.update_part_values(part_name, updates, latest_ver)
-                        try: log_event('conflict','overwrite_attempt', part=part_name, success=ok2)
-                        except Exception: pass
-                        if not ok2 and remote:
-                            self.model.rows[row].update(remote)
+                        self._retry_part_update(part_name, updates, latest_ver, 'overwrite', fallback=remote)
                     elif dlg.choice == 'merge':
                         merged = dlg.merged
                         latest_ver = remote.get('row_version', expected_version)
                         merged_clean = {k:v for k,v in merged.items() if k in self.model.COLUMNS and k != 'Project Part'}
-                        ok2, info2 = self.model.update_part_values(part_name, merged_clean, latest_ver)
-                        try: log_event('conflict','merge_attempt', part=part_name, success=ok2, fields=list(merged_clean.keys()))
-                        except Exception: pass
-                        if not ok2 and remote:
-                            self.model.rows[row].update(remote)
+                        self._retry_part_update(part_name, merged_clean, latest_ver, 'merge', fallback=remote, fields=list(merged_clean.keys()))
                 else:
                     if remote:
-                        self.model.rows[row].update(remote)
-            elif not ok:
-                try: log_event('conflict','other_update_failure', part=part_name, reason=info)
-                except Exception: pass
-            self.refresh_table()
-            if self.on_data_changed:
-                self.on_data_changed()
+                        self.model.set_part_fields(part_name, remote)
+            self._submit_part_update(row, updates, '% Complete', resolve)
         except Exception as e:
             print(f"ERROR in percent_changed: {e}")
 
@@ -6351,50 +9076,65 @@ class DatabaseView(QWidget):
                     updates["Actual Start Date"] = today_str
                 if not self.model.rows[row].get("Actual Finish Date"):
                     updates["Actual Finish Date"] = today_str
-            expected_version = self.model.rows[row].get('row_version', 0)
-            ok, info = self.model.update_part_values(part_name, updates, expected_version)
-            if not ok and info == 'Conflict':
-                try: log_event('conflict','detected', part=part_name, field='Status')
-                except Exception: pass
-                remote = self.model.get_row_snapshot(part_name) or {}
-                original = dict(self.model.rows[row])
+            def resolve(remote, expected_version):
+                original = dict(self.model.row_by_name(part_name) or {})
                 dlg = ConflictResolutionDialog(part_name, original=original, pending=updates, remote=remote, parent=self)
                 if dlg.exec_():
                     if dlg.choice == 'keep':
                         if remote:
-                            self.model.rows[row].update(remote)
+                            self.model.set_part_fields(part_name, remote)
                             try: log_event('conflict','keep_remote', part=part_name)
                             except Exception: pass
                     elif dlg.choice == 'overwrite':
                         latest_ver = remote.get('row_version', expected_version)
-                        ok2, info2 = self.model.update_part_values(part_name, updates, latest_ver)
-                        try: log_event('conflict','overwrite_attempt', part=part_name, success=ok2)
-                        except Exception: pass
-                        if not ok2 and remote:
-                            self.model.rows[row].update(remote)
+                        self._retry_part_update(part_name, updates, latest_ver, 'overwrite', fallback=remote)
                     elif dlg.choice == 'merge':
                         merged = dlg.merged
                         latest_ver = remote.get('row_version', expected_version)
                         merged_clean = {k:v for k,v in merged.items() if k in self.model.COLUMNS and k != 'Project Part'}
-                        ok2, info2 = self.model.update_part_values(part_name, merged_clean, latest_ver)
-                        try: log_event('conflict','merge_attempt', part=part_name, success=ok2, fields=list(merged_clean.keys()))
-                        except Exception: pass
-                        if not ok2 and remote:
-                            self.model.rows[row].update(remote)
+                        self._retry_part_update(part_name, merged_clean, latest_ver, 'merge', fallback=remote, fields=list(merged_clean.keys()))
                 else:
                     if remote:
-                        self.model.rows[row].update(remote)
-            elif not ok:
-                try: log_event('conflict','other_update_failure', part=part_name, reason=info)
-                except Exception: pass
-            self.refresh_table()
-            if self.on_data_changed:
-                self.on_data_changed()
+                        self.model.set_part_fields(part_name, remote)
+            self._submit_part_update(row, updates, 'Status', resolve)
         except Exception as e:
             print(f"ERROR in status_changed: {e}")
 
 
 class MainWindow(QMainWindow):
+    def _open_performance_panel(self):
+        dlg = getattr(self, '_perf_dialog', None)
+        if dlg is None:
+            dlg = self._perf_dialog = PerformanceDialog(PERF, self, watchdog=self._stall_watchdog)
+        dlg.show()
+        dlg.raise_()
+        dlg.activateWindow()
+
+    _stall_watchdog = None
+
+    def _set_stall_watchdog(self, enabled):
+        """Start/stop the UI stall watchdog (Tools menu, QSettings Diagnostics/stall_watchdog)."""
+        try:
+            if enabled and self._stall_watchdog is None:
+                from PyQt5.QtCore import QSettings
+                try:
+                    threshold = int(QSettings('LSI', 'ProjectApp').value('Diagnostics/stall_threshold_ms', 250))
+                except Exception:
+                    threshold = 250
+                self._stall_watchdog = UiStallWatchdog(threshold, self)
+                self._stall_watchdog.context = self.sidebar.currentItem().text() if self.sidebar.currentItem() else ""
+                self._stall_watchdog.start()
+            elif not enabled and self._stall_watchdog is not None:
+                self._stall_watchdog.stop()
+                self._stall_watchdog = None
+            # Rebuilt on next open so the stalls table follows the toggle
+            if getattr(self, '_perf_dialog', None) is not None:
+                self._perf_dialog.close()
+                self._perf_dialog.deleteLater()
+                self._perf_dialog = None
+        except Exception as e:
+            print(f"Stall watchdog toggle failed: {e}")
+
     def _open_holidays_manager(self):
         from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QListWidget, QLineEdit, QMessageBox
         dlg = QDialog(self)
@@ -6447,10 +9187,7 @@ class MainWindow(QMainWindow):
             save_holiday_dates(vals)
             # Refresh views to apply shading
             try:
-                if hasattr(self, 'gantt_chart_view'):
-                    self.gantt_chart_view.render_gantt(self.model)
-                if hasattr(self, 'timeline_view'):
-                    self.timeline_view.render_timeline()
+                self._mark_views_stale((1, 3))
                 if self.statusBar():
                     self.statusBar().showMessage("Holidays saved", 2500)
             except Exception:
@@ -6461,35 +9198,86 @@ class MainWindow(QMainWindow):
         v.addLayout(btns)
         dlg.setLayout(v)
         dlg.exec_()
-    def on_data_changed(self):
-        # Refresh all views when data changes
+    # --- Lazy view refresh ---
+    # Stack pages rendered from ProjectDataModel rows (tree, gantt, timeline, database, dashboard)
+    MODEL_VIEW_PAGES = (0, 1, 3, 4, 5)
+
+    def _view_refreshers(self):
+        """Stack index -> callable that rebuilds that page from the model."""
+        out = {}
         if hasattr(self, 'project_tree_view'):
-            self.project_tree_view.refresh()
+            out[0] = self.project_tree_view.refresh
         if hasattr(self, 'gantt_chart_view'):
-            self.gantt_chart_view.render_gantt(self.model)
+            # Layout diffing keeps this to the bars whose geometry/state changed
+            out[1] = lambda: self.gantt_chart_view.render_gantt(self.model)
         if hasattr(self, 'timeline_view'):
-            self.timeline_view.render_timeline()
+            out[3] = self.timeline_view.render_timeline
         if hasattr(self, 'database_view'):
-            self.database_view.refresh_table()
+            out[4] = self.database_view.refresh_table
         if hasattr(self, 'progress_dashboard'):
-            # Refresh metrics summary
-            self.progress_dashboard.refresh()
+            out[5] = self.progress_dashboard.refresh
+        return out
+
+    def _mark_views_stale(self, indices):
+        """Flag pages as out of date and schedule one deferred refresh for the burst.
+        Only the visible page is rebuilt then; hidden pages wait until display_view shows them."""
+        from PyQt5.QtCore import QTimer
+        self._stale_views.update(indices)
+        if not self._view_refresh_pending:
+            self._view_refresh_pending = True
+            QTimer.singleShot(0, self._flush_view_refresh)
+
+    def _flush_view_refresh(self):
+        self._view_refresh_pending = False
+        if hasattr(self, 'views'):
+            self._ensure_view_fresh(self.views.currentIndex())
         # Update DB status banner
         try:
             self._update_db_status()
         except Exception:
             pass
+
+    def _ensure_view_fresh(self, index):
+        """Rebuild the page at index if it was marked stale; returns True when a refresh ran."""
+        if index not in self._stale_views:
+            return False
+        self._stale_views.discard(index)
+        fn = self._view_refreshers().get(index)
+        if fn is None:
+            return False
+        try:
+            fn()
+        except Exception as e:
+            print(f"View refresh failed (page {index}): {e}")
+        return True
+
+    def on_data_changed(self, include_database=True):
+        # Rows may have been edited in place, so drop derived caches; views rebuild lazily
+        try:
+            self.model.bump_data_version()
+        except Exception:
+            pass
+        self._mark_views_stale(p for p in self.MODEL_VIEW_PAGES if include_database or p != 4)
+
+    def _on_model_event(self, event):
+        """Model change listener. The Database view subscribes on its own, so it is skipped here."""
+        if event.structural:
+            self.on_data_changed(include_database=False)
+        else:
+            self.on_parts_changed(event.parts)
+
+    def on_parts_changed(self, part_names):
+        """Targeted variant of on_data_changed for in-place edits of existing parts.
+        The model has already bumped data_version for these edits and the Database view repaints itself."""
+        self._mark_views_stale(p for p in self.MODEL_VIEW_PAGES if p != 4)
+
     def display_view(self, index):
+        if self._stall_watchdog is not None and self.sidebar.item(index) is not None:
+            self._stall_watchdog.context = self.sidebar.item(index).text()
         self.views.setCurrentIndex(index)
-        if index == 0:
-            self.project_tree_view.refresh()
-        elif index == 1:
-            self.gantt_chart_view.render_gantt(self.model)
-        elif index == 4:
-            self.database_view.refresh_table()
-        elif index == 5 and hasattr(self, 'progress_dashboard'):
-            self.progress_dashboard.refresh()
-        elif index == 6 and hasattr(self, 'cost_estimates_view'):
+        self._ensure_view_fresh(index)
+        if index == 6 and hasattr(self, 'cost_estimates_view'):
+            # Cost data lives outside ProjectDataModel's change events, so always reload it
             self.cost_estimates_view.refresh()
     def _on_jump_to_gantt_from_tree(self, part_name):
         try:
@@ -6499,9 +9287,9 @@ class MainWindow(QMainWindow):
                     self.sidebar.setCurrentRow(1)
             except Exception:
                 pass
-            # Render & highlight
+            # Render (if stale) & highlight
             if hasattr(self, 'gantt_chart_view'):
-                self.gantt_chart_view.render_gantt(self.model)
+                self._ensure_view_fresh(1)
                 if hasattr(self.gantt_chart_view, 'highlight_bar'):
                     self.gantt_chart_view.highlight_bar(part_name)
             if self.statusBar():
@@ -6530,7 +9318,7 @@ class MainWindow(QMainWindow):
                     background-color: #4B4B4B;
                     color: #FF8200;
                 }
-                QLineEdit, QTableWidget, QTreeWidget, QComboBox, QDateEdit, QHeaderView::section {
+                QLineEdit, QTableView, QTreeWidget, QComboBox, QDateEdit, QSpinBox, QHeaderView::section {
                     background-color: #333333;
                     color: #FF8200;
                     border: 1px solid #FF8200;
@@ -6540,12 +9328,17 @@ class MainWindow(QMainWindow):
                     color: #FF8200;
                     border: 1px solid #FF8200;
                 }
-                QTableWidget QTableCornerButton::section {
+                QTableView QTableCornerButton::section {
                     background-color: #333333;
                 }
             """)
 
             self.model = model
+            # Pages awaiting a rebuild; see _mark_views_stale
+            self._stale_views = set()
+            self._view_refresh_pending = False
+            # Views refresh from model change events rather than explicit calls after each load/edit
+            self.model.subscribe(self._on_model_event)
             # File-based edit lock ownership flag
             self._own_lock = False
 
@@ -6666,19 +9459,18 @@ class MainWindow(QMainWindow):
             
             # Define reload action logic to use in Tools menu
             def do_reload():
-                try:
-                    # Re-load from disk to pick up synced changes
-                    self.model.load_from_db()
-                    self.on_data_changed()
+                def reloaded():
                     if self.statusBar():
                         self.statusBar().showMessage("Reloaded from disk", 3000)
-                except Exception as e:
-                    print(f"Reload failed: {e}")
-                finally:
                     try:
                         self._update_db_status()
                     except Exception:
                         pass
+                try:
+                    # Re-load from disk (on the DB worker) to pick up synced changes
+                    self.model.load_async(on_done=reloaded)
+                except Exception as e:
+                    print(f"Reload failed: {e}")
             # Keep a reference for other components (e.g., file change watcher)
             self._do_reload = do_reload
 
@@ -6698,7 +9490,7 @@ class MainWindow(QMainWindow):
                 act_reload.triggered.connect(do_reload)
                 tmenu.addSeparator()
                 # Onboarding settings toggle
-                from PyQt5.QtCore import QSettings
+                from PyQt5.QtCore import QSettings, QTimer
                 s_on = QSettings('LSI','ProjectApp')
                 hide_flag = s_on.value('Onboarding/hide_empty_dialog', False)
                 if isinstance(hide_flag, str):
@@ -6721,6 +9513,26 @@ class MainWindow(QMainWindow):
                 act_open_folder.triggered.connect(self.open_data_folder)
                 act_manage_holidays = tmenu.addAction("Manage Holidays…")
                 act_manage_holidays.triggered.connect(self._open_holidays_manager)
+                act_performance = tmenu.addAction("Performance…")
+                act_performance.triggered.connect(self._open_performance_panel)
+                act_watchdog = tmenu.addAction("Detect UI Stalls")
+                act_watchdog.setCheckable(True)
+                watchdog_flag = s_on.value('Diagnostics/stall_watchdog', False)
+                if isinstance(watchdog_flag, str):
+                    watchdog_flag = watchdog_flag.lower() in ('1','true','yes','on')
+                watchdog_flag = bool(watchdog_flag) or os.environ.get('PROJECT_STALL_WATCHDOG', '').lower() in ('1','true','yes','on')
+                act_watchdog.setChecked(watchdog_flag)
+                def toggle_watchdog(on):
+                    try:
+                        s_on.setValue('Diagnostics/stall_watchdog', bool(on))
+                        self._set_stall_watchdog(on)
+                        if self.statusBar():
+                            self.statusBar().showMessage("UI stall detection {}".format("enabled" if on else "disabled"), 2500)
+                    except Exception:
+                        pass
+                act_watchdog.toggled.connect(toggle_watchdog)
+                if watchdog_flag:
+                    QTimer.singleShot(0, lambda: self._set_stall_watchdog(True))
                 tmenu.addSeparator()
                 act_switch_db = tmenu.addAction("Switch Data File…")
                 def do_switch_db():
@@ -6739,11 +9551,11 @@ class MainWindow(QMainWindow):
                             QSettings('LSI','ProjectApp').setValue('DB/path', path)
                         except Exception:
                             pass
-                        # Point model to new DB and reload
+                        # Point model to new DB and reload; queued writes still target the old file
+                        self.model.flush_pending_writes()
                         self.model.DB_FILE = path
                         self.model.ensure_schema()
                         self.model.load_from_db()
-                        self.on_data_changed()
                         if self.statusBar():
                             self.statusBar().showMessage("Switched DB and reloaded", 3000)
                     except Exception as e:
@@ -6752,8 +9564,9 @@ class MainWindow(QMainWindow):
                 act_backup_db = tmenu.addAction("Backup Database…")
                 def do_backup_db():
                     import datetime
-                    try:
-                        base = os.path.abspath(self.model.DB_FILE)
+                    base = os.path.abspath(self.model.DB_FILE)
+                    def copy_files(job):
+                        # Runs on the DB worker, after any queued saves
                         folder = os.path.dirname(base)
                         ts = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
                         stem = os.path.splitext(os.path.basename(base))[0]
@@ -6765,6 +9578,8 @@ class MainWindow(QMainWindow):
                             src = base + ext
                             if os.path.exists(src):
                                 shutil.copy2(src, dest + ext)
+                        return dest
+                    def copied(dest):
                         try:
                             # Record last backup time in QSettings and log
                             from PyQt5.QtCore import QSettings
@@ -6774,10 +9589,11 @@ class MainWindow(QMainWindow):
                             pass
                         if self.statusBar():
                             self.statusBar().showMessage(f"Backup created: {dest}", 3000)
-                    except Exception as e:
+                    def failed(e):
                         try: log_event('backup','backup_failed', error=str(e))
                         except Exception: pass
                         print(f"Backup failed: {e}")
+                    self.model.db_worker().submit(copy_files, on_done=copied, on_error=failed, label="Backing up database")
                 act_backup_db.triggered.connect(do_backup_db)
                 # Create Shared Folder (OneDrive template)
                 def do_create_shared_folder():
@@ -6858,10 +9674,10 @@ class MainWindow(QMainWindow):
                                     QSettings('LSI','ProjectApp').setValue('DB/path', dest_db)
                                 except Exception:
                                     pass
+                                self.model.flush_pending_writes()
                                 self.model.DB_FILE = dest_db
                                 self.model.ensure_schema()
                                 self.model.load_from_db()
-                                self.on_data_changed()
                         except Exception:
                             pass
                         if self.statusBar():
@@ -7027,8 +9843,10 @@ class MainWindow(QMainWindow):
                     if ok:
                         self._sync_watch_ms = int(sec * 1000)
                         try:
-                            if hasattr(self, '_db_watch_timer') and self._db_watch_timer is not None:
-                                self._db_watch_timer.setInterval(self._sync_watch_ms)
+                            if getattr(self, '_db_watcher', None) is not None:
+                                self._db_watcher.set_poll_interval(self._sync_watch_ms)
+                            if getattr(self, '_lock_heartbeat_timer', None) is not None:
+                                self._lock_heartbeat_timer.setInterval(self._sync_watch_ms * 10)
                         except Exception:
                             pass
                         try:
@@ -7324,6 +10142,17 @@ class MainWindow(QMainWindow):
             self.open_folder_btn = _QBtn("Open Data Folder")
             self.open_folder_btn.setStyleSheet("font-size:11px")
             self.open_folder_btn.clicked.connect(self.open_data_folder)
+            # Background DB work indicator (hidden while the worker is idle)
+            from PyQt5.QtWidgets import QProgressBar
+            self.db_busy_label = QLabel()
+            self.db_busy_label.setStyleSheet("color:#ccc; font-size:11px")
+            self.db_busy_bar = QProgressBar()
+            self.db_busy_bar.setFixedWidth(120)
+            self.db_busy_bar.setMaximumHeight(14)
+            self.db_busy_bar.setTextVisible(False)
+            self.db_busy_cancel = _QBtn("Cancel")
+            self.db_busy_cancel.setStyleSheet("font-size:11px")
+            self.db_busy_cancel.clicked.connect(lambda: self.model.db_worker().cancel_all())
             sb.addPermanentWidget(self.db_status_label, 1)
             sb.addPermanentWidget(self.db_sync_label, 0)
             sb.addPermanentWidget(self.code_sync_label, 0)
@@ -7331,6 +10160,13 @@ class MainWindow(QMainWindow):
             sb.addPermanentWidget(self.db_warning_label, 0)
             sb.addPermanentWidget(self.db_ro_label, 0)
             sb.addPermanentWidget(self.open_folder_btn, 0)
+            sb.addPermanentWidget(self.db_busy_label, 0)
+            sb.addPermanentWidget(self.db_busy_bar, 0)
+            sb.addPermanentWidget(self.db_busy_cancel, 0)
+            worker = self.model.db_worker()
+            worker.busyChanged.connect(self._on_db_busy)
+            worker.progress.connect(self._on_db_progress)
+            self._on_db_busy(worker.busy, "")
             self._update_db_status()
             # Initialize code sync status once at startup
             try:
@@ -7347,28 +10183,29 @@ class MainWindow(QMainWindow):
                 self._update_read_only_indicator()
             except Exception:
                 pass
-            # Initialize DB change watcher (detect OneDrive sync updates)
+            # Initialize DB change watcher (detect OneDrive sync updates): file events, or polling on network shares
             try:
                 from PyQt5.QtCore import QTimer
                 self._db_last_mtime = self._get_db_mtime()
                 self._db_change_prompt_at = 0.0
-                self._db_watch_timer = QTimer(self)
                 # Respect persisted interval
                 try:
                     from PyQt5.QtCore import QSettings
                     self._sync_watch_ms = int(QSettings('LSI','ProjectApp').value('Sync/watch_interval_ms', 2000))
                 except Exception:
                     self._sync_watch_ms = 2000
-                self._db_watch_timer.setInterval(int(self._sync_watch_ms))
-                self._db_watch_timer.timeout.connect(self._check_db_changed)
-                self._db_watch_timer.start()
-                # Initialize code sync tracking for periodic refresh
-                try:
-                    self._last_code_mtime = self._get_code_mtime()
-                except Exception:
-                    self._last_code_mtime = 0.0
-                self._code_check_accum = 0
-                self._lock_tick = 0
+                self._last_code_mtime = 0.0
+                self._last_lock_info = self._read_edit_lock() or {}
+                self._db_watcher = DbChangeWatcher(self.model.DB_FILE, self._sync_watch_ms,
+                                                   code_probe=self._get_code_mtime, parent=self)
+                self._db_watcher.changed.connect(self._check_db_changed)
+                self._db_watcher.codeChanged.connect(self._on_code_changed)
+                self._db_watcher.start()
+                # Heartbeat our lock (and re-evaluate staleness of others') every ~10 watch intervals
+                self._lock_heartbeat_timer = QTimer(self)
+                self._lock_heartbeat_timer.setInterval(int(self._sync_watch_ms) * 10)
+                self._lock_heartbeat_timer.timeout.connect(self._lock_heartbeat)
+                self._lock_heartbeat_timer.start()
             except Exception:
                 pass
 
@@ -7396,7 +10233,6 @@ class MainWindow(QMainWindow):
                         if resp != QMessageBox.Yes:
                             return
                     self.model.load_sample_data()
-                    self.on_data_changed()
                     if self.statusBar():
                         self.statusBar().showMessage("Sample data created", 3000)
                 except Exception as e:
@@ -7412,19 +10248,21 @@ class MainWindow(QMainWindow):
                 from PyQt5.QtCore import QTimer, QSettings
                 # Perform a quick integrity check shortly after startup (asynchronous so UI shows quickly)
                 def run_integrity_check():
-                    try:
-                        import sqlite3
-                        with self.model._connect() as _c:
+                    def check(job):
+                        with self.model._read() as _c:
                             cur = _c.cursor()
                             cur.execute('PRAGMA quick_check')
-                            rows = cur.fetchall()
-                            ok = all(r[0] == 'ok' for r in rows)
-                            log_event('integrity','quick_check_result', ok=ok, details=[r[0] for r in rows])
-                            if not ok and self.statusBar():
-                                self.statusBar().showMessage('DB integrity issues detected – consider restoring a backup', 8000)
-                    except Exception as e:
+                            return [r[0] for r in cur.fetchall()]
+                    def checked(details):
+                        ok = all(d == 'ok' for d in details)
+                        try: log_event('integrity','quick_check_result', ok=ok, details=details)
+                        except Exception: pass
+                        if not ok and self.statusBar():
+                            self.statusBar().showMessage('DB integrity issues detected – consider restoring a backup', 8000)
+                    def failed(e):
                         try: log_event('integrity','quick_check_error', error=str(e))
                         except Exception: pass
+                    self.model.db_worker().submit(check, on_done=checked, on_error=failed, label="Checking database")
                 QTimer.singleShot(3000, run_integrity_check)
                 # Daily reminder (every 6 hours tick) if last backup older than 7 days
                 def backup_reminder_tick():
@@ -7491,7 +10329,6 @@ class MainWindow(QMainWindow):
                     if dlg.selected_action == 'sample':
                         try:
                             self.model.load_sample_data()
-                            self.on_data_changed()
                         except Exception as e:
                             print(f"Onboarding sample data failed: {e}")
                     elif dlg.selected_action == 'switch':
@@ -7571,6 +10408,9 @@ class MainWindow(QMainWindow):
         # Update cached mtime baseline for watcher if needed
         try:
             self._db_last_mtime = self._get_db_mtime()
+            watcher = getattr(self, '_db_watcher', None)
+            if watcher is not None and watcher.db_path != os.path.abspath(self.model.DB_FILE):
+                watcher.set_db_path(self.model.DB_FILE)
         except Exception:
             pass
     def _get_db_mtime(self):
@@ -7809,58 +10649,55 @@ class MainWindow(QMainWindow):
                 self.lock_label.setText(txt)
         except Exception:
             pass
-    def _check_db_changed(self):
+    def _lock_heartbeat(self):
+        try:
+            if getattr(self, '_own_lock', False):
+                self._write_edit_lock()
+            # A lock can go stale without its file changing
+            self._update_lock_status(getattr(self, '_last_lock_info', None) or {})
+        except Exception:
+            pass
+    def _on_code_changed(self, m):
+        if m and m != getattr(self, '_last_code_mtime', 0.0):
+            self._last_code_mtime = m
+            self._update_code_status()
+    def _check_db_changed(self, db_changed=True, lock_changed=True):
+        # Slot for DbChangeWatcher.changed (runs on the GUI thread, once per debounced change)
         import time
         try:
-            # Refresh lock status every tick; heartbeat our lock every ~10 ticks
-            try:
-                self._update_lock_status()
-                self._lock_tick = getattr(self, '_lock_tick', 0) + 1
-                if self._lock_tick >= 10 and getattr(self, '_own_lock', False):
-                    self._lock_tick = 0
-                    self._write_edit_lock()
-            except Exception:
-                pass
             # If another user holds a fresh lock and we're in editing mode, switch to read-only
-            try:
-                info = self._read_edit_lock() or {}
-                owner = info.get('owner')
-                if owner and owner != self._whoami() and not self._is_lock_stale(info):
-                    if not bool(getattr(self.model, 'read_only', False)):
-                        # Flip to read-only and reflect in UI
-                        self.model.read_only = True
-                        try:
-                            if hasattr(self, '_act_toggle_ro'):
-                                self._act_toggle_ro.blockSignals(True)
-                                self._act_toggle_ro.setChecked(True)
-                                self._act_toggle_ro.blockSignals(False)
-                        except Exception:
-                            pass
-                        try:
-                            if hasattr(self, 'database_view') and hasattr(self.database_view, 'set_read_only'):
-                                self.database_view.set_read_only(True)
-                        except Exception:
-                            pass
-                        try:
-                            self._update_read_only_indicator()
-                        except Exception:
-                            pass
-                        if self.statusBar():
-                            self.statusBar().showMessage("Another user acquired the edit lock — switching to Read-Only", 3500)
-            except Exception:
-                pass
-            # Periodically refresh code sync label (every ~5 ticks)
-            try:
-                self._code_check_accum = getattr(self, '_code_check_accum', 0) + 1
-                if self._code_check_accum >= 5:
-                    self._code_check_accum = 0
-                    m = self._get_code_mtime()
-                    if m and m != getattr(self, '_last_code_mtime', 0.0):
-                        self._last_code_mtime = m
-                        self._update_code_status()
-            except Exception:
-                pass
-
+            if lock_changed:
+                try:
+                    info = self._read_edit_lock() or {}
+                    self._last_lock_info = info
+                    self._update_lock_status(info)
+                    owner = info.get('owner')
+                    if owner and owner != self._whoami() and not self._is_lock_stale(info):
+                        if not bool(getattr(self.model, 'read_only', False)):
+                            # Flip to read-only and reflect in UI
+                            self.model.read_only = True
+                            try:
+                                if hasattr(self, '_act_toggle_ro'):
+                                    self._act_toggle_ro.blockSignals(True)
+                                    self._act_toggle_ro.setChecked(True)
+                                    self._act_toggle_ro.blockSignals(False)
+                            except Exception:
+                                pass
+                            try:
+                                if hasattr(self, 'database_view') and hasattr(self.database_view, 'set_read_only'):
+                                    self.database_view.set_read_only(True)
+                            except Exception:
+                                pass
+                            try:
+                                self._update_read_only_indicator()
+                            except Exception:
+                                pass
+                            if self.statusBar():
+                                self.statusBar().showMessage("Another user acquired the edit lock — switching to Read-Only", 3500)
+                except Exception:
+                    pass
+            if not db_changed:
+                return
             cur = self._get_db_mtime()
             last = getattr(self, '_db_last_mtime', 0.0)
             if cur and (cur > last + 0.5):
@@ -8084,8 +10921,41 @@ class MainWindow(QMainWindow):
             self.save_filter_settings()
         except Exception:
             pass
+        try:
+            # Queued edits must reach the database before the app exits
+            self.model.flush_pending_writes(15000)
+            self.model.close_connections()
+        except Exception:
+            pass
+        try:
+            if self._stall_watchdog is not None:
+                self._stall_watchdog.stop()
+            if getattr(self, '_db_watcher', None) is not None:
+                self._db_watcher.stop()
+        except Exception:
+            pass
         super().closeEvent(event)
 
+    # --- Background DB work indicator ---
+    def _on_db_busy(self, busy, label):
+        try:
+            self.db_busy_label.setText(f"{label}…" if busy and label else "")
+            self.db_busy_bar.setRange(0, 0)  # indeterminate until the job reports progress
+            job = self.model.db_worker().current_job if busy else None
+            self.db_busy_cancel.setVisible(bool(job is not None and job.cancellable))
+            self.db_busy_bar.setVisible(bool(busy))
+            self.db_busy_label.setVisible(bool(busy))
+        except Exception:
+            pass
+
+    def _on_db_progress(self, job, done, total):
+        try:
+            if total > 0:
+                self.db_busy_bar.setRange(0, total)
+                self.db_busy_bar.setValue(min(done, total))
+        except Exception:
+            pass
+
     # --- Dynamic header resize to fit window and eliminate cushion ---
     def _resize_header(self):
         try:
@@ -0,0 +1,159 @@
+"""Qt-free project schema and export helpers shared by main.py and cli.py.
+
+Importing this module pulls in neither PyQt5 nor NumPy, so command-line exports stay light.
+"""
+
+# NOTE: Append-only pattern; new progress-related columns added at end to avoid breaking older rows
+PROJECT_COLUMNS = [
+    "Project Part", "Parent", "Children", "Start Date", "Duration (days)", "Internal/External", "Dependencies", "Type", "Calculated End Date", "Resources", "Notes", "Responsible", "Images", "Pace Link", "Attachments",
+    # Progress tracking fields
+    "% Complete",            # Integer 0-100 (leaf editable, parents rolled up)
+    "Status",                 # Planned | In Progress | Blocked | Done | Deferred
+    "Actual Start Date",      # Set when Status transitions to In Progress
+    "Actual Finish Date",     # Set when Status transitions to Done
+    "Baseline Start Date",    # Captured first time valid start/duration appear
+    "Baseline End Date",      # Derived from baseline start + duration (working days not yet applied)
+    # Cost tracking fields
+    "Production Cost",        # Internal estimated production cost (materials + fabrication labor)
+    "Installation Cost",      # Internal estimated install cost (crew labor + equipment)
+    "Production Price",       # Decimal number (price to be charged for production)
+    "Installation Price",     # Decimal number (price to be charged for installation)
+    # Extended cost breakdown (append-only)
+    "Material Cost",          # Materials-only direct cost
+    "Fabrication Labor Hours",# Hours for shop fabrication
+    "Installation Labor Hours",# Hours for field install
+    "Labor Rate",             # Default blended labor rate (can be overridden per row)
+    "Install Labor Rate"      # Field install labor rate
+    ,"Equipment Cost"         # Lift / crane / equipment rental cost
+    ,"Permit/Eng Cost"        # Permitting or engineering fees
+    ,"Contingency %"          # Applied percentage buffer (on cost basis)
+    ,"Warranty Reserve %"     # Percentage of price allocated to warranty reserve
+    ,"Risk Level"             # Low | Medium | High affects margin target (future)
+    ,"Quote Version"          # Current working quote version label
+    ,"Frozen Production Cost" # Snapshot baseline cost
+    ,"Frozen Installation Cost"
+    ,"Frozen Production Price"
+    ,"Frozen Installation Price"
+]
+
+
+def parse_mdy(s):
+    """Parse an MM-dd-YYYY string to datetime.date (None if blank/invalid). Fast path for zero-padded strings."""
+    import datetime
+    if not s:
+        return None
+    s = str(s).strip()
+    try:
+        if len(s) == 10 and s[2] == '-' and s[5] == '-':
+            return datetime.date(int(s[6:10]), int(s[0:2]), int(s[3:5]))
+        return datetime.datetime.strptime(s, "%m-%d-%Y").date()
+    except Exception:
+        return None
+
+
+# --- Streaming XLSX export ---
+XLSX_MONEY_COLUMNS = {"Production Cost", "Installation Cost", "Production Price", "Installation Price", "Material Cost",
+                      "Labor Rate", "Install Labor Rate", "Equipment Cost", "Permit/Eng Cost", "Frozen Production Cost",
+                      "Frozen Installation Cost", "Frozen Production Price", "Frozen Installation Price"}
+XLSX_NUMBER_COLUMNS = {"Duration (days)", "Fabrication Labor Hours", "Installation Labor Hours"}
+XLSX_PERCENT_COLUMNS = {"% Complete", "Contingency %", "Warranty Reserve %"}   # stored as points (0-100)
+XLSX_DATE_COLUMNS = {"Start Date", "Calculated End Date", "Actual Start Date", "Actual Finish Date",
+                     "Baseline Start Date", "Baseline End Date"}
+
+def xlsx_column_kind(name):
+    """Export type of a ProjectDataModel column: money, number, pct100, date or text."""
+    if name in XLSX_MONEY_COLUMNS:
+        return "money"
+    if name in XLSX_NUMBER_COLUMNS:
+        return "number"
+    if name in XLSX_PERCENT_COLUMNS:
+        return "pct100"
+    if name in XLSX_DATE_COLUMNS:
+        return "date"
+    return "text"
+
+def write_xlsx_stream(path, columns, rows, sheet_title="Sheet1", meta_rows=None, sample_size=200):
+    """Write rows to path with openpyxl's write-only workbook, so memory stays flat however many rows.
+    columns: [(header, kind)] with kind in text / money / number / pct (fraction) / pct100 (points) / date.
+    Values are converted per declared kind (no guessing from text); widths come from the first sample_size rows.
+    Blank values are left out of the sheet entirely. openpyxl serializes through lxml when it is installed.
+    Returns the number of data rows written."""
+    import itertools
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, Alignment, PatternFill, numbers
+    from openpyxl.utils import get_column_letter
+    formats = {"money": numbers.FORMAT_CURRENCY_USD_SIMPLE, "pct": "0.0%", "pct100": "0.0%", "date": "mm-dd-yyyy"}
+    def to_number(v):
+        if v is None or v == "":
+            return None
+        if isinstance(v, (int, float)):
+            return v
+        s = str(v).strip().replace('$', '').replace(',', '')
+        try:
+            return float(s) if s else None
+        except ValueError:
+            return str(v)
+    def convert(kind, v):
+        if kind in ("money", "number", "pct"):
+            return to_number(v)
+        if kind == "pct100":
+            n = to_number(v)
+            return n / 100.0 if isinstance(n, (int, float)) else n
+        if kind == "date":
+            if v is None or v == "" or hasattr(v, "year"):
+                return v if v != "" else None
+            d = parse_mdy(v)
+            return d if d is not None else str(v)
+        return None if v is None or v == "" else v
+    kinds = [k for _, k in columns]
+    it = iter(rows)
+    sample = list(itertools.islice(it, sample_size))
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_title)
+    # Widths must be declared before the first row is streamed
+    for idx, (header, kind) in enumerate(columns):
+        width = len(str(header))
+        if kind == "date":
+            width = max(width, 10)
+        for r in sample:
+            v = r[idx]
+            if v is not None:
+                width = max(width, len(f"{v:,.2f}") if isinstance(v, float) else len(str(v)))
+        ws.column_dimensions[get_column_letter(idx + 1)].width = min(60, width + 2)
+    bold = Font(bold=True)
+    center = Alignment(horizontal='center')
+    fill = PatternFill(start_color='FFD9D9D9', end_color='FFD9D9D9', fill_type='solid')
+    head = []
+    for header, _ in columns:
+        c = WriteOnlyCell(ws, value=header)
+        c.font = bold; c.alignment = center; c.fill = fill
+        head.append(c)
+    ws.append(head)
+    # One formatted cell per styled column, reused across rows: append() serializes the row immediately
+    templates = []
+    for kind in kinds:
+        if kind in formats:
+            c = WriteOnlyCell(ws)
+            c.number_format = formats[kind]
+            templates.append(c)
+        else:
+            templates.append(None)
+    count = 0
+    for r in itertools.chain(sample, it):
+        out = []
+        for tmpl, kind, v in zip(templates, kinds, r):
+            v = convert(kind, v)
+            if tmpl is not None and v is not None and not isinstance(v, str):
+                tmpl.value = v
+                out.append(tmpl)
+            else:
+                out.append(v)
+        ws.append(out)
+        count += 1
+    if meta_rows:
+        meta = wb.create_sheet('_Meta')
+        for m in meta_rows:
+            meta.append(list(m))
+    wb.save(path)
+    return count
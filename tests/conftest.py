@@ -0,0 +1,83 @@
+import os
+import sys
+import shutil
+import tempfile
+import importlib.util
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+# main.py imports its sibling modules (project_io) by name
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+MAIN_PATH = os.path.join(ROOT, 'main.py')
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture(scope='session')
+def main(qapp):
+    """main.py imported once as 'app_main' (the module the older script-style tests register too)."""
+    if 'app_main' not in sys.modules:
+        spec = importlib.util.spec_from_file_location('app_main', MAIN_PATH)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules['app_main'] = module
+        spec.loader.exec_module(module)
+    return sys.modules['app_main']
+
+
+@pytest.fixture(autouse=True, scope='session')
+def _isolated_app_log(main):
+    """Send app.log records written during the run to a temp folder instead of the repo."""
+    d = tempfile.mkdtemp(prefix='applog_tests_')
+    path = os.path.join(d, 'app.log')
+    state = {}
+
+    def point(mod):
+        writer = getattr(mod, '_LOG_WRITER', None) if mod is not None else None
+        if writer is not None and writer.path is None:
+            writer.path = path
+            state[id(writer)] = writer
+
+    for name in ('app_main', 'main'):
+        point(sys.modules.get(name))
+    yield
+    for writer in state.values():
+        writer.flush()
+        writer.path = None
+    shutil.rmtree(d, ignore_errors=True)
+
+
+@pytest.fixture
+def db_dir(tmp_path, monkeypatch):
+    """Empty folder for the test's database; PROJECT_DB_PATH points at project_data.db inside it."""
+    monkeypatch.setenv('PROJECT_DB_PATH', str(tmp_path / 'project_data.db'))
+    return str(tmp_path)
+
+
+@pytest.fixture
+def make_model(main, db_dir):
+    """make_model(n=0, fields=None, save=True): writable ProjectDataModel on db_dir.
+    Adds n parts P0..Pn-1 (start 01-05-2026, 3 days, 0 %, Planned); fields overrides columns per row,
+    a callable value being called with the row number. With rows and save=True the model is saved
+    and migrated, so rows carry row_version for the concurrency paths."""
+    def make(n=0, fields=None, save=True):
+        model = main.ProjectDataModel()
+        model.read_only = False
+        for i in range(n):
+            r = {c: "" for c in model.COLUMNS}
+            r.update({"Project Part": f"P{i}", "Start Date": "01-05-2026", "Duration (days)": "3",
+                      "% Complete": "0", "Status": "Planned"})
+            r.update({k: v(i) if callable(v) else v for k, v in (fields or {}).items()})
+            model.rows.append(r)
+        if n and save:
+            model.save_to_db()
+            model.ensure_schema()  # adds the row_version/last_modified_utc concurrency columns
+        return model
+    return make
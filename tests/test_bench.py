@@ -0,0 +1,36 @@
+import json
+
+import bench  # repo root is on sys.path (conftest.py)
+
+
+def test_synthetic_project_shape(main):
+    rows = bench.generate_rows(main.ProjectDataModel.COLUMNS, 2000, depth=3, fanout=5, dep_density=0.5, seed=1)
+    assert len(rows) == 2000
+    names = [r["Project Part"] for r in rows]
+    assert len(set(names)) == len(names)
+    pos = {n: i for i, n in enumerate(names)}
+    for r in rows:
+        # Parents and dependencies always come earlier: a forest and an acyclic dependency graph
+        if r["Parent"]:
+            assert pos[r["Parent"]] < pos[r["Project Part"]]
+            assert r["Project Part"].count(".") <= 2
+        for dep in filter(None, r["Dependencies"].split(", ")):
+            assert pos[dep] < pos[r["Project Part"]]
+    assert 0.35 < sum(1 for r in rows if r["Dependencies"]) / len(rows) < 0.65
+    assert rows == bench.generate_rows(main.ProjectDataModel.COLUMNS, 2000, depth=3, fanout=5, dep_density=0.5, seed=1)
+    s = main.compute_schedule(rows)
+    assert len(s.order) == len(rows)
+
+
+def test_benchmark_run_and_compare(main, qapp):
+    args = bench.parse_args(['--sizes', '150', '--repeat', '1'])
+    results = bench.bench_size(main, qapp, 150, args)
+    for key in ('load_from_db', 'save_to_db.incremental', 'rollup_progress', 'progress_metrics',
+                'update_calculated_end_dates', 'render_gantt', 'ProjectTreeView.refresh',
+                'DatabaseView.refresh_table', 'CostEstimatesView.refresh', 'cli.export.xlsx', 'cli.import.json'):
+        assert results[key]['runs'] >= 1 and results[key]['median_ms'] >= 0
+    report = {'meta': {}, 'results': {'150': results}}
+    json.dumps(report)
+    slower = {'results': {'150': {k: dict(v, median_ms=v['median_ms'] * 3 + 5) for k, v in results.items()}}}
+    assert bench.compare(report, report, 0.2) == []
+    assert bench.compare(slower, report, 0.2)
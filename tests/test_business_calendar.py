@@ -0,0 +1,40 @@
+import datetime
+import random
+
+
+def _brute_force(d, n, holidays):
+    cur = d
+    added = 0
+    while added < n:
+        cur += datetime.timedelta(days=1)
+        if cur.weekday() < 5 and cur not in holidays:
+            added += 1
+    return cur
+
+
+def test_add_workdays_matches_day_by_day_walk(main):
+    rnd = random.Random(7)
+    base = datetime.date(2025, 1, 1)
+    holidays = {base + datetime.timedelta(days=rnd.randrange(0, 900)) for _ in range(40)}
+    cal = main.BusinessCalendar(holidays)
+    starts, counts, expected = [], [], []
+    for _ in range(500):
+        d = base + datetime.timedelta(days=rnd.randrange(0, 700))
+        n = rnd.randrange(0, 120)
+        exp = _brute_force(d, n, holidays)
+        assert cal.add_workdays(d, n) == exp, (d, n)
+        starts.append(d); counts.append(n); expected.append(exp)
+    assert cal.add_workdays_batch(starts, counts) == expected
+
+
+def test_weekend_runs_cover_every_weekend_day(main):
+    cal = main.BusinessCalendar()
+    start, end = datetime.date(2026, 3, 1), datetime.date(2026, 4, 11)  # Sunday .. Saturday
+    days = set()
+    for a, b in cal.weekend_runs(start, end):
+        while a < b:
+            days.add(a)
+            a += datetime.timedelta(days=1)
+    expected = {start + datetime.timedelta(days=i) for i in range((end - start).days + 1)
+                if (start + datetime.timedelta(days=i)).weekday() >= 5}
+    assert days == expected
@@ -0,0 +1,167 @@
+import os
+import time
+
+import pytest
+
+from PyQt5.QtCore import Qt
+
+# Unsaved rows "Part 0".."Part n-1", alternating External/Internal
+COSTED = {"Project Part": lambda i: f"Part {i}", "Internal/External": lambda i: "Internal" if i % 2 else "External",
+          "Production Cost": lambda i: 100 + i, "Installation Cost": "$1,000.00",
+          "Production Price": lambda i: 150 + 2 * i, "Installation Price": 1200}
+
+
+def test_cost_rollup_sums_subtrees_in_one_pass(main):
+    model = main.ProjectDataModel.__new__(main.ProjectDataModel)
+    def cost(name, parent, pc, pp):
+        return {"Project Part": name, "Parent": parent, "Dependencies": "",
+                "Production Cost": pc, "Installation Cost": "", "Production Price": pp, "Installation Price": "10"}
+    model.rows = [cost("Root", "", "$1,000.00", "1500"), cost("Mid", "Root", 200, "300")]
+    # Deep chain under Mid plus a Parent cycle that must not loop forever
+    prev = "Mid"
+    for i in range(2000):
+        model.rows.append(cost(f"L{i}", prev, "1", "2"))
+        prev = f"L{i}"
+    model.rows += [cost("X", "Y", "5", "5"), cost("Y", "X", "7", "7")]
+    model.data_version = 0
+    model._index = None
+    model._index_version = -1
+    rollup = model.cost_rollup()
+    assert rollup.own(model.rows[0]) == (1000.0, 0.0, 1500.0, 10.0)
+    assert rollup.totals(model.rows[1]) == (2200.0, 0.0, 4300.0, 20010.0)
+    assert rollup.totals(model.rows[0]) == (3200.0, 0.0, 5800.0, 20020.0)
+    assert rollup.totals(model.rows[-1])[0] == 12.0
+    assert model.cost_rollup() is rollup
+    model.rows[2]["Production Cost"] = "101"
+    model.bump_data_version()
+    assert model.cost_rollup().totals(model.rows[0])[0] == 3300.0
+
+
+def test_filtering_uses_proxy_without_rebuilding_model(main, make_model):
+    view = main.CostEstimatesView(make_model(5000, fields=COSTED, save=False))
+    resets = []
+    view.cost_model.modelReset.connect(lambda: resets.append(1))
+    t0 = time.perf_counter()
+    for text in ("P", "Pa", "Part 4", "Part 49"):
+        view.le_filter.setText(text)
+    assert time.perf_counter() - t0 < 2.0
+    assert not resets
+    assert view.table.rowCount() == 111  # "Part 49" and "Part 490".."Part 4999"
+    view.combo_int_ext.setCurrentText("Internal")
+    assert all(view._cell_value(r, 13) == "Internal" for r in range(view.table.rowCount()))
+    assert "Rows: 56" in view.totals_label.text()
+    # Typed values underneath, formatted only for display
+    assert view._cell_value(0, 4) == 1149.0 and view._cell_text(0, 4) == "1,149.00"
+    idx = view.proxy.index(0, main.CostTableModel.COL_MARGIN)
+    assert view.proxy.data(idx, Qt.UserRole) == view._cell_value(0, 9)
+    assert view.proxy.data(idx).endswith("%")
+
+
+def test_xlsx_export_writes_raw_numbers(main, make_model, db_dir):
+    openpyxl = pytest.importorskip('openpyxl')
+    view = main.CostEstimatesView(make_model(3, fields=COSTED, save=False))
+    path = os.path.join(db_dir, 'costs.xlsx')
+    from PyQt5.QtWidgets import QFileDialog
+    orig = QFileDialog.getSaveFileName
+    try:
+        QFileDialog.getSaveFileName = staticmethod(lambda *a, **k: (path, ''))
+        view._export_xlsx()
+    finally:
+        QFileDialog.getSaveFileName = orig
+    ws = openpyxl.load_workbook(path)['Costs']
+    header = [c.value for c in ws[1]]
+    row = [c.value for c in ws[2]]
+    assert row[header.index("Total Cost")] == 1100.0
+    margin = row[header.index("Margin %")]
+    assert isinstance(margin, float) and abs(margin - (1350 - 1100) / 1350) < 1e-9
+    assert ws.cell(row=2, column=header.index("Margin %") + 1).number_format == '0.0%'
+
+
+def test_pricing_engine_matches_single_part_formula_and_sweeps_fast(main):
+    rows = [
+        {"Project Part": "Derived", "Material Cost": "400", "Fabrication Labor Hours": "10", "Labor Rate": "60",
+         "Installation Labor Hours": "4", "Install Labor Rate": "50", "Equipment Cost": "100",
+         "Contingency %": "10", "Warranty Reserve %": "2", "Risk Level": "High"},
+        {"Project Part": "Direct", "Production Cost": "$1,000.00", "Installation Cost": "", "Risk Level": "Low"},
+        {"Project Part": "Uncosted"},
+    ]
+    engine = main.PricingEngine(rows)
+    r = engine.suggest(0.30)
+    # Derived: pc = 400 + 10*60, ic = 4*50 + 100, margin 30% + 3 pts for High risk
+    assert abs(r["prod"][0] - 1000 * 1.1 / 0.67) < 1e-9 and abs(r["inst"][0] - 300 * 1.1 / 0.67) < 1e-9
+    total = 1300 * 1.1 / 0.67
+    assert abs(r["effective_margin"][0] - (total - 1300 * 1.1 - total * 0.02) / total * 100) < 1e-9
+    assert abs(r["prod"][1] - 1000 / 0.72) < 1e-9 and r["inst"][1] != r["inst"][1]  # NaN: no install cost
+    assert r["total"][2] == 0
+    sweep = engine.sweep([0.10, 0.20])
+    assert [round(s["target_margin"]) for s in sweep] == [10, 20]
+    assert abs(sweep[1]["price"] - (1300 * 1.1 / 0.77 + 1000 / 0.82)) < 1e-6
+
+    big = [{"Project Part": f"P{i}", "Production Cost": 100 + i % 50, "Installation Cost": 40,
+            "Contingency %": 5, "Warranty Reserve %": 1, "Risk Level": ("Low", "Medium", "High")[i % 3]}
+           for i in range(10000)]
+    engine = main.PricingEngine(big)
+    t0 = time.perf_counter()
+    sweep = engine.sweep([m / 100.0 for m in range(10, 41)])
+    assert time.perf_counter() - t0 < 0.5
+    assert len(sweep) == 31
+    assert all(a["price"] < b["price"] for a, b in zip(sweep, sweep[1:]))
+
+
+def test_margin_sweep_dialog_fills_table(main, make_model, monkeypatch):
+    view = main.CostEstimatesView(make_model(20, fields=COSTED, save=False))
+    seen = {}
+    from PyQt5.QtWidgets import QDialog, QTableWidget
+    def fake_exec(dlg):
+        seen['rows'] = dlg.findChild(QTableWidget).rowCount()
+        return 0
+    monkeypatch.setattr(QDialog, 'exec_', fake_exec)
+    view._open_margin_sweep_dialog()
+    assert seen['rows'] == 31
+
+
+def test_quote_version_deltas_and_compare_run_in_sqlite(main, make_model):
+    costs = ((100, 200), (50, 0), (10, 40))
+    model = make_model(3, fields={"Project Part": lambda i: f"Q{i}", "Production Cost": lambda i: str(costs[i][0]),
+                                  "Production Price": lambda i: str(costs[i][1])})
+    model.save_quote_version("v1")
+    base = model.load_quote_version_map("v1")
+    model.rows[0]["Production Price"] = "$250.00"
+    del model.rows[2]
+    model.save_to_db()
+    model.save_quote_version("v2")
+    deltas = model.quote_version_delta_map("v1")
+    assert model.quote_version_delta_map("v1") is deltas  # served from the LRU until rows change
+    assert set(deltas) == {"Q0", "Q1"}
+    part, b, c, dpct, bm, cm, dpts = deltas["Q0"]
+    assert (b, c) == (200.0, 250.0) and abs(dpct - 25.0) < 1e-9 and abs(dpts - (60.0 - 50.0)) < 1e-9
+    assert deltas["Q1"][3] == 0.0  # no base price: no % delta
+    rows = model.compare_quote_versions(["v1", "v2", model.CURRENT_QUOTE])
+    assert rows[0] == ("Q0", 200.0, 250.0, 250.0, 25.0)
+    assert rows[2][0] == "Q2" and rows[2][2] is None and rows[2][-1] is None
+    margins = model.compare_quote_versions(["v1", "v2"], metric="margin")
+    assert abs(margins[0][-1] - 10.0) < 1e-9
+    # The view takes its version deltas from SQLite, rebasing unsaved edits on the version's price
+    model.rows[1]["Production Price"] = "100"
+    view = main.CostEstimatesView(model)
+    view.version_combo.setCurrentText("v1")
+    records = {r[0]: r for r in view.cost_model.records}
+    assert abs(records["Q0"][10] - 25.0) < 1e-9 and abs(records["Q0"][11] - 10.0) < 1e-9
+    assert records["Q1"][10] == 0.0 and abs(records["Q1"][11] - 50.0) < 1e-9
+    # Further refreshes of the same rows reuse the cached join
+    queries = []
+    orig_deltas = model.quote_version_deltas
+    model.quote_version_deltas = lambda *a: queries.append(a) or orig_deltas(*a)
+    view.refresh()
+    view.refresh()
+    assert queries == []
+    model.bump_data_version()
+    view.refresh()
+    assert queries == [("v1",)]
+    del model.quote_version_deltas
+    # Rename invalidates the cached map under both names
+    cached = model.quote_version_delta_map("v1")
+    assert model.rename_quote_version("v1", "v0")
+    assert model.quote_version_delta_map("v1") == {}
+    assert model.load_quote_version_map("v0") == base
+    assert model.quote_version_delta_map("v0") == cached and model.quote_version_delta_map("v0") is not cached
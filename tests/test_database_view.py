@@ -0,0 +1,164 @@
+import time
+import sqlite3
+import threading
+
+from PyQt5.QtWidgets import QStyleOptionViewItem
+from PyQt5.QtCore import Qt
+
+
+# Every part after P0 sits under it
+UNDER_P0 = {"Parent": lambda i: "P0" if i else ""}
+
+
+def test_large_table_opens_without_cell_widgets(main, make_model):
+    model = make_model(20000, fields=UNDER_P0)
+    t0 = time.perf_counter()
+    view = main.DatabaseView(model)
+    assert time.perf_counter() - t0 < 3.0
+    tm = view.table_model
+    assert tm.rowCount() == 20000
+    pc_col = model.COLUMNS.index("% Complete")
+    assert view.table.indexWidget(tm.index(5, pc_col)) is None
+    # Parent rows roll up progress and are not editable there
+    assert not tm.flags(tm.index(0, pc_col)) & Qt.ItemIsEditable
+    assert tm.flags(tm.index(5, pc_col)) & Qt.ItemIsEditable
+    assert tm.data(tm.index(0, model.COLUMNS.index("Children"))).startswith("P1, P2")
+
+
+def test_delegate_edit_commits_through_model(main, qapp, make_model):
+    model = make_model(5, fields=UNDER_P0)
+    view = main.DatabaseView(model)
+    tm = view.table_model
+    delegate = view.table.itemDelegate()
+    idx = tm.index(3, model.COLUMNS.index("% Complete"))
+    editor = delegate.createEditor(view.table.viewport(), QStyleOptionViewItem(), idx)
+    delegate.setEditorData(editor, idx)
+    editor.setValue(100)
+    delegate.setModelData(editor, tm, idx)
+    qapp.processEvents()
+    model.flush_pending_writes()  # optimistic updates are written on the DB worker
+    assert model.rows[3]["% Complete"] in (100, "100")
+    assert model.rows[3]["Status"] == "Done"
+    # Parent editor only accepts existing part names
+    pidx = tm.index(4, model.COLUMNS.index("Parent"))
+    editor = delegate.createEditor(view.table.viewport(), QStyleOptionViewItem(), pidx)
+    assert "P2" in editor.completer().model().stringList()
+    editor.setText("Nope")
+    delegate.setModelData(editor, tm, pidx)
+    qapp.processEvents()
+    assert model.rows[4]["Parent"] == "P0"
+    editor.setText("P2")
+    delegate.setModelData(editor, tm, pidx)
+    qapp.processEvents()
+    model.flush_pending_writes()
+    assert model.rows[4]["Parent"] == "P2"
+
+
+def test_single_cell_edit_refreshes_only_row_and_rolled_up_ancestors(main, make_model):
+    model = make_model(6, fields=UNDER_P0)
+    model.rows[5]["Parent"] = "P1"  # P0 > P1 > P5
+    model.save_to_db()
+    events = []
+    resets = []
+    view = main.DatabaseView(model)
+    model.subscribe(events.append)
+    tm = view.table_model
+    tm.modelReset.connect(lambda: resets.append(1))
+    repainted = []
+    tm.dataChanged.connect(lambda a, b, *_: repainted.append(a.row()))
+    view.commit_edit(5, model.COLUMNS.index("% Complete"), 100)
+    model.flush_pending_writes()
+    # One merged notification carrying the edited row and the rolled-up ancestors
+    assert len(events) == 1 and events[0].kind == main.ModelEvent.FIELDS_CHANGED
+    assert set(events[0].parts) == {"P5", "P1", "P0"}
+    assert events[0].changes["P1"]["Status"] == ("Planned", "Done")
+    assert sorted(repainted) == [0, 1, 5]
+    assert not resets
+    assert model.rows[1]["% Complete"] == 100 and model.rows[1]["Status"] == "Done"
+    # Moving a part in the hierarchy is structural and rebuilds the table
+    view.commit_edit(5, model.COLUMNS.index("Parent"), "P2")
+    model.flush_pending_writes()
+    assert any(ev.kind == main.ModelEvent.HIERARCHY_MOVED for ev in events[1:]) and resets
+
+
+def test_conflict_dialog_follows_the_part_after_rows_moved(main, make_model):
+    model = make_model(5, fields=UNDER_P0)
+    with sqlite3.connect(model.DB_FILE) as c:
+        c.execute('UPDATE project_parts SET "Notes"=?, row_version=row_version+1 WHERE "Project Part"=?', ("remote", "P3"))
+    view = main.DatabaseView(model)
+    shown = []
+    class FakeDialog:
+        def __init__(self, part_name, original, pending, remote, parent=None):
+            shown.append((part_name, original.get("Project Part"), remote.get("Notes")))
+            self.choice = 'keep'
+        def exec_(self):
+            return 1
+    orig_dialog = main.ConflictResolutionDialog
+    main.ConflictResolutionDialog = FakeDialog
+    try:
+        view.status_changed(3, model.COLUMNS.index("Status"), "Done")
+        model.delete_row(1)  # P3 moves up before the conflict comes back
+        model.flush_pending_writes()
+    finally:
+        main.ConflictResolutionDialog = orig_dialog
+    assert shown == [("P3", "P3", "remote")]
+    assert model.row_by_name("P3")["Notes"] == "remote"
+    assert model.row_by_name("P4")["Notes"] == ""
+
+
+def test_conflict_resolution_reads_and_writes_on_the_db_worker(main, make_model):
+    model = make_model(3, fields=UNDER_P0)
+    with sqlite3.connect(model.DB_FILE) as c:
+        c.execute('UPDATE project_parts SET "Notes"=?, row_version=row_version+1 WHERE "Project Part"=?', ("remote", "P2"))
+    view = main.DatabaseView(model)
+    gui_thread = threading.current_thread()
+    io_threads = []
+    orig_snapshot, orig_write = model.get_row_snapshot, model._write_part_values
+    model.get_row_snapshot = lambda *a: io_threads.append(threading.current_thread()) or orig_snapshot(*a)
+    model._write_part_values = lambda *a: io_threads.append(threading.current_thread()) or orig_write(*a)
+    class OverwriteDialog:
+        def __init__(self, part_name, original, pending, remote, parent=None):
+            self.choice = 'overwrite'
+        def exec_(self):
+            return 1
+    orig_dialog = main.ConflictResolutionDialog
+    main.ConflictResolutionDialog = OverwriteDialog
+    try:
+        view.status_changed(2, model.COLUMNS.index("Status"), "Done")
+        model.flush_pending_writes()
+    finally:
+        main.ConflictResolutionDialog = orig_dialog
+    # Update, snapshot, forced update: all off the GUI thread
+    assert len(io_threads) == 3 and gui_thread not in io_threads
+    row = model.row_by_name("P2")
+    assert row["Status"] == "Done" and row["row_version"] == 2
+    with sqlite3.connect(model.DB_FILE) as c:
+        assert c.execute('SELECT "Status", "Notes" FROM project_parts WHERE "Project Part"=?', ("P2",)).fetchone() == ("Done", "remote")
+
+
+def test_edits_show_at_once_and_roll_back_when_the_write_fails(main, make_model):
+    model = make_model(3, fields=UNDER_P0)
+    view = main.DatabaseView(model)
+    gate = threading.Event()
+    orig_write = model._write_part_values
+    def slow_failing_write(*a):
+        gate.wait(5)
+        return False, "disk I/O error", None
+    model._write_part_values = slow_failing_write
+    warnings = []
+    orig_warning = main.QMessageBox.warning
+    main.QMessageBox.warning = staticmethod(lambda parent, title, text, *a: warnings.append(text))
+    try:
+        view.status_changed(2, model.COLUMNS.index("Status"), "In Progress")
+        # Shown while the write is still queued behind slow storage
+        assert model.row_by_name("P2")["Status"] == "In Progress"
+        assert view.table_model.data(view.table_model.index(2, model.COLUMNS.index("Status"))) == "In Progress"
+        assert warnings == []
+        gate.set()
+        model.flush_pending_writes()
+    finally:
+        main.QMessageBox.warning = orig_warning
+        model._write_part_values = orig_write
+    row = model.row_by_name("P2")
+    assert row["Status"] == "Planned" and row["Actual Start Date"] == ""
+    assert len(warnings) == 1 and "disk I/O error" in warnings[0]
@@ -0,0 +1,76 @@
+import os
+import time
+
+from PyQt5.QtWidgets import QApplication
+
+
+def _pump_until(cond, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not cond() and time.monotonic() < deadline:
+        QApplication.processEvents()
+        time.sleep(0.01)
+    return cond()
+
+
+def _touch(path, data):
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(data)
+
+
+def test_file_events_are_debounced_into_one_signal(main, tmp_path):
+    db = os.path.join(tmp_path, 'project_data.db')
+    _touch(db, 'x')
+    seen = []
+    w = main.DbChangeWatcher(db, poll_ms=60000)
+    w.changed.connect(lambda db_changed, lock_changed: seen.append((db_changed, lock_changed)))
+    try:
+        w.start()
+        assert _pump_until(lambda: w.watching)
+        _pump_until(lambda: False, 0.1)
+        assert seen == []
+        # A burst of writes to the database and its WAL is reported once
+        for i in range(5):
+            _touch(db, 'y')
+            _touch(db + '-wal', 'w')
+            time.sleep(0.02)
+        assert _pump_until(lambda: seen)
+        _pump_until(lambda: False, 2 * w.DEBOUNCE_MS / 1000.0)
+        assert seen == [(True, False)]
+        with open(db + '.lock.json', 'w', encoding='utf-8') as f:
+            f.write('{"owner": "someone@host"}')
+        assert _pump_until(lambda: len(seen) == 2)
+        assert seen[1] == (False, True)
+        os.remove(db + '.lock.json')
+        assert _pump_until(lambda: len(seen) == 3)
+        assert seen[2] == (False, True)
+    finally:
+        w.stop()
+
+
+def test_polling_fallback_backs_off_and_follows_db_switch(main, tmp_path):
+    db = os.path.join(tmp_path, 'a.db')
+    other = os.path.join(tmp_path, 'b.db')
+    _touch(db, 'x')
+    _touch(other, 'x')
+    seen = []
+    w = main.DbChangeWatcher(db, poll_ms=100, force_poll=True)
+    w.changed.connect(lambda db_changed, lock_changed: seen.append((db_changed, lock_changed)))
+    try:
+        w.start()
+        # Quiet polls double the interval up to MAX_POLL_MS
+        assert _pump_until(lambda: w._probe._interval >= 800)
+        assert not w.watching
+        w.set_poll_interval(100)
+        _pump_until(lambda: w._probe._interval == 100, 1.0)
+        _touch(db, 'y')
+        assert _pump_until(lambda: seen == [(True, False)])
+        # Switching files rebaselines without reporting a change; the old file is no longer watched
+        w.set_db_path(other)
+        _pump_until(lambda: False, 0.3)
+        _touch(db, 'z')
+        _pump_until(lambda: False, 0.5)
+        assert seen == [(True, False)]
+        _touch(other, 'y')
+        assert _pump_until(lambda: len(seen) == 2)
+    finally:
+        w.stop()
@@ -0,0 +1,40 @@
+import os
+import sqlite3
+
+
+def test_connections_are_reused_and_follow_db_switch(main, make_model, db_dir):
+    model = make_model(1)
+    opened = []
+    orig_open = main.DbConnections._open
+    main.DbConnections._open = lambda self: opened.append(self.path) or orig_open(self)
+    try:
+        for i in range(5):
+            ok, ver = model.update_part_values("P0", {"Notes": f"n{i}"}, i)
+            assert ok and ver == i + 1
+            assert model.get_row_snapshot("P0")["Notes"] == f"n{i}"
+        # PRAGMAs and column metadata were already in place: nothing reopened
+        assert opened == [model.DB_FILE]  # first reader only
+        cols = model._db().columns(None)
+        assert "row_version" in cols and set(model.COLUMNS) <= set(cols)
+        # A failed write leaves the writer usable and outside a transaction
+        try:
+            with model._connect() as conn:
+                conn.execute('UPDATE project_parts SET "Notes"=? WHERE "Project Part"=?', ("lost", "P0"))
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+        assert not model._db()._writer.in_transaction
+        assert model.get_row_snapshot("P0")["Notes"] == "n4"
+        # Switching DB_FILE closes the old connections and reconnects to the new file
+        old = model._db()
+        model.DB_FILE = os.path.join(db_dir, 'b.db')
+        model.ensure_schema()
+        model.create_table()
+        model.ensure_schema()
+        assert model._db() is not old and old._writer is None
+        assert model.get_row_snapshot("P0") is None
+        with sqlite3.connect(model.DB_FILE) as c:
+            assert "row_version" in [row[1] for row in c.execute("PRAGMA table_info(project_parts)")]
+    finally:
+        main.DbConnections._open = orig_open
+        model.close_connections()
@@ -0,0 +1,119 @@
+import sqlite3
+import threading
+import time
+
+
+def _db_values(model, col):
+    with sqlite3.connect(model.DB_FILE) as c:
+        return dict(c.execute(f'SELECT "Project Part", "{col}" FROM project_parts'))
+
+
+def test_async_saves_coalesce_and_keep_edit_order(qapp, make_model):
+    model = make_model(50)
+    worker = model.db_worker()
+    submitted = []
+    orig_submit = worker.submit
+    worker.submit = lambda fn, **kw: submitted.append(kw.get('label')) or orig_submit(fn, **kw)
+    for i in range(10):
+        model.rows[1]["Notes"] = f"edit {i}"
+        model.save_async()
+    qapp.processEvents()
+    model.rows[2]["Notes"] = "later"
+    model.save_async()
+    assert model.flush_pending_writes()
+    assert submitted == ["Saving changes", "Saving changes"]
+    notes = _db_values(model, "Notes")
+    assert notes["P1"] == "edit 9" and notes["P2"] == "later"
+    assert not worker.busy
+
+
+def test_load_async_applies_rows_only_when_done_and_can_be_cancelled(main, make_model):
+    model = make_model(3000)
+    with sqlite3.connect(model.DB_FILE) as c:
+        c.execute('UPDATE project_parts SET "Notes" = ? WHERE "Project Part" = ?', ("remote", "P7"))
+    events = []
+    model.subscribe(events.append)
+    loaded = []
+    model.load_async(on_done=lambda: loaded.append(1))
+    assert model.rows[7]["Notes"] == ""  # untouched until the read has finished
+    assert model.flush_pending_writes()
+    assert loaded == [1] and model.rows[7]["Notes"] == "remote"
+    assert [e.kind for e in events] == [main.ModelEvent.RELOADED]
+    rows_before = model.rows
+    gate = threading.Event()
+    model.db_worker().submit(lambda job: gate.wait(5))  # hold the queue so the cancel lands first
+    job = model.load_async(on_done=lambda: loaded.append(2))
+    job.cancel()
+    gate.set()
+    model.flush_pending_writes()
+    assert loaded == [1] and model.rows is rows_before
+
+
+def test_queued_updates_of_one_part_do_not_conflict_with_each_other(make_model):
+    model = make_model(3)
+    results = []
+    ver = model.rows[1].get('row_version', 0)
+    for pc in (10, 20, 30):
+        model.update_part_values_async("P1", {"% Complete": pc}, ver, lambda ok, info: results.append(ok))
+    assert model.flush_pending_writes()
+    assert results == [True, True, True]
+    assert model.rows[1]["% Complete"] == 30
+    assert _db_values(model, "% Complete")["P1"] in (30, "30")
+    # A stale version from another writer is still reported as a conflict
+    model.update_part_values_async("P1", {"% Complete": 40}, ver, lambda ok, info: results.append(info))
+    model.flush_pending_writes()
+    assert results[-1] == "Conflict"
+
+
+def test_save_waits_for_queued_updates_of_the_same_part(qapp, make_model):
+    model = make_model(3)
+    orig_write = model._write_part_values
+    def slow_write(*args):
+        time.sleep(0.2)
+        return orig_write(*args)
+    model._write_part_values = slow_write
+    results = []
+    model.update_part_values_async("P1", {"Status": "Done"}, model.rows[1].get('row_version', 0),
+                                   lambda ok, info: results.append(ok))
+    model.set_part_fields("P1", {"Notes": "local"})
+    model.save_async()
+    qapp.processEvents()
+    assert model.flush_pending_writes()
+    assert results == [True]
+    assert model.rows[1]["Status"] == "Done" and model.rows[1]["row_version"] == 1
+    assert _db_values(model, "Status")["P1"] == "Done"
+    assert _db_values(model, "Notes")["P1"] == "local"
+    assert _db_values(model, "row_version")["P1"] == 1
+    assert model.pending_changes() == ([], [], [])
+
+
+def test_quote_versions_and_baselines_are_written_on_the_worker(make_model):
+    model = make_model(3)
+    model.rows[0]["Production Price"] = "100"
+    model.save_quote_version("v1")
+    writers = []
+    orig_connect = model._connect
+    model._connect = lambda: writers.append(threading.current_thread()) or orig_connect()
+    done = []
+    model.rows[0]["Production Price"] = "250"
+    model.save_quote_version_async("v1", replace=True, on_done=done.append)
+    model.save_baseline_async("b1", on_done=done.append)
+    # Both were snapshotted when queued
+    model.rows[0]["Production Price"] = "999"
+    model.rows[0]["Start Date"] = "02-02-2026"
+    assert model.db_worker().wait_idle()
+    assert len(done) == 2
+    assert writers and all(t is not threading.main_thread() for t in writers)
+    assert model.load_quote_version_map("v1")["P0"][2] == 250.0
+    assert model.load_baseline_map("b1")["P0"][0] == "01-05-2026"
+    # Rename (over an existing version) and delete go through the worker as well
+    model.save_quote_version("v2")
+    writers.clear()
+    model.rename_quote_version_async("v1", "v2", replace=True, on_done=done.append)
+    model.delete_quote_version_async("b1", on_done=done.append)
+    model.rename_quote_version_async("missing", "v2", replace=True, on_done=done.append)
+    assert model.db_worker().wait_idle()
+    assert done[2:] == [True, True, False]
+    assert len(writers) == 3 and threading.main_thread() not in writers
+    assert model.list_quote_versions() == ["v2"]
+    assert model.load_quote_version_map("v2")["P0"][2] == 250.0
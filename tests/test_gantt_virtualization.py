@@ -0,0 +1,66 @@
+import datetime
+
+
+class _Model:
+    COLUMNS = ["Project Part", "Parent", "Start Date", "Duration (days)", "Dependencies", "% Complete"]
+
+    def __init__(self, n):
+        self.rows = []
+        for i in range(n):
+            start = datetime.date(2026, 1, 5) + datetime.timedelta(days=i % 60)
+            self.rows.append({
+                "Project Part": f"P{i}",
+                "Parent": f"P{i // 10}" if i >= 10 else "",
+                "Start Date": start.strftime("%m-%d-%Y"),
+                "Duration (days)": "4",
+                "Dependencies": f"P{i - 1}" if i % 5 else "",
+                "% Complete": str(i % 100),
+            })
+
+
+def test_large_gantt_only_materializes_visible_rows(main):
+    view = main.GanttChartView()
+    view.resize(1000, 700)
+    view.render_gantt(_Model(3000))
+    layout = view._gantt_layout
+    assert layout.virtual and len(layout.bars) == 3000
+    assert 0 < len(view._gantt_slots) < 200
+    # Jumping to a far-away bar materializes and highlights it
+    view.highlight_bar("P2900")
+    bar = view._name_to_rect["P2900"]
+    assert bar.row["Project Part"] == "P2900" and bar.pen().width() == 3
+    assert "P5" not in view._name_to_rect
+    # Full materialization (used by export) covers every row, then shrinks back
+    view._sync_gantt_items(full=True)
+    assert len(view._gantt_slots) == 3000
+    view._sync_gantt_items()
+    assert len(view._gantt_slots) < 200
+    assert len(view.scene.items()) < 2000
+
+
+def test_small_gantt_is_fully_materialized(main):
+    view = main.GanttChartView()
+    view.render_gantt(_Model(40))
+    assert not view._gantt_layout.virtual
+    assert len(view._name_to_rect) == 40
+    assert len(view._name_to_text_item) == 40
+
+
+def test_rerender_after_edit_updates_items_in_place(main):
+    model = _Model(40)
+    view = main.GanttChartView()
+    view.render_gantt(model)
+    view.view.scale(1.5, 1.5)
+    untouched = view._name_to_rect["P3"]
+    count = len(view.scene.items())
+    model.rows[7]["% Complete"] = "50"
+    view.render_gantt(model)
+    assert view._name_to_rect["P3"] is untouched
+    assert len(view.scene.items()) == count
+    assert view.view.transform().m11() == 1.5
+    slot = next(s for s in view._gantt_slots.values() if s.bar.row["Project Part"] == "P7")
+    assert slot.prog.rect().width() == int(slot.bar.rect().width() * 50 / 100)
+    # Moving a bar outside the current date range forces a rebuild
+    model.rows[7]["Start Date"] = "06-01-2026"
+    view.render_gantt(model)
+    assert view._name_to_rect["P3"] is not untouched
@@ -0,0 +1,64 @@
+import sqlite3
+
+
+def _db_rows(model):
+    with sqlite3.connect(model.DB_FILE) as conn:
+        return conn.execute('SELECT id, "Project Part", "Notes" FROM project_parts ORDER BY id').fetchall()
+
+
+def _row(model, name, parent=""):
+    r = {c: "" for c in model.COLUMNS}
+    r.update({"Project Part": name, "Parent": parent, "Start Date": "01-05-2026", "Duration (days)": "3"})
+    return r
+
+
+def test_incremental_save_only_touches_changed_rows(make_model):
+    model = make_model()
+    model.rows.extend([_row(model, "A"), _row(model, "B", "A"), _row(model, "C", "A")])
+    model.save_to_db()
+    before = {name: rid for rid, name, _ in _db_rows(model)}
+    assert model.pending_changes() == ([], [], [])
+    # Edit one row, delete one, add one
+    model.rows[1]["Notes"] = "edited"
+    del model.rows[2]
+    model.rows.append(_row(model, "D", "A"))
+    inserted, changed, deleted = model.pending_changes()
+    assert inserted == ["D"] and changed == ["B"] and deleted == ["C"]
+    model.save_to_db()
+    after = _db_rows(model)
+    names = [n for _, n, _ in after]
+    assert names == ["A", "B", "D"]
+    # Untouched and edited rows keep their ids (no table rewrite)
+    ids = {n: rid for rid, n, _ in after}
+    assert ids["A"] == before["A"] and ids["B"] == before["B"]
+    assert dict((n, notes) for _, n, notes in after)["B"] == "edited"
+    # Round trip through a fresh model
+    again = make_model()
+    assert [r["Project Part"] for r in again.rows] == ["A", "B", "D"]
+    assert again.pending_changes() is not None
+
+
+def test_renames_and_mid_list_inserts_keep_row_order(make_model):
+    model = make_model()
+    model.rows.extend([_row(model, f"P{i}") for i in range(4)])
+    model.save_to_db()
+    model.rows[1]["Project Part"] = "P1-renamed"
+    assert model.pending_changes() is None
+    model.save_to_db()
+    assert [r["Project Part"] for r in make_model().rows] == ["P0", "P1-renamed", "P2", "P3"]
+    model.rows.insert(2, _row(model, "X"))
+    assert model.pending_changes() is None
+    model.save_to_db()
+    # Appending stays incremental
+    model.rows.append(_row(model, "Y"))
+    assert model.pending_changes() == (["Y"], [], [])
+    model.save_to_db()
+    assert [r["Project Part"] for r in make_model().rows] == ["P0", "P1-renamed", "X", "P2", "P3", "Y"]
+
+
+def test_duplicate_names_fall_back_to_full_rewrite(make_model):
+    model = make_model()
+    model.rows.extend([_row(model, "A"), _row(model, "A")])
+    assert model.pending_changes() is None
+    model.save_to_db()
+    assert [n for _, n, _ in _db_rows(model)] == ["A", "A"]
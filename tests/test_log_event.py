@@ -0,0 +1,29 @@
+import os
+import json
+
+
+def test_log_writer_batches_off_thread_and_rotates_generations(main, tmp_path):
+    path = os.path.join(tmp_path, 'app.log')
+    writer = main._JsonLogWriter(path=path, max_bytes=20_000, backups=2, flush_seconds=60)
+    writer.put('test', 'first', {'obj': object(), 'n': 1})
+    # Nothing is written by the caller; a batch waits for size, time or flush()
+    assert not os.path.exists(path)
+    assert writer.flush()
+    with open(path, encoding='utf-8') as f:
+        rec = json.loads(f.readline())
+    assert rec['category'] == 'test' and rec['event'] == 'first' and rec['n'] == 1
+    assert rec['user'] == writer.user and rec['obj'].startswith('<object')
+    for i in range(1000):
+        writer.put('test', 'bulk', {'i': i})
+    assert writer.flush()
+    names = sorted(os.listdir(tmp_path))
+    assert {'app.log.1', 'app.log.2'} <= set(names) and 'app.log.3' not in names
+    # Oldest generations are dropped; the newest records survive in order
+    lines = []
+    for name in ('app.log.2', 'app.log.1', 'app.log'):
+        if name not in names:
+            continue
+        with open(os.path.join(tmp_path, name), encoding='utf-8') as f:
+            lines += [json.loads(l) for l in f]
+    assert [r['i'] for r in lines if 'i' in r][-1] == 999
+    assert all(os.path.getsize(os.path.join(tmp_path, n)) <= 20_000 + 200 * 100 for n in names)
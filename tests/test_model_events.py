@@ -0,0 +1,41 @@
+# A with children B and C
+TREE = {"Project Part": lambda i: "ABC"[i], "Parent": lambda i: "A" if i else ""}
+
+
+def test_field_edits_report_old_and_new_values(main, make_model):
+    model = make_model(3, fields=TREE)
+    events = []
+    model.subscribe(events.append)
+    assert model.set_part_fields("B", {"Notes": "x", "Parent": "A"}) == {"Notes": ("", "x")}
+    ev = events[-1]
+    assert ev.kind == main.ModelEvent.FIELDS_CHANGED and ev.parts == ["B"] and not ev.structural
+    # No-op edits stay silent
+    model.set_part_fields("B", {"Notes": "x"})
+    assert len(events) == 1
+    model.set_part_fields("C", {"Parent": "B"})
+    assert events[-1].kind == main.ModelEvent.HIERARCHY_MOVED and events[-1].structural
+    assert model.ancestors_of("C") == ("B", "A")
+    model.unsubscribe(events.append)
+    model.set_part_fields("C", {"Notes": "y"})
+    assert len(events) == 2
+
+
+def test_batch_merges_events_and_reload_wins(main, make_model):
+    model = make_model(3, fields=TREE)
+    events = []
+    model.subscribe(events.append)
+    with model.batch():
+        model.set_part_fields("B", {"Notes": "1"})
+        model.set_part_fields("B", {"Notes": "2"})
+        model.set_part_fields("C", {"Notes": "3"})
+        assert events == []
+    assert len(events) == 1
+    assert events[0].changes == {"B": {"Notes": ("", "2")}, "C": {"Notes": ("", "3")}}
+    with model.batch():
+        model.set_part_fields("B", {"Notes": "4"})
+        model.load_from_db()
+    assert events[-1].kind == main.ModelEvent.RELOADED and len(events) == 2
+    # A failing listener does not stop delivery to the others
+    model.subscribe(lambda ev: 1 / 0)
+    model.delete_row(2)
+    assert events[-1].kind == main.ModelEvent.ROWS_REMOVED and events[-1].parts == ["C"]
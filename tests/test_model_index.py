@@ -0,0 +1,19 @@
+def test_model_index_lookups_follow_data_version(main):
+    model = main.ProjectDataModel.__new__(main.ProjectDataModel)
+    model.rows = [
+        {"Project Part": "Root", "Parent": "", "Dependencies": ""},
+        {"Project Part": "Mid", "Parent": "Root", "Dependencies": ""},
+        {"Project Part": "Leaf", "Parent": "Mid", "Dependencies": "Mid, Root"},
+    ]
+    model.data_version = 0
+    model._index = None
+    model._index_version = -1
+    assert model.ancestors_of("Leaf") == ("Mid", "Root")
+    assert [r["Project Part"] for r in model.children_of("Root")] == ["Mid"]
+    assert model.dependents_of("Root") == ["Leaf"]
+    assert model.has_children("Mid") and not model.has_children("Leaf")
+    # In-place structural edit is picked up after a version bump
+    model.rows[2]["Parent"] = "Root"
+    model.bump_data_version()
+    assert model.ancestors_of("Leaf") == ("Root",)
+    assert not model.has_children("Mid")
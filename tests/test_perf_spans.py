@@ -0,0 +1,53 @@
+def test_spans_record_counts_and_percentiles(main):
+    rec = main.PerfRecorder(size=50)
+    assert rec.capacity == 50
+    for ms in range(1, 101):
+        rec.record('op', float(ms), {})
+    st = rec.stats()['op']
+    # Only the last 50 operations are kept
+    assert st['count'] == 50 and st['last'] == 100.0 and st['max'] == 100.0
+    assert st['p50'] in (75.0, 76.0) and st['p95'] in (97.0, 98.0)
+    @main.timed('test.outer', note=lambda res, n: {'n': n})
+    def outer(n):
+        with main.perf_span('test.inner') as inner:
+            main.perf_note(rows=n)
+        return inner
+    main.PERF.clear()
+    inner = outer(7)
+    recent = main.PERF.recent()
+    assert [r[1] for r in recent] == ['test.inner', 'test.outer']
+    assert recent[0][3] == {'rows': 7} and recent[1][3] == {'n': 7}
+    assert inner.ms is not None and recent[1][2] >= inner.ms
+    try:
+        with main.perf_span('test.fail'):
+            raise ValueError('x')
+    except ValueError:
+        pass
+    assert main.PERF.recent(1)[0][3] == {'error': 'ValueError'}
+
+
+def test_hot_paths_show_up_in_the_performance_panel(main, make_model):
+    model = make_model(20, save=False)
+    main.PERF.clear()
+    model.save_to_db()
+    model.load_from_db()
+    main.compute_schedule(model.rows)
+    stats = main.PERF.stats()
+    assert {'db.save.plan', 'db.save', 'db.load', 'rollup.progress', 'schedule.cpm'} <= set(stats)
+    assert [f for _, n, _, f in main.PERF.recent() if n == 'db.load'][-1]['rows'] == 20
+    dlg = main.PerformanceDialog(main.PERF)
+    try:
+        names = {dlg.summary.item(r, 0).text() for r in range(dlg.summary.rowCount())}
+        assert 'db.load' in names
+        assert dlg.recent.rowCount() == len(main.PERF.recent())
+    finally:
+        dlg.close()
+
+
+def test_timed_slots_accept_signal_arguments(main, make_model):
+    model = make_model()
+    view = main.CostEstimatesView(model)
+    main.PERF.clear()
+    # stateChanged(int) is connected straight to the decorated refresh()
+    view.chk_rollup.setChecked(not view.chk_rollup.isChecked())
+    assert main.PERF.stats()['render.costs']['count'] == 1
@@ -0,0 +1,34 @@
+import datetime
+
+
+def _row(name, start, dur, deps=""):
+    return {"Project Part": name, "Start Date": start, "Duration (days)": str(dur), "Dependencies": deps}
+
+
+def test_critical_path_and_float(main):
+    rows = [
+        _row("A", "01-05-2026", 5),
+        _row("B", "01-05-2026", 3, "A"),
+        _row("C", "01-05-2026", 1, "A"),
+        _row("D", "01-05-2026", 2, "B, C"),
+        _row("E", "01-05-2026", 1),
+    ]
+    s = main.compute_schedule(rows)
+    assert s.critical == {"A", "B", "D"}
+    assert s.total_float["C"] == 2
+    assert s.total_float["E"] == 9
+    assert s.es["D"] == datetime.datetime(2026, 1, 13)
+    assert s.project_finish == datetime.datetime(2026, 1, 15)
+    assert s.order.index("A") < s.order.index("B") < s.order.index("D")
+
+
+def test_cycles_and_unknown_dependencies_do_not_break_schedule(main):
+    rows = [
+        _row("X", "02-02-2026", 2, "Y"),
+        _row("Y", "02-02-2026", 2, "X"),
+        _row("Z", "02-02-2026", 4, "Missing"),
+    ]
+    s = main.compute_schedule(rows)
+    assert s.critical == {"Z"}
+    assert s.total_float["X"] is None
+    assert s.ef["Y"] == datetime.datetime(2026, 2, 4)
@@ -0,0 +1,46 @@
+import time
+
+from PyQt5.QtWidgets import QApplication
+
+
+def _pump_until(cond, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not cond() and time.monotonic() < deadline:
+        QApplication.processEvents()
+        time.sleep(0.02)
+    return cond()
+
+
+def slow_handler():
+    time.sleep(0.45)
+
+
+def test_blocked_gui_thread_is_recorded_with_its_stack(main):
+    wd = main.UiStallWatchdog(threshold_ms=150)
+    wd.context = "Gantt Chart"
+    main.PERF.clear()
+    wd.start()
+    try:
+        _pump_until(lambda: False, 0.2)  # heartbeats flowing, nothing recorded
+        assert wd.stalls() == []
+        slow_handler()
+        assert _pump_until(lambda: wd.stalls())
+        st = wd.stalls()[0]
+        assert st['where'].startswith('slow_handler (test_stall_watchdog.py:')
+        assert st['view'] == "Gantt Chart" and 'time.sleep(0.45)' in st['stack']
+        assert 250 <= st['ms'] < 2000
+        assert main.PERF.stats()['ui.stall']['count'] == 1
+        slow_handler()
+        assert _pump_until(lambda: len(wd.stalls()) == 2)
+        worst = wd.worst_offenders()
+        assert len(worst) == 1 and worst[0]['count'] == 2
+        dlg = main.PerformanceDialog(main.PERF, watchdog=wd)
+        try:
+            assert dlg.stalls.rowCount() == 1
+            dlg.stalls.selectRow(0)
+            assert 'slow_handler' in dlg.stall_stack.toPlainText()
+        finally:
+            dlg.close()
+    finally:
+        wd.stop()
+    assert not wd.running
@@ -0,0 +1,102 @@
+def test_parents_centre_on_children_and_leaves_stack(main):
+    L = main.TreeLayout(["a"], {"a": ["c", "B"], "c": ["e", "d"]})
+    pos = L.positions()
+    row = L.NODE_H + L.V_GAP
+    assert pos["B"] == (L.NODE_W + L.H_GAP, 0)
+    assert pos["d"][1] == row and pos["e"][1] == 2 * row
+    assert pos["c"][1] == 1.5 * row
+    assert pos["a"] == (0, (pos["B"][1] + pos["c"][1]) / 2)
+
+
+def test_collapse_remeasures_only_the_branch_and_changed_ancestors(main):
+    # 20k-deep chain would overflow a recursive layout
+    chain = {f"C{i}": [f"C{i + 1}"] for i in range(20000)}
+    chain["C0"].append("Side")
+    L = main.TreeLayout(["C0"], chain)
+    assert len(L.positions()) == 20002
+    measured = []
+    orig = L._measure
+    L._measure = lambda n: (measured.append(n), orig(n))
+    # Collapsing deep inside leaves every ancestor's extent unchanged: no climb to the root
+    L.set_collapsed({"C15000"})
+    assert measured == ["C15000", "C14999"]
+    assert len(L.positions()) == 15002
+    fresh = main.TreeLayout(["C0"], chain, {"C15000"}).positions()
+    assert L.positions() == fresh
+    L.set_collapsed(set())
+    assert len(L.positions()) == 20002
+
+
+def test_tree_view_reuses_layout_until_data_changes(main, make_model):
+    model = make_model()
+    model.rows = [{"Project Part": "Root", "Parent": ""}, {"Project Part": "Kid", "Parent": "Root"}]
+    model.bump_data_version()
+    view = main.ProjectTreeView(model)
+    view._collapsed = set()
+    first = view._compute_layout()
+    assert set(first.positions()) == {"Root", "Kid"}
+    view._collapsed.add("Root")
+    assert view._compute_layout() is first
+    assert set(first.positions()) == {"Root"}
+    model.rows.append({"Project Part": "Other", "Parent": ""})
+    model.bump_data_version()
+    again = view._compute_layout()
+    assert again is not first and set(again.positions()) == {"Root", "Other"}
+
+
+def test_tree_scene_uses_one_item_per_node_and_one_path_per_parent(main, make_model):
+    model = make_model()
+    model.rows = [{"Project Part": "Root", "Parent": "", "% Complete": "50"}]
+    model.rows += [{"Project Part": f"K{i}", "Parent": "Root"} for i in range(5)]
+    model.rows += [{"Project Part": f"G{i}", "Parent": "K0", "Status": "Done"} for i in range(3)]
+    model.bump_data_version()
+    view = main.ProjectTreeView(model)
+    view._collapsed = set()
+    view.refresh()
+    nodes = [it for it in view.scene.items() if isinstance(it, main.TreeNodeItem)]
+    assert len(nodes) == 9
+    assert len(view.scene.items()) == 9 + 2
+    root = view._name_to_item["Root"]
+    assert root.toggle_hit(root.mapToScene(12, root.boundingRect().height() / 2))
+    assert not view._name_to_item["K1"].toggle_hit(view._name_to_item["K1"].mapToScene(12, 20))
+    # Collapsing moves/removes existing items instead of rebuilding the scene
+    k1 = view._name_to_item["K1"]
+    view._collapsed.add("K0")
+    view.refresh()
+    assert view._name_to_item["K1"] is k1 and "G0" not in view._name_to_item
+    assert view._name_to_item["K0"].collapsed
+    assert len(view.scene.items()) == 6 + 1
+
+
+def test_minimap_is_cached_and_repainted_only_where_nodes_changed(main, make_model):
+    model = make_model()
+    model.rows = [{"Project Part": "Root", "Parent": ""}]
+    model.rows += [{"Project Part": f"K{i}", "Parent": "Root"} for i in range(4)]
+    model.rows += [{"Project Part": "Deep", "Parent": "K3"}]
+    model.bump_data_version()
+    view = main.ProjectTreeView(model)
+    view._collapsed = set()
+    view.refresh()
+    item, src, px = view._mini_cache
+    key = item.pixmap().cacheKey()
+
+    def pixel_alpha(name):
+        r = view._name_to_item[name].sceneBoundingRect()
+        img = item.pixmap().toImage()
+        return img.pixelColor(int((r.center().x() - src.x()) * px), int((r.center().y() - src.y()) * px)).alpha()
+
+    deep_alpha = pixel_alpha("Deep")
+    assert deep_alpha > 0
+    deep_rect = view._name_to_item["Deep"].sceneBoundingRect()
+    # Panning/zooming only moves the viewport box
+    view.view.scale(2, 2)
+    view._update_minimap_viewport()
+    assert view._mini_cache[0].pixmap().cacheKey() == key
+    # Collapsing repaints the dirty rects inside the existing cached pixmap
+    view._collapsed.add("K3")
+    view.refresh()
+    assert view._mini_cache[0] is item and view._mini_cache[1] is src
+    img = item.pixmap().toImage()
+    c = deep_rect.center()
+    assert img.pixelColor(int((c.x() - src.x()) * px), int((c.y() - src.y()) * px)).alpha() == 0
+    assert pixel_alpha("K3") > 0
@@ -0,0 +1,75 @@
+def test_data_changes_refresh_only_the_visible_view_once(main, qapp, make_model):
+    # A non-empty DB, so a clean profile doesn't open the modal first-run dialog
+    model = make_model(1)
+    win = main.MainWindow(model)
+    try:
+        calls = []
+        win.project_tree_view.refresh = lambda: calls.append('tree')
+        win.timeline_view.render_timeline = lambda: calls.append('timeline')
+        win.display_view(0)
+        qapp.processEvents()
+        calls.clear()
+        # A burst of changes coalesces into one deferred refresh of the visible page
+        for _ in range(5):
+            win.on_data_changed()
+        assert calls == []
+        qapp.processEvents()
+        assert calls == ['tree']
+        # Hidden pages stay stale until shown, and are rebuilt once
+        win.display_view(3)
+        win.display_view(0)
+        win.display_view(3)
+        assert calls == ['tree', 'timeline']
+    finally:
+        win.close()
+
+
+def test_gantt_edit_dialog_marks_other_views_stale_and_rolls_up(main, qapp, make_model):
+    from PyQt5.QtWidgets import QDialog, QFormLayout, QLineEdit, QPushButton, QSpinBox
+    model = make_model(3, fields={"Parent": lambda i: "P0" if i == 1 else ""})
+    win = main.MainWindow(model)
+    calls = []
+    win.project_tree_view.refresh = lambda: calls.append('tree')
+    win.display_view(1)
+    qapp.processEvents()
+    rendered = []
+    gantt = win.gantt_chart_view
+    gantt.render_gantt(model)
+    orig_render = gantt.render_gantt
+    gantt.render_gantt = lambda m: rendered.append(m.row_by_name("P0")["% Complete"]) or orig_render(m)
+
+    def edit(fields):
+        def fake_exec(dialog):
+            form = dialog.findChild(QFormLayout)
+            for i in range(form.rowCount()):
+                label = form.itemAt(i, QFormLayout.LabelRole)
+                field = form.itemAt(i, QFormLayout.FieldRole)
+                if label is None or field is None or label.widget().text() not in fields:
+                    continue
+                w, val = field.widget(), fields[label.widget().text()]
+                w.setValue(val) if isinstance(w, QSpinBox) else w.setText(val)
+            next(b for b in dialog.findChildren(QPushButton) if b.text() == "Save").click()
+            return 1
+        orig_exec = QDialog.exec_
+        QDialog.exec_ = fake_exec
+        try:
+            gantt.show_edit_dialog(model.row_by_name("P1"))
+        finally:
+            QDialog.exec_ = orig_exec
+
+    try:
+        # The chart redrawn right after the edit already shows the rolled-up parent
+        edit({"% Complete": 100})
+        assert rendered and rendered[-1] == 100
+        win.display_view(0)
+        assert calls == ['tree']
+        # Moving the part under another parent rebuilds the other views once they are shown
+        win.display_view(1)
+        edit({"Parent": "P2"})
+        win.display_view(0)
+        assert calls == ['tree', 'tree']
+        assert model.row_by_name("P2")["% Complete"] == 100
+        model.flush_pending_writes()
+        assert main.ProjectDataModel().row_by_name("P1")["Parent"] == "P2"
+    finally:
+        win.close()
@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+import sqlite3
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def test_write_xlsx_stream_types_values_per_column(main, tmp_path):
+    import openpyxl
+    d = str(tmp_path)
+    path = os.path.join(d, 'out.xlsx')
+    columns = [("Name", "text"), ("Cost", "money"), ("Done", "pct100"), ("Start", "date")]
+    rows = iter([("A", "$1,250.50", "40", "01-05-2026"), ("B", "", None, "bad"), ("C", 3, "100", "")])
+    assert main.write_xlsx_stream(path, columns, rows, sheet_title='Parts', meta_rows=[["Generated", "now"]]) == 3
+    wb = openpyxl.load_workbook(path)
+    ws = wb['Parts']
+    assert [c.value for c in ws[1]] == ["Name", "Cost", "Done", "Start"]
+    assert ws['B2'].value == 1250.5 and ws['B2'].number_format.startswith('"$"')
+    assert ws['C2'].value == 0.4 and ws['C2'].number_format == '0.0%'
+    assert ws['D2'].value.year == 2026 and ws['D2'].number_format == 'mm-dd-yyyy'
+    assert ws['B3'].value is None and ws['D3'].value == "bad"
+    assert ws['B4'].value == 3 and ws['C4'].value == 1.0
+    assert wb['_Meta']['A1'].value == "Generated"
+
+
+def test_cli_xlsx_export_streams_all_model_columns(main, tmp_path):
+    import openpyxl
+    d = str(tmp_path)
+    db = os.path.join(d, 'project_data.db')
+    out = os.path.join(d, 'parts.xlsx')
+    cols = main.ProjectDataModel.COLUMNS
+    with sqlite3.connect(db) as conn:
+        conn.execute("CREATE TABLE project_parts (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                     + ",".join(f'"{c}" TEXT' for c in cols) + ")")
+        row = {c: "" for c in cols}
+        conn.executemany(f"INSERT INTO project_parts ({','.join(chr(34) + c + chr(34) for c in cols)}) VALUES ({','.join('?' * len(cols))})",
+                         ([f"P{i}" if c == "Project Part" else ("12.5" if c == "Production Cost" else row[c]) for c in cols]
+                          for i in range(50000)))
+    # Anything the child logs lands next to the temp database, never in the repo
+    env = dict(os.environ, PROJECT_DB_PATH=db)
+    t0 = time.perf_counter()
+    res = subprocess.run([sys.executable, os.path.join(ROOT, 'cli.py'), 'export', '--database', db, '--out', out],
+                         capture_output=True, text=True, cwd=d, env=env)
+    elapsed = time.perf_counter() - t0
+    assert res.returncode == 0, res.stderr
+    assert "Exported 50000 rows" in res.stdout
+    assert elapsed < 30
+    wb = openpyxl.load_workbook(out, read_only=True)
+    ws = wb['Project Parts']
+    header = next(ws.iter_rows(min_row=1, max_row=1, values_only=True))
+    assert list(header) == list(cols)
+    first = next(ws.iter_rows(min_row=2, max_row=2, values_only=True))
+    assert first[0] == "P0" and first[cols.index("Production Cost")] == 12.5
+    assert sum(1 for _ in ws.iter_rows(min_row=2, max_col=1, values_only=True)) == 50000
+    wb.close()
+    # The export path never loads the Qt application
+    probe = subprocess.run([sys.executable, '-c', "import sys, cli; cli.export_xlsx(sys.argv[1], sys.argv[2]); "
+                            "print('PyQt5' in sys.modules)", db, os.path.join(d, 'probe.xlsx')],
+                           capture_output=True, text=True, cwd=ROOT, env=env)
+    assert probe.returncode == 0, probe.stderr
+    assert probe.stdout.strip() == "False"